@@ -381,7 +381,7 @@ class SequenceExecutor(QObject):
             
             # Clear existing matches before starting
             overlay.cached_matches = []
-            overlay.match_counters = {}
+            overlay.reset_tracking()
             
             # DIRECT MATCHING: Take a screenshot and manually find matches
             self._log_debug("Taking initial screenshot to manually search for matches")
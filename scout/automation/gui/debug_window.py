@@ -17,13 +17,14 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox, QComboBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtGui import QPixmap
 import cv2
 import numpy as np
 import logging
 from scout.automation.core import AutomationPosition
 from scout.automation.actions import ActionType
 from scout.automation.gui.debug_tab import AutomationDebugTab
+from scout.core.window.image_utils import numpy_to_qimage
 
 logger = logging.getLogger(__name__)
 
@@ -163,17 +164,10 @@ class ImagePreview(QLabel):
                 -1
             )
             
-        # Convert to Qt image and display
-        height, width = display.shape[:2]
-        bytes_per_line = 3 * width
-        qt_image = QImage(
-            display.data,
-            width,
-            height,
-            bytes_per_line,
-            QImage.Format.Format_RGB888
-        )
-        self.setPixmap(QPixmap.fromImage(qt_image))
+        # Wrap the BGR image for Qt without converting and display
+        qt_image = numpy_to_qimage(display)
+        if qt_image is not None:
+            self.setPixmap(QPixmap.fromImage(qt_image))
 
 class AutomationDebugWindow(QMainWindow):
     """
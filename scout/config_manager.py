@@ -81,7 +81,11 @@ class ConfigManager:
             "target_frequency": "1.0",
             "sound_enabled": "false",
             "templates_dir": "scout/templates",
-            "grouping_threshold": "10"
+            "grouping_threshold": "10",
+            "cpu_budget": "0.25",
+            "latency_budget": "0.0",
+            "track_iou_threshold": "0.3",
+            "track_min_hits": "1"
         }
         
         # Scanner settings
@@ -187,6 +191,10 @@ class ConfigManager:
             - grouping_threshold: Pixel distance for grouping matches
             - match_persistence: Number of frames to keep matches without updates
             - distance_threshold: Maximum pixel distance to consider matches as the same group
+            - cpu_budget: Share of one CPU core detection may use (0 disables the limit)
+            - latency_budget: Target seconds from capture to result (0 disables it)
+            - track_iou_threshold: Minimum overlap to link a match to an existing track
+            - track_min_hits: Frames a match must be seen before it is shown
         """
         config = self._load_config()
         
@@ -198,7 +206,11 @@ class ConfigManager:
             "templates_dir": config.get("template_matching", "templates_dir", fallback="scout/templates"),
             "grouping_threshold": config.getint("template_matching", "grouping_threshold", fallback=10),
             "match_persistence": config.getint("template_matching", "match_persistence", fallback=3),
-            "distance_threshold": config.getint("template_matching", "distance_threshold", fallback=100)
+            "distance_threshold": config.getint("template_matching", "distance_threshold", fallback=100),
+            "cpu_budget": config.getfloat("template_matching", "cpu_budget", fallback=0.25),
+            "latency_budget": config.getfloat("template_matching", "latency_budget", fallback=0.0),
+            "track_iou_threshold": config.getfloat("template_matching", "track_iou_threshold", fallback=0.3),
+            "track_min_hits": config.getint("template_matching", "track_min_hits", fallback=1)
         }
 
     def update_template_matching_settings(self, settings: Dict[str, Any]) -> None:
@@ -215,6 +227,10 @@ class ConfigManager:
                 - grouping_threshold: Pixel distance for grouping matches
                 - match_persistence: Number of frames to keep matches without updates
                 - distance_threshold: Maximum pixel distance to consider matches as the same group
+                - cpu_budget: Share of one CPU core detection may use (0 disables the limit)
+                - latency_budget: Target seconds from capture to result (0 disables it)
+                - track_iou_threshold: Minimum overlap to link a match to an existing track
+                - track_min_hits: Frames a match must be seen before it is shown
         """
         config = self._load_config()
         
@@ -229,6 +245,10 @@ class ConfigManager:
         config.set("template_matching", "grouping_threshold", str(settings.get("grouping_threshold", 10)))
         config.set("template_matching", "match_persistence", str(settings.get("match_persistence", 3)))
         config.set("template_matching", "distance_threshold", str(settings.get("distance_threshold", 100)))
+        config.set("template_matching", "cpu_budget", str(settings.get("cpu_budget", 0.25)))
+        config.set("template_matching", "latency_budget", str(settings.get("latency_budget", 0.0)))
+        config.set("template_matching", "track_iou_threshold", str(settings.get("track_iou_threshold", 0.3)))
+        config.set("template_matching", "track_min_hits", str(settings.get("track_min_hits", 1)))
         
         self._save_config(config)
         logger.debug(f"Updated template matching settings: {settings}")
@@ -93,7 +93,7 @@ class WaitForElementTask(Task):
     Parameters:
     - strategy: Detection strategy ('template', 'ocr', 'yolo')
     - timeout: Maximum time to wait in seconds
-    - check_interval: Time between checks in seconds
+    - check_interval: Minimum time between checks in seconds (checks wait for new frames)
     
     Plus strategy-specific parameters:
     - templates: For template strategy
@@ -160,23 +160,21 @@ class WaitForElementTask(Task):
                 class_ids=self.params.get('class_ids')
             )
             
-            # Track start time
+            # Check once per new frame, at most every check_interval seconds
             start_time = time.time()
-            
-            # Loop until timeout
-            while time.time() - start_time < timeout:
-                # Execute detection
-                detect_task.execute(context)
-                
+            stream = detection_service.stream(
+                lambda: detect_task.result if detect_task.execute(context) else None,
+                timeout=timeout,
+                min_interval=check_interval,
+                consumer=self.name
+            )
+            for update in stream:
                 # Check if element was found
-                if detect_task.result and len(detect_task.result) > 0:
+                if update.results:
                     # Store the detection results
-                    self.result = detect_task.result
+                    self.result = update.results
                     logger.debug(f"Element found after {time.time() - start_time:.1f} seconds")
                     return True
-                
-                # Wait before next check
-                time.sleep(check_interval)
             
             # Timeout reached
             self.fail(f"Timeout waiting for element ({timeout} seconds)")
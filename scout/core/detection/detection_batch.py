@@ -0,0 +1,551 @@
+"""
+Detection Batch
+
+This module provides the DetectionBatch class, a compact, immutable container
+for detection results. Instead of allocating one dictionary per hit, results
+are stored as parallel NumPy arrays (struct-of-arrays). A lazy dictionary view
+is provided for compatibility with code written against the List[Dict] format.
+offset_results shifts results of either form from region into frame space.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+import numpy as np
+
+
+def _readonly(values: Any, dtype: Any) -> np.ndarray:
+    """
+    Convert values to a read-only 1-D array without touching the caller's array.
+
+    Args:
+        values: Array-like values
+        dtype: Target dtype
+
+    Returns:
+        Read-only NumPy array (a view when no conversion was required)
+    """
+    array = np.asarray(values, dtype=dtype).reshape(-1).view()
+    array.flags.writeable = False
+    return array
+
+
+class DetectionBatch(Sequence):
+    """
+    Immutable struct-of-arrays representation of detection results.
+
+    A batch stores positions, sizes, confidences and labels of any number of
+    detections in NumPy arrays. It:
+
+    - Behaves as a read-only sequence of result dictionaries (built on access)
+    - Applies coordinate offsets lazily, sharing the underlying arrays
+    - Provides vectorized sorting, filtering and duplicate suppression
+    - Can be cached and shared between threads without defensive copies
+
+    Dictionaries produced by the view have the same keys as the historic
+    template results: 'type', 'template_name', 'x', 'y', 'width', 'height'
+    and 'confidence'.
+    """
+
+    __slots__ = ('_x', '_y', '_width', '_height', '_confidence',
+                 '_label_ids', '_labels', '_offset', '_type')
+
+    def __init__(self, x: Any, y: Any, width: Any, height: Any, confidence: Any,
+                 label_ids: Any = None, labels: Iterable[str] = (),
+                 offset: Tuple[int, int] = (0, 0), detection_type: str = 'template'):
+        """
+        Initialize a detection batch.
+
+        Args:
+            x: Left coordinates of the detections
+            y: Top coordinates of the detections
+            width: Widths of the detections
+            height: Heights of the detections
+            confidence: Confidence scores (0.0-1.0)
+            label_ids: Index into labels for every detection (None for all zeros)
+            labels: Label names (e.g. template names)
+            offset: (dx, dy) added to x and y when coordinates are read
+            detection_type: Value reported as 'type' in the dictionary view
+        """
+        self._x = _readonly(x, np.int32)
+        self._y = _readonly(y, np.int32)
+        self._width = _readonly(width, np.int32)
+        self._height = _readonly(height, np.int32)
+        self._confidence = _readonly(confidence, np.float32)
+
+        if label_ids is None:
+            label_ids = np.zeros(len(self._x), dtype=np.int32)
+        self._label_ids = _readonly(label_ids, np.int32)
+        self._labels = tuple(labels)
+        self._offset = (int(offset[0]), int(offset[1]))
+        self._type = detection_type
+
+        lengths = {len(self._x), len(self._y), len(self._width), len(self._height),
+                   len(self._confidence), len(self._label_ids)}
+        if len(lengths) != 1:
+            raise ValueError("All detection arrays must have the same length")
+
+    @classmethod
+    def empty(cls, detection_type: str = 'template') -> 'DetectionBatch':
+        """
+        Create an empty batch.
+
+        Args:
+            detection_type: Value reported as 'type' in the dictionary view
+
+        Returns:
+            Batch without detections
+        """
+        return cls([], [], [], [], [], detection_type=detection_type)
+
+    @classmethod
+    def from_match_locations(cls, label: str, x: Any, y: Any, width: int, height: int,
+                             confidence: Any, detection_type: str = 'template') -> 'DetectionBatch':
+        """
+        Create a batch from the locations of one label (e.g. np.where output).
+
+        Args:
+            label: Label shared by all detections
+            x: Left coordinates
+            y: Top coordinates
+            width: Width shared by all detections
+            height: Height shared by all detections
+            confidence: Confidence scores
+            detection_type: Value reported as 'type' in the dictionary view
+
+        Returns:
+            New batch
+        """
+        count = len(x)
+        return cls(
+            x, y,
+            np.full(count, width, dtype=np.int32),
+            np.full(count, height, dtype=np.int32),
+            confidence,
+            np.zeros(count, dtype=np.int32),
+            (label,),
+            detection_type=detection_type
+        )
+
+    @classmethod
+    def from_dicts(cls, results: Iterable[Dict[str, Any]],
+                   detection_type: str = 'template') -> 'DetectionBatch':
+        """
+        Create a batch from result dictionaries.
+
+        Label names are taken from 'template_name' (or 'label'/'class_name').
+
+        Args:
+            results: Result dictionaries with x, y, width, height and confidence
+            detection_type: Value reported as 'type' when a result has none
+
+        Returns:
+            New batch
+        """
+        if isinstance(results, DetectionBatch):
+            return results
+
+        results = list(results)
+        labels: Dict[str, int] = {}
+        label_ids = []
+
+        for result in results:
+            name = result.get('template_name', result.get('label', result.get('class_name', '')))
+            label_ids.append(labels.setdefault(name, len(labels)))
+
+        if results:
+            detection_type = results[0].get('type', detection_type)
+
+        return cls(
+            [r.get('x', 0) for r in results],
+            [r.get('y', 0) for r in results],
+            [r.get('width', 0) for r in results],
+            [r.get('height', 0) for r in results],
+            [r.get('confidence', 0.0) for r in results],
+            label_ids,
+            labels.keys(),
+            detection_type=detection_type
+        )
+
+    @classmethod
+    def from_tuples(cls, matches: Iterable[Tuple[str, int, int, int, int, float]],
+                    detection_type: str = 'template') -> 'DetectionBatch':
+        """
+        Create a batch from overlay tuples (the inverse of to_tuples).
+
+        Args:
+            matches: (name, x, y, width, height, confidence) tuples
+            detection_type: Value reported as 'type' in the dictionary view
+
+        Returns:
+            New batch
+        """
+        matches = list(matches)
+        labels: Dict[str, int] = {}
+        label_ids = [labels.setdefault(match[0], len(labels)) for match in matches]
+        columns = list(zip(*matches)) if matches else [()] * 6
+        return cls(columns[1], columns[2], columns[3], columns[4], columns[5], label_ids,
+                   labels.keys(), detection_type=detection_type)
+
+    @classmethod
+    def concatenate(cls, batches: Iterable['DetectionBatch']) -> 'DetectionBatch':
+        """
+        Concatenate batches into one, merging their label tables.
+
+        Offsets of the input batches are applied to the result.
+
+        Args:
+            batches: Batches to combine
+
+        Returns:
+            Combined batch
+        """
+        batches = [batch for batch in batches if batch is not None]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+
+        labels: Dict[str, int] = {}
+        label_ids = []
+        for batch in batches:
+            remap = np.array([labels.setdefault(name, len(labels)) for name in batch._labels]
+                             or [0], dtype=np.int32)
+            label_ids.append(remap[batch._label_ids])
+
+        return cls(
+            np.concatenate([batch.x for batch in batches]),
+            np.concatenate([batch.y for batch in batches]),
+            np.concatenate([batch._width for batch in batches]),
+            np.concatenate([batch._height for batch in batches]),
+            np.concatenate([batch._confidence for batch in batches]),
+            np.concatenate(label_ids),
+            labels.keys(),
+            detection_type=batches[0]._type
+        )
+
+    # Array accessors
+
+    @property
+    def x(self) -> np.ndarray:
+        """Left coordinates with the offset applied."""
+        return self._x + self._offset[0] if self._offset[0] else self._x
+
+    @property
+    def y(self) -> np.ndarray:
+        """Top coordinates with the offset applied."""
+        return self._y + self._offset[1] if self._offset[1] else self._y
+
+    @property
+    def width(self) -> np.ndarray:
+        """Widths of the detections."""
+        return self._width
+
+    @property
+    def height(self) -> np.ndarray:
+        """Heights of the detections."""
+        return self._height
+
+    @property
+    def confidence(self) -> np.ndarray:
+        """Confidence scores of the detections."""
+        return self._confidence
+
+    @property
+    def label_ids(self) -> np.ndarray:
+        """Index into labels for every detection."""
+        return self._label_ids
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        """Label table of the batch."""
+        return self._labels
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Offset applied to x and y."""
+        return self._offset
+
+    @property
+    def detection_type(self) -> str:
+        """Value reported as 'type' in the dictionary view."""
+        return self._type
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """Detections as an (N, 4) array of x, y, width, height."""
+        return np.stack([self.x, self.y, self._width, self._height], axis=1)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """Detection centers as an (N, 2) float array."""
+        return np.stack([self.x + self._width / 2.0, self.y + self._height / 2.0], axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the underlying arrays in bytes."""
+        return (self._x.nbytes + self._y.nbytes + self._width.nbytes + self._height.nbytes +
+                self._confidence.nbytes + self._label_ids.nbytes)
+
+    def label_of(self, index: int) -> str:
+        """
+        Get the label of a detection.
+
+        Args:
+            index: Detection index
+
+        Returns:
+            Label name ('' if the batch has no label table)
+        """
+        if not self._labels:
+            return ''
+        return self._labels[self._label_ids[index]]
+
+    # Derived batches (all share or slice the underlying arrays)
+
+    def with_offset(self, dx: int, dy: int) -> 'DetectionBatch':
+        """
+        Get a view of this batch with its coordinates shifted.
+
+        No arrays are copied; the offset is applied when coordinates are read.
+
+        Args:
+            dx: Horizontal shift
+            dy: Vertical shift
+
+        Returns:
+            Shifted batch
+        """
+        if not dx and not dy:
+            return self
+        return DetectionBatch(
+            self._x, self._y, self._width, self._height, self._confidence,
+            self._label_ids, self._labels,
+            offset=(self._offset[0] + dx, self._offset[1] + dy),
+            detection_type=self._type
+        )
+
+    def select(self, indices: Any) -> 'DetectionBatch':
+        """
+        Get a batch with the detections picked by indices, a slice or a boolean mask.
+
+        Args:
+            indices: Integer indices, slice or boolean mask
+
+        Returns:
+            Selected batch
+        """
+        return DetectionBatch(
+            self._x[indices], self._y[indices], self._width[indices],
+            self._height[indices], self._confidence[indices],
+            self._label_ids[indices], self._labels,
+            offset=self._offset, detection_type=self._type
+        )
+
+    def sorted(self, descending: bool = True) -> 'DetectionBatch':
+        """
+        Get the batch sorted by confidence.
+
+        Args:
+            descending: Whether to put the highest confidence first
+
+        Returns:
+            Sorted batch
+        """
+        order = np.argsort(-self._confidence if descending else self._confidence, kind='stable')
+        return self.select(order)
+
+    def top_k(self, k: int) -> 'DetectionBatch':
+        """
+        Get the k most confident detections, highest first.
+
+        Args:
+            k: Number of detections to keep (<= 0 keeps all)
+
+        Returns:
+            Batch with at most k detections
+        """
+        if k <= 0 or k >= len(self):
+            return self.sorted()
+
+        # Partial selection followed by a sort of the k survivors only
+        candidates = np.argpartition(-self._confidence, k - 1)[:k]
+        order = candidates[np.argsort(-self._confidence[candidates], kind='stable')]
+        return self.select(order)
+
+    def filter_confidence(self, threshold: float) -> 'DetectionBatch':
+        """
+        Get the detections with a confidence of at least the threshold.
+
+        Args:
+            threshold: Minimum confidence
+
+        Returns:
+            Filtered batch
+        """
+        return self.select(self._confidence >= threshold)
+
+    def suppress_duplicates(self, min_distance: float, metric: str = 'euclidean',
+                            per_label: bool = False) -> 'DetectionBatch':
+        """
+        Greedy non-maximum suppression based on the distance between positions.
+
+        Detections are visited from the highest confidence down; every later
+        detection that is too close to a kept one is dropped. With the
+        'euclidean' metric a detection is too close when its distance is below
+        min_distance; with 'chebyshev' when both |dx| and |dy| are at most
+        min_distance.
+
+        Args:
+            min_distance: Distance threshold in pixels
+            metric: 'euclidean' or 'chebyshev'
+            per_label: Only suppress detections that share a label
+
+        Returns:
+            Batch of kept detections, highest confidence first
+        """
+        if metric not in ('euclidean', 'chebyshev'):
+            raise ValueError(f"Unsupported distance metric: {metric}")
+
+        ordered = self.sorted()
+        count = len(ordered)
+        if count <= 1 or min_distance <= 0:
+            return ordered
+
+        xs = ordered._x.astype(np.float32)
+        ys = ordered._y.astype(np.float32)
+        label_ids = ordered._label_ids
+        suppressed = np.zeros(count, dtype=bool)
+        keep = []
+
+        for i in range(count):
+            if suppressed[i]:
+                continue
+            keep.append(i)
+
+            # Compare against every later detection in one vectorized step
+            dx = np.abs(xs[i + 1:] - xs[i])
+            dy = np.abs(ys[i + 1:] - ys[i])
+            if metric == 'euclidean':
+                close = dx * dx + dy * dy < min_distance * min_distance
+            else:
+                close = (dx <= min_distance) & (dy <= min_distance)
+            if per_label:
+                close &= label_ids[i + 1:] == label_ids[i]
+            suppressed[i + 1:] |= close
+
+        return ordered.select(np.asarray(keep, dtype=np.intp))
+
+    # Compatibility views
+
+    def to_dict(self, index: int) -> Dict[str, Any]:
+        """
+        Build the result dictionary of one detection.
+
+        Args:
+            index: Detection index
+
+        Returns:
+            Result dictionary
+        """
+        return {
+            'type': self._type,
+            'template_name': self.label_of(index),
+            'x': int(self._x[index]) + self._offset[0],
+            'y': int(self._y[index]) + self._offset[1],
+            'width': int(self._width[index]),
+            'height': int(self._height[index]),
+            'confidence': float(self._confidence[index])
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Build result dictionaries for all detections.
+
+        Returns:
+            List of result dictionaries
+        """
+        return [self.to_dict(i) for i in range(len(self))]
+
+    def to_tuples(self) -> List[Tuple[str, int, int, int, int, float]]:
+        """
+        Convert to the overlay tuple format.
+
+        Returns:
+            List of (name, x, y, width, height, confidence) tuples
+        """
+        names = [self.label_of(i) for i in range(len(self))]
+        return list(zip(names, self.x.tolist(), self.y.tolist(), self._width.tolist(),
+                        self._height.tolist(), self._confidence.tolist()))
+
+    # Sequence protocol
+
+    def __len__(self) -> int:
+        """Return the number of detections."""
+        return len(self._x)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> Any:
+        """Return a result dictionary for an integer index, or a batch otherwise."""
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("DetectionBatch index out of range")
+            return self.to_dict(int(index))
+        return self.select(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over result dictionaries."""
+        for i in range(len(self)):
+            yield self.to_dict(i)
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare with another batch or a list of result dictionaries."""
+        if isinstance(other, DetectionBatch):
+            return self.to_tuples() == other.to_tuples() and self._type == other._type
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        """Support pickling for the persistent detection cache."""
+        return (DetectionBatch, (np.array(self._x), np.array(self._y), np.array(self._width),
+                                 np.array(self._height), np.array(self._confidence),
+                                 np.array(self._label_ids), self._labels, self._offset, self._type))
+
+    def __repr__(self) -> str:
+        """Return a short description of the batch."""
+        return (f"DetectionBatch(type={self._type!r}, count={len(self)}, "
+                f"labels={list(self._labels)}, offset={self._offset})")
+
+
+def offset_results(results: Union[List[Dict], DetectionBatch], x: int, y: int) -> Union[List[Dict], DetectionBatch]:
+    """
+    Shift detection results from region space into frame space without modifying them.
+
+    Args:
+        results: Detection results (batch or result dictionaries)
+        x: Horizontal region offset
+        y: Vertical region offset
+
+    Returns:
+        Shifted results; dictionaries (and their 'bbox' lists) are always
+        copies, even without an offset, so callers never share them
+    """
+    if isinstance(results, DetectionBatch):
+        return results.with_offset(x, y) if (x or y) else results
+
+    shifted = []
+    for result in results:
+        result = dict(result)
+        if 'x' in result and 'y' in result:
+            result['x'] += x
+            result['y'] += y
+        if result.get('bbox') is not None:
+            bbox = list(result['bbox'])
+            bbox[0] += x
+            bbox[1] += y
+            result['bbox'] = bbox
+        shifted.append(result)
+    return shifted
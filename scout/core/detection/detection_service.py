@@ -7,16 +7,28 @@ strategies to identify objects and text in screenshots.
 
 import time
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Union
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple, Union
 import numpy as np
 
 from scout.core.events.event_bus import EventBus
 from scout.core.events.event_types import EventType
 from scout.core.events.event import Event
 from scout.core.window.window_service_interface import WindowServiceInterface
+from scout.core.window.frame_source import Frame, FrameSource
+from scout.core.window.capture_planner import CapturePlanner
 from scout.core.detection.strategy import DetectionStrategy
-from scout.core.utils.caching import cache_manager
+from scout.core.detection.detection_batch import DetectionBatch, offset_results
+from scout.core.detection.detection_stream import DetectionStream
+from scout.core.detection.process_worker import DetectionProcessPool, RemoteDetectionStrategy
+from scout.core.detection.pipeline import DetectionPipeline, PipelineResult, PipelineSpec, PipelineStep
+from scout.core.detection.spatial_priors import SpatialPriors
+from scout.core.utils.caching import cache_manager, ResponseMapCache
+from scout.core.utils.memory import memory_policy
 from scout.core.utils.parallel import image_processor
+from scout.core.utils.single_flight import SingleFlight
 from scout.core.utils.performance import ExecutionTimer, profile
 
 # Set up logging
@@ -43,9 +55,50 @@ class DetectionService:
         self.window_service = window_service
         self.strategies: Dict[str, DetectionStrategy] = {}
         self.context = {}
-        self._latest_screenshot = None
-        self._latest_screenshot_time = 0
-        self._cache_timeout = 0.5  # Screenshot cache timeout in seconds
+        self._lock = threading.Lock()  # Serializes updates of the strategy registry and context
+        self._cache_timeout = 0.5  # Maximum age of a reused screenshot in seconds
+        
+        # Share the window service's frames when it has a frame source
+        frame_source = getattr(window_service, 'frame_source', None)
+        if not isinstance(frame_source, FrameSource):
+            frame_source = FrameSource(self._capture_window, name='detection')
+        self.frame_source = frame_source
+        
+        # Frame the detections of a thread are pinned to (see use_frame)
+        self._pinned = threading.local()
+        
+        # Optional planner capturing only requested regions (see set_capture_planner)
+        self.capture_planner: Optional[CapturePlanner] = None
+        
+        # Concurrent requests for the same detection on the same image share one run
+        self._flights = SingleFlight()
+        
+        # Optional declarative per-frame pipeline (see set_pipeline)
+        self.pipeline: Optional[DetectionPipeline] = None
+        self._pipeline_lock = threading.Lock()
+        self._pipeline_result: Optional[PipelineResult] = None
+        
+        # A cached screenshot is cheap to recapture, so drop it early under pressure.
+        # The policy holds the frame source weakly and forgets this service with it.
+        self._memory_name = f'screenshot:{id(self):x}'
+        frame_source_ref = weakref.ref(self.frame_source)
+        
+        def footprint() -> int:
+            frame_source = frame_source_ref()
+            return frame_source.get_footprint() if frame_source is not None else 0
+            
+        def trim(target_bytes: int) -> int:
+            frame_source = frame_source_ref()
+            return frame_source.trim(target_bytes) if frame_source is not None else 0
+            
+        memory_policy.register(self._memory_name, footprint=footprint, trim=trim, priority=10)
+        weakref.finalize(self, memory_policy.unregister, self._memory_name)
+        
+    def shutdown(self) -> None:
+        """Release the pipeline and stop reporting the cached screenshot to the memory policy."""
+        self.set_pipeline(None)
+        memory_policy.unregister(self._memory_name)
+        logger.info("Detection service shut down")
         
     def register_strategy(self, name: str, strategy: DetectionStrategy) -> None:
         """
@@ -55,9 +108,25 @@ class DetectionService:
             name: Name of the strategy
             strategy: Detection strategy implementation
         """
-        self.strategies[name] = strategy
+        # Replace the registry instead of mutating it, so concurrent readers see either version
+        with self._lock:
+            self.strategies = {**self.strategies, name: strategy}
         logger.info(f"Registered detection strategy: {name}")
         
+    def use_process_pool(self, pool: DetectionProcessPool, strategies: Optional[List[str]] = None) -> None:
+        """
+        Run detections in worker processes instead of this process.
+        
+        Remote proxies replace the local strategies of the same names, so the
+        detection methods are unchanged. Several services may share one pool.
+        
+        Args:
+            pool: Started detection process pool
+            strategies: Strategy names to delegate (None for all the pool serves)
+        """
+        for name in strategies if strategies is not None else pool.strategy_names:
+            self.register_strategy(name, RemoteDetectionStrategy(pool, name))
+        
     def set_context(self, context: Dict[str, Any]) -> None:
         """
         Set context data for detection operations.
@@ -65,27 +134,20 @@ class DetectionService:
         Args:
             context: Context data (e.g., window title, resolution)
         """
-        self.context = context
+        # A private copy, replaced as a whole, so readers never see a half-updated context
+        with self._lock:
+            self.context = dict(context)
         logger.debug(f"Set detection context: {context}")
         
-    def _get_screenshot(self, use_cache: bool = True) -> Optional[np.ndarray]:
+    def _capture_window(self) -> Optional[np.ndarray]:
         """
-        Get a screenshot from the window service.
+        Capture a screenshot through the window service.
+        
+        Used as capture function when the window service has no frame source.
         
-        Args:
-            use_cache: Whether to use cached screenshot if available
-            
         Returns:
             Screenshot image or None if not available
         """
-        # Use cached screenshot if it's recent enough
-        current_time = time.time()
-        if (use_cache and 
-            self._latest_screenshot is not None and 
-            current_time - self._latest_screenshot_time < self._cache_timeout):
-            logger.debug("Using cached screenshot")
-            return self._latest_screenshot
-            
         # Get window title from context (for logging purposes)
         window_title = self.context.get('window_title')
         if not window_title:
@@ -103,18 +165,245 @@ class DetectionService:
             
         if screenshot is None:
             logger.warning("Failed to capture screenshot")
+            
+        return screenshot
+        
+    def get_frame(self, newer_than: Optional[int] = None, use_cache: bool = True) -> Optional[Frame]:
+        """
+        Get a frame from the shared frame source.
+        
+        Args:
+            newer_than: Only accept frames with a higher ID than this (None for latest)
+            use_cache: Whether a frame up to the cache timeout old may be reused
+            
+        Returns:
+            Frame or None if capture failed
+        """
+        if newer_than is not None:
+            return self.frame_source.get_newer_than(newer_than)
+            
+        pinned = getattr(self._pinned, 'frame', None)
+        if pinned is not None:
+            return pinned
+            
+        # Without the cache only the current tick's frame is reused
+        return self.frame_source.get_latest(self._cache_timeout if use_cache else 0)
+        
+    @contextmanager
+    def use_frame(self, frame: Frame) -> Iterator[Frame]:
+        """
+        Run the detections of the current thread on a given frame.
+        
+        Inside the block, detections (with or without use_cache) and
+        run_pipeline use this frame instead of capturing or reusing another.
+        
+        Args:
+            frame: Frame to detect on
+            
+        Yields:
+            The frame
+        """
+        previous = getattr(self._pinned, 'frame', None)
+        self._pinned.frame = frame
+        try:
+            yield frame
+        finally:
+            self._pinned.frame = previous
+            
+    def _get_screenshot(self, use_cache: bool = True) -> Optional[np.ndarray]:
+        """
+        Get a screenshot from the shared frame source.
+        
+        Args:
+            use_cache: Whether to use cached screenshot if available
+            
+        Returns:
+            Screenshot image (read-only) or None if not available
+        """
+        frame = self.get_frame(use_cache=use_cache)
+        return frame.image if frame is not None else None
+    
+    def stream(self, detect: Callable[[], Any], timeout: Optional[float] = None,
+               min_interval: Optional[float] = None, cancel_event: Optional[threading.Event] = None,
+               consumer: str = 'stream') -> DetectionStream:
+        """
+        Stream a detection's results, computed once per new frame.
+        
+        The stream is both an iterator and an async iterator. The detection
+        runs on the frame awaited for each update (see use_frame), so it never
+        captures a frame of its own. The first update uses a frame at most
+        the screenshot cache timeout old. A consumer that falls behind skips
+        to the latest frame.
+        
+        Args:
+            detect: Detection to run, e.g. lambda: service.detect_template('ok')
+                or service.run_pipeline
+            timeout: Seconds after which the stream ends (None to run until cancelled)
+            min_interval: Minimum seconds between updates (None for every new frame)
+            cancel_event: Event ending the stream when set
+            consumer: Name for per-consumer dropped-frame statistics
+            
+        Returns:
+            Detection stream
+        """
+        return DetectionStream(self.frame_source, detect, timeout=timeout, min_interval=min_interval,
+                               cancel_event=cancel_event, consumer=consumer, frame_scope=self.use_frame,
+                               max_age=self._cache_timeout)
+    
+    def set_capture_planner(self, planner: Optional[CapturePlanner]) -> None:
+        """
+        Set the planner used to capture regions without the full window.
+        
+        With a planner, region detections capture only their region (together
+        with the regions registered by other consumers for the same tick)
+        unless a fresh full screenshot is already available.
+        
+        Args:
+            planner: Capture planner with regions relative to the window, or None
+        """
+        self.capture_planner = planner
+        
+    def register_capture_region(self, name: str, region: Dict[str, int]) -> None:
+        """
+        Register a window region that is polled every tick.
+        
+        Args:
+            name: Consumer name
+            region: Region relative to the window {left, top, width, height}
+        """
+        if self.capture_planner is None:
+            logger.warning("No capture planner set; region registration ignored")
+            return
+        self.capture_planner.register(name, region)
+        
+    def _get_detection_image(self, region: Optional[Dict[str, int]],
+                             use_cache: bool = True) -> Tuple[Optional[np.ndarray], int, int]:
+        """
+        Get the image to run detection on.
+        
+        Args:
+            region: Region to search in {left, top, width, height} (None for full image)
+            use_cache: Whether to use cached screenshot if available
+            
+        Returns:
+            Tuple of (image or None if unavailable, region x offset, region y offset)
+        """
+        if region and self.capture_planner is not None and getattr(self._pinned, 'frame', None) is None:
+            # Crop a fresh full frame if there is one, otherwise capture just the region
+            frame = self.frame_source.latest_frame
+            if not (use_cache and frame is not None and frame.age <= self._cache_timeout):
+                captured = self._capture_region(region, use_cache)
+                if captured[0] is not None:
+                    return captured
+                    
+        screenshot = self._get_screenshot(use_cache)
+        if screenshot is None:
+            return None, 0, 0
+            
+        if not region:
+            return screenshot, 0, 0
+            
+        x, y, w, h = self._clamp_region(region, screenshot.shape[1], screenshot.shape[0])
+        return screenshot[y:y+h, x:x+w], x, y
+        
+    def _capture_region(self, region: Dict[str, int],
+                        use_cache: bool = True) -> Tuple[Optional[np.ndarray], int, int]:
+        """
+        Capture a window region through the capture planner.
+        
+        Args:
+            region: Region relative to the window {left, top, width, height}
+            use_cache: Whether a region captured up to the cache timeout ago may be reused
+            
+        Returns:
+            Tuple of (region image or None if capture failed, x offset, y offset)
+        """
+        # The planner may be replaced concurrently
+        planner = self.capture_planner
+        position = self.window_service.get_window_position() if planner is not None else None
+        if not position:
+            return None, 0, 0
+            
+        x, y, w, h = self._clamp_region(region, position[2], position[3])
+        with ExecutionTimer("Region capture"):
+            image = planner.capture_region(
+                {'left': x, 'top': y, 'width': w, 'height': h},
+                max_age=self._cache_timeout if use_cache else 0
+            )
+        return image, x, y
+        
+    def _frame_key(self, image: np.ndarray) -> Optional[Tuple[str, int, int, int, int, int]]:
+        """
+        Identify an image as a part of the latest captured frame.
+        
+        Args:
+            image: Detection image, region crop or tile
+            
+        Returns:
+            Tuple of (frame source ID, frame ID, x, y, width, height), or None
+            if the image is not a view into the latest frame (e.g. a separately
+            captured region)
+        """
+        frame_source = self.frame_source
+        frame = getattr(self._pinned, 'frame', None) or frame_source.latest_frame
+        if frame is None:
+            return None
+        base = frame.image
+        if image.strides != base.strides or not np.may_share_memory(image, base):
+            return None
+            
+        offset = image.__array_interface__['data'][0] - base.__array_interface__['data'][0]
+        y, rest = divmod(offset, base.strides[0])
+        x, remainder = divmod(rest, base.strides[1])
+        if offset < 0 or remainder or x + image.shape[1] > base.shape[1] or y + image.shape[0] > base.shape[0]:
             return None
+        return (frame_source.source_id, frame.frame_id, int(x), int(y), image.shape[1], image.shape[0])
+        
+    def _frame_key_params(self, strategy: DetectionStrategy, image: np.ndarray) -> Dict[str, Any]:
+        """
+        Get the frame_key argument for strategies caching correlation peaks per frame.
+        
+        Args:
+            strategy: Detection strategy
+            image: Image the strategy is run on
             
-        # Update cache
-        self._latest_screenshot = screenshot
-        self._latest_screenshot_time = current_time
+        Returns:
+            {'frame_key': key} or an empty dictionary
+        """
+        if not isinstance(getattr(strategy, 'response_cache', None), ResponseMapCache):
+            return {}
+        key = self._frame_key(image)
+        return {'frame_key': key} if key is not None else {}
         
-        return screenshot
+    @staticmethod
+    def _clamp_region(region: Dict[str, int], width: int, height: int) -> Tuple[int, int, int, int]:
+        """
+        Clamp a region to an image of the given size.
+        
+        Args:
+            region: Region {left, top, width, height}; missing values extend to the edge
+            width: Image width
+            height: Image height
+            
+        Returns:
+            Tuple of (x, y, width, height) within bounds
+        """
+        x = region.get('left', 0)
+        y = region.get('top', 0)
+        w = region.get('width', width - x)
+        h = region.get('height', height - y)
+        
+        # Ensure region is within bounds
+        x = max(0, min(x, width - 1))
+        y = max(0, min(y, height - 1))
+        w = max(1, min(w, width - x))
+        h = max(1, min(h, height - y))
+        return x, y, w, h
     
     @profile(name="detect_template")
     def detect_template(self, template_name: str, confidence_threshold: float = 0.7,
                       max_results: int = 10, region: Optional[Dict[str, int]] = None,
-                      use_cache: bool = True) -> List[Dict]:
+                      use_cache: bool = True) -> Union[List[Dict], DetectionBatch]:
         """
         Detect a template in the current window.
         
@@ -128,36 +417,17 @@ class DetectionService:
         Returns:
             List of detection results with positions and confidence scores
         """
-        if 'template' not in self.strategies:
+        # Read the registry once; it may be replaced concurrently
+        strategy = self.strategies.get('template')
+        if strategy is None:
             logger.error("Template matching strategy not registered")
             return []
-            
-        # Get the strategy
-        strategy = self.strategies['template']
         
-        # Get screenshot
-        screenshot = self._get_screenshot(use_cache)
-        if screenshot is None:
+        # Get the screenshot, or just the region when it can be captured alone
+        detection_image, x, y = self._get_detection_image(region, use_cache)
+        if detection_image is None:
             return []
             
-        # Crop region if specified
-        if region:
-            x = region.get('left', 0)
-            y = region.get('top', 0)
-            w = region.get('width', screenshot.shape[1] - x)
-            h = region.get('height', screenshot.shape[0] - y)
-            
-            # Ensure region is within bounds
-            x = max(0, min(x, screenshot.shape[1] - 1))
-            y = max(0, min(y, screenshot.shape[0] - 1))
-            w = max(1, min(w, screenshot.shape[1] - x))
-            h = max(1, min(h, screenshot.shape[0] - y))
-            
-            detection_image = screenshot[y:y+h, x:x+w]
-        else:
-            detection_image = screenshot
-            x, y = 0, 0
-            
         # Check cache for this detection
         params = {
             'template_name': template_name,
@@ -169,54 +439,61 @@ class DetectionService:
             cached_result = cache_manager.detection_cache.get('template', detection_image, params)
             if cached_result is not None:
                 logger.debug(f"Using cached template detection result for {template_name}")
-                # Adjust coordinates for region if needed
-                if region:
-                    for result in cached_result:
-                        result['x'] += x
-                        result['y'] += y
-                return cached_result
+                return self._offset_results(cached_result, x, y)
         
-        # Perform detection in parallel tiles if image is large
-        if detection_image.shape[0] > 800 or detection_image.shape[1] > 800:
-            logger.debug(f"Using parallel processing for large image: {detection_image.shape}")
-            
-            # Define detection function for each tile
-            def detect_in_tile(tile: np.ndarray) -> List[Dict]:
-                return strategy.detect(
-                    image=tile,
-                    template_names=[template_name],
-                    confidence_threshold=confidence_threshold,
-                    max_results=max_results
-                )
+        def detect() -> Union[List[Dict], DetectionBatch]:
+            # Perform detection in parallel tiles if image is large
+            if detection_image.shape[0] > 800 or detection_image.shape[1] > 800:
+                logger.debug(f"Using parallel processing for large image: {detection_image.shape}")
+                
+                # Define detection function for each tile
+                def detect_in_tile(tile: np.ndarray) -> Union[List[Dict], DetectionBatch]:
+                    return strategy.detect(
+                        image=tile,
+                        template_names=[template_name],
+                        confidence_threshold=confidence_threshold,
+                        max_results=max_results,
+                        **self._frame_key_params(strategy, tile)
+                    )
+                
+                # Process image in tiles
+                with ExecutionTimer("Parallel template detection"):
+                    results = image_processor.apply_detection_in_tiles(
+                        detection_image,
+                        detect_in_tile,
+                        tile_size=400,
+                        overlap=50,
+                        min_distance=20
+                    )
+            else:
+                # Regular detection for smaller images
+                with ExecutionTimer("Template detection"):
+                    results = strategy.detect(
+                        image=detection_image,
+                        template_names=[template_name],
+                        confidence_threshold=confidence_threshold,
+                        max_results=max_results,
+                        **self._frame_key_params(strategy, detection_image)
+                    )
             
-            # Process image in tiles
-            with ExecutionTimer("Parallel template detection"):
-                results = image_processor.apply_detection_in_tiles(
-                    detection_image,
-                    detect_in_tile,
-                    tile_size=400,
-                    overlap=50,
-                    min_distance=20
-                )
-        else:
-            # Regular detection for smaller images
-            with ExecutionTimer("Template detection"):
-                results = strategy.detect(
-                    image=detection_image,
-                    template_names=[template_name],
-                    confidence_threshold=confidence_threshold,
-                    max_results=max_results
-                )
+            # Cache the result
+            if use_cache:
+                cache_manager.detection_cache.put('template', detection_image, params, results)
+            return results
         
-        # Cache the result
-        if use_cache:
-            cache_manager.detection_cache.put('template', detection_image, params, results)
+        # A running detection of the template with a lower threshold and a
+        # higher result limit answers this request as well
+        results, (threshold, limit) = self._flights.do(
+            ('template', self._image_identity(detection_image, x, y), template_name),
+            detect,
+            spec=(confidence_threshold, max_results),
+            covers=self._covers_template_request
+        )
+        if (threshold, limit) != (confidence_threshold, max_results):
+            results = self._narrow_results(results, confidence_threshold, max_results)
         
-        # Adjust coordinates for region if needed
-        if region:
-            for result in results:
-                result['x'] += x
-                result['y'] += y
+        # Shift into screenshot coordinates, in this caller's own copy
+        results = self._offset_results(results, x, y)
                 
         # Publish detection event
         self._publish_detection_event('template', results, template_name)
@@ -240,36 +517,17 @@ class DetectionService:
         Returns:
             List of text detection results with positions and content
         """
-        if 'ocr' not in self.strategies:
+        # Read the registry once; it may be replaced concurrently
+        strategy = self.strategies.get('ocr')
+        if strategy is None:
             logger.error("OCR strategy not registered")
             return []
-            
-        # Get the strategy
-        strategy = self.strategies['ocr']
         
-        # Get screenshot
-        screenshot = self._get_screenshot(use_cache)
-        if screenshot is None:
+        # Get the screenshot, or just the region when it can be captured alone
+        detection_image, x, y = self._get_detection_image(region, use_cache)
+        if detection_image is None:
             return []
             
-        # Crop region if specified
-        if region:
-            x = region.get('left', 0)
-            y = region.get('top', 0)
-            w = region.get('width', screenshot.shape[1] - x)
-            h = region.get('height', screenshot.shape[0] - y)
-            
-            # Ensure region is within bounds
-            x = max(0, min(x, screenshot.shape[1] - 1))
-            y = max(0, min(y, screenshot.shape[0] - 1))
-            w = max(1, min(w, screenshot.shape[1] - x))
-            h = max(1, min(h, screenshot.shape[0] - y))
-            
-            detection_image = screenshot[y:y+h, x:x+w]
-        else:
-            detection_image = screenshot
-            x, y = 0, 0
-            
         # Check cache for this detection
         params = {
             'pattern': pattern,
@@ -281,32 +539,31 @@ class DetectionService:
             cached_result = cache_manager.detection_cache.get('ocr', detection_image, params)
             if cached_result is not None:
                 logger.debug("Using cached OCR detection result")
-                # Adjust coordinates for region if needed
-                if region:
-                    for result in cached_result:
-                        result['x'] += x
-                        result['y'] += y
-                return cached_result
+                return self._offset_results(cached_result, x, y)
         
         # Perform detection - no parallel processing for OCR as it's usually better
         # to process the whole image at once for context
-        with ExecutionTimer("OCR detection"):
-            results = strategy.detect(
-                detection_image,
-                pattern=pattern,
-                confidence_threshold=confidence_threshold,
-                preprocess_method=preprocess
-            )
+        def detect() -> List[Dict]:
+            with ExecutionTimer("OCR detection"):
+                results = strategy.detect(
+                    detection_image,
+                    pattern=pattern,
+                    confidence_threshold=confidence_threshold,
+                    preprocess_method=preprocess
+                )
+            
+            # Cache the result
+            if use_cache:
+                cache_manager.detection_cache.put('ocr', detection_image, params, results)
+            return results
         
-        # Cache the result
-        if use_cache:
-            cache_manager.detection_cache.put('ocr', detection_image, params, results)
+        results, _ = self._flights.do(
+            ('ocr', self._image_identity(detection_image, x, y), pattern, confidence_threshold, preprocess),
+            detect
+        )
         
-        # Adjust coordinates for region if needed
-        if region:
-            for result in results:
-                result['x'] += x
-                result['y'] += y
+        # Shift into screenshot coordinates, in this caller's own copy
+        results = self._offset_results(results, x, y)
                 
         # Publish detection event
         self._publish_detection_event('ocr', results, pattern)
@@ -330,36 +587,17 @@ class DetectionService:
         Returns:
             List of object detection results with bounding boxes and classes
         """
-        if 'yolo' not in self.strategies:
+        # Read the registry once; it may be replaced concurrently
+        strategy = self.strategies.get('yolo')
+        if strategy is None:
             logger.error("YOLO strategy not registered")
             return []
-            
-        # Get the strategy
-        strategy = self.strategies['yolo']
         
-        # Get screenshot
-        screenshot = self._get_screenshot(use_cache)
-        if screenshot is None:
+        # Get the screenshot, or just the region when it can be captured alone
+        detection_image, x, y = self._get_detection_image(region, use_cache)
+        if detection_image is None:
             return []
             
-        # Crop region if specified
-        if region:
-            x = region.get('left', 0)
-            y = region.get('top', 0)
-            w = region.get('width', screenshot.shape[1] - x)
-            h = region.get('height', screenshot.shape[0] - y)
-            
-            # Ensure region is within bounds
-            x = max(0, min(x, screenshot.shape[1] - 1))
-            y = max(0, min(y, screenshot.shape[0] - 1))
-            w = max(1, min(w, screenshot.shape[1] - x))
-            h = max(1, min(h, screenshot.shape[0] - y))
-            
-            detection_image = screenshot[y:y+h, x:x+w]
-        else:
-            detection_image = screenshot
-            x, y = 0, 0
-            
         # Check cache for this detection
         params = {
             'class_names': class_names,
@@ -371,35 +609,33 @@ class DetectionService:
             cached_result = cache_manager.detection_cache.get('yolo', detection_image, params)
             if cached_result is not None:
                 logger.debug("Using cached YOLO detection result")
-                # Adjust coordinates for region if needed
-                if region:
-                    for result in cached_result:
-                        if 'bbox' in result:
-                            result['bbox'][0] += x
-                            result['bbox'][1] += y
-                return cached_result
+                return self._offset_results(cached_result, x, y)
         
         # YOLO is already optimized for parallel execution internally,
         # so we don't need to do tiled processing
-        with ExecutionTimer("YOLO detection"):
-            results = strategy.detect(
-                detection_image,
-                class_names=class_names,
-                confidence_threshold=confidence_threshold,
-                nms_threshold=nms_threshold
-            )
+        def detect() -> List[Dict]:
+            with ExecutionTimer("YOLO detection"):
+                results = strategy.detect(
+                    detection_image,
+                    class_names=class_names,
+                    confidence_threshold=confidence_threshold,
+                    nms_threshold=nms_threshold
+                )
+            
+            # Cache the result
+            if use_cache:
+                cache_manager.detection_cache.put('yolo', detection_image, params, results)
+            return results
+        
+        classes = tuple(class_names) if class_names is not None else None
+        results, _ = self._flights.do(
+            ('yolo', self._image_identity(detection_image, x, y), classes, confidence_threshold, nms_threshold),
+            detect
+        )
+        
+        # Shift into screenshot coordinates, in this caller's own copy
+        results = self._offset_results(results, x, y)
         
-        # Cache the result
-        if use_cache:
-            cache_manager.detection_cache.put('yolo', detection_image, params, results)
-        
-        # Adjust coordinates for region if needed
-        if region:
-            for result in results:
-                if 'bbox' in result:
-                    result['bbox'][0] += x
-                    result['bbox'][1] += y
-                    
         # Publish detection event
         self._publish_detection_event('yolo', results, class_names)
         
@@ -408,7 +644,7 @@ class DetectionService:
     def detect_all_templates(self, template_names: Optional[List[str]] = None,
                            confidence_threshold: float = 0.7,
                            region: Optional[Dict[str, int]] = None,
-                           use_cache: bool = True) -> List[Dict]:
+                           use_cache: bool = True) -> Union[List[Dict], DetectionBatch]:
         """
         Detect multiple templates in the current window.
         
@@ -421,40 +657,21 @@ class DetectionService:
         Returns:
             List of detection results with positions and confidence scores
         """
-        if 'template' not in self.strategies:
+        # Read the registry once; it may be replaced concurrently
+        strategy = self.strategies.get('template')
+        if strategy is None:
             logger.error("Template matching strategy not registered")
             return []
-            
-        # Get the strategy
-        strategy = self.strategies['template']
         
         # Get available templates if not specified
         if template_names is None:
             template_names = strategy.get_template_names()
             
-        # Get screenshot
-        screenshot = self._get_screenshot(use_cache)
-        if screenshot is None:
+        # Get the screenshot, or just the region when it can be captured alone
+        detection_image, x, y = self._get_detection_image(region, use_cache)
+        if detection_image is None:
             return []
             
-        # Crop region if specified
-        if region:
-            x = region.get('left', 0)
-            y = region.get('top', 0)
-            w = region.get('width', screenshot.shape[1] - x)
-            h = region.get('height', screenshot.shape[0] - y)
-            
-            # Ensure region is within bounds
-            x = max(0, min(x, screenshot.shape[1] - 1))
-            y = max(0, min(y, screenshot.shape[0] - 1))
-            w = max(1, min(w, screenshot.shape[1] - x))
-            h = max(1, min(h, screenshot.shape[0] - y))
-            
-            detection_image = screenshot[y:y+h, x:x+w]
-        else:
-            detection_image = screenshot
-            x, y = 0, 0
-            
         # Check cache for this detection
         params = {
             'template_names': template_names,
@@ -465,29 +682,82 @@ class DetectionService:
             cached_result = cache_manager.detection_cache.get('template', detection_image, params)
             if cached_result is not None:
                 logger.debug("Using cached multi-template detection result")
-                # Adjust coordinates for region if needed
-                if region:
-                    for result in cached_result:
-                        result['x'] += x
-                        result['y'] += y
-                return cached_result
+                return self._offset_results(cached_result, x, y)
         
+        def detect() -> Union[List[Dict], DetectionBatch]:
+            # Templates with learned locations are only searched there, unless this
+            # request is a periodic sweep; priors only apply to full-window images
+            priors = getattr(strategy, 'spatial_priors', None)
+            if not isinstance(priors, SpatialPriors) or region:
+                priors = None
+                
+            if priors is not None and not priors.next_is_sweep():
+                results = self._detect_templates_in_priors(
+                    strategy, priors, detection_image, template_names, confidence_threshold
+                )
+            else:
+                results = self._detect_templates_in_image(
+                    strategy, detection_image, template_names, confidence_threshold
+                )
+                
+            if priors is not None:
+                priors.observe_results(results, (detection_image.shape[1], detection_image.shape[0]))
+            
+            # Cache the result
+            if use_cache:
+                cache_manager.detection_cache.put('template', detection_image, params, results)
+            return results
+        
+        # A running detection of the same templates with a lower threshold answers this request as well
+        results, threshold = self._flights.do(
+            ('templates', self._image_identity(detection_image, x, y), tuple(template_names)),
+            detect,
+            spec=confidence_threshold,
+            covers=lambda running, wanted: running <= wanted
+        )
+        if threshold != confidence_threshold:
+            results = self._narrow_results(results, confidence_threshold)
+        
+        # Shift into screenshot coordinates, in this caller's own copy
+        results = self._offset_results(results, x, y)
+                
+        # Publish detection event
+        self._publish_detection_event('template', results, template_names)
+        
+        return results
+    
+    def _detect_templates_in_image(self, strategy: DetectionStrategy, image: np.ndarray,
+                                   template_names: List[str],
+                                   confidence_threshold: float) -> Union[List[Dict], DetectionBatch]:
+        """
+        Search templates in a whole image, in parallel tiles if it is large.
+        
+        Args:
+            strategy: Template matching strategy
+            image: Image to search
+            template_names: Templates to detect
+            confidence_threshold: Minimum confidence level (0.0-1.0)
+            
+        Returns:
+            Detection results in image coordinates
+        """
         # Perform detection in parallel tiles if image is large
-        if detection_image.shape[0] > 800 or detection_image.shape[1] > 800:
-            logger.debug(f"Using parallel processing for large image: {detection_image.shape}")
+        if image.shape[0] > 800 or image.shape[1] > 800:
+            logger.debug(f"Using parallel processing for large image: {image.shape}")
             
             # Define detection function for each tile
-            def detect_in_tile(tile: np.ndarray) -> List[Dict]:
+            def detect_in_tile(tile: np.ndarray) -> Union[List[Dict], DetectionBatch]:
                 return strategy.detect(
                     image=tile,
                     template_names=template_names,
-                    confidence_threshold=confidence_threshold
+                    confidence_threshold=confidence_threshold,
+                    **self._frame_key_params(strategy, tile)
                 )
             
             # Process image in tiles
             with ExecutionTimer("Parallel multi-template detection"):
                 results = image_processor.apply_detection_in_tiles(
-                    detection_image,
+                    image,
                     detect_in_tile,
                     tile_size=400,
                     overlap=50,
@@ -497,28 +767,68 @@ class DetectionService:
             # Regular detection for smaller images
             with ExecutionTimer("Multi-template detection"):
                 results = strategy.detect(
-                    image=detection_image,
+                    image=image,
                     template_names=template_names,
-                    confidence_threshold=confidence_threshold
+                    confidence_threshold=confidence_threshold,
+                    **self._frame_key_params(strategy, image)
                 )
+                
+        return results
+    
+    def _detect_templates_in_priors(self, strategy: DetectionStrategy, priors: SpatialPriors,
+                                    image: np.ndarray, template_names: List[str],
+                                    confidence_threshold: float) -> Union[List[Dict], DetectionBatch]:
+        """
+        Search templates only in the regions they were learned in.
         
-        # Cache the result
-        if use_cache:
-            cache_manager.detection_cache.put('template', detection_image, params, results)
+        Templates without learned regions are searched in the whole image;
+        templates sharing a region are searched together.
         
-        # Adjust coordinates for region if needed
-        if region:
-            for result in results:
-                result['x'] += x
-                result['y'] += y
+        Args:
+            strategy: Template matching strategy
+            priors: Learned template locations
+            image: Full window image
+            template_names: Templates to detect
+            confidence_threshold: Minimum confidence level (0.0-1.0)
+            
+        Returns:
+            Detection results in image coordinates
+        """
+        frame_size = (image.shape[1], image.shape[0])
+        full_frame: List[str] = []
+        by_region: Dict[Tuple[int, int, int, int], List[str]] = {}
+        for name in template_names:
+            regions = priors.regions(name, frame_size)
+            if regions is None:
+                full_frame.append(name)
+            else:
+                for region in regions:
+                    by_region.setdefault(region, []).append(name)
+                    
+        parts = []
+        if full_frame:
+            parts.append(self._detect_templates_in_image(strategy, image, full_frame, confidence_threshold))
+            
+        with ExecutionTimer("Prior-restricted multi-template detection"):
+            for (x, y, w, h), names in by_region.items():
+                crop = image[y:y+h, x:x+w]
+                found = strategy.detect(
+                    image=crop,
+                    template_names=names,
+                    confidence_threshold=confidence_threshold,
+                    **self._frame_key_params(strategy, crop)
+                )
+                parts.append(self._offset_results(found, x, y))
                 
-        # Publish detection event
-        self._publish_detection_event('template', results, template_names)
+        logger.debug(f"Searched {len(template_names) - len(full_frame)} templates in "
+                     f"{len(by_region)} learned regions, {len(full_frame)} in the full image")
         
-        return results
+        if parts and all(isinstance(part, DetectionBatch) for part in parts):
+            return DetectionBatch.concatenate(parts)
+        return [result for part in parts for result in part]
     
     def run_template_detection(self, template_names: List[str], confidence_threshold: float = 0.7,
-                           max_results: int = 10, region: Optional[Dict[str, int]] = None) -> List[Dict]:
+                           max_results: int = 10, region: Optional[Dict[str, int]] = None) -> Union[List[Dict], DetectionBatch]:
         """
         Run template detection on the current window.
         
@@ -538,21 +848,23 @@ class DetectionService:
             logger.debug(f"Detection parameters: confidence={confidence_threshold}, max_results={max_results}, region={region}")
             
             # Check if we have template strategy registered
-            if 'template' not in self.strategies:
+            strategy = self.strategies.get('template')
+            if strategy is None:
                 logger.error("Template strategy not registered in detection service")
                 return []
             
             # Check context
-            if not self.context or not self.context.get('window_title'):
+            context = self.context
+            if not context or not context.get('window_title'):
                 logger.warning("Window title missing from context, detection might not work correctly")
-                window_title = self.context.get('window_title', 'Unknown Window')
-                logger.debug(f"Current context: {self.context}")
+                window_title = context.get('window_title', 'Unknown Window')
+                logger.debug(f"Current context: {context}")
             else:
-                window_title = self.context.get('window_title')
+                window_title = context.get('window_title')
                 logger.debug(f"Using window title from context: {window_title}")
             
             # Validate template names
-            all_templates = self.strategies['template'].get_template_names()
+            all_templates = strategy.get_template_names()
             missing_templates = [t for t in template_names if t not in all_templates]
             if missing_templates:
                 logger.warning(f"Some templates not found: {missing_templates}")
@@ -578,15 +890,19 @@ class DetectionService:
             # Limit the number of results if needed
             if max_results > 0 and len(results) > max_results:
                 logger.debug(f"Limiting results from {len(results)} to {max_results}")
-                # Sort by confidence score (highest first) and take the top max_results
-                results.sort(key=lambda x: x.get('confidence', 0), reverse=True)
-                results = results[:max_results]
+                # Take the top max_results by confidence score (highest first)
+                if isinstance(results, DetectionBatch):
+                    results = results.top_k(max_results)
+                else:
+                    results = sorted(results, key=lambda x: x.get('confidence', 0), reverse=True)
+                    results = results[:max_results]
                 
             logger.info(f"Template detection complete: found {len(results)} matches")
-            for i, result in enumerate(results):
-                logger.debug(f"Result {i+1}: template={result.get('template_name')}, "
-                            f"confidence={result.get('confidence'):.2f}, "
-                            f"position=({result.get('x')}, {result.get('y')})")
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, result in enumerate(results):
+                    logger.debug(f"Result {i+1}: template={result.get('template_name')}, "
+                                f"confidence={result.get('confidence'):.2f}, "
+                                f"position=({result.get('x')}, {result.get('y')})")
             
             return results
             
@@ -594,20 +910,189 @@ class DetectionService:
             logger.error(f"Error in run_template_detection: {e}", exc_info=True)
             return []
     
+    def _image_identity(self, image: np.ndarray, x: int, y: int) -> Tuple:
+        """
+        Identify a detection image for request coalescing.
+        
+        Args:
+            image: Detection image
+            x: Region x offset of the image
+            y: Region y offset of the image
+            
+        Returns:
+            The image's frame key, or for images that are not part of the
+            latest frame, the array's identity and offset (the array is kept
+            alive by the running request)
+        """
+        frame_key = self._frame_key(image)
+        if frame_key is not None:
+            return ('frame',) + frame_key
+        return ('array', id(image), x, y, image.shape)
+        
+    @staticmethod
+    def _covers_template_request(running: Tuple[float, int], wanted: Tuple[float, int]) -> bool:
+        """
+        Check whether a running template detection's results contain a request's.
+        
+        Args:
+            running: (confidence threshold, max results) of the running detection
+            wanted: (confidence threshold, max results) of the request
+            
+        Returns:
+            True if the running detection's threshold is not higher and its
+            limit not lower (a limit of 0 or less means unlimited)
+        """
+        if running[0] > wanted[0]:
+            return False
+        return running[1] <= 0 or 0 < wanted[1] <= running[1]
+        
+    @staticmethod
+    def _narrow_results(results: Union[List[Dict], DetectionBatch], confidence_threshold: float,
+                        max_results: Optional[int] = None) -> Union[List[Dict], DetectionBatch]:
+        """
+        Narrow results of a broader detection to a stricter request.
+        
+        Args:
+            results: Results computed with a lower threshold or a higher limit
+            confidence_threshold: Minimum confidence of the request
+            max_results: Maximum number of results of the request (None or 0 for no limit)
+            
+        Returns:
+            Results above the threshold, the most confident first if limited
+        """
+        if isinstance(results, DetectionBatch):
+            results = results.filter_confidence(confidence_threshold)
+            return results.top_k(max_results) if max_results is not None else results
+        results = [r for r in results if r.get('confidence', 0) >= confidence_threshold]
+        if max_results is not None and max_results > 0:
+            results = sorted(results, key=lambda r: r.get('confidence', 0), reverse=True)[:max_results]
+        return results
+        
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Get request coalescing statistics.
+        
+        Returns:
+            Dictionary with request and execution counts and 'coalescing_ratio',
+            the share of requests answered by another request's detection
+        """
+        return self._flights.get_stats()
+    
+    def set_pipeline(self, spec: Optional[Union[PipelineSpec, Dict[str, Any]]], max_workers: int = 1) -> None:
+        """
+        Set the detection pipeline run once per frame by run_pipeline.
+        
+        Args:
+            spec: Pipeline spec or its dictionary form (None to remove the pipeline)
+            max_workers: Steps run concurrently per frame
+        """
+        if isinstance(spec, dict):
+            spec = PipelineSpec.from_dict(spec)
+        with self._pipeline_lock:
+            if self.pipeline is not None:
+                self.pipeline.close()
+            self.pipeline = DetectionPipeline(spec, self._run_pipeline_step, max_workers) if spec else None
+            self._pipeline_result = None
+        if spec:
+            logger.info(f"Set detection pipeline with {len(spec.steps)} steps on {len(spec.regions)} regions")
+        
+    @property
+    def pipeline_result(self) -> Optional[PipelineResult]:
+        """Result of the latest pipeline pass."""
+        return self._pipeline_result
+
+    @property
+    def cache_timeout(self) -> float:
+        """Maximum age in seconds of a reused screenshot."""
+        return self._cache_timeout
+        
+    def run_pipeline(self, frame: Optional[Frame] = None) -> Optional[PipelineResult]:
+        """
+        Run the detection pipeline on a frame.
+        
+        Each frame is processed once: asking again for a frame the pipeline
+        already ran on returns the same result, so any number of consumers can
+        call this per tick. A combined 'detection_pipeline_completed' event is
+        published for every new pass.
+        
+        Args:
+            frame: Frame to process (None for the latest frame)
+            
+        Returns:
+            Combined pipeline result, or None without a pipeline or frame
+        """
+        with self._pipeline_lock:
+            if self.pipeline is None:
+                return None
+            if frame is None:
+                frame = self.get_frame()
+                if frame is None:
+                    return None
+            previous = self._pipeline_result
+            if previous is not None and frame.frame_id <= previous.frame_id:
+                return previous
+                
+            with ExecutionTimer("detection_pipeline"):
+                result = self.pipeline.run(frame.image, frame.frame_id, frame.timestamp)
+            self._pipeline_result = result
+            
+        if self.event_bus:
+            self.event_bus.publish('detection_pipeline_completed', result)
+        return result
+        
+    def _run_pipeline_step(self, step: PipelineStep, image: np.ndarray) -> Union[List[Dict], DetectionBatch]:
+        """
+        Run one pipeline step's strategy on its prepared image.
+        
+        Args:
+            step: Pipeline step
+            image: Region crop or derived plane of the frame
+            
+        Returns:
+            Detection results in image coordinates
+        """
+        strategy = self.strategies.get(step.strategy)
+        if strategy is None:
+            raise ValueError(f"{step.strategy} strategy not registered")
+        return strategy.detect(image, **dict(step.params), **self._frame_key_params(strategy, image))
+    
+    @staticmethod
+    def _offset_results(results: Union[List[Dict], DetectionBatch],
+                        x: int, y: int) -> Union[List[Dict], DetectionBatch]:
+        """
+        Shift results from region space into screenshot space for one caller.
+        
+        Batches are immutable and shifted as views. Result dictionaries (and
+        their 'bbox' lists) are copied, even without an offset, so results held
+        by the detection cache or shared with coalesced requests are never
+        modified and callers may change their own copies.
+        
+        Args:
+            results: Detection results
+            x: Horizontal region offset
+            y: Vertical region offset
+            
+        Returns:
+            Shifted results
+        """
+        return offset_results(results, x, y)
+    
     def clear_cache(self) -> None:
         """Clear the detection cache."""
         # Clear screenshot cache
-        self._latest_screenshot = None
-        self._latest_screenshot_time = 0
+        self.frame_source.invalidate()
         
         # Clear strategy caches
         cache_manager.detection_cache.clear()
         logger.info("Cleared detection cache")
     
-    def _publish_detection_event(self, strategy_name: str, results: List[Dict], query: Any) -> None:
+    def _publish_detection_event(self, strategy_name: str, results: Union[List[Dict], DetectionBatch],
+                                 query: Any) -> None:
         """
         Publish detection event to event bus.
         
+        Batches are published as-is; subscribers iterate them as dictionaries.
+        
         Args:
             strategy_name: Name of detection strategy used
             results: Detection results to publish
@@ -0,0 +1,171 @@
+"""
+Detection Stream
+
+This module turns one-shot detection calls into a stream of results, one per
+new frame. Instead of each consumer polling with its own sleep loop or
+timer, it iterates a DetectionStream:
+
+    for update in detection_service.stream(lambda: service.detect_template('ok')):
+        if update.results:
+            break
+
+or, from a coroutine:
+
+    async for update in detection_service.stream(detect, timeout=10):
+        ...
+
+Each update is computed on a frame newer than the previous one, the first on
+a frame no older than max_age, so a stream never starts on a frame from before
+the action it is waiting for. Given a frame scope (DetectionService.stream
+passes DetectionService.use_frame), the detection runs on exactly the awaited
+frame instead of fetching its own, so update.frame_id is the frame the results
+belong to. A consumer slower than
+the capture rate skips straight to the latest frame (the frames
+in between are counted as dropped), so a backlog can never build up. The
+stream ends when it is cancelled or its timeout expires.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Optional
+
+from scout.core.window.frame_source import Frame, FrameSource
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DetectionUpdate:
+    """Detection results for one frame of a stream."""
+    frame_id: int  # Frame awaited for this update (and detected on, with a frame scope)
+    timestamp: float  # Capture time of that frame (time.monotonic())
+    results: Any
+    dropped: int  # Frames skipped since the previous update
+
+
+class DetectionStream:
+    """
+    Runs a detection once per new frame, as a blocking or asynchronous iterator.
+    """
+
+    def __init__(self, frame_source: FrameSource, detect: Callable[[], Any],
+                 timeout: Optional[float] = None, min_interval: Optional[float] = None,
+                 cancel_event: Optional[threading.Event] = None, consumer: str = 'stream',
+                 frame_scope: Optional[Callable[[Frame], ContextManager]] = None,
+                 max_age: Optional[float] = None) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            frame_source: Frame source the detection reads its frames from
+            detect: Detection run on the latest frame (e.g. a bound detect_* call)
+            timeout: Seconds after which the stream ends (None to run until cancelled)
+            min_interval: Minimum seconds between updates (None for every new frame)
+            cancel_event: Event ending the stream when set (None to create one)
+            consumer: Name for the frame source's per-consumer drop counters
+            frame_scope: Context manager factory making detections inside it
+                use the awaited frame (None to let detect fetch its own frame)
+            max_age: Maximum age in seconds of an existing frame the first
+                update may use (None to accept the latest frame however old)
+        """
+        self.frame_source = frame_source
+        self.detect = detect
+        self.min_interval = min_interval
+        self.consumer = consumer
+        self.frame_scope = frame_scope
+        self.max_age = max_age
+        self._cancel = cancel_event if cancel_event is not None else threading.Event()
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._frame_id = 0
+        self._last_update: Optional[float] = None
+
+        # Statistics
+        self.updates = 0
+        self.dropped = 0
+        self.timed_out = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the stream was cancelled."""
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """End the stream; a blocked next_update returns None promptly."""
+        self._cancel.set()
+        self.frame_source.wake_waiters()
+
+    def next_update(self) -> Optional[DetectionUpdate]:
+        """
+        Wait for the next frame and run the detection on it.
+
+        Returns:
+            The update, or None once the stream is cancelled or timed out
+        """
+        if self._frame_id == 0 and self.max_age is not None:
+            # A stale frame counts as seen, so the first update waits for a fresh one
+            latest = self.frame_source.latest_frame
+            if latest is not None and latest.age > self.max_age:
+                self._frame_id = latest.frame_id
+
+        while not self._cancel.is_set():
+            now = time.monotonic()
+            remaining = None if self._deadline is None else self._deadline - now
+            if remaining is not None and remaining <= 0:
+                self.timed_out = True
+                return None
+
+            # Rate limit requested by the consumer
+            if self.min_interval and self._last_update is not None:
+                wait = self._last_update + self.min_interval - now
+                if wait > 0:
+                    self._cancel.wait(wait if remaining is None else min(wait, remaining))
+                    continue
+
+            frame = self.frame_source.get_newer_than(self._frame_id, timeout=remaining, consumer=self.consumer,
+                                                     cancel_event=self._cancel)
+            if frame is None:
+                # Capture failed or the timeout would pass first; retry after a tick
+                wait = self.frame_source.min_interval
+                self._cancel.wait(wait if remaining is None else min(wait, max(remaining, 0)))
+                continue
+
+            dropped = frame.frame_id - self._frame_id - 1 if self._frame_id else 0
+            self._frame_id = frame.frame_id
+            self._last_update = time.monotonic()
+            with self.frame_scope(frame) if self.frame_scope is not None else nullcontext():
+                results = self.detect()
+
+            self.updates += 1
+            self.dropped += dropped
+            return DetectionUpdate(frame.frame_id, frame.timestamp, results, dropped)
+        return None
+
+    def __iter__(self) -> 'DetectionStream':
+        return self
+
+    def __next__(self) -> DetectionUpdate:
+        update = self.next_update()
+        if update is None:
+            raise StopIteration
+        return update
+
+    def __aiter__(self) -> 'DetectionStream':
+        return self
+
+    async def __anext__(self) -> DetectionUpdate:
+        """Run the next update on an executor thread without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            update = await loop.run_in_executor(None, self.next_update)
+        except asyncio.CancelledError:
+            # Let the executor thread return instead of waiting for more frames
+            self.cancel()
+            raise
+        if update is None:
+            raise StopAsyncIteration
+        return update
@@ -0,0 +1,247 @@
+"""
+Detection Worker
+
+This module provides the DetectionWorker class, which runs a detection cycle
+on a background thread and publishes each result as an immutable snapshot.
+Publishing swaps a single reference, so readers such as the overlay's draw
+timer pick up the latest snapshot without locks and never block on, or see a
+half-written result from, the detection thread.
+"""
+
+import time
+import logging
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# A detection cycle returns (matches, capture timestamp, frame ID), or None on failure
+DetectionResult = Optional[Tuple[Sequence[Any], float, Optional[int]]]
+
+
+@dataclass(frozen=True)
+class DetectionSnapshot:
+    """An immutable detection result."""
+    sequence: int
+    matches: Tuple[Any, ...]
+    capture_timestamp: float  # time.monotonic() when the analyzed frame was captured
+    published_at: float  # time.monotonic() when the result was published
+    frame_id: Optional[int] = None
+    detection_time: float = 0.0  # Seconds spent in the detection cycle
+
+    @property
+    def age(self) -> float:
+        """Seconds since the analyzed frame was captured."""
+        return time.monotonic() - self.capture_timestamp
+
+
+class DetectionWorker:
+    """
+    Background detection thread with a lock-free latest-result slot.
+
+    The detection function runs on the worker thread every interval seconds;
+    a cycle that takes longer than the interval delays the next one instead
+    of queueing more work.
+    """
+
+    def __init__(self, detect_func: Callable[[], DetectionResult], interval: float = 1.0,
+                 name: str = "DetectionWorker", staleness_window: int = 100):
+        """
+        Initialize the detection worker.
+
+        Args:
+            detect_func: Detection cycle returning (matches, capture timestamp, frame ID) or None
+            interval: Seconds between detection cycles
+            name: Thread name
+            staleness_window: Number of drawn snapshots kept for staleness statistics
+        """
+        if interval <= 0:
+            raise ValueError("Detection interval must be positive")
+
+        self.detect_func = detect_func
+        self.name = name
+        self._interval = interval
+        self._latest: Optional[DetectionSnapshot] = None
+        self._sequence = itertools.count(1)
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.cycles = 0
+        self.failures = 0
+        self.overruns = 0  # Cycles that took longer than one interval
+        self._total_detection_time = 0.0
+        self._last_drawn_sequence = 0
+        self._staleness: Deque[float] = deque(maxlen=max(1, staleness_window))
+
+    @property
+    def latest(self) -> Optional[DetectionSnapshot]:
+        """Most recently published snapshot."""
+        return self._latest
+
+    @property
+    def interval(self) -> float:
+        """Seconds between detection cycles."""
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval: float) -> None:
+        """Set the cycle interval; a running worker applies it from the next cycle."""
+        if interval <= 0:
+            raise ValueError("Detection interval must be positive")
+        self._interval = interval
+        self._wake_event.set()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running."""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"{self.name} started at {1.0 / self._interval:.1f} Hz")
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        Stop the worker thread.
+
+        Args:
+            timeout: Maximum time to wait for the current cycle to finish
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"{self.name} did not stop within {timeout}s")
+        self._thread = None
+        logger.info(f"{self.name} stopped")
+
+    def publish(self, matches: Sequence[Any], capture_timestamp: Optional[float] = None,
+                frame_id: Optional[int] = None, detection_time: float = 0.0) -> DetectionSnapshot:
+        """
+        Publish a new snapshot.
+
+        Args:
+            matches: Detection results (stored as a tuple)
+            capture_timestamp: When the analyzed frame was captured (default: now)
+            frame_id: ID of the analyzed frame
+            detection_time: Seconds spent producing the result
+
+        Returns:
+            The published snapshot
+        """
+        now = time.monotonic()
+        snapshot = DetectionSnapshot(
+            sequence=next(self._sequence),
+            matches=tuple(matches),
+            capture_timestamp=now if capture_timestamp is None else capture_timestamp,
+            published_at=now,
+            frame_id=frame_id,
+            detection_time=detection_time
+        )
+        # A single reference assignment is atomic, so readers see either the old or the new snapshot
+        self._latest = snapshot
+        return snapshot
+
+    def clear(self) -> None:
+        """Drop the latest snapshot."""
+        self._latest = None
+
+    def record_draw(self, snapshot: DetectionSnapshot) -> float:
+        """
+        Record that a snapshot's results were drawn.
+
+        Args:
+            snapshot: Snapshot that was drawn
+
+        Returns:
+            Capture-to-draw staleness in seconds
+        """
+        staleness = snapshot.age
+        self._staleness.append(staleness)
+        self._last_drawn_sequence = snapshot.sequence
+        return staleness
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get worker statistics.
+
+        Returns:
+            Dictionary with cycle counts, detection time and capture-to-draw staleness
+        """
+        staleness = sorted(self._staleness)
+        latest = self._latest
+        return {
+            'running': self.is_running,
+            'interval': self._interval,
+            'cycles': self.cycles,
+            'failures': self.failures,
+            'overruns': self.overruns,
+            'avg_detection_time': self._total_detection_time / self.cycles if self.cycles else 0.0,
+            'latest_sequence': latest.sequence if latest is not None else 0,
+            'last_drawn_sequence': self._last_drawn_sequence,
+            'draws_recorded': len(staleness),
+            'staleness_last': self._staleness[-1] if staleness else 0.0,
+            'staleness_avg': sum(staleness) / len(staleness) if staleness else 0.0,
+            'staleness_p95': staleness[min(len(staleness) - 1, int(0.95 * len(staleness)))] if staleness else 0.0,
+            'staleness_max': staleness[-1] if staleness else 0.0
+        }
+
+    def run_once(self) -> Optional[DetectionSnapshot]:
+        """
+        Run one detection cycle on the calling thread and publish its result.
+
+        Returns:
+            The published snapshot, or None if the cycle failed
+        """
+        start = time.monotonic()
+        try:
+            result = self.detect_func()
+        except Exception as e:
+            logger.error(f"Error in {self.name} cycle: {e}", exc_info=True)
+            result = None
+        detection_time = time.monotonic() - start
+
+        if result is None:
+            self.failures += 1
+            return None
+
+        matches, capture_timestamp, frame_id = result
+        self.cycles += 1
+        self._total_detection_time += detection_time
+        return self.publish(matches, capture_timestamp, frame_id, detection_time)
+
+    def _run(self) -> None:
+        """Run detection cycles until stopped."""
+        while not self._stop_event.is_set():
+            cycle_start = time.monotonic()
+            self.run_once()
+
+            next_cycle = cycle_start + self._interval
+            if time.monotonic() > next_cycle:
+                self.overruns += 1
+                continue
+
+            # Sleep until the next cycle; an interval change reschedules it
+            while not self._stop_event.is_set():
+                self._wake_event.clear()
+                remaining = next_cycle - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._wake_event.wait(remaining):
+                    next_cycle = cycle_start + self._interval
@@ -0,0 +1,349 @@
+"""
+Global Motion Compensation
+
+This module estimates how far the whole view moved between two frames and
+reuses detections across pure translations. While the world map is dragged
+or scrolled, most of the frame is the previous frame shifted by a constant
+offset; instead of matching every template against the entire frame again,
+the previous detections are shifted by that offset and only the strips of
+newly exposed content are searched.
+
+The shift is estimated by phase correlation on a downscaled grayscale copy
+of the frame and refined on a full-resolution patch. A shift is only trusted
+if the overlapping parts of the two frames agree after aligning them, so
+zooming, animations or opening dialogs fall back to full detection.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from scout.core.detection.tracker import iou_matrix
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Detections: (label, x, y, width, height, confidence)
+Match = Tuple[str, int, int, int, int, float]
+
+
+@dataclass(frozen=True)
+class ShiftEstimate:
+    """Estimated translation of the current frame relative to the previous one."""
+    dx: int  # Content moved right by dx pixels (negative: left)
+    dy: int  # Content moved down by dy pixels (negative: up)
+    response: float  # Phase correlation peak strength (0-1)
+    residual: float  # Mean absolute difference of the aligned overlap (0-255)
+
+    @property
+    def is_zero(self) -> bool:
+        """Whether the view did not move."""
+        return self.dx == 0 and self.dy == 0
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """
+    Convert an image to single-channel grayscale.
+
+    Args:
+        image: BGR, BGRA or grayscale image
+
+    Returns:
+        Grayscale image
+    """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def phase_shift(previous: np.ndarray, current: np.ndarray,
+                window: Optional[np.ndarray] = None) -> Tuple[float, float, float]:
+    """
+    Estimate the translation between two equally sized grayscale images.
+
+    Args:
+        previous: Previous image
+        current: Current image
+        window: Optional Hanning window of the same size
+
+    Returns:
+        Tuple of (dx, dy, response) where (dx, dy) is how far the content
+        moved from previous to current
+    """
+    (dx, dy), response = cv2.phaseCorrelate(
+        np.float32(previous), np.float32(current), window
+    )
+    return dx, dy, response
+
+
+def exposed_regions(width: int, height: int, dx: int, dy: int,
+                    margin: int = 0) -> List[Tuple[int, int, int, int]]:
+    """
+    Get the regions of a frame that show content not visible in the previous frame.
+
+    Args:
+        width: Frame width
+        height: Frame height
+        dx: Horizontal content shift
+        dy: Vertical content shift
+        margin: Extra pixels added on the inner side of each strip, so objects
+            straddling the old frame border are found in full
+
+    Returns:
+        Up to two regions as (x, y, width, height), without overlap
+    """
+    regions = []
+    top, bottom = 0, height
+
+    # Full-width horizontal strip first, then a vertical strip over the remaining rows
+    if dy > 0:
+        strip = min(dy + margin, height)
+        regions.append((0, 0, width, strip))
+        top = strip
+    elif dy < 0:
+        start = max(height + dy - margin, 0)
+        regions.append((0, start, width, height - start))
+        bottom = start
+
+    if dx != 0 and bottom > top:
+        if dx > 0:
+            strip = min(dx + margin, width)
+            regions.append((0, top, strip, bottom - top))
+        else:
+            start = max(width + dx - margin, 0)
+            regions.append((start, top, width - start, bottom - top))
+
+    return regions
+
+
+class MotionCompensator:
+    """
+    Reuses detections across frames that differ only by a translation.
+
+    Call detect() with every frame. The first frame, frames after a
+    non-translational change, and every full_sweep_interval-th compensated
+    frame are searched completely; other frames only have their newly
+    exposed strips searched.
+    """
+
+    def __init__(self, scale: float = 0.25, min_response: float = 0.2, max_residual: float = 12.0,
+                 max_shift_ratio: float = 0.5, refine_size: int = 128, full_sweep_interval: int = 20,
+                 duplicate_iou: float = 0.5) -> None:
+        """
+        Initialize the motion compensator.
+
+        Args:
+            scale: Downscale factor for the coarse shift estimate
+            min_response: Minimum phase correlation response to trust a shift
+            max_residual: Maximum mean absolute difference (0-255) between the
+                aligned frames for the change to count as a pure translation
+            max_shift_ratio: Largest shift, as a fraction of the frame size,
+                that is compensated; larger shifts are detected in full
+            refine_size: Side of the full-resolution patch used to refine the
+                coarse estimate (0 to skip refinement)
+            full_sweep_interval: Compensated frames after which a full detection
+                is forced to correct drift
+            duplicate_iou: IoU above which a strip detection replaces a shifted one
+        """
+        self.scale = scale
+        self.min_response = min_response
+        self.max_residual = max_residual
+        self.max_shift_ratio = max_shift_ratio
+        self.refine_size = refine_size
+        self.full_sweep_interval = full_sweep_interval
+        self.duplicate_iou = duplicate_iou
+
+        self._previous_gray: Optional[np.ndarray] = None
+        self._previous_small: Optional[np.ndarray] = None
+        self._previous_matches: List[Match] = []
+        self._window: Optional[np.ndarray] = None
+        self._since_full = 0
+
+        # Statistics
+        self.full_detections = 0
+        self.compensated_detections = 0
+        self.pixels_searched = 0
+        self.pixels_total = 0
+
+    def reset(self) -> None:
+        """Forget the previous frame so the next detection is a full one."""
+        self._previous_gray = None
+        self._previous_small = None
+        self._previous_matches = []
+        self._since_full = 0
+
+    def estimate_shift(self, previous: np.ndarray, current: np.ndarray,
+                       previous_small: Optional[np.ndarray] = None,
+                       current_small: Optional[np.ndarray] = None) -> Optional[ShiftEstimate]:
+        """
+        Estimate the translation between two grayscale frames.
+
+        Args:
+            previous: Previous frame (grayscale, full resolution)
+            current: Current frame (grayscale, full resolution)
+            previous_small: Downscaled previous frame, if already computed
+            current_small: Downscaled current frame, if already computed
+
+        Returns:
+            Integer shift estimate, or None if the frames are not related by
+            a translation
+        """
+        if previous.shape != current.shape:
+            return None
+
+        if previous_small is None:
+            previous_small = self._downscale(previous)
+        if current_small is None:
+            current_small = self._downscale(current)
+
+        if self._window is None or self._window.shape != current_small.shape:
+            self._window = cv2.createHanningWindow(current_small.shape[::-1], cv2.CV_32F)
+
+        dx, dy, response = phase_shift(previous_small, current_small, self._window)
+        if response < self.min_response:
+            return None
+        dx, dy = dx / self.scale, dy / self.scale
+
+        dx, dy = self._refine(previous, current, dx, dy)
+
+        height, width = current.shape
+        if abs(dx) > width * self.max_shift_ratio or abs(dy) > height * self.max_shift_ratio:
+            return None
+
+        residual = self._residual(previous, current, dx, dy)
+        if residual > self.max_residual:
+            return None
+
+        return ShiftEstimate(dx=dx, dy=dy, response=float(response), residual=residual)
+
+    def detect(self, image: np.ndarray,
+               detect_func: Callable[[np.ndarray], Sequence[Match]],
+               margin: int = 0) -> Tuple[List[Match], Optional[ShiftEstimate]]:
+        """
+        Detect objects in a frame, reusing previous detections when the view only moved.
+
+        Args:
+            image: Current frame (BGR)
+            detect_func: Detection function returning matches in coordinates of
+                the image it is given
+            margin: Size of the largest object searched for; strips are widened
+                by it so objects crossing the old frame border are found
+
+        Returns:
+            Tuple of (matches in frame coordinates, shift estimate or None if
+            a full detection was run)
+        """
+        gray = to_gray(image)
+        small = self._downscale(gray)
+        height, width = gray.shape
+
+        shift = None
+        if self._previous_gray is not None and self._since_full < self.full_sweep_interval:
+            shift = self.estimate_shift(self._previous_gray, gray, self._previous_small, small)
+
+        # Without movement there is nothing to reuse: whatever changed did so in place
+        if shift is None or shift.is_zero:
+            shift = None
+            matches = list(detect_func(image))
+            self._since_full = 0
+            self.full_detections += 1
+            self.pixels_searched += width * height
+        else:
+            matches = self._compensate(image, shift, detect_func, margin)
+            self._since_full += 1
+            self.compensated_detections += 1
+
+        self.pixels_total += width * height
+        self._previous_gray = gray
+        self._previous_small = small
+        self._previous_matches = matches
+        return matches, shift
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get compensation statistics.
+
+        Returns:
+            Dictionary with detection counts and the fraction of pixels searched
+        """
+        return {
+            'full_detections': self.full_detections,
+            'compensated_detections': self.compensated_detections,
+            'searched_ratio': self.pixels_searched / self.pixels_total if self.pixels_total else 1.0
+        }
+
+    def _compensate(self, image: np.ndarray, shift: ShiftEstimate,
+                    detect_func: Callable[[np.ndarray], Sequence[Match]], margin: int) -> List[Match]:
+        """Shift previous matches and detect in the newly exposed strips."""
+        height, width = image.shape[:2]
+
+        matches = []
+        for label, x, y, w, h, confidence in self._previous_matches:
+            x, y = x + shift.dx, y + shift.dy
+            if x >= 0 and y >= 0 and x + w <= width and y + h <= height:
+                matches.append((label, x, y, w, h, confidence))
+
+        found = []
+        for rx, ry, rw, rh in exposed_regions(width, height, shift.dx, shift.dy, margin):
+            self.pixels_searched += rw * rh
+            for label, x, y, w, h, confidence in detect_func(image[ry:ry + rh, rx:rx + rw]):
+                found.append((label, x + rx, y + ry, w, h, confidence))
+
+        if found and matches:
+            # Fresh detections win over shifted copies of the same object
+            overlap = iou_matrix(np.array([m[1:5] for m in matches]), np.array([f[1:5] for f in found]))
+            matches = [m for m, row in zip(matches, overlap) if row.max() <= self.duplicate_iou]
+
+        logger.debug(f"Motion compensated shift ({shift.dx}, {shift.dy}): "
+                     f"{len(matches)} shifted, {len(found)} found in exposed strips")
+        return matches + found
+
+    def _downscale(self, gray: np.ndarray) -> np.ndarray:
+        """Downscale a grayscale frame for the coarse estimate."""
+        if self.scale >= 1.0:
+            return gray
+        return cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+    def _refine(self, previous: np.ndarray, current: np.ndarray, dx: float, dy: float) -> Tuple[int, int]:
+        """Refine a coarse shift on a full-resolution patch and round it."""
+        coarse_x, coarse_y = int(round(dx)), int(round(dy))
+        size = self.refine_size
+        height, width = current.shape
+        if size <= 0:
+            return coarse_x, coarse_y
+
+        # Center patch of the current frame and the matching patch of the previous one
+        size = min(size, width - abs(coarse_x), height - abs(coarse_y))
+        if size < 16:
+            return coarse_x, coarse_y
+        cx = (width - size) // 2
+        cy = (height - size) // 2
+        px, py = cx - coarse_x, cy - coarse_y
+        if px < 0 or py < 0 or px + size > width or py + size > height:
+            return coarse_x, coarse_y
+
+        fine_x, fine_y, response = phase_shift(previous[py:py + size, px:px + size],
+                                               current[cy:cy + size, cx:cx + size])
+        if response < self.min_response:
+            return coarse_x, coarse_y
+        return coarse_x + int(round(fine_x)), coarse_y + int(round(fine_y))
+
+    @staticmethod
+    def _residual(previous: np.ndarray, current: np.ndarray, dx: int, dy: int) -> float:
+        """Mean absolute difference between the frames where they overlap after aligning them."""
+        height, width = current.shape
+        overlap_w, overlap_h = width - abs(dx), height - abs(dy)
+        if overlap_w <= 0 or overlap_h <= 0:
+            return float('inf')
+
+        prev_x, prev_y = max(-dx, 0), max(-dy, 0)
+        cur_x, cur_y = max(dx, 0), max(dy, 0)
+        # Subsample rows and columns; a translation check does not need every pixel
+        a = previous[prev_y:prev_y + overlap_h:2, prev_x:prev_x + overlap_w:2]
+        b = current[cur_y:cur_y + overlap_h:2, cur_x:cur_x + overlap_w:2]
+        return float(cv2.absdiff(a, b).mean())
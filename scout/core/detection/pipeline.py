@@ -0,0 +1,399 @@
+"""
+Detection Pipeline
+
+This module lets detection be declared once instead of polled by every
+consumer. A PipelineSpec names regions of the window, derived image planes
+and detection steps, each with its own rate, for example:
+
+    {
+        "regions": {
+            "map": {"left": 0, "top": 80, "width": 1280, "height": 560},
+            "coords": {"left": 540, "top": 520, "width": 200, "height": 30, "parent": "map"}
+        },
+        "steps": {
+            "coords": {"strategy": "ocr", "region": "coords", "params": {"pattern": "\\\\d+"}},
+            "resources": {"strategy": "template", "every_seconds": 5,
+                          "params": {"template_names": ["gold", "wood"]}},
+            "map_icons": {"strategy": "template", "region": "map", "every_frames": 2,
+                          "motion_margin": 48}
+        }
+    }
+
+DetectionPipeline executes a spec on a frame as a small DAG: region crops
+(regions may be nested in other regions), then derived planes of those crops,
+then the steps that are due. Crops and planes are computed once per frame and
+shared by every step using them. All results are returned, in frame
+coordinates, in one PipelineResult.
+
+A template step with a motion_margin keeps a MotionCompensator: while the map
+is only panned (dragging, scanning), its previous results are shifted by the
+estimated offset and just the newly exposed strips are searched.
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from scout.core.detection.detection_batch import DetectionBatch, offset_results
+from scout.core.detection.motion import MotionCompensator, to_gray
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Derived planes steps can run on, by name
+PLANES: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'bgr': lambda image: image,
+    'gray': to_gray
+}
+
+
+def register_plane(name: str, func: Callable[[np.ndarray], np.ndarray]) -> None:
+    """
+    Register a derived image plane steps can request.
+
+    Args:
+        name: Plane name used in step specs
+        func: Function deriving the plane from a BGR region crop
+    """
+    PLANES[name] = func
+
+
+@dataclass(frozen=True)
+class PipelineRegion:
+    """A named rectangle of the window, or of another region if it has a parent."""
+    name: str
+    left: int
+    top: int
+    width: int
+    height: int
+    parent: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PipelineStep:
+    """A detection run on a region's plane at its own rate."""
+    name: str
+    strategy: str  # Registered strategy name ('template', 'ocr', 'yolo')
+    region: Optional[str] = None  # None for the whole frame
+    params: Mapping[str, Any] = field(default_factory=dict)
+    plane: str = 'bgr'
+    every_frames: int = 1  # Run on every n-th pipeline frame
+    every_seconds: Optional[float] = None  # And at most this often
+    motion_margin: Optional[int] = None  # Largest object size; set to compensate panning (template steps)
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """The latest results of one step."""
+    step: str
+    frame_id: int  # Frame the results were computed on
+    timestamp: float  # Capture time of that frame
+    results: Union[List[Dict], DetectionBatch]  # In frame coordinates
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    """Combined results of one pipeline pass."""
+    frame_id: int
+    timestamp: float
+    steps: Mapping[str, StepResult]  # Latest results of every step that ever ran
+    ran: Tuple[str, ...]  # Steps run on this frame
+    duration: float  # Seconds the pass took
+
+    def __getitem__(self, step: str) -> Union[List[Dict], DetectionBatch]:
+        """Get a step's latest results."""
+        return self.steps[step].results
+
+    def __contains__(self, step: object) -> bool:
+        """Whether a step has results."""
+        return step in self.steps
+
+    def age(self, step: str) -> int:
+        """
+        Get how many frames old a step's results are.
+
+        Args:
+            step: Step name
+
+        Returns:
+            Frame ID difference between this pass and the step's results
+        """
+        return self.frame_id - self.steps[step].frame_id
+
+
+class PipelineSpec:
+    """
+    A validated set of regions and steps.
+    """
+
+    def __init__(self, regions: Iterable[PipelineRegion] = (), steps: Iterable[PipelineStep] = ()) -> None:
+        """
+        Initialize and validate the spec.
+
+        Args:
+            regions: Named regions
+            steps: Detection steps
+
+        Raises:
+            ValueError: On duplicate names, unknown references, region cycles,
+                unknown planes or invalid rates
+        """
+        self.regions: Dict[str, PipelineRegion] = {}
+        for region in regions:
+            if region.name in self.regions:
+                raise ValueError(f"Duplicate pipeline region: {region.name}")
+            self.regions[region.name] = region
+
+        self.steps: Dict[str, PipelineStep] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate pipeline step: {step.name}")
+            if step.region is not None and step.region not in self.regions:
+                raise ValueError(f"Step '{step.name}' uses unknown region '{step.region}'")
+            if step.plane not in PLANES:
+                raise ValueError(f"Step '{step.name}' uses unknown plane '{step.plane}'")
+            if step.every_frames < 1:
+                raise ValueError(f"Step '{step.name}' must run at least every frame count of 1")
+            if step.motion_margin is not None and step.motion_margin < 0:
+                raise ValueError(f"Step '{step.name}' has a negative motion margin")
+            self.steps[step.name] = step
+
+        for name in self.regions:
+            self.region_chain(name)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'PipelineSpec':
+        """
+        Create a spec from a dictionary (e.g. loaded from JSON).
+
+        Args:
+            data: Dictionary with 'regions' and 'steps', each mapping names to fields
+
+        Returns:
+            The spec
+        """
+        regions = [PipelineRegion(name=name, **fields) for name, fields in data.get('regions', {}).items()]
+        steps = []
+        for name, fields in data.get('steps', {}).items():
+            fields = dict(fields)
+            fields['params'] = dict(fields.get('params', {}))
+            steps.append(PipelineStep(name=name, **fields))
+        return cls(regions, steps)
+
+    def region_chain(self, name: str) -> List[PipelineRegion]:
+        """
+        Get a region and its ancestors, outermost first.
+
+        Args:
+            name: Region name
+
+        Returns:
+            Regions from the outermost parent to the region itself
+
+        Raises:
+            ValueError: If the parent chain is broken or cyclic
+        """
+        chain = []
+        seen = set()
+        while name is not None:
+            if name in seen:
+                raise ValueError(f"Pipeline region cycle through '{name}'")
+            region = self.regions.get(name)
+            if region is None:
+                raise ValueError(f"Unknown pipeline region: {name}")
+            seen.add(name)
+            chain.append(region)
+            name = region.parent
+        return chain[::-1]
+
+
+class DetectionPipeline:
+    """
+    Executes a PipelineSpec once per frame.
+    """
+
+    def __init__(self, spec: PipelineSpec,
+                 run_step: Callable[[PipelineStep, np.ndarray], Union[List[Dict], DetectionBatch]],
+                 max_workers: int = 1) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            spec: Regions and steps to execute
+            run_step: Function running a step's detection on its prepared image,
+                returning results in image coordinates
+            max_workers: Steps run concurrently per frame (1 to run them in order)
+        """
+        self.spec = spec
+        self.run_step = run_step
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='pipeline') if max_workers > 1 else None
+
+        self._frames = 0
+        self._last_run: Dict[str, Tuple[int, float]] = {}  # step -> (frame index, timestamp)
+        self._latest: Dict[str, StepResult] = {}
+        self._motion: Dict[str, MotionCompensator] = {
+            name: MotionCompensator() for name, step in spec.steps.items() if step.motion_margin is not None
+        }
+
+        # Statistics
+        self.step_runs: Dict[str, int] = {name: 0 for name in spec.steps}
+        self.step_time: Dict[str, float] = {name: 0.0 for name in spec.steps}
+        self.crops = 0
+        self.planes = 0
+
+    def due_steps(self, timestamp: float) -> List[PipelineStep]:
+        """
+        Get the steps due on the next frame.
+
+        Args:
+            timestamp: Capture time of the next frame
+
+        Returns:
+            Steps to run
+        """
+        due = []
+        for step in self.spec.steps.values():
+            last = self._last_run.get(step.name)
+            if last is None:
+                due.append(step)
+                continue
+            frames_since = self._frames - last[0]
+            if frames_since < step.every_frames:
+                continue
+            if step.every_seconds is not None and timestamp - last[1] < step.every_seconds:
+                continue
+            due.append(step)
+        return due
+
+    def run(self, image: np.ndarray, frame_id: int, timestamp: Optional[float] = None) -> PipelineResult:
+        """
+        Execute the due steps on a frame.
+
+        Args:
+            image: Frame image (BGR)
+            frame_id: Frame ID
+            timestamp: Capture time of the frame from time.monotonic() (None for now)
+
+        Returns:
+            Combined result with the latest results of every step
+        """
+        start = time.perf_counter()
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        due = self.due_steps(timestamp)
+
+        # Crops and planes first, each computed once however many steps use it
+        crops: Dict[Optional[str], Tuple[np.ndarray, int, int]] = {None: (image, 0, 0)}
+        planes: Dict[Tuple[Optional[str], str], np.ndarray] = {}
+        inputs = []
+        for step in due:
+            if step.region not in crops:
+                for region in self.spec.region_chain(step.region):
+                    if region.name not in crops:
+                        crops[region.name] = self._crop(crops[region.parent], region)
+                        self.crops += 1
+            crop, x, y = crops[step.region]
+            key = (step.region, step.plane)
+            if key not in planes:
+                planes[key] = PLANES[step.plane](crop)
+                self.planes += 1
+            inputs.append((step, planes[key], x, y))
+
+        if self._executor is not None and len(inputs) > 1:
+            outcomes = list(self._executor.map(lambda item: self._run(*item), inputs))
+        else:
+            outcomes = [self._run(*item) for item in inputs]
+
+        for step, (results, error, elapsed) in zip(due, outcomes):
+            self._last_run[step.name] = (self._frames, timestamp)
+            self.step_runs[step.name] += 1
+            self.step_time[step.name] += elapsed
+            if error is not None and step.name in self._latest:
+                # Keep the last good results, but report the failure
+                previous = self._latest[step.name]
+                self._latest[step.name] = StepResult(step.name, previous.frame_id, previous.timestamp,
+                                                     previous.results, error)
+            else:
+                self._latest[step.name] = StepResult(step.name, frame_id, timestamp, results, error)
+        self._frames += 1
+
+        return PipelineResult(
+            frame_id=frame_id,
+            timestamp=timestamp,
+            steps=dict(self._latest),
+            ran=tuple(step.name for step in due),
+            duration=time.perf_counter() - start
+        )
+
+    def close(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pipeline statistics.
+
+        Returns:
+            Dictionary with frame, crop and plane counts and per-step run
+            counts, average times and, for motion compensated steps, the
+            compensator's statistics ('motion')
+        """
+        steps = {
+            name: {
+                'runs': runs,
+                'avg_time': self.step_time[name] / runs if runs else 0.0
+            }
+            for name, runs in self.step_runs.items()
+        }
+        for name, compensator in self._motion.items():
+            steps[name]['motion'] = compensator.get_stats()
+        return {
+            'frames': self._frames,
+            'crops': self.crops,
+            'planes': self.planes,
+            'steps': steps
+        }
+
+    def _run(self, step: PipelineStep, image: np.ndarray, x: int, y: int) -> Tuple[Any, Optional[str], float]:
+        """Run one step and shift its results into frame coordinates."""
+        start = time.perf_counter()
+        try:
+            if step.name in self._motion:
+                results = self._run_compensated(step, image)
+            else:
+                results = self.run_step(step, image)
+            results = offset_results(results, x, y)
+            error = None
+        except Exception as e:
+            logger.error(f"Pipeline step '{step.name}' failed: {e}", exc_info=True)
+            results, error = [], str(e)
+        return results, error, time.perf_counter() - start
+
+    def _run_compensated(self, step: PipelineStep, image: np.ndarray) -> DetectionBatch:
+        """Run a step on the parts of its image not covered by its shifted previous results."""
+        detection_type = ['template']
+
+        def detect(part: np.ndarray) -> List[Tuple[str, int, int, int, int, float]]:
+            batch = DetectionBatch.from_dicts(self.run_step(step, part))
+            detection_type[0] = batch.detection_type
+            return batch.to_tuples()
+
+        matches, _ = self._motion[step.name].detect(image, detect, step.motion_margin)
+        return DetectionBatch.from_tuples(matches, detection_type[0])
+
+    @staticmethod
+    def _crop(parent: Tuple[np.ndarray, int, int], region: PipelineRegion) -> Tuple[np.ndarray, int, int]:
+        """Crop a region from its parent's crop, clamped to the parent."""
+        image, px, py = parent
+        height, width = image.shape[:2]
+        x = max(0, min(region.left, width - 1))
+        y = max(0, min(region.top, height - 1))
+        w = max(1, min(region.width, width - x))
+        h = max(1, min(region.height, height - y))
+        return image[y:y + h, x:x + w], px + x, py + y
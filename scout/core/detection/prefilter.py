@@ -0,0 +1,495 @@
+"""
+Template Prefilter Cascade
+
+This module provides the PrefilterCascade class, which rules out most frame
+positions for a template with cheap tests before the full correlation runs.
+Most of a frame cannot contain a given template: the area is flat, much
+brighter or darker, or lacks the template's colors. The cascade evaluates,
+for every template position:
+
+1. 'statistics': window mean and standard deviation from integral images,
+   compared with the template's
+2. 'color': the share of pixels in the template's dominant colors, from an
+   integral image of a per-template color mask
+3. 'coarse': normalized correlation on downscaled copies of frame and template
+
+Each stage only looks at positions the previous stages accepted. The accepted
+positions are grouped into candidate windows, and the full correlation is run
+on those windows only. Rejection ratios are counted per template and stage, so
+thresholds can be tuned per template with configure_template().
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Stage names in evaluation order
+STAGES = ('statistics', 'color', 'coarse')
+
+# Match methods where higher scores are better; only these can be prefiltered
+SUPPORTED_METHODS = (cv2.TM_CCOEFF_NORMED, cv2.TM_CCORR_NORMED)
+
+# Quantization levels per color channel for dominant color masks
+COLOR_LEVELS = 8
+
+# (x, y, width, height) in template position coordinates
+Window = Tuple[int, int, int, int]
+
+
+def window_sums(integral: np.ndarray, height: int, width: int) -> np.ndarray:
+    """
+    Sum every height x width window of an image from its integral image.
+
+    Args:
+        integral: Integral image of shape (H + 1, W + 1)
+        height: Window height
+        width: Window width
+
+    Returns:
+        Array of shape (H - height + 1, W - width + 1)
+    """
+    result = integral[height:, width:] - integral[:-height, width:]
+    result -= integral[height:, :-width]
+    result += integral[:-height, :-width]
+    return result
+
+
+def color_bins(image: np.ndarray) -> np.ndarray:
+    """
+    Quantize a BGR image into COLOR_LEVELS ** 3 color bins.
+
+    Args:
+        image: BGR image (uint8)
+
+    Returns:
+        Bin index per pixel (uint16)
+    """
+    shift = 8 - int(np.log2(COLOR_LEVELS))
+    quantized = (image[:, :, :3] >> shift).astype(np.uint16)
+    return (quantized[:, :, 0] * COLOR_LEVELS + quantized[:, :, 1]) * COLOR_LEVELS + quantized[:, :, 2]
+
+
+def mask_windows(mask: np.ndarray) -> List[Window]:
+    """
+    Group the set positions of a mask into non-overlapping windows.
+
+    Args:
+        mask: Boolean array of template positions
+
+    Returns:
+        Windows as (x, y, width, height) covering every set position
+    """
+    if not mask.any():
+        return []
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+    boxes = [(int(x), int(y), int(x + w), int(y + h)) for x, y, w, h, _ in stats[1:count]]
+
+    # Components' bounding boxes can overlap; merge those so no position is correlated twice
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    boxes[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in boxes]
+
+
+def correlate_windows(image: np.ndarray, template: np.ndarray, windows: Sequence[Window],
+                      match_method: int) -> np.ndarray:
+    """
+    Run cv2.matchTemplate only at the template positions inside some windows.
+
+    Args:
+        image: Image to search
+        template: Template image
+        windows: Windows of template positions from mask_windows()
+        match_method: OpenCV match method where higher scores are better
+
+    Returns:
+        Score map of cv2.matchTemplate's shape, with -1 outside the windows
+    """
+    height, width = template.shape[:2]
+    result = np.full((image.shape[0] - height + 1, image.shape[1] - width + 1), -1.0, dtype=np.float32)
+    for x, y, w, h in windows:
+        region = image[y:y + h + height - 1, x:x + w + width - 1]
+        result[y:y + h, x:x + w] = cv2.matchTemplate(region, template, match_method)
+    return result
+
+
+class FramePrefilter:
+    """
+    Per-frame data shared by the prefilters of all templates.
+
+    Everything is computed on first use.
+    """
+
+    def __init__(self, image: np.ndarray) -> None:
+        """
+        Initialize the frame data.
+
+        Args:
+            image: Frame (BGR or grayscale, uint8)
+        """
+        self.image = image
+        self.height, self.width = image.shape[:2]
+        self._gray: Optional[np.ndarray] = None
+        self._integrals: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._bins: Optional[np.ndarray] = None
+        self._small: Dict[float, np.ndarray] = {}
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale frame."""
+        if self._gray is None:
+            self._gray = self.image if self.image.ndim == 2 else cv2.cvtColor(self.image[:, :, :3], cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def integrals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Integral images of the grayscale values and their squares."""
+        if self._integrals is None:
+            self._integrals = cv2.integral2(self.gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        return self._integrals
+
+    @property
+    def bins(self) -> Optional[np.ndarray]:
+        """Color bin of every pixel (None for grayscale frames)."""
+        if self._bins is None and self.image.ndim == 3:
+            self._bins = color_bins(self.image)
+        return self._bins
+
+    def downscaled(self, scale: float) -> np.ndarray:
+        """
+        Get the frame downscaled by a factor.
+
+        Args:
+            scale: Scale factor (0-1)
+
+        Returns:
+            Downscaled frame
+        """
+        small = self._small.get(scale)
+        if small is None:
+            small = cv2.resize(self.image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            self._small[scale] = small
+        return small
+
+
+class _TemplateProfile:
+    """Statistics of one template used by the cascade stages."""
+
+    def __init__(self, template: np.ndarray, color_coverage: float, max_colors: int) -> None:
+        gray = template if template.ndim == 2 else cv2.cvtColor(template[:, :, :3], cv2.COLOR_BGR2GRAY)
+        self.height, self.width = template.shape[:2]
+        self.mean = float(gray.mean())
+        self.std = float(gray.std())
+
+        # Smallest set of color bins covering color_coverage of the template
+        self.color_lut: Optional[np.ndarray] = None
+        self.color_fraction = 0.0
+        if template.ndim == 3:
+            counts = np.bincount(color_bins(template).ravel(), minlength=COLOR_LEVELS ** 3)
+            order = np.argsort(counts)[::-1]
+            cumulative = np.cumsum(counts[order]) / counts.sum()
+            used = min(int(np.searchsorted(cumulative, color_coverage)) + 1, max_colors)
+            self.color_lut = np.zeros(COLOR_LEVELS ** 3, dtype=np.uint8)
+            self.color_lut[order[:used]] = 1
+            self.color_fraction = float(cumulative[used - 1])
+
+
+class PrefilterCascade:
+    """
+    Cheap rejection tests run before full template correlation.
+
+    Thresholds are deliberately loose: a stage should only reject positions
+    that clearly cannot reach the confidence threshold. Every option can be
+    overridden per template with configure_template().
+    """
+
+    def __init__(self, stages: Sequence[str] = STAGES, min_std_ratio: float = 0.5,
+                 max_std_ratio: float = 2.0, mean_tolerance: Optional[float] = 40.0,
+                 min_template_std: float = 4.0, color_coverage: float = 0.8, max_colors: int = 16,
+                 color_ratio: float = 0.5, coarse_scale: float = 0.25, coarse_slack: float = 0.25,
+                 min_coarse_size: int = 8, max_candidate_ratio: float = 0.5) -> None:
+        """
+        Initialize the cascade.
+
+        Args:
+            stages: Stages to run, a subset of STAGES
+            min_std_ratio: Minimum window/template standard deviation ratio
+            max_std_ratio: Maximum window/template standard deviation ratio
+            mean_tolerance: Maximum difference of window and template mean
+                brightness (None to skip the brightness test)
+            min_template_std: Templates flatter than this skip the deviation test
+            color_coverage: Share of template pixels the dominant colors must cover
+            max_colors: Maximum number of dominant color bins
+            color_ratio: Minimum share of dominant-color pixels in a window,
+                relative to the share in the template
+            coarse_scale: Downscale factor of the coarse correlation
+            coarse_slack: How far below the confidence threshold a coarse
+                score may be for the position to be kept
+            min_coarse_size: Minimum downscaled template side for the coarse stage
+            max_candidate_ratio: Candidate windows covering more than this share
+                of all positions are not worth it; the full correlation is run
+        """
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown prefilter stages: {sorted(unknown)}")
+
+        self.options: Dict[str, Any] = {
+            'stages': tuple(stage for stage in STAGES if stage in stages),
+            'min_std_ratio': min_std_ratio,
+            'max_std_ratio': max_std_ratio,
+            'mean_tolerance': mean_tolerance,
+            'min_template_std': min_template_std,
+            'color_coverage': color_coverage,
+            'max_colors': max_colors,
+            'color_ratio': color_ratio,
+            'coarse_scale': coarse_scale,
+            'coarse_slack': coarse_slack,
+            'min_coarse_size': min_coarse_size,
+            'max_candidate_ratio': max_candidate_ratio
+        }
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+        self._profiles: Dict[Tuple[str, int, int, int], _TemplateProfile] = {}
+        self._lock = threading.Lock()
+        # template -> counters
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def configure_template(self, name: str, **options: Any) -> None:
+        """
+        Override cascade options for one template.
+
+        Args:
+            name: Template name
+            **options: Constructor options to override (e.g. stages=('color',))
+        """
+        unknown = set(options) - set(self.options)
+        if unknown:
+            raise ValueError(f"Unknown prefilter options: {sorted(unknown)}")
+        with self._lock:
+            self._overrides.setdefault(name, {}).update(options)
+            self._profiles = {k: v for k, v in self._profiles.items() if k[0] != name}
+
+    def options_for(self, name: str) -> Dict[str, Any]:
+        """
+        Get the effective options of a template.
+
+        Args:
+            name: Template name
+
+        Returns:
+            Options with the template's overrides applied
+        """
+        options = dict(self.options)
+        options.update(self._overrides.get(name, {}))
+        return options
+
+    def prepare(self, image: np.ndarray) -> FramePrefilter:
+        """
+        Wrap a frame so data shared by all templates is computed once.
+
+        Args:
+            image: Frame to search
+
+        Returns:
+            Frame prefilter data
+        """
+        return FramePrefilter(image)
+
+    def candidates(self, frame: FramePrefilter, template: np.ndarray, name: str,
+                   threshold: float, match_method: int = cv2.TM_CCOEFF_NORMED) -> np.ndarray:
+        """
+        Find the template positions that pass every stage.
+
+        Args:
+            frame: Prepared frame
+            template: Template image
+            name: Template name (for options, caching and statistics)
+            threshold: Confidence threshold of the search
+            match_method: OpenCV match method of the full correlation
+
+        Returns:
+            Boolean array of shape (H - h + 1, W - w + 1)
+        """
+        options = self.options_for(name)
+        profile = self._get_profile(name, template, options)
+        height, width = profile.height, profile.width
+        out_h, out_w = frame.height - height + 1, frame.width - width + 1
+
+        mask = np.ones((out_h, out_w), dtype=bool)
+        counters = {}
+        for stage in options['stages']:
+            tested = int(np.count_nonzero(mask))
+            if tested == 0:
+                break
+            stage_mask = getattr(self, f'_{stage}_mask')(frame, template, profile, options, threshold, match_method)
+            if stage_mask is None:
+                continue
+            mask &= stage_mask
+            counters[stage] = (tested, tested - int(np.count_nonzero(mask)))
+
+        with self._lock:
+            stats = self._stats.setdefault(name, {'evaluations': 0, 'positions': 0, 'candidates': 0})
+            stats['evaluations'] += 1
+            stats['positions'] += out_h * out_w
+            stats['candidates'] += int(np.count_nonzero(mask))
+            for stage, (tested, rejected) in counters.items():
+                stats[f'{stage}_tested'] = stats.get(f'{stage}_tested', 0) + tested
+                stats[f'{stage}_rejected'] = stats.get(f'{stage}_rejected', 0) + rejected
+        return mask
+
+    def candidate_windows(self, mask: np.ndarray) -> List[Window]:
+        """
+        Group accepted positions into non-overlapping windows.
+
+        Args:
+            mask: Accepted positions from candidates()
+
+        Returns:
+            Windows as (x, y, width, height) in position coordinates
+        """
+        return mask_windows(mask)
+
+    def match(self, frame: FramePrefilter, template: np.ndarray, name: str, threshold: float,
+              match_method: int = cv2.TM_CCOEFF_NORMED) -> Optional[np.ndarray]:
+        """
+        Correlate a template only in the windows the cascade accepts.
+
+        Args:
+            frame: Prepared frame
+            template: Template image
+            name: Template name
+            threshold: Confidence threshold of the search
+            match_method: OpenCV match method (must be in SUPPORTED_METHODS)
+
+        Returns:
+            Score map like cv2.matchTemplate's, with -1 at rejected positions,
+            or None if the candidates cover too much of the frame to be worth
+            it (the caller should run the full correlation)
+        """
+        if match_method not in SUPPORTED_METHODS:
+            return None
+
+        mask = self.candidates(frame, template, name, threshold, match_method)
+        windows = self.candidate_windows(mask)
+        area = sum(w * h for _, _, w, h in windows)
+        if area > self.options_for(name)['max_candidate_ratio'] * mask.size:
+            with self._lock:
+                self._stats[name]['full_fallbacks'] = self._stats[name].get('full_fallbacks', 0) + 1
+            return None
+
+        return correlate_windows(frame.image, template, windows, match_method)
+
+    def clear(self) -> None:
+        """Drop cached template profiles and statistics (e.g. after templates were reloaded)."""
+        with self._lock:
+            self._profiles.clear()
+            self._stats.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get rejection statistics per template.
+
+        Returns:
+            Dictionary mapping template names to their evaluation count,
+            candidate ratio, full correlation fallbacks and, per stage, the
+            share of the positions reaching the stage that it rejected
+        """
+        with self._lock:
+            stats = {name: dict(counters) for name, counters in self._stats.items()}
+
+        report = {}
+        for name, counters in stats.items():
+            entry = {
+                'evaluations': counters['evaluations'],
+                'candidate_ratio': counters['candidates'] / counters['positions'] if counters['positions'] else 0.0,
+                'full_fallbacks': counters.get('full_fallbacks', 0),
+                'rejection_ratios': {}
+            }
+            for stage in STAGES:
+                tested = counters.get(f'{stage}_tested', 0)
+                if tested:
+                    entry['rejection_ratios'][stage] = counters[f'{stage}_rejected'] / tested
+            report[name] = entry
+        return report
+
+    def _get_profile(self, name: str, template: np.ndarray, options: Dict[str, Any]) -> _TemplateProfile:
+        """Get a template's cached profile, computing it if needed."""
+        key = (name,) + tuple(template.shape[:2]) + (template.ndim,)
+        with self._lock:
+            profile = self._profiles.get(key)
+        if profile is None:
+            profile = _TemplateProfile(template, options['color_coverage'], options['max_colors'])
+            with self._lock:
+                self._profiles[key] = profile
+        return profile
+
+    def _statistics_mask(self, frame: FramePrefilter, template: np.ndarray, profile: _TemplateProfile,
+                         options: Dict[str, Any], threshold: float, match_method: int) -> Optional[np.ndarray]:
+        """Accept windows whose brightness and contrast resemble the template's."""
+        sums, squared = frame.integrals
+        area = float(profile.height * profile.width)
+        mean = window_sums(sums, profile.height, profile.width)
+        mean /= area
+        mask = np.ones(mean.shape, dtype=bool)
+
+        if options['mean_tolerance'] is not None:
+            mask &= np.abs(mean - profile.mean) <= options['mean_tolerance']
+
+        if profile.std >= options['min_template_std']:
+            variance = window_sums(squared, profile.height, profile.width)
+            variance /= area
+            variance -= mean * mean
+            std_ratio_sq = variance / (profile.std * profile.std)
+            mask &= std_ratio_sq >= options['min_std_ratio'] ** 2
+            mask &= std_ratio_sq <= options['max_std_ratio'] ** 2
+        return mask
+
+    def _color_mask(self, frame: FramePrefilter, template: np.ndarray, profile: _TemplateProfile,
+                    options: Dict[str, Any], threshold: float, match_method: int) -> Optional[np.ndarray]:
+        """Accept windows containing enough of the template's dominant colors."""
+        bins = frame.bins
+        if bins is None or profile.color_lut is None:
+            return None
+        color_mask = profile.color_lut[bins]
+        integral = cv2.integral(color_mask, sdepth=cv2.CV_32S)
+        share = window_sums(integral, profile.height, profile.width)
+        needed = options['color_ratio'] * profile.color_fraction * profile.height * profile.width
+        return share >= needed
+
+    def _coarse_mask(self, frame: FramePrefilter, template: np.ndarray, profile: _TemplateProfile,
+                     options: Dict[str, Any], threshold: float, match_method: int) -> Optional[np.ndarray]:
+        """Accept positions near downscaled correlation peaks."""
+        scale = options['coarse_scale']
+        if min(profile.height, profile.width) * scale < options['min_coarse_size'] or scale >= 1.0:
+            return None
+
+        small_frame = frame.downscaled(scale)
+        small_template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        if (small_frame.shape[0] < small_template.shape[0] or
+                small_frame.shape[1] < small_template.shape[1]):
+            return None
+        scores = cv2.matchTemplate(small_frame, small_template, match_method)
+        passed = (scores >= threshold - options['coarse_slack']).astype(np.uint8)
+        # A full-resolution peak can fall between coarse positions
+        passed = cv2.dilate(passed, np.ones((3, 3), np.uint8))
+
+        out_h = frame.height - profile.height + 1
+        out_w = frame.width - profile.width + 1
+        rows = np.minimum((np.arange(out_h) * scale).round().astype(int), passed.shape[0] - 1)
+        cols = np.minimum((np.arange(out_w) * scale).round().astype(int), passed.shape[1] - 1)
+        return passed[np.ix_(rows, cols)].astype(bool)
@@ -0,0 +1,624 @@
+"""
+Detection Worker Processes
+
+This module moves heavy detection out of the GUI process, where it competes
+with Qt for the GIL. A DetectionProcessPool starts worker processes that
+build their strategies once (templates and models stay resident) and serve
+detection requests:
+
+- Frames are handed over through a SharedFrameRing, a ring of fixed-size
+  slots in shared memory. A request only names the slot, so the frame is
+  never pickled, and a slot is leased until its request is answered.
+- Requests and compact results (DetectionBatch pickles as a few arrays) go
+  over one pipe per worker.
+- A worker that dies is restarted; its in-flight requests fail with
+  WorkerCrashedError and are retried once on another or the restarted worker.
+
+DetectionService stays a thin client: RemoteDetectionStrategy is registered
+in place of the local strategy (see DetectionService.use_process_pool), and
+several services, e.g. one per game window, can share one pool. Workers
+report their template names and sizes and their spatial priors file when
+they start, so the proxy can answer for them without a round trip.
+"""
+
+import os
+import time
+import logging
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scout.core.detection.strategy import DetectionStrategy
+from scout.core.detection.spatial_priors import SpatialPriors
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Room for a 1920x1080 BGRA frame per slot
+DEFAULT_SLOT_BYTES = 1920 * 1080 * 4
+
+# Per-slot header: sequence number, height, width, channels
+HEADER_FIELDS = 4
+
+
+class WorkerCrashedError(RuntimeError):
+    """A worker process died while handling a request."""
+
+
+class SharedFrameRing:
+    """
+    Fixed-size frame slots in shared memory.
+
+    The creating process writes frames; worker processes attach by name and
+    read them as views. Each write bumps the slot's sequence number, which a
+    reader checks to make sure the slot still holds the frame it was sent.
+    """
+
+    def __init__(self, slots: int = 8, slot_bytes: int = DEFAULT_SLOT_BYTES, name: Optional[str] = None) -> None:
+        """
+        Create a ring, or attach to an existing one.
+
+        Args:
+            slots: Number of frame slots
+            slot_bytes: Maximum frame size in bytes
+            name: Shared memory name to attach to (None to create a new ring)
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        header_bytes = slots * HEADER_FIELDS * 8
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_bytes + slots * slot_bytes)
+        else:
+            # Workers share their creator's resource tracker, which removes the memory with the ring
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.header = np.ndarray((slots, HEADER_FIELDS), dtype=np.int64, buffer=self.shm.buf)
+        self.data = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=self.shm.buf, offset=header_bytes)
+        if self.owner:
+            self.header[:] = 0
+
+    def write(self, slot: int, image: np.ndarray) -> int:
+        """
+        Copy a frame into a slot.
+
+        Args:
+            slot: Slot index
+            image: uint8 image (grayscale or multi-channel)
+
+        Returns:
+            The slot's new sequence number
+
+        Raises:
+            ValueError: If the image is not uint8 or does not fit in a slot
+        """
+        if image.dtype != np.uint8:
+            raise ValueError(f"Only uint8 frames can be shared, got {image.dtype}")
+        if image.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {image.nbytes} bytes exceeds the slot size of {self.slot_bytes} bytes")
+
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        target = self.data[slot, :image.nbytes].reshape(image.shape)
+        np.copyto(target, image)
+        sequence = int(self.header[slot, 0]) + 1
+        self.header[slot] = (sequence, height, width, channels)
+        return sequence
+
+    def read(self, slot: int, sequence: int) -> np.ndarray:
+        """
+        Get a read-only view of a frame in a slot.
+
+        Args:
+            slot: Slot index
+            sequence: Sequence number the frame was written with
+
+        Returns:
+            Image view
+
+        Raises:
+            ValueError: If the slot no longer holds that frame
+        """
+        current, height, width, channels = (int(value) for value in self.header[slot])
+        if current != sequence:
+            raise ValueError(f"Frame slot {slot} was overwritten (sequence {current}, expected {sequence})")
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        image = self.data[slot, :height * width * channels].reshape(shape)
+        image.flags.writeable = False
+        return image
+
+    def close(self) -> None:
+        """Detach from the ring, removing it if this process created it."""
+        self.header = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Frame views are still referenced; the mapping goes away with the process
+            logger.debug("Frame ring closed while frame views were still in use")
+        if self.owner:
+            self.shm.unlink()
+
+
+def create_default_strategies(templates_dir: Optional[str] = None) -> Dict[str, DetectionStrategy]:
+    """
+    Create the strategies a worker serves by default.
+
+    Args:
+        templates_dir: Template directory for template matching (None for the default)
+
+    Returns:
+        Strategies by name: 'template', and 'ocr' if Tesseract bindings are installed
+    """
+    from scout.core.detection.strategies.template_strategy import TemplateMatchingStrategy
+
+    strategies: Dict[str, DetectionStrategy] = {'template': TemplateMatchingStrategy(templates_dir)}
+    try:
+        from scout.core.detection.strategies.ocr_strategy import OCRStrategy
+        strategies['ocr'] = OCRStrategy()
+    except ImportError:
+        logger.debug("OCR not available in detection worker")
+    return strategies
+
+
+def _describe_strategies(strategies: Dict[str, DetectionStrategy]) -> Dict[str, Dict[str, Any]]:
+    """
+    Describe a worker's strategies for the parent process.
+
+    Args:
+        strategies: Strategies by name
+
+    Returns:
+        Per strategy: 'templates' mapping template names to (width, height)
+        (None for strategies without templates) and 'spatial_priors', the
+        path of the priors file (None without persistent priors)
+    """
+    info = {}
+    for name, strategy in strategies.items():
+        templates = getattr(strategy, 'templates', None)
+        priors = getattr(strategy, 'spatial_priors', None)
+        info[name] = {
+            'templates': ({template: (image.shape[1], image.shape[0]) for template, image in templates.items()}
+                          if isinstance(templates, dict) else None),
+            'spatial_priors': str(priors.path) if getattr(priors, 'path', None) is not None else None
+        }
+    return info
+
+
+def _worker_main(conn: Any, ring_name: str, slots: int, slot_bytes: int,
+                 factory: Callable[..., Dict[str, DetectionStrategy]], factory_args: Tuple) -> None:
+    """
+    Serve detection requests in a worker process.
+
+    Args:
+        conn: Pipe end for requests and results
+        ring_name: Shared memory name of the frame ring
+        slots: Number of frame slots
+        slot_bytes: Slot size in bytes
+        factory: Picklable function creating the strategies
+        factory_args: Arguments for the factory
+    """
+    ring = SharedFrameRing(slots, slot_bytes, name=ring_name)
+    strategies = factory(*factory_args)
+    conn.send(('ready', os.getpid(), _describe_strategies(strategies)))
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message is None:
+                break
+
+            request_id, slot, sequence, strategy_name, params = message
+            try:
+                image = ring.read(slot, sequence)
+                strategy = strategies.get(strategy_name)
+                if strategy is None:
+                    raise ValueError(f"{strategy_name} strategy not available in detection worker")
+                conn.send((request_id, True, strategy.detect(image, **params)))
+            except Exception as e:
+                conn.send((request_id, False, f"{type(e).__name__}: {e}"))
+    finally:
+        ring.close()
+
+
+class _Worker:
+    """Parent-side state of one worker process."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Any = None
+        self.pid: Optional[int] = None
+        self.ready = threading.Event()
+        self.send_lock = threading.Lock()
+        self.pending: Dict[int, Tuple[Future, int]] = {}  # request ID -> (future, slot)
+        self.restarts = 0
+
+
+class DetectionProcessPool:
+    """
+    Pool of detection worker processes fed through shared memory.
+    """
+
+    def __init__(self, strategy_factory: Callable[..., Dict[str, DetectionStrategy]] = create_default_strategies,
+                 factory_args: Tuple = (), workers: int = 1, slots: int = 8,
+                 slot_bytes: int = DEFAULT_SLOT_BYTES, max_restarts: int = 5,
+                 start_timeout: float = 60.0) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            strategy_factory: Picklable module-level function creating a worker's strategies
+            factory_args: Picklable arguments for the factory
+            workers: Number of worker processes
+            slots: Frames that can be in flight at once
+            slot_bytes: Maximum frame size in bytes
+            max_restarts: Restarts allowed per worker before it is given up
+            start_timeout: Seconds to wait for a worker to load its strategies
+        """
+        self.strategy_factory = strategy_factory
+        self.factory_args = factory_args
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.max_restarts = max_restarts
+        self.start_timeout = start_timeout
+        self.strategy_names: List[str] = []
+        self.strategy_info: Dict[str, Dict[str, Any]] = {}  # As reported by the workers (see _describe_strategies)
+
+        self._context = multiprocessing.get_context('spawn')  # Forking a Qt process is unsafe
+        self._workers = [_Worker(index) for index in range(workers)]
+        self._ring: Optional[SharedFrameRing] = None
+        self._lock = threading.Lock()
+        self._free_slots = threading.Semaphore(slots)
+        self._slot_pool: List[int] = list(range(slots))
+        self._slot_users: Dict[int, int] = {}  # slot -> requests using it
+        self._shared_frame: Optional[Tuple[np.ndarray, int, int]] = None  # (image, slot, sequence) in use
+        self._request_ids = itertools.count(1)
+        self._running = False
+
+        # Statistics
+        self.requests = 0
+        self.failures = 0
+        self.crashes = 0
+        self.shared_frames = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the pool has been started and not stopped."""
+        return self._running
+
+    def start(self) -> None:
+        """
+        Create the frame ring and start the workers.
+
+        Raises:
+            RuntimeError: If no worker becomes ready within the start timeout
+        """
+        if self._running:
+            return
+        self._ring = SharedFrameRing(self.slots, self.slot_bytes)
+        self._running = True
+        for worker in self._workers:
+            self._spawn(worker)
+
+        deadline = time.monotonic() + self.start_timeout
+        for worker in self._workers:
+            worker.ready.wait(max(deadline - time.monotonic(), 0))
+        if not any(worker.ready.is_set() for worker in self._workers):
+            self.stop()
+            raise RuntimeError("No detection worker became ready")
+        logger.info(f"Started {len(self._workers)} detection worker processes serving {self.strategy_names}")
+
+    def stop(self) -> None:
+        """Stop the workers and release the frame ring."""
+        if not self._running:
+            return
+        self._running = False
+        for worker in self._workers:
+            try:
+                with worker.send_lock:
+                    worker.conn.send(None)
+            except Exception:
+                pass
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.kill()
+                    worker.process.join(timeout=5)
+            self._fail_pending(worker, RuntimeError("Detection pool stopped"))
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        logger.info("Stopped detection worker processes")
+
+    def submit(self, strategy: str, image: np.ndarray, slot_timeout: Optional[float] = None, **params) -> Future:
+        """
+        Send a detection request to the least busy worker.
+
+        Waits for a free frame slot if all are in use.
+
+        Args:
+            strategy: Strategy name in the worker
+            image: uint8 frame or region crop
+            slot_timeout: Maximum seconds to wait for a free frame slot (None to wait indefinitely)
+            **params: Keyword arguments for the strategy's detect()
+
+        Returns:
+            Future of the detection results
+
+        Raises:
+            RuntimeError: If the pool is not running or no worker is available
+            TimeoutError: If no frame slot became free in time, e.g. because a worker hangs
+        """
+        if not self._running:
+            raise RuntimeError("Detection pool is not running")
+        workers = [worker for worker in self._workers if worker.ready.is_set()]
+        if not workers:
+            raise RuntimeError("No detection worker available")
+        worker = min(workers, key=lambda w: len(w.pending))
+
+        slot, sequence = self._acquire_slot(image, slot_timeout)
+        request_id = next(self._request_ids)
+        future: Future = Future()
+        with self._lock:
+            worker.pending[request_id] = (future, slot)
+            self.requests += 1
+        try:
+            with worker.send_lock:
+                worker.conn.send((request_id, slot, sequence, strategy, params))
+        except Exception as e:
+            self._resolve(worker, request_id, False, WorkerCrashedError(f"Sending to detection worker failed: {e}"))
+        return future
+
+    def detect(self, strategy: str, image: np.ndarray, timeout: Optional[float] = None,
+               retries: int = 1, **params) -> Any:
+        """
+        Run a detection in a worker and wait for its results.
+
+        Args:
+            strategy: Strategy name in the worker
+            image: uint8 frame or region crop
+            timeout: Maximum seconds to wait for the results (None to wait indefinitely)
+            retries: How often to resend a request whose worker crashed
+            **params: Keyword arguments for the strategy's detect()
+
+        Returns:
+            Detection results
+
+        Raises:
+            WorkerCrashedError: If the worker crashed on every attempt
+            TimeoutError: If the results did not arrive in time
+            RuntimeError: If the detection failed in the worker
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        for attempt in range(retries + 1):
+            future = self.submit(strategy, image, slot_timeout=remaining(), **params)
+            try:
+                return future.result(remaining())
+            except FutureTimeoutError:
+                raise TimeoutError(f"Detection worker did not answer within {timeout} seconds")
+            except WorkerCrashedError:
+                if attempt == retries:
+                    raise
+                logger.warning("Detection worker crashed; retrying request")
+                self._wait_for_worker(remaining())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with request, failure, crash and shared-frame counts and
+            per-worker PIDs, restarts and pending requests
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'failures': self.failures,
+                'crashes': self.crashes,
+                'shared_frames': self.shared_frames,
+                'free_slots': len(self._slot_pool),
+                'workers': [
+                    {'pid': w.pid, 'ready': w.ready.is_set(), 'restarts': w.restarts, 'pending': len(w.pending)}
+                    for w in self._workers
+                ]
+            }
+
+    def _spawn(self, worker: _Worker) -> None:
+        """Start a worker process and its result reader."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._ring.name, self.slots, self.slot_bytes, self.strategy_factory, self.factory_args),
+            name=f"DetectionWorker-{worker.index}",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        worker.process, worker.conn = process, parent_conn
+        worker.ready.clear()
+        threading.Thread(target=self._read_results, args=(worker, process, parent_conn),
+                         name=f"DetectionWorkerReader-{worker.index}", daemon=True).start()
+
+    def _read_results(self, worker: _Worker, process: multiprocessing.Process, conn: Any) -> None:
+        """Receive a worker's results until its process exits, then restart it."""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == 'ready':
+                _, worker.pid, info = message
+                self.strategy_info = info
+                self.strategy_names = sorted(info)
+                worker.ready.set()
+                continue
+            request_id, ok, payload = message
+            self._resolve(worker, request_id, ok, payload)
+
+        worker.ready.clear()
+        conn.close()
+        process.join(timeout=1)
+        if not self._running:
+            return
+
+        self.crashes += 1
+        logger.error(f"Detection worker {worker.index} (pid {process.pid}) exited with code {process.exitcode}")
+        self._fail_pending(worker, WorkerCrashedError(f"Detection worker exited with code {process.exitcode}"))
+        if worker.restarts >= self.max_restarts:
+            logger.error(f"Detection worker {worker.index} crashed {worker.restarts + 1} times; not restarting")
+            return
+        worker.restarts += 1
+        time.sleep(min(0.1 * 2 ** worker.restarts, 5.0))
+        if self._running:
+            self._spawn(worker)
+
+    def _resolve(self, worker: _Worker, request_id: int, ok: bool, payload: Any) -> None:
+        """Complete a request's future and release its frame slot."""
+        with self._lock:
+            entry = worker.pending.pop(request_id, None)
+            if entry is None:
+                return
+            future, slot = entry
+            self._release_slot(slot)
+            if not ok:
+                self.failures += 1
+        if ok:
+            future.set_result(payload)
+        elif isinstance(payload, BaseException):
+            future.set_exception(payload)
+        else:
+            future.set_exception(RuntimeError(f"Detection failed in worker: {payload}"))
+
+    def _fail_pending(self, worker: _Worker, error: BaseException) -> None:
+        """Fail every request still pending on a worker."""
+        with self._lock:
+            request_ids = list(worker.pending)
+        for request_id in request_ids:
+            self._resolve(worker, request_id, False, error)
+
+    def _acquire_slot(self, image: np.ndarray, timeout: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Lease a slot holding the image.
+
+        A read-only image (such as a FrameSource frame) that is already in a
+        leased slot is shared instead of copied again.
+
+        Raises:
+            TimeoutError: If no slot became free within the timeout
+        """
+        shareable = not image.flags.writeable
+        if shareable:
+            with self._lock:
+                shared = self._shared_frame
+                if shared is not None and shared[0] is image:
+                    self._slot_users[shared[1]] += 1
+                    self.shared_frames += 1
+                    return shared[1], shared[2]
+
+        if not self._free_slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No free detection frame slot within {timeout} seconds")
+        with self._lock:
+            slot = self._slot_pool.pop()
+            self._slot_users[slot] = 1
+        sequence = self._ring.write(slot, np.ascontiguousarray(image))
+        if shareable:
+            with self._lock:
+                if slot in self._slot_users:
+                    self._shared_frame = (image, slot, sequence)
+        return slot, sequence
+
+    def _release_slot(self, slot: int) -> None:
+        """Drop one request's use of a slot (called with the lock held)."""
+        self._slot_users[slot] -= 1
+        if self._slot_users[slot] == 0:
+            del self._slot_users[slot]
+            if self._shared_frame is not None and self._shared_frame[1] == slot:
+                self._shared_frame = None
+            self._slot_pool.append(slot)
+            self._free_slots.release()
+
+    def _wait_for_worker(self, timeout: Optional[float]) -> None:
+        """Wait until any worker is ready again."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._running and not any(worker.ready.is_set() for worker in self._workers):
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            time.sleep(0.05)
+
+
+class RemoteDetectionStrategy(DetectionStrategy):
+    """
+    Strategy proxy running detections in a DetectionProcessPool.
+
+    Template names and sizes come from the workers' start-up report. If the
+    worker strategy keeps spatial priors in a file, the proxy loads them too,
+    so DetectionService restricts searches to learned regions as it does
+    locally. Correlation peaks are not reused across requests behind the
+    proxy: frame keys are not sent to the workers, as consecutive requests
+    may go to different workers.
+    """
+
+    def __init__(self, pool: DetectionProcessPool, name: str, timeout: Optional[float] = 30.0) -> None:
+        """
+        Initialize the proxy.
+
+        Args:
+            pool: Started detection pool
+            name: Name of the strategy in the workers
+            timeout: Maximum seconds to wait for a frame slot and the detection
+        """
+        self.pool = pool
+        self.name = name
+        self.timeout = timeout
+
+        info = pool.strategy_info.get(name, {})
+        self.template_sizes: Dict[str, Tuple[int, int]] = dict(info.get('templates') or {})  # name -> (width, height)
+        priors_path = info.get('spatial_priors')
+        self.spatial_priors: Optional[SpatialPriors] = SpatialPriors(priors_path) if priors_path else None
+
+    def detect(self, image: np.ndarray, params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """
+        Run the detection in a worker process.
+
+        Args:
+            image: Image to analyze
+            params: Detection parameters
+            **kwargs: Detection parameters as keyword arguments
+
+        Returns:
+            The worker strategy's results
+
+        Raises:
+            TimeoutError: If no frame slot became free or no results arrived in time
+        """
+        return self.pool.detect(self.name, image, timeout=self.timeout, **dict(params or {}, **kwargs))
+
+    def get_template_names(self) -> List[str]:
+        """
+        Get the names of the templates loaded in the workers.
+
+        Returns:
+            List of template names (empty for strategies without templates)
+        """
+        return list(self.template_sizes)
+
+    def get_name(self) -> str:
+        """Get the name of this detection strategy."""
+        return f"Remote {self.name}"
+
+    def get_required_params(self) -> List[str]:
+        """Get the required parameters for this strategy."""
+        return []
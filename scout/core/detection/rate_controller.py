@@ -0,0 +1,254 @@
+"""
+Detection Rate Controller
+
+This module provides the DetectionRateController class, which chooses the
+detection interval from measured cost instead of a fixed target frequency.
+Each detection tick reports how long it took and how much CPU it used; the
+controller lowers the rate to keep detection within a CPU share and to leave
+headroom on a busy machine, raises it (up to the configured target) when a
+latency budget needs it, and backs off while the game window is minimized or
+its contents do not change. Running several Scout instances on one host then
+degrades gracefully instead of saturating the CPU.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+# Try to import real psutil, fall back to our stub implementation
+try:
+    import psutil
+except ImportError:
+    import scout.core.utils.psutil_stub as psutil
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Size of the thumbnail used to decide whether the window contents changed
+SIGNATURE_SIZE = (32, 18)
+
+
+def frame_signature(image: np.ndarray) -> np.ndarray:
+    """
+    Compute a small grayscale thumbnail for cheap change detection.
+
+    Args:
+        image: BGR or grayscale image
+
+    Returns:
+        Thumbnail as float32 array
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(image, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class DetectionRateController:
+    """
+    Adapts the detection rate to measured detection cost and CPU headroom.
+
+    The rate never exceeds max_frequency (the user's target frequency) and
+    never drops below min_frequency. Decreases apply immediately; increases
+    are limited to a factor of ramp per tick so one cheap tick does not cause
+    a burst.
+    """
+
+    def __init__(self, max_frequency: float, min_frequency: float = 0.2,
+                 cpu_budget: Optional[float] = 0.25, latency_budget: Optional[float] = None,
+                 min_headroom: float = 0.2, idle_backoff: float = 2.0, change_threshold: float = 2.0,
+                 smoothing: float = 0.3, ramp: float = 1.5,
+                 cpu_percent_func: Optional[Callable[[], float]] = None) -> None:
+        """
+        Initialize the rate controller.
+
+        Args:
+            max_frequency: Highest detection rate in ticks per second
+            min_frequency: Lowest detection rate, also the idle rate
+            cpu_budget: Share of one CPU core detection may use (None to disable)
+            latency_budget: Target seconds from capture to published result;
+                the rate is only raised as far as needed to meet it (None to disable)
+            min_headroom: Fraction of system CPU to keep free; the rate is
+                scaled down when the system is busier than that
+            idle_backoff: Interval multiplier per idle tick
+            change_threshold: Mean absolute thumbnail difference (0-255) below
+                which a frame counts as unchanged
+            smoothing: Weight of the newest measurement in the moving averages
+            ramp: Maximum rate increase factor per tick
+            cpu_percent_func: System CPU usage in percent (default: psutil.cpu_percent)
+        """
+        if max_frequency <= 0 or min_frequency <= 0:
+            raise ValueError("Detection frequencies must be positive")
+
+        self.max_frequency = max_frequency
+        self.min_frequency = min(min_frequency, max_frequency)
+        self.cpu_budget = cpu_budget
+        self.latency_budget = latency_budget
+        self.min_headroom = min_headroom
+        self.idle_backoff = idle_backoff
+        self.change_threshold = change_threshold
+        self.smoothing = smoothing
+        self.ramp = ramp
+        self._cpu_percent = cpu_percent_func or (lambda: psutil.cpu_percent(interval=None))
+
+        self._frequency = max_frequency
+        self._avg_detection_time: Optional[float] = None
+        self._avg_cpu_time: Optional[float] = None
+        self._last_signature: Optional[np.ndarray] = None
+        self._limit = 'target'  # What determined the current rate
+
+        # Statistics
+        self.ticks = 0
+        self.idle_ticks = 0
+        self.unchanged_frames = 0
+        self.system_cpu = 0.0
+
+    @property
+    def frequency(self) -> float:
+        """Current detection rate in ticks per second."""
+        return self._frequency
+
+    @property
+    def interval(self) -> float:
+        """Current seconds between detection ticks."""
+        return 1.0 / self._frequency
+
+    def set_target(self, max_frequency: float) -> None:
+        """
+        Change the highest detection rate and restart adaptation from it.
+
+        Args:
+            max_frequency: Highest detection rate in ticks per second
+        """
+        if max_frequency <= 0:
+            raise ValueError("Detection frequencies must be positive")
+        self.max_frequency = max_frequency
+        self.min_frequency = min(self.min_frequency, max_frequency)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget measurements and return to the target rate."""
+        self._frequency = self.max_frequency
+        self._avg_detection_time = None
+        self._avg_cpu_time = None
+        self._last_signature = None
+        self._limit = 'target'
+
+    def is_unchanged(self, image: np.ndarray) -> bool:
+        """
+        Check whether a frame looks the same as the last changed one.
+
+        Frames are compared with the last frame that counted as changed, so
+        slow drift accumulates until it crosses the threshold.
+
+        Args:
+            image: Captured frame
+
+        Returns:
+            True if the frame differs from the reference by less than
+            change_threshold
+        """
+        signature = frame_signature(image)
+        previous = self._last_signature
+
+        if (previous is not None and previous.shape == signature.shape and
+                float(cv2.absdiff(signature, previous).mean()) < self.change_threshold):
+            self.unchanged_frames += 1
+            return True
+
+        self._last_signature = signature
+        return False
+
+    def update(self, detection_time: float, cpu_time: Optional[float] = None) -> float:
+        """
+        Record a detection tick and compute the next interval.
+
+        Args:
+            detection_time: Wall-clock seconds the tick took
+            cpu_time: CPU seconds the tick used (default: detection_time)
+
+        Returns:
+            Seconds until the next tick
+        """
+        self.ticks += 1
+        cpu_time = detection_time if cpu_time is None else cpu_time
+        self._avg_detection_time = self._average(self._avg_detection_time, detection_time)
+        self._avg_cpu_time = self._average(self._avg_cpu_time, cpu_time)
+
+        target = self.max_frequency
+        limit = 'target'
+
+        # A frame waits up to one interval before detection starts, so the
+        # capture-to-result latency is about interval + detection time
+        if self.latency_budget:
+            slack = self.latency_budget - self._avg_detection_time
+            if slack > 0 and 1.0 / slack < target:
+                target, limit = 1.0 / slack, 'latency'
+
+        if self.cpu_budget and self._avg_cpu_time > 0:
+            cpu_limit = self.cpu_budget / self._avg_cpu_time
+            if cpu_limit < target:
+                target, limit = cpu_limit, 'cpu_budget'
+
+        # Give way when other processes (e.g. other instances) keep the machine busy
+        try:
+            self.system_cpu = float(self._cpu_percent()) / 100.0
+        except Exception as e:
+            logger.debug(f"Could not read system CPU usage: {e}")
+            self.system_cpu = 0.0
+        headroom = 1.0 - self.system_cpu
+        if self.min_headroom > 0 and headroom < self.min_headroom:
+            target *= max(headroom, 0.0) / self.min_headroom
+            limit = 'headroom'
+
+        target = min(max(target, self.min_frequency), self.max_frequency)
+        if target > self._frequency:
+            target = min(target, self._frequency * self.ramp)
+
+        if limit != self._limit:
+            logger.debug(f"Detection rate now limited by {limit}: {target:.2f} Hz")
+        self._frequency = target
+        self._limit = limit
+        return self.interval
+
+    def update_idle(self) -> float:
+        """
+        Record a tick skipped because the window is minimized or unchanged.
+
+        Returns:
+            Seconds until the next tick
+        """
+        self.ticks += 1
+        self.idle_ticks += 1
+        self._frequency = max(self._frequency / self.idle_backoff, self.min_frequency)
+        self._limit = 'idle'
+        return self.interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get controller statistics.
+
+        Returns:
+            Dictionary with the current rate, what limits it and the measured costs
+        """
+        avg_cpu = self._avg_cpu_time or 0.0
+        return {
+            'frequency': self._frequency,
+            'interval': self.interval,
+            'max_frequency': self.max_frequency,
+            'limited_by': self._limit,
+            'avg_detection_time': self._avg_detection_time or 0.0,
+            'avg_cpu_time': avg_cpu,
+            'cpu_share': avg_cpu * self._frequency,
+            'system_cpu': self.system_cpu,
+            'ticks': self.ticks,
+            'idle_ticks': self.idle_ticks,
+            'unchanged_frames': self.unchanged_frames
+        }
+
+    def _average(self, current: Optional[float], value: float) -> float:
+        """Exponential moving average."""
+        if current is None:
+            return value
+        return current + self.smoothing * (value - current)
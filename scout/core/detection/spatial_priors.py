@@ -0,0 +1,333 @@
+"""
+Spatial Priors
+
+This module provides the SpatialPriors class, which learns where each template
+has been found and restricts later searches to those areas. Buttons, HUD icons
+and dialog headers only ever appear in a few fixed places, so searching the
+whole frame for them wastes most of the matching time.
+
+Matches are counted on a coarse grid per template and frame size. Once a
+template has enough observations, its search regions are the occupied cells
+grown by a safety margin. Every sweep_interval-th request searches the full
+frame so templates can be learned in new places. Priors are stored as JSON
+next to the templates.
+"""
+
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (x, y, width, height)
+Region = Tuple[int, int, int, int]
+
+
+class SpatialPriors:
+    """
+    Per-template search regions learned from past matches.
+
+    Priors are kept separately for every frame size, because UI elements move
+    when the game window is resized.
+    """
+
+    FILENAME = "spatial_priors.json"
+    VERSION = 1
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, cell_size: int = 32, margin: int = 32,
+                 min_observations: int = 3, sweep_interval: int = 50, max_coverage: float = 0.6,
+                 save_interval: float = 30.0) -> None:
+        """
+        Initialize spatial priors.
+
+        Args:
+            path: JSON file the priors are loaded from and saved to (None to keep them in memory)
+            cell_size: Grid cell size in pixels
+            margin: Safety margin in pixels added around learned locations
+            min_observations: Matches needed before a template's search is restricted
+            sweep_interval: Every this many requests a full-frame sweep is run (0 to never sweep)
+            max_coverage: Fraction of the frame above which restricting is not worth it
+            save_interval: Minimum seconds between automatic saves
+        """
+        self.path = Path(path) if path is not None else None
+        self.cell_size = cell_size
+        self.margin = margin
+        self.min_observations = min_observations
+        self.sweep_interval = sweep_interval
+        self.max_coverage = max_coverage
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        # template -> frame size -> (hit counts per cell, observations)
+        self._grids: Dict[str, Dict[Tuple[int, int], List[Any]]] = {}
+        self._regions: Dict[Tuple[str, Tuple[int, int]], Optional[List[Region]]] = {}
+        self._requests = 0
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        # Statistics
+        self.sweeps = 0
+        self.restricted_searches = 0
+        self.full_searches = 0
+
+        if self.path is not None:
+            self.load()
+
+    def next_is_sweep(self) -> bool:
+        """
+        Count a detection request and tell whether it should search the full frame.
+
+        Returns:
+            True if this request is a learning sweep
+        """
+        with self._lock:
+            self._requests += 1
+            sweep = self.sweep_interval > 0 and self._requests % self.sweep_interval == 0
+        if sweep:
+            self.sweeps += 1
+        return sweep
+
+    def regions(self, name: str, frame_size: Tuple[int, int]) -> Optional[List[Region]]:
+        """
+        Get the regions a template should be searched in.
+
+        Args:
+            name: Template name
+            frame_size: Frame size as (width, height)
+
+        Returns:
+            Search regions, or None if the template must be searched in the
+            full frame (not learned yet, or restricting would not save enough)
+        """
+        key = (name, tuple(frame_size))
+        with self._lock:
+            if key not in self._regions:
+                self._regions[key] = self._compute_regions(name, key[1])
+            regions = self._regions[key]
+
+        if regions is None:
+            self.full_searches += 1
+        else:
+            self.restricted_searches += 1
+        return regions
+
+    def observe(self, name: str, boxes: Iterable[Tuple[int, int, int, int]],
+                frame_size: Tuple[int, int]) -> None:
+        """
+        Record where a template matched.
+
+        Args:
+            name: Template name
+            boxes: Match boxes as (x, y, width, height) in frame coordinates
+            frame_size: Frame size as (width, height)
+        """
+        width, height = frame_size
+        rows = -(-height // self.cell_size)
+        cols = -(-width // self.cell_size)
+        cell = self.cell_size
+
+        with self._lock:
+            entry = self._grids.setdefault(name, {}).get((width, height))
+            if entry is None:
+                entry = [np.zeros((rows, cols), dtype=np.uint32), 0]
+                self._grids[name][(width, height)] = entry
+
+            counts = entry[0]
+            observed = 0
+            for x, y, w, h in boxes:
+                x1, y1 = max(int(x) // cell, 0), max(int(y) // cell, 0)
+                x2 = min((int(x) + int(w) - 1) // cell, cols - 1)
+                y2 = min((int(y) + int(h) - 1) // cell, rows - 1)
+                if x2 < x1 or y2 < y1:
+                    continue
+                counts[y1:y2 + 1, x1:x2 + 1] += 1
+                observed += 1
+
+            if observed:
+                entry[1] += observed
+                self._regions.pop((name, (width, height)), None)
+                self._dirty = True
+
+        if observed:
+            self._maybe_save()
+
+    def observe_results(self, results: Iterable[Dict[str, Any]], frame_size: Tuple[int, int]) -> None:
+        """
+        Record template detection results.
+
+        Args:
+            results: Result dictionaries (or a DetectionBatch) in frame coordinates
+            frame_size: Frame size as (width, height)
+        """
+        boxes: Dict[str, List[Region]] = {}
+        for result in results:
+            name = result.get('template_name')
+            if name is not None:
+                boxes.setdefault(name, []).append(
+                    (result['x'], result['y'], result['width'], result['height'])
+                )
+        for name, template_boxes in boxes.items():
+            self.observe(name, template_boxes, frame_size)
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """
+        Forget learned locations.
+
+        Args:
+            name: Template to forget (None for all)
+        """
+        with self._lock:
+            if name is None:
+                self._grids.clear()
+                self._regions.clear()
+            else:
+                self._grids.pop(name, None)
+                self._regions = {k: v for k, v in self._regions.items() if k[0] != name}
+            self._dirty = True
+
+    def load(self) -> bool:
+        """
+        Load priors from the JSON file.
+
+        Returns:
+            True if priors were loaded
+        """
+        if self.path is None or not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION or data.get('cell_size') != self.cell_size:
+                logger.info(f"Ignoring spatial priors with incompatible format: {self.path}")
+                return False
+
+            grids: Dict[str, Dict[Tuple[int, int], List[Any]]] = {}
+            for name, sizes in data.get('templates', {}).items():
+                for size_key, entry in sizes.items():
+                    width, height = (int(v) for v in size_key.split('x'))
+                    counts = np.zeros((-(-height // self.cell_size), -(-width // self.cell_size)), dtype=np.uint32)
+                    for row, col, count in entry.get('cells', []):
+                        if row < counts.shape[0] and col < counts.shape[1]:
+                            counts[row, col] = count
+                    grids.setdefault(name, {})[(width, height)] = [counts, int(entry.get('observations', 0))]
+
+            with self._lock:
+                self._grids = grids
+                self._regions.clear()
+                self._dirty = False
+            logger.info(f"Loaded spatial priors for {len(grids)} templates from {self.path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading spatial priors from {self.path}: {e}")
+            return False
+
+    def save(self) -> bool:
+        """
+        Save priors to the JSON file.
+
+        Returns:
+            True if priors were saved
+        """
+        if self.path is None:
+            return False
+
+        with self._lock:
+            templates = {}
+            for name, sizes in self._grids.items():
+                templates[name] = {
+                    f"{width}x{height}": {
+                        'observations': observations,
+                        'cells': [[int(r), int(c), int(counts[r, c])] for r, c in zip(*np.nonzero(counts))]
+                    }
+                    for (width, height), (counts, observations) in sizes.items()
+                }
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        data = {'version': self.VERSION, 'cell_size': self.cell_size, 'templates': templates}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            tmp_path.replace(self.path)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving spatial priors to {self.path}: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get spatial prior statistics.
+
+        Returns:
+            Dictionary with learned template count and search counts
+        """
+        with self._lock:
+            learned = sum(
+                1 for sizes in self._grids.values()
+                if any(observations >= self.min_observations for _, observations in sizes.values())
+            )
+        return {
+            'templates': len(self._grids),
+            'learned_templates': learned,
+            'sweeps': self.sweeps,
+            'restricted_searches': self.restricted_searches,
+            'full_searches': self.full_searches
+        }
+
+    def _compute_regions(self, name: str, frame_size: Tuple[int, int]) -> Optional[List[Region]]:
+        """Compute search regions from a template's grid (lock held)."""
+        entry = self._grids.get(name, {}).get(frame_size)
+        if entry is None or entry[1] < self.min_observations:
+            return None
+
+        counts = entry[0]
+        mask = (counts > 0).astype(np.uint8)
+        grow = -(-self.margin // self.cell_size)
+        if grow > 0:
+            mask = cv2.dilate(mask, np.ones((2 * grow + 1, 2 * grow + 1), np.uint8))
+
+        width, height = frame_size
+        if mask.sum() * self.cell_size * self.cell_size > self.max_coverage * width * height:
+            return None
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        boxes = [(int(left), int(top), int(left + cols), int(top + rows))
+                 for left, top, cols, rows, _ in stats[1:count]]
+
+        # Bounding boxes of separate components can still overlap; merge those
+        # so no area is searched twice
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(boxes)):
+                for j in range(i + 1, len(boxes)):
+                    a, b = boxes[i], boxes[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        boxes[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                        del boxes[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+
+        regions = []
+        for x1, y1, x2, y2 in boxes:
+            x, y = x1 * self.cell_size, y1 * self.cell_size
+            regions.append((x, y, min(x2 * self.cell_size, width) - x, min(y2 * self.cell_size, height) - y))
+        return regions
+
+    def _maybe_save(self) -> None:
+        """Save if there are unsaved observations and the save interval has passed."""
+        if self.path is not None and self._dirty and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
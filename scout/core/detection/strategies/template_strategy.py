@@ -5,7 +5,7 @@ This module provides a concrete implementation of the DetectionStrategy
 for template matching based detection.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import cv2
 import logging
@@ -13,6 +13,12 @@ import os
 from pathlib import Path
 
 from ..strategy import DetectionStrategy
+from ..detection_batch import DetectionBatch
+from ..spatial_priors import SpatialPriors
+from ..fft_correlation import FFTCorrelationEngine
+from ..prefilter import PrefilterCascade, SUPPORTED_METHODS as PREFILTER_METHODS, mask_windows, correlate_windows
+from ..template_clusters import TemplateClusterIndex, representative_threshold
+from scout.core.utils.caching import cache_manager
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +51,23 @@ class TemplateMatchingStrategy(DetectionStrategy):
         self.template_sizes: Dict[str, tuple] = {}
         self.match_method = cv2.TM_CCOEFF_NORMED
         
+        # Where each template was found before; stored next to the templates
+        self.spatial_priors = SpatialPriors(self.templates_dir / SpatialPriors.FILENAME)
+        
+        # Normalized correlation by FFT, sharing the frame transform across templates
+        self.fft_engine = FFTCorrelationEngine()
+        self.use_fft = True
+        
+        # Optional cheap rejection tests before full correlation (None to disable)
+        self.prefilter: Optional[PrefilterCascade] = None
+        
+        # Near-duplicate templates searched through a representative; see cluster_templates()
+        self.template_clusters = TemplateClusterIndex(self.templates_dir / TemplateClusterIndex.FILENAME)
+        self.use_clusters = True
+        
+        # Correlation peaks per frame, reused across thresholds and result limits
+        self.response_cache = cache_manager.response_cache
+        
         # Load templates
         self._load_templates()
         
@@ -70,7 +93,8 @@ class TemplateMatchingStrategy(DetectionStrategy):
     
     def detect(self, image: np.ndarray, template_names: Optional[List[str]] = None,
                  confidence_threshold: float = 0.7, match_method: Optional[int] = None,
-                 max_results: int = 10, group_threshold: int = 10) -> List[Dict[str, Any]]:
+                 max_results: int = 10, group_threshold: int = 10,
+                 frame_key: Optional[tuple] = None) -> DetectionBatch:
         """
         Perform template matching on an image.
         
@@ -81,9 +105,13 @@ class TemplateMatchingStrategy(DetectionStrategy):
             match_method: OpenCV match method (None for default)
             max_results: Maximum number of matches per template
             group_threshold: Pixel distance for grouping matches
+            frame_key: Identity of the image within a captured frame, starting
+                with the frame source ID and frame ID; correlation peaks are
+                cached under it (None to not cache)
             
         Returns:
-            List of match dictionaries, each containing:
+            DetectionBatch with the matches of all templates. It behaves as a
+            sequence of match dictionaries, each containing:
             - 'type': 'template'
             - 'template_name': Name of matched template
             - 'x', 'y': Position coordinates
@@ -115,13 +143,29 @@ class TemplateMatchingStrategy(DetectionStrategy):
             
         if not selected_templates:
             logger.warning("No valid templates available for matching")
-            return []
+            return DetectionBatch.empty()
             
         logger.info(f"Matching {len(selected_templates)} templates with confidence threshold {confidence_threshold}")
         logger.debug(f"Using templates: {sorted(list(selected_templates.keys()))}")
         logger.debug(f"Image dimensions: {image.shape}")
         
-        results = []
+        batches = []
+        # Frame spectrum and prefilter data, computed on first use and shared by all templates
+        shared: Dict[str, Any] = {}
+        
+        # Peaks already computed for this frame, by an earlier query with any threshold or limit
+        peaks: Dict[str, tuple] = {}
+        if frame_key is not None and self.response_cache is not None:
+            for name in selected_templates:
+                found = self.response_cache.get(frame_key, self._cache_name(name), match_method, confidence_threshold)
+                if found is not None:
+                    peaks[name] = found
+        
+        # Near-duplicates only get correlated where their representative scored high enough
+        precomputed: Dict[str, tuple] = {}
+        if self.use_clusters and match_method == cv2.TM_CCOEFF_NORMED:
+            pending = {name: t for name, t in selected_templates.items() if name not in peaks}
+            precomputed = self._match_clusters(image, pending, confidence_threshold, shared)
         
         # Process each template
         for name, template in selected_templates.items():
@@ -136,89 +180,192 @@ class TemplateMatchingStrategy(DetectionStrategy):
             # Perform template matching
             try:
                 logger.debug(f"Running template matching for '{name}' with method {match_method}")
-                result = cv2.matchTemplate(image, template, match_method)
-                
-                # Find locations above threshold
-                locations = np.where(result >= confidence_threshold)
-                match_count = len(locations[0]) if locations[0].size > 0 else 0
-                
-                logger.debug(f"Found {match_count} potential matches for template '{name}' above threshold {confidence_threshold}")
-                
-                # Convert to list of matches
-                matches = []
-                for y, x in zip(*locations):
-                    matches.append((int(x), int(y), float(result[y, x])))
+                if name in peaks:
+                    xs, ys, scores = peaks[name]
+                else:
+                    result, complete = precomputed.get(name) or self._match_map(
+                        image, name, template, match_method, confidence_threshold, shared
+                    )
+                    if frame_key is not None and self.response_cache is not None:
+                        self.response_cache.put(frame_key, self._cache_name(name), match_method,
+                                                result, confidence_threshold, complete)
                     
-                # Sort by confidence (highest first)
-                matches.sort(key=lambda m: m[2], reverse=True)
+                    # Find locations above threshold
+                    ys, xs = np.nonzero(result >= confidence_threshold)
+                    scores = result[ys, xs]
+                logger.debug(f"Found {len(xs)} potential matches for template '{name}' above threshold {confidence_threshold}")
+                
+                width, height = self.template_sizes.get(name, (0, 0))
+                matches = DetectionBatch.from_match_locations(
+                    name, xs, ys, width, height, scores
+                )
                 
-                # Limit to max matches
+                # Keep the most confident matches (sorted, highest first)
                 if len(matches) > max_results:
                     logger.debug(f"Limiting {len(matches)} matches to {max_results} for template '{name}'")
-                    matches = matches[:max_results]
+                matches = matches.top_k(max_results)
                 
                 # Group similar matches (non-maxima suppression)
                 if group_threshold > 0 and len(matches) > 1:
                     before_count = len(matches)
-                    grouped_matches = []
-                    while matches:
-                        # Take the best match
-                        best_match = matches.pop(0)
-                        best_x, best_y, best_conf = best_match
-                        
-                        # Compare with remaining matches
-                        i = 0
-                        while i < len(matches):
-                            x, y, _ = matches[i]
-                            # If too close to best match, remove
-                            if (abs(x - best_x) <= group_threshold and 
-                                abs(y - best_y) <= group_threshold):
-                                matches.pop(i)
-                            else:
-                                i += 1
-                                
-                        grouped_matches.append(best_match)
-                        
-                    matches = grouped_matches
+                    matches = matches.suppress_duplicates(group_threshold, metric='chebyshev')
                     logger.debug(f"Grouped matches from {before_count} to {len(matches)} for template '{name}'")
                 
-                # Convert to result format
-                width, height = self.template_sizes.get(name, (0, 0))
-                for x, y, conf in matches:
-                    results.append({
-                        'type': 'template',
-                        'template_name': name,
-                        'x': x,
-                        'y': y,
-                        'width': width,
-                        'height': height,
-                        'confidence': conf
-                    })
+                batches.append(matches)
                 
             except Exception as e:
                 logger.error(f"Error matching template '{name}': {e}", exc_info=True)
                 
+        results = DetectionBatch.concatenate(batches)
         logger.info(f"Found total of {len(results)} template matches across all templates")
         
         # Log top matches for debugging
-        if results:
-            # Sort by confidence score
-            sorted_results = sorted(results, key=lambda r: r.get('confidence', 0), reverse=True)
-            top_matches = sorted_results[:min(5, len(sorted_results))]
-            
+        if results and logger.isEnabledFor(logging.DEBUG):
             logger.debug("Top matches:")
-            for i, match in enumerate(top_matches):
+            for i, match in enumerate(results.top_k(5)):
                 logger.debug(f"  {i+1}. Template: {match.get('template_name')}, "
                             f"Confidence: {match.get('confidence'):.3f}, "
                             f"Position: ({match.get('x')}, {match.get('y')})")
         
         return results
     
+    def cluster_templates(self, similarity: float = 0.9) -> List[Dict[str, Any]]:
+        """
+        Cluster near-duplicate templates and save the clusters next to the templates.
+        
+        Args:
+            similarity: Minimum normalized correlation of a member with its representative
+            
+        Returns:
+            List of clusters, each with 'representative' and 'members' (name -> similarity)
+        """
+        clusters = self.template_clusters.cluster(self.templates, similarity)
+        return [{'representative': c.representative, 'members': dict(c.similarities)} for c in clusters]
+    
+    def calibrate_fft(self, frame_shape: tuple) -> int:
+        """
+        Measure when FFT matching beats direct matching for frames of a given shape.
+        
+        Args:
+            frame_shape: Shape of the images that will be searched, e.g. (720, 1280, 3)
+            
+        Returns:
+            Template area from which FFT matching is used
+        """
+        return self.fft_engine.calibrate(frame_shape)
+    
+    def _match_map(self, image: np.ndarray, name: str, template: np.ndarray, match_method: int,
+                   confidence_threshold: float, shared: Dict[str, Any],
+                   use_prefilter: bool = True) -> Tuple[np.ndarray, bool]:
+        """
+        Compute a template's score map with the cheapest applicable backend.
+        
+        Args:
+            image: Image to search
+            name: Template name
+            template: Template image
+            match_method: OpenCV match method
+            confidence_threshold: Minimum confidence level (for the prefilter)
+            shared: Per-frame data shared between templates of one detect() call
+            use_prefilter: Whether the prefilter cascade may skip positions
+            
+        Returns:
+            Tuple of (score map of cv2.matchTemplate's shape, whether every
+            position holds its true score rather than only those that can
+            reach the threshold)
+        """
+        if use_prefilter and self.prefilter is not None and match_method in PREFILTER_METHODS:
+            if 'prefilter' not in shared:
+                shared['prefilter'] = self.prefilter.prepare(image)
+            result = self.prefilter.match(shared['prefilter'], template, name, confidence_threshold, match_method)
+            if result is not None:
+                return result, False
+        
+        if self._use_fft_for(image, template, match_method):
+            if 'spectrum' not in shared:
+                shared['spectrum'] = self.fft_engine.prepare(image)
+            return self.fft_engine.match_fft(shared['spectrum'], template, key=name), True
+        return cv2.matchTemplate(image, template, match_method), True
+    
+    def _match_clusters(self, image: np.ndarray, selected_templates: Dict[str, np.ndarray],
+                        confidence_threshold: float, shared: Dict[str, Any]) -> Dict[str, Tuple[np.ndarray, bool]]:
+        """
+        Compute score maps of clustered templates through their representatives.
+        
+        Args:
+            image: Image to search
+            selected_templates: Templates requested by detect()
+            confidence_threshold: Minimum confidence level
+            shared: Per-frame data shared between templates of one detect() call
+            
+        Returns:
+            Score maps and whether they are complete, by template name
+            (templates not handled here are missing)
+        """
+        maps: Dict[str, Tuple[np.ndarray, bool]] = {}
+        searches, _ = self.template_clusters.plan(list(selected_templates))
+        for cluster, members in searches:
+            representative = self.templates.get(cluster.representative)
+            if (representative is None or image.shape[0] < representative.shape[0] or
+                    image.shape[1] < representative.shape[1]):
+                continue
+            
+            try:
+                # The bound only holds for the exact map, so no prefiltering here
+                rep_map, _ = self._match_map(image, cluster.representative, representative, cv2.TM_CCOEFF_NORMED,
+                                             confidence_threshold, shared, use_prefilter=False)
+                for name in members:
+                    if name == cluster.representative:
+                        maps[name] = (rep_map, True)
+                        continue
+                    bound = representative_threshold(cluster.similarity(name), confidence_threshold)
+                    windows = mask_windows(rep_map >= bound)
+                    area = sum(w * h for _, _, w, h in windows)
+                    if area > 0.5 * rep_map.size:
+                        continue  # Not worth it; searched like an unclustered template
+                    maps[name] = (correlate_windows(image, selected_templates[name], windows, cv2.TM_CCOEFF_NORMED),
+                                  False)
+                logger.debug(f"Searched {len(members)} templates through representative '{cluster.representative}'")
+            except Exception as e:
+                logger.error(f"Error matching template cluster '{cluster.representative}': {e}", exc_info=True)
+        return maps
+    
+    def _cache_name(self, name: str) -> str:
+        """Response cache name of a template, unique across template directories."""
+        return str(self.templates_dir / name)
+    
+    def _use_fft_for(self, image: np.ndarray, template: np.ndarray, match_method: int) -> bool:
+        """
+        Check whether a template should be matched with the FFT engine.
+        
+        Args:
+            image: Image to search
+            template: Template to match
+            match_method: OpenCV match method
+            
+        Returns:
+            True for normalized correlation with templates above the crossover size
+        """
+        return (self.use_fft and
+                match_method == cv2.TM_CCOEFF_NORMED and
+                image.dtype == np.uint8 and
+                image.ndim == template.ndim and
+                image.shape[2:] == template.shape[2:] and
+                self.fft_engine.use_fft(template))
+    
     def _load_templates(self) -> None:
         """Load all template images from templates directory."""
         self.templates = {}
         self.template_sizes = {}
         
+        # Cached spectra and peaks belong to the previous template images;
+        # the response cache is shared, so only this directory's peaks are dropped
+        self.fft_engine.clear()
+        if self.response_cache is not None:
+            self.response_cache.remove_templates(os.path.join(str(self.templates_dir), ''))
+        if self.prefilter is not None:
+            self.prefilter.clear()
+        
         try:
             logger.info(f"Loading templates from directory: {self.templates_dir}")
             
@@ -291,6 +438,9 @@ class TemplateMatchingStrategy(DetectionStrategy):
                 except Exception as e:
                     logger.error(f"Error loading template {template_file}: {e}", exc_info=True)
             
+            # Clusters are only valid for the exact template images they were built from
+            self.template_clusters.load(self.templates)
+            
             # Log summary
             logger.info(f"Successfully loaded {successful_loads} of {len(template_files)} templates")
             logger.info(f"Available templates: {sorted(list(self.templates.keys()))}")
@@ -36,7 +36,8 @@ class DetectionStrategy(ABC):
             params: Detection parameters specific to the strategy
             
         Returns:
-            List of detection results as dictionaries
+            List of detection results as dictionaries, or a DetectionBatch
+            (which behaves as a read-only sequence of such dictionaries)
             Each result should contain at minimum:
             - 'type': Type of detected element
             - 'x', 'y': Position coordinates
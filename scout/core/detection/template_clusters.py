@@ -0,0 +1,344 @@
+"""
+Template Clusters
+
+This module groups near-identical templates, such as the same resource icon
+at several levels, under a representative template. Only the representative
+is correlated with the whole frame; the other members are correlated only at
+the positions where the representative scored high enough that the member
+could reach the confidence threshold there.
+
+For cv2.TM_CCOEFF_NORMED the score is the cosine of the angle between the
+zero-mean template and window vectors, and angles obey the triangle
+inequality. If a member's similarity to the representative is s and it
+scores at least t at a position, the representative scores at least
+cos(acos(s) + acos(t)) there. Searching members only where that bound holds
+therefore finds every match a full search would.
+
+Clustering is an offline analysis: cluster() compares templates of equal
+size pairwise and stores the result as JSON next to the templates, keyed by
+a fingerprint of every template's pixels so edited templates are not matched
+against stale clusters.
+"""
+
+import json
+import math
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TemplateCluster:
+    """A representative template and the near-duplicates searched through it."""
+    representative: str
+    similarities: Tuple[Tuple[str, float], ...]  # (member, similarity to representative), excluding it
+
+    @property
+    def members(self) -> Tuple[str, ...]:
+        """All templates of the cluster, representative first."""
+        return (self.representative,) + tuple(name for name, _ in self.similarities)
+
+    def similarity(self, name: str) -> float:
+        """
+        Get a member's similarity to the representative.
+
+        Args:
+            name: Member name
+
+        Returns:
+            Normalized correlation of the member with the representative
+        """
+        if name == self.representative:
+            return 1.0
+        return dict(self.similarities)[name]
+
+
+def template_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Compute the normalized correlation of two equally sized templates.
+
+    Args:
+        a: First template
+        b: Second template
+
+    Returns:
+        TM_CCOEFF_NORMED score (-1 to 1)
+    """
+    score = float(cv2.matchTemplate(a, b, cv2.TM_CCOEFF_NORMED)[0, 0])
+    return score if math.isfinite(score) else 0.0
+
+
+def representative_threshold(similarity: float, threshold: float) -> float:
+    """
+    Lowest representative score at which a member can still reach a threshold.
+
+    Args:
+        similarity: Member's similarity to the representative
+        threshold: Confidence threshold of the member
+
+    Returns:
+        Score bound for the representative (-1 if any position qualifies)
+    """
+    angle = math.acos(max(min(similarity, 1.0), -1.0)) + math.acos(max(min(threshold, 1.0), -1.0))
+    if angle >= math.pi:
+        return -1.0
+    # Small margin against floating point differences between correlation backends
+    return math.cos(angle) - 1e-3
+
+
+def fingerprint(template: np.ndarray) -> str:
+    """
+    Fingerprint a template's pixels.
+
+    Args:
+        template: Template image
+
+    Returns:
+        Hex digest of the template's shape and pixels
+    """
+    digest = hashlib.sha1(str(template.shape).encode())
+    digest.update(np.ascontiguousarray(template).tobytes())
+    return digest.hexdigest()
+
+
+class TemplateClusterIndex:
+    """
+    Clusters of near-duplicate templates, persisted next to the templates.
+    """
+
+    FILENAME = "template_clusters.json"
+    VERSION = 1
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Initialize the cluster index.
+
+        Args:
+            path: JSON file the clusters are loaded from and saved to (None to keep them in memory)
+        """
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._clusters: List[TemplateCluster] = []
+        self._by_member: Dict[str, TemplateCluster] = {}
+
+        # Statistics
+        self.clustered_searches = 0
+        self.member_searches = 0
+
+    @property
+    def clusters(self) -> List[TemplateCluster]:
+        """Clusters with more than one member."""
+        return list(self._clusters)
+
+    def cluster_of(self, name: str) -> Optional[TemplateCluster]:
+        """
+        Get the cluster a template belongs to.
+
+        Args:
+            name: Template name
+
+        Returns:
+            The cluster, or None if the template is not clustered
+        """
+        return self._by_member.get(name)
+
+    def cluster(self, templates: Mapping[str, np.ndarray], similarity: float = 0.9) -> List[TemplateCluster]:
+        """
+        Cluster templates and save the result.
+
+        Templates of the same shape are compared pairwise. The template similar
+        to the most others becomes a representative, and every unassigned
+        template at least `similarity` similar to it joins its cluster; this
+        repeats until no clusters with two or more members remain.
+
+        Args:
+            templates: Template images by name
+            similarity: Minimum similarity of a member to its representative
+
+        Returns:
+            Clusters with more than one member
+        """
+        by_shape: Dict[Tuple[int, ...], List[str]] = {}
+        for name in sorted(templates):
+            by_shape.setdefault(templates[name].shape, []).append(name)
+
+        clusters = []
+        for names in by_shape.values():
+            if len(names) < 2:
+                continue
+            count = len(names)
+            scores = np.eye(count)
+            for i in range(count):
+                for j in range(i + 1, count):
+                    scores[i, j] = scores[j, i] = template_similarity(templates[names[i]], templates[names[j]])
+
+            unassigned = set(range(count))
+            while len(unassigned) > 1:
+                candidates = sorted(unassigned)
+                neighbours = {i: [j for j in candidates if j != i and scores[i, j] >= similarity] for i in candidates}
+                center = max(candidates, key=lambda i: (len(neighbours[i]), scores[i, candidates].sum()))
+                if not neighbours[center]:
+                    break
+                members = sorted(neighbours[center], key=lambda j: -scores[center, j])
+                clusters.append(TemplateCluster(
+                    representative=names[center],
+                    similarities=tuple((names[j], float(scores[center, j])) for j in members)
+                ))
+                unassigned -= {center, *members}
+
+        fingerprints = {name: fingerprint(templates[name]) for name in templates}
+        self._set_clusters(clusters)
+        self.save(fingerprints, similarity)
+        logger.info(f"Clustered {sum(len(c.members) for c in clusters)} of {len(templates)} templates "
+                    f"into {len(clusters)} clusters")
+        return clusters
+
+    def load(self, templates: Mapping[str, np.ndarray]) -> bool:
+        """
+        Load clusters saved for the given templates.
+
+        Clusters containing a template that changed or no longer exists are dropped.
+
+        Args:
+            templates: Currently loaded template images by name
+
+        Returns:
+            True if clusters were loaded
+        """
+        self._set_clusters([])
+        if self.path is None or not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                logger.info(f"Ignoring template clusters with incompatible format: {self.path}")
+                return False
+
+            saved = data.get('fingerprints', {})
+            current = {}
+            clusters = []
+            for entry in data.get('clusters', []):
+                cluster = TemplateCluster(
+                    representative=entry['representative'],
+                    similarities=tuple((name, float(score)) for name, score in entry['members'])
+                )
+                valid = True
+                for name in cluster.members:
+                    if name not in templates:
+                        valid = False
+                        break
+                    if name not in current:
+                        current[name] = fingerprint(templates[name])
+                    if saved.get(name) != current[name]:
+                        valid = False
+                        break
+                if valid:
+                    clusters.append(cluster)
+                else:
+                    logger.info(f"Dropping stale template cluster of '{cluster.representative}'")
+
+            self._set_clusters(clusters)
+            logger.info(f"Loaded {len(clusters)} template clusters from {self.path}")
+            return bool(clusters)
+
+        except Exception as e:
+            logger.error(f"Error loading template clusters from {self.path}: {e}")
+            return False
+
+    def save(self, fingerprints: Mapping[str, str], similarity: float) -> bool:
+        """
+        Save the clusters to the JSON file.
+
+        Args:
+            fingerprints: Fingerprints of the clustered templates by name
+            similarity: Similarity threshold the clusters were built with
+
+        Returns:
+            True if the clusters were saved
+        """
+        if self.path is None:
+            return False
+
+        data = {
+            'version': self.VERSION,
+            'similarity': similarity,
+            'fingerprints': dict(fingerprints),
+            'clusters': [
+                {'representative': c.representative, 'members': [list(m) for m in c.similarities]}
+                for c in self._clusters
+            ]
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            tmp_path.replace(self.path)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving template clusters to {self.path}: {e}")
+            return False
+
+    def plan(self, names: List[str]) -> Tuple[List[Tuple[TemplateCluster, List[str]]], List[str]]:
+        """
+        Split requested templates into cluster searches and independent ones.
+
+        A cluster is only searched through its representative if at least two
+        of its members are requested; otherwise nothing would be saved.
+
+        Args:
+            names: Requested template names
+
+        Returns:
+            Tuple of ([(cluster, requested members)], independent template names)
+        """
+        grouped: Dict[str, List[str]] = {}
+        independent = []
+        for name in names:
+            cluster = self._by_member.get(name)
+            if cluster is None:
+                independent.append(name)
+            else:
+                grouped.setdefault(cluster.representative, []).append(name)
+
+        searches = []
+        for representative, members in grouped.items():
+            if len(members) < 2:
+                independent.extend(members)
+            else:
+                searches.append((self._by_member[representative], members))
+                self.clustered_searches += 1
+                self.member_searches += len(members)
+        return searches, independent
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cluster statistics.
+
+        Returns:
+            Dictionary with cluster counts and how many searches went through clusters
+        """
+        return {
+            'clusters': len(self._clusters),
+            'clustered_templates': len(self._by_member),
+            'clustered_searches': self.clustered_searches,
+            'member_searches': self.member_searches
+        }
+
+    def _set_clusters(self, clusters: List[TemplateCluster]) -> None:
+        """Replace the clusters and the member lookup."""
+        by_member = {name: cluster for cluster in clusters for name in cluster.members}
+        with self._lock:
+            self._clusters = clusters
+            self._by_member = by_member
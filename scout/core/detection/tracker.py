@@ -0,0 +1,322 @@
+"""
+Object Tracker
+
+This module provides the IoUTracker class, which links detections across
+frames into tracks with stable IDs. Each update predicts where every track
+should be from its recent motion, associates the new detections with the
+predictions by intersection over union (computed for all pairs at once), and
+ages out tracks that have gone unmatched for too long. Code that needs to
+follow one object, such as automation steps, can keep its track ID instead of
+re-matching the object every frame.
+"""
+
+import logging
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# linear_sum_assignment is only needed for optimal association
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Detections and overlay matches: (label, x, y, width, height, confidence)
+Match = Tuple[str, int, int, int, int, float]
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Compute the intersection over union of every pair of boxes.
+
+    Args:
+        boxes_a: Array of shape (N, 4) with (x, y, width, height) rows
+        boxes_b: Array of shape (M, 4) with (x, y, width, height) rows
+
+    Returns:
+        Array of shape (N, M) with IoU values in [0, 1]
+    """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+    inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    intersection = inter_w * inter_h
+    union = (a[:, 2:3] * a[:, 3:4]) + (b[:, 2] * b[:, 3]) - intersection
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(union > 0, intersection / union, 0.0)
+
+
+@dataclass(frozen=True)
+class TrackedObject:
+    """An immutable view of a track after an update."""
+    track_id: int
+    label: str
+    x: float
+    y: float
+    width: float
+    height: float
+    confidence: float
+    velocity: Tuple[float, float]  # Pixels per update
+    hits: int  # Updates in which the track was matched
+    misses: int  # Consecutive updates without a match
+    age: int  # Updates since the track was created
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        """Center of the tracked box."""
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+    @property
+    def is_predicted(self) -> bool:
+        """Whether the position is a prediction because the last update missed it."""
+        return self.misses > 0
+
+    def as_match(self) -> Match:
+        """Convert to the overlay's match tuple format."""
+        return (self.label, int(round(self.x)), int(round(self.y)),
+                int(round(self.width)), int(round(self.height)), self.confidence)
+
+
+class _Track:
+    """Mutable tracker-internal state of one track."""
+
+    __slots__ = ('track_id', 'label', 'box', 'velocity', 'confidence', 'hits', 'misses', 'age')
+
+    def __init__(self, track_id: int, detection: Match) -> None:
+        self.track_id = track_id
+        self.label = detection[0]
+        self.box = np.array(detection[1:5], dtype=np.float64)
+        self.velocity = np.zeros(2)
+        self.confidence = float(detection[5])
+        self.hits = 1
+        self.misses = 0
+        self.age = 1
+
+    def predicted_box(self) -> np.ndarray:
+        """Box shifted by one update of motion."""
+        box = self.box.copy()
+        box[:2] += self.velocity
+        return box
+
+    def snapshot(self) -> TrackedObject:
+        """Create an immutable view of the track."""
+        x, y, width, height = (float(v) for v in self.box)
+        return TrackedObject(
+            track_id=self.track_id, label=self.label, x=x, y=y, width=width, height=height,
+            confidence=self.confidence, velocity=(float(self.velocity[0]), float(self.velocity[1])),
+            hits=self.hits, misses=self.misses, age=self.age
+        )
+
+
+class IoUTracker:
+    """
+    Multi-object tracker associating detections by IoU.
+
+    A track is reported once it has been matched min_hits times and keeps
+    being reported, at its predicted position, for up to max_misses updates
+    without a match. Tracks follow detections of any label unless
+    match_labels is set; the label and confidence of a track are those of
+    its latest detection.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, min_hits: int = 1, max_misses: int = 2,
+                 association: str = 'greedy', match_labels: bool = False,
+                 velocity_smoothing: float = 0.5, duplicate_iou: Optional[float] = 0.5) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            iou_threshold: Minimum IoU between a prediction and a detection to associate them
+            min_hits: Matches needed before a track is reported
+            max_misses: Consecutive unmatched updates before a track is dropped
+            association: 'greedy' (highest IoU first) or 'hungarian' (optimal,
+                needs scipy; falls back to greedy without it)
+            match_labels: Only associate detections with tracks of the same label
+            velocity_smoothing: Weight of the newest displacement in the velocity estimate
+            duplicate_iou: Detections overlapping a more confident one by more
+                than this IoU are dropped before association (None to keep all)
+        """
+        if association not in ('greedy', 'hungarian'):
+            raise ValueError(f"Unknown association method: {association}")
+        if association == 'hungarian' and not SCIPY_AVAILABLE:
+            logger.warning("scipy is not available, using greedy track association")
+            association = 'greedy'
+
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_misses = max_misses
+        self.association = association
+        self.match_labels = match_labels
+        self.velocity_smoothing = velocity_smoothing
+        self.duplicate_iou = duplicate_iou
+
+        self._tracks: List[_Track] = []
+        self._ids = itertools.count(1)
+        self._objects: Tuple[TrackedObject, ...] = ()
+
+        # Statistics
+        self.updates = 0
+        self.tracks_created = 0
+        self.tracks_dropped = 0
+
+    @property
+    def objects(self) -> Tuple[TrackedObject, ...]:
+        """Objects reported by the latest update."""
+        return self._objects
+
+    def get(self, track_id: int) -> Optional[TrackedObject]:
+        """
+        Get a reported object by track ID.
+
+        Args:
+            track_id: ID of the track
+
+        Returns:
+            The object, or None if the track is not reported anymore
+        """
+        for obj in self._objects:
+            if obj.track_id == track_id:
+                return obj
+        return None
+
+    def reset(self) -> None:
+        """Drop all tracks. Track IDs are not reused."""
+        self._tracks = []
+        self._objects = ()
+
+    def update(self, detections: Sequence[Match]) -> Tuple[TrackedObject, ...]:
+        """
+        Advance the tracker by one frame.
+
+        Args:
+            detections: Detections of the frame as (label, x, y, width, height, confidence)
+
+        Returns:
+            Reported objects, ordered by track ID
+        """
+        self.updates += 1
+        detections = self._suppress_duplicates(list(detections))
+
+        predicted = np.array([track.predicted_box() for track in self._tracks]).reshape(-1, 4)
+        det_boxes = np.array([d[1:5] for d in detections], dtype=np.float64).reshape(-1, 4)
+        pairs = self._associate(predicted, det_boxes, detections)
+
+        matched_tracks = set()
+        matched_detections = set()
+        for t, d in pairs:
+            self._apply_match(self._tracks[t], detections[d])
+            matched_tracks.add(t)
+            matched_detections.add(d)
+
+        survivors = []
+        for t, track in enumerate(self._tracks):
+            if t not in matched_tracks:
+                track.misses += 1
+                track.age += 1
+                if track.misses > self.max_misses:
+                    self.tracks_dropped += 1
+                    continue
+                # Coast along the predicted path
+                track.box = track.predicted_box()
+            survivors.append(track)
+
+        for d, detection in enumerate(detections):
+            if d not in matched_detections:
+                survivors.append(_Track(next(self._ids), detection))
+                self.tracks_created += 1
+
+        self._tracks = survivors
+        self._objects = tuple(
+            track.snapshot() for track in sorted(survivors, key=lambda track: track.track_id)
+            if track.hits >= self.min_hits
+        )
+        return self._objects
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get tracker statistics.
+
+        Returns:
+            Dictionary with track counts
+        """
+        return {
+            'updates': self.updates,
+            'active_tracks': len(self._tracks),
+            'reported_tracks': len(self._objects),
+            'tracks_created': self.tracks_created,
+            'tracks_dropped': self.tracks_dropped,
+            'association': self.association
+        }
+
+    def _apply_match(self, track: _Track, detection: Match) -> None:
+        """Update a track with its associated detection."""
+        box = np.array(detection[1:5], dtype=np.float64)
+        # A missed track has coasted to its prediction, so this is still one update of motion
+        displacement = box[:2] - track.box[:2]
+        track.velocity += self.velocity_smoothing * (displacement - track.velocity)
+        track.box = box
+        track.label = detection[0]
+        track.confidence = float(detection[5])
+        track.hits += 1
+        track.misses = 0
+        track.age += 1
+
+    def _associate(self, predicted: np.ndarray, det_boxes: np.ndarray,
+                   detections: Sequence[Match]) -> List[Tuple[int, int]]:
+        """Pair track indices with detection indices."""
+        if len(predicted) == 0 or len(det_boxes) == 0:
+            return []
+
+        iou = iou_matrix(predicted, det_boxes)
+        if self.match_labels:
+            track_labels = np.array([track.label for track in self._tracks], dtype=object)
+            det_labels = np.array([d[0] for d in detections], dtype=object)
+            iou[track_labels[:, None] != det_labels[None, :]] = 0.0
+
+        if self.association == 'hungarian':
+            rows, cols = linear_sum_assignment(-iou)
+            return [(int(t), int(d)) for t, d in zip(rows, cols) if iou[t, d] >= self.iou_threshold]
+
+        # Greedy: take candidate pairs from highest IoU down
+        tracks, dets = np.nonzero(iou >= self.iou_threshold)
+        order = np.argsort(-iou[tracks, dets], kind='stable')
+        pairs = []
+        used_tracks = set()
+        used_dets = set()
+        for i in order:
+            t, d = int(tracks[i]), int(dets[i])
+            if t in used_tracks or d in used_dets:
+                continue
+            pairs.append((t, d))
+            used_tracks.add(t)
+            used_dets.add(d)
+        return pairs
+
+    def _suppress_duplicates(self, detections: List[Match]) -> List[Match]:
+        """Drop detections that overlap a more confident detection."""
+        if self.duplicate_iou is None or len(detections) < 2:
+            return detections
+
+        order = sorted(range(len(detections)), key=lambda i: detections[i][5], reverse=True)
+        ranked = [detections[i] for i in order]
+        iou = iou_matrix(np.array([d[1:5] for d in ranked]), np.array([d[1:5] for d in ranked]))
+
+        keep = np.ones(len(ranked), dtype=bool)
+        for i in range(len(ranked)):
+            if keep[i]:
+                overlapping = iou[i, i + 1:] > self.duplicate_iou
+                keep[i + 1:][overlapping] = False
+        return [d for d, k in zip(ranked, keep) if k]
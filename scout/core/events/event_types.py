@@ -27,6 +27,7 @@ class EventType(Enum):
     # Detection events
     DETECTION_COMPLETED = auto()
     DETECTION_FAILED = auto()
+    DETECTION_PIPELINE_COMPLETED = auto()
     
     # Game state events
     GAME_STATE_CHANGED = auto()
@@ -358,4 +358,144 @@ class ActionsServiceInterface(Protocol):
         Args:
             text: Text to type
         """
-        ... 
\ No newline at end of file
+        ... 
+
+class AsyncWindowServiceInterface(Protocol):
+    """
+    Asyncio counterpart of the window management service.
+    
+    Blocking window calls and captures run in an executor, so coroutines can
+    await them without blocking the event loop.
+    """
+    
+    async def find_window(self) -> bool:
+        """
+        Find the game window by its title.
+        
+        Returns:
+            bool: True if window found, False otherwise
+        """
+        ...
+        
+    async def get_window_position(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get the position and size of the game window.
+        
+        Returns:
+            Optional[Tuple[int, int, int, int]]: Tuple of (x, y, width, height) or None if window not found
+        """
+        ...
+        
+    async def capture_screenshot(self) -> Optional[np.ndarray]:
+        """
+        Capture a screenshot of the game window.
+        
+        Returns:
+            Optional[np.ndarray]: Screenshot as numpy array in BGR format, or None if failed
+        """
+        ...
+        
+    async def wait_for_window(self, timeout: Optional[float] = None, interval: float = 0.5) -> bool:
+        """
+        Wait until the game window is found.
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+            interval: Time between searches in seconds
+            
+        Returns:
+            bool: True if the window was found before the timeout
+        """
+        ...
+
+
+class AsyncDetectionServiceInterface(Protocol):
+    """
+    Asyncio counterpart of the detection service.
+    
+    Detections run in an executor; waiting for frames and for elements to
+    appear costs a coroutine rather than a thread.
+    """
+    
+    async def detect_template(self, template_name: str, **params) -> List[Dict[str, Any]]:
+        """
+        Detect a template in the current frame.
+        
+        Args:
+            template_name: Name of the template to detect
+            **params: Detection parameters (confidence_threshold, region, ...)
+            
+        Returns:
+            List of matches
+        """
+        ...
+        
+    async def detect_text(self, **params) -> List[Dict[str, Any]]:
+        """
+        Detect text in the current frame.
+        
+        Args:
+            **params: Detection parameters (pattern, region, ...)
+            
+        Returns:
+            List of text results
+        """
+        ...
+        
+    async def next_frame(self, frame_id: int = 0, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for a frame newer than the given frame ID.
+        
+        Args:
+            frame_id: ID of the last frame the caller has seen
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+            
+        Returns:
+            The frame, or None on timeout
+        """
+        ...
+        
+    async def wait_for(self, detect: Any, predicate: Any = bool, timeout: Optional[float] = None) -> Any:
+        """
+        Run a detection on each new frame until its results satisfy a predicate.
+        
+        Args:
+            detect: Detection callable run on the latest frame
+            predicate: Function deciding whether the results are the awaited ones
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+            
+        Returns:
+            The accepted results, or None on timeout
+        """
+        ...
+
+
+class AsyncAutomationServiceInterface(Protocol):
+    """
+    Asyncio counterpart of the automation service.
+    """
+    
+    async def execute_task(self, task: Any) -> bool:
+        """
+        Execute a task and wait for it to finish.
+        
+        Args:
+            task: Task to execute
+            
+        Returns:
+            bool: True if the task succeeded
+        """
+        ...
+        
+    async def wait_for_task(self, task_name: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a queued task to complete or fail.
+        
+        Args:
+            task_name: Name of the task
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+            
+        Returns:
+            bool: True if the task completed, False if it failed or timed out
+        """
+        ...
@@ -0,0 +1,369 @@
+"""
+Asyncio Services
+
+This module provides asyncio counterparts of the core services (see the
+Async*ServiceInterface protocols). They wrap the synchronous services:
+blocking work such as capture, OpenCV matching and OCR runs in dedicated
+executors, while waiting (for the window, a frame, an element or a task) is
+done by coroutines. A thousand pending waits therefore cost a thousand
+coroutines and at most one capture per frame, instead of a thousand threads
+each sleeping in its own polling loop.
+
+Use them from any running asyncio loop, or from Qt through QtAsyncBridge
+(scout.core.services.qt_async).
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from scout.core.automation.task import TaskStatus
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ServiceExecutors:
+    """
+    Named thread pools for the blocking work behind the async services.
+
+    Capture is serialized in its own pool so it never queues behind long
+    detections; detection gets one thread per core (OpenCV releases the GIL).
+    """
+
+    DEFAULT_SIZES = {
+        'capture': 1,
+        'detection': os.cpu_count() or 4,
+        'automation': 1
+    }
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None) -> None:
+        """
+        Initialize the executors.
+
+        Args:
+            sizes: Worker counts by executor name, overriding DEFAULT_SIZES
+        """
+        self.sizes = dict(self.DEFAULT_SIZES, **(sizes or {}))
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+
+    def get(self, name: str) -> ThreadPoolExecutor:
+        """
+        Get an executor, creating it on first use.
+
+        Args:
+            name: Executor name
+
+        Returns:
+            Thread pool
+        """
+        executor = self._executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(self.sizes.get(name, 1), thread_name_prefix=f'async-{name}')
+            self._executors[name] = executor
+        return executor
+
+    async def run(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking function in an executor and await its result.
+
+        Args:
+            name: Executor name
+            func: Function to run
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get(name), functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shut down all executors.
+
+        Args:
+            wait: Whether to wait for running work to finish
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+        self._executors.clear()
+
+
+class AsyncWindowService:
+    """
+    Asyncio adapter for the window service.
+    """
+
+    def __init__(self, window_service: Any, executors: Optional[ServiceExecutors] = None) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            window_service: Synchronous window service
+            executors: Executors to run blocking calls in (None for private ones)
+        """
+        self.window_service = window_service
+        self.executors = executors or ServiceExecutors()
+
+    async def find_window(self) -> bool:
+        """Find the game window."""
+        return await self.executors.run('capture', self.window_service.find_window)
+
+    async def get_window_position(self) -> Optional[Tuple[int, int, int, int]]:
+        """Get the position and size of the game window."""
+        return await self.executors.run('capture', self.window_service.get_window_position)
+
+    async def capture_screenshot(self) -> Optional[np.ndarray]:
+        """Capture a screenshot of the game window."""
+        return await self.executors.run('capture', self.window_service.capture_screenshot)
+
+    def client_to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """Convert client coordinates to screen coordinates (does not block)."""
+        return self.window_service.client_to_screen(x, y)
+
+    def screen_to_client(self, screen_x: int, screen_y: int) -> Tuple[int, int]:
+        """Convert screen coordinates to client coordinates (does not block)."""
+        return self.window_service.screen_to_client(screen_x, screen_y)
+
+    async def wait_for_window(self, timeout: Optional[float] = None, interval: float = 0.5) -> bool:
+        """
+        Wait until the game window is found.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+            interval: Time between searches in seconds
+
+        Returns:
+            True if the window was found before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if await self.find_window():
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                await asyncio.sleep(min(interval, remaining))
+            else:
+                await asyncio.sleep(interval)
+
+
+class AsyncDetectionService:
+    """
+    Asyncio adapter for the detection service.
+
+    Frame waits are shared: however many coroutines await the next frame,
+    one capture runs per frame.
+    """
+
+    CAPTURE_TIMEOUT = 1.0  # Longest a capture thread waits for a frame in seconds
+
+    def __init__(self, detection_service: Any, executors: Optional[ServiceExecutors] = None) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            detection_service: Synchronous detection service
+            executors: Executors to run blocking calls in (None for private ones)
+        """
+        self.detection_service = detection_service
+        self.executors = executors or ServiceExecutors()
+        self._capture: Optional[asyncio.Future] = None
+        self._capture_deadline = 0.0
+
+    async def detect_template(self, template_name: str, **params) -> Any:
+        """Detect a template in the current frame (see DetectionService.detect_template)."""
+        return await self.executors.run('detection', self.detection_service.detect_template, template_name, **params)
+
+    async def detect_all_templates(self, **params) -> Any:
+        """Detect several templates in the current frame (see DetectionService.detect_all_templates)."""
+        return await self.executors.run('detection', self.detection_service.detect_all_templates, **params)
+
+    async def detect_text(self, **params) -> Any:
+        """Detect text in the current frame (see DetectionService.detect_text)."""
+        return await self.executors.run('detection', self.detection_service.detect_text, **params)
+
+    async def detect_objects(self, **params) -> Any:
+        """Detect objects in the current frame (see DetectionService.detect_objects)."""
+        return await self.executors.run('detection', self.detection_service.detect_objects, **params)
+
+    async def run_pipeline(self, frame: Optional[Any] = None) -> Any:
+        """Run the detection pipeline (see DetectionService.run_pipeline)."""
+        return await self.executors.run('detection', self.detection_service.run_pipeline, frame)
+
+    async def next_frame(self, frame_id: int = 0, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for a frame newer than the given frame ID.
+
+        Args:
+            frame_id: ID of the last frame the caller has seen
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+
+        Returns:
+            The frame, or None on timeout or capture failure
+        """
+        frame_source = self.detection_service.frame_source
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame = frame_source.latest_frame
+            if frame is not None and frame.frame_id > frame_id:
+                return frame
+
+            # Every waiter attaches to the same capture of the next frame. Its
+            # wait is bounded so the capture thread is not held by waiters that
+            # have timed out or been cancelled
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            capture = self._capture
+            if capture is None or capture.done() or capture.get_loop() is not asyncio.get_running_loop():
+                capture_timeout = self.CAPTURE_TIMEOUT if remaining is None else min(remaining, self.CAPTURE_TIMEOUT)
+                self._capture_deadline = time.monotonic() + capture_timeout
+                self._capture = asyncio.ensure_future(self.executors.run(
+                    'capture', frame_source.get_newer_than, frame_source.latest_id, capture_timeout
+                ))
+            capture, capture_deadline = self._capture, self._capture_deadline
+            try:
+                frame = await asyncio.wait_for(asyncio.shield(capture), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if frame is None:
+                # A capture that ran out of time is retried until our own deadline
+                now = time.monotonic()
+                if now < capture_deadline or (deadline is not None and now >= deadline):
+                    return None
+
+    async def wait_for(self, detect: Callable[[], Any], predicate: Callable[[Any], bool] = bool,
+                       timeout: Optional[float] = None) -> Any:
+        """
+        Run a detection on each new frame until its results satisfy a predicate.
+
+        Args:
+            detect: Detection callable run on each awaited frame (see
+                DetectionService.use_frame), e.g. lambda: service.detect_template('ok')
+            predicate: Function deciding whether the results are the awaited ones
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+
+        Returns:
+            The accepted results, or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        # A frame older than the cache timeout counts as seen, so the first
+        # detection waits for a fresh one
+        latest = self.detection_service.frame_source.latest_frame
+        stale = latest is not None and latest.age > self.detection_service.cache_timeout
+        frame_id = latest.frame_id if stale else 0
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            frame = await self.next_frame(frame_id, remaining)
+            if frame is None:
+                if remaining is not None and deadline - time.monotonic() <= 0:
+                    return None
+                # Capture failed; try again on the next tick
+                await asyncio.sleep(self.detection_service.frame_source.min_interval)
+                continue
+            frame_id = frame.frame_id
+
+            results = await self.executors.run('detection', self._detect_on, frame, detect)
+            if predicate(results):
+                return results
+
+    def _detect_on(self, frame: Any, detect: Callable[[], Any]) -> Any:
+        """Run a detection on the given frame (in an executor thread)."""
+        with self.detection_service.use_frame(frame):
+            return detect()
+
+
+class AsyncAutomationService:
+    """
+    Asyncio adapter for the automation service.
+    """
+
+    def __init__(self, automation_service: Any, executors: Optional[ServiceExecutors] = None,
+                 poll_interval: float = 0.05) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            automation_service: Synchronous automation service
+            executors: Executors to run blocking calls in (None for private ones)
+            poll_interval: Longest time between task status checks in seconds
+        """
+        self.automation_service = automation_service
+        self.executors = executors or ServiceExecutors()
+        self.poll_interval = poll_interval
+
+    async def execute_task(self, task: Any) -> bool:
+        """
+        Execute a task and wait for it to finish.
+
+        Args:
+            task: Task to execute
+
+        Returns:
+            True if the task succeeded
+        """
+        return await self.executors.run('automation', self.automation_service.execute_task_synchronously, task)
+
+    async def wait_for_task(self, task_name: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a queued task to complete or fail.
+
+        The wait wakes on the task's completion and failure callbacks. The
+        status is still checked every poll_interval, for cancellation (which
+        has no callback) and for tasks that do not support callbacks.
+
+        Args:
+            task_name: Name of the task
+            timeout: Maximum time to wait in seconds (None to wait indefinitely)
+
+        Returns:
+            True if the task completed, False if it failed, was canceled,
+            is unknown or the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        finished = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def notify(*args: Any) -> None:
+            # Called on the automation thread
+            try:
+                loop.call_soon_threadsafe(finished.set)
+            except RuntimeError:
+                pass  # The waiting loop has already closed
+
+        try:
+            self.automation_service.register_task_completion_callback(task_name, notify)
+            self.automation_service.register_task_failure_callback(task_name, notify)
+        except AttributeError as e:
+            logger.debug(f"Polling task '{task_name}', callbacks unavailable: {e}")
+
+        while True:
+            task = self.automation_service.get_task(task_name)
+            if task is None:
+                return False
+            if task.status == TaskStatus.COMPLETED:
+                return True
+            if task.status in (TaskStatus.FAILED, TaskStatus.CANCELED):
+                return False
+            interval = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                interval = min(interval, remaining)
+            try:
+                await asyncio.wait_for(finished.wait(), interval)
+                finished.clear()
+            except asyncio.TimeoutError:
+                pass
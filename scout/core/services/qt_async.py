@@ -0,0 +1,116 @@
+"""
+Qt Asyncio Bridge
+
+This module connects asyncio coroutines (such as the async services) with
+the Qt event loop. If qasync is installed, install_qt_event_loop() makes
+asyncio run on Qt's own event loop, so coroutines and widgets share the GUI
+thread. Without qasync, QtAsyncBridge runs an asyncio loop in a background
+thread and delivers each coroutine's outcome back to the Qt thread through a
+queued signal, so callbacks may safely touch widgets.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# qasync is optional: it runs asyncio directly on the Qt event loop
+try:
+    import qasync
+    QASYNC_AVAILABLE = True
+except ImportError:
+    QASYNC_AVAILABLE = False
+    logger.debug("qasync not available; coroutines run on a background event loop")
+
+
+def install_qt_event_loop(app: Any) -> Optional[asyncio.AbstractEventLoop]:
+    """
+    Make asyncio run on the Qt application's event loop.
+
+    Args:
+        app: QApplication instance
+
+    Returns:
+        The installed event loop, or None if qasync is not available
+    """
+    if not QASYNC_AVAILABLE:
+        return None
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    logger.info("Installed asyncio event loop on the Qt event loop")
+    return loop
+
+
+class QtAsyncBridge(QObject):
+    """
+    Runs coroutines for Qt code and reports their outcome on the Qt thread.
+    """
+
+    # (callback, finished future), emitted from the asyncio loop's thread
+    _finished = pyqtSignal(object, object)
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, parent: Optional[QObject] = None) -> None:
+        """
+        Initialize the bridge.
+
+        Args:
+            loop: Running event loop to use, e.g. from install_qt_event_loop
+                (None to start a private loop in a background thread)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._thread: Optional[threading.Thread] = None
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, args=(loop,), name='QtAsyncBridge', daemon=True)
+            self._thread.start()
+        self.loop = loop
+
+        # Delivered in this object's (the Qt) thread
+        self._finished.connect(self._on_finished)
+
+    def submit(self, coro: Coroutine, on_done: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Schedule a coroutine on the asyncio loop.
+
+        Args:
+            coro: Coroutine to run
+            on_done: Called on the Qt thread with the finished future
+
+        Returns:
+            Future of the coroutine's result; cancel() cancels the coroutine
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if on_done is not None:
+            future.add_done_callback(lambda finished: self._finished.emit(on_done, finished))
+        return future
+
+    def stop(self) -> None:
+        """Stop the private event loop, if the bridge started one."""
+        if self._thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """Run the private event loop until stopped."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def _on_finished(self, callback: Callable[[Future], None], future: Future) -> None:
+        """Invoke a completion callback on the Qt thread."""
+        try:
+            callback(future)
+        except Exception as e:
+            logger.error(f"Error in coroutine completion callback: {e}", exc_info=True)
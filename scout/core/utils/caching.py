@@ -7,6 +7,8 @@ for expensive operations like image detection and processing.
 """
 
 import os
+import sys
+import copy
 import time
 import pickle
 import hashlib
@@ -19,26 +21,64 @@ from datetime import datetime, timedelta
 from collections import OrderedDict
 import threading
 
+from scout.core.utils.memory import memory_policy
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value.
+    
+    Objects exposing an integer ``nbytes`` (NumPy arrays, detection batches)
+    report that; dictionaries, lists and tuples are walked recursively.
+    Anything else falls back to sys.getsizeof.
+    
+    Args:
+        value: Value to measure
+        
+    Returns:
+        Estimated size in bytes
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, (int, np.integer)):
+        return int(nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
 class LRUCache:
     """
     Least Recently Used (LRU) cache implementation.
     
-    This cache evicts the least recently used items when it reaches its capacity.
+    This cache evicts the least recently used items when it reaches its capacity
+    (or its byte budget, if one is set). The byte footprint of every entry is
+    tracked so the cache can be trimmed under memory pressure.
     Thread-safe implementation using locks.
     """
     
-    def __init__(self, capacity: int = 100):
+    def __init__(self, capacity: int = 100, max_bytes: Optional[int] = None,
+                sizeof: Optional[Callable[[Any], int]] = None):
         """
         Initialize LRU cache with specified capacity.
         
         Args:
             capacity: Maximum number of items to store in the cache
+            max_bytes: Maximum total size of cached values in bytes (None for no limit)
+            sizeof: Function estimating the size of a value (default: estimate_size)
         """
         self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or estimate_size
         self.cache = OrderedDict()
+        self.sizes: Dict[str, int] = {}
+        self.current_bytes = 0
+        self.evictions = 0
         self.lock = threading.RLock()
         
     def get(self, key: str) -> Any:
@@ -71,19 +111,63 @@ class LRUCache:
             if key in self.cache:
                 # Remove existing entry
                 self.cache.pop(key)
+                self.current_bytes -= self.sizes.pop(key, 0)
                 
             # Add to end (mark as recently used)
             self.cache[key] = value
+            size = self.sizeof(value)
+            self.sizes[key] = size
+            self.current_bytes += size
             
             # Check if we exceeded capacity
-            if len(self.cache) > self.capacity:
+            while len(self.cache) > self.capacity:
                 # Remove least recently used item (first item)
-                self.cache.popitem(last=False)
+                self._evict_oldest()
                 
+            # Check if we exceeded the byte budget (always keep the newest item)
+            if self.max_bytes is not None:
+                while self.current_bytes > self.max_bytes and len(self.cache) > 1:
+                    self._evict_oldest()
+                    
+    def _evict_oldest(self) -> None:
+        """Evict the least recently used item."""
+        key, _ = self.cache.popitem(last=False)
+        self.current_bytes -= self.sizes.pop(key, 0)
+        self.evictions += 1
+        
+    def get_footprint(self) -> int:
+        """
+        Get the estimated size of all cached values.
+        
+        Returns:
+            Size in bytes
+        """
+        with self.lock:
+            return self.current_bytes
+            
+    def trim(self, target_bytes: int) -> int:
+        """
+        Evict least recently used items until the cache fits the target size.
+        
+        Args:
+            target_bytes: Maximum number of bytes to keep
+            
+        Returns:
+            Number of evicted items
+        """
+        with self.lock:
+            evicted = 0
+            while self.cache and self.current_bytes > target_bytes:
+                self._evict_oldest()
+                evicted += 1
+            return evicted
+            
     def clear(self) -> None:
         """Clear all items from the cache."""
         with self.lock:
             self.cache.clear()
+            self.sizes.clear()
+            self.current_bytes = 0
             
     def remove(self, key: str) -> bool:
         """
@@ -98,6 +182,7 @@ class LRUCache:
         with self.lock:
             if key in self.cache:
                 self.cache.pop(key)
+                self.current_bytes -= self.sizes.pop(key, 0)
                 return True
             return False
             
@@ -315,6 +400,32 @@ class ImageHashCache:
                 logger.info("Cleared persistent cache")
             except Exception as e:
                 logger.warning(f"Error clearing persistent cache: {str(e)}")
+                
+    def get_footprint(self) -> int:
+        """
+        Get the estimated size of the in-memory cache.
+        
+        Returns:
+            Size in bytes
+        """
+        return self.memory_cache.get_footprint()
+        
+    def trim(self, target_bytes: int) -> int:
+        """
+        Shrink the in-memory cache (the persistent cache is left untouched).
+        
+        Args:
+            target_bytes: Maximum number of bytes to keep
+            
+        Returns:
+            Number of evicted entries
+        """
+        return self.memory_cache.trim(target_bytes)
+        
+    @property
+    def evictions(self) -> int:
+        """Number of entries evicted from the in-memory cache."""
+        return self.memory_cache.evictions
 
 
 class DetectionCache:
@@ -323,6 +434,11 @@ class DetectionCache:
     
     This cache stores detection results by strategy type, parameters, and input image,
     allowing for efficient retrieval of previous detection results.
+    
+    Cached results are immutable: result lists are stored as tuples of private
+    copies and every hit returns fresh copies, so callers shifting or editing
+    their results never change what other callers get. DetectionBatch results
+    are immutable already and are shared as-is.
     """
     
     def __init__(self, cache_dir: Optional[str] = None, 
@@ -355,6 +471,9 @@ class DetectionCache:
             )
         }
         
+        # Serializes the read-modify-write of an image's result entries
+        self._lock = threading.Lock()
+        
         # Create cache directory if specified and doesn't exist
         if self.cache_dir and not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
@@ -410,7 +529,7 @@ class DetectionCache:
                         return None
                         
                 logger.debug(f"Cache hit for {strategy_type} detection with params: {params}")
-                return result_entry.get('result')
+                return self._thaw(result_entry.get('result'))
                 
         return None
         
@@ -431,20 +550,33 @@ class DetectionCache:
         # Get image cache for this strategy
         image_cache = self.image_caches[strategy_type]
         
-        # Get existing cached results for this image or create new entry
-        cached_result = image_cache.get(image) or {}
-        
-        # Store results for the specific parameters
+        # Store results for the specific parameters in a new entry dictionary,
+        # so readers of the previous one are unaffected
         cache_key = self._get_cache_key(strategy_type, params)
-        cached_result[cache_key] = {
-            'result': result,
+        entry = {
+            'result': self._freeze(result),
             'timestamp': time.time()
         }
-        
-        # Update cache
-        image_cache.put(image, cached_result)
+        with self._lock:
+            cached_result = dict(image_cache.get(image) or {})
+            cached_result[cache_key] = entry
+            image_cache.put(image, cached_result)
         logger.debug(f"Cached {strategy_type} detection result with params: {params}")
         
+    @staticmethod
+    def _freeze(result: Any) -> Any:
+        """Store result lists as tuples of private copies."""
+        if isinstance(result, (list, tuple)):
+            return tuple(copy.deepcopy(item) for item in result)
+        return result
+        
+    @staticmethod
+    def _thaw(result: Any) -> Any:
+        """Return result lists as fresh copies the caller may modify."""
+        if isinstance(result, (list, tuple)):
+            return [copy.deepcopy(item) for item in result]
+        return result
+        
     def clear(self, strategy_type: Optional[str] = None) -> None:
         """
         Clear cache items.
@@ -463,6 +595,238 @@ class DetectionCache:
             for cache_type, cache in self.image_caches.items():
                 cache.clear()
             logger.info("Cleared all detection caches")
+            
+    def get_footprint(self) -> int:
+        """
+        Get the estimated in-memory size of all strategy caches.
+        
+        Returns:
+            Size in bytes
+        """
+        return sum(cache.get_footprint() for cache in self.image_caches.values())
+        
+    def trim(self, target_bytes: int) -> int:
+        """
+        Shrink all strategy caches proportionally to fit the target size.
+        
+        Args:
+            target_bytes: Maximum number of bytes to keep
+            
+        Returns:
+            Number of evicted entries
+        """
+        total = self.get_footprint()
+        if total <= target_bytes:
+            return 0
+            
+        ratio = target_bytes / total
+        return sum(
+            cache.trim(int(cache.get_footprint() * ratio))
+            for cache in self.image_caches.values()
+        )
+        
+    @property
+    def evictions(self) -> int:
+        """Number of entries evicted from all strategy caches."""
+        return sum(cache.evictions for cache in self.image_caches.values())
+
+
+class ResponseMapCache:
+    """
+    Cache of template correlation peaks per frame.
+    
+    DetectionCache keys results by every detection parameter, so asking for
+    the same template on the same frame with another confidence threshold or
+    result limit recomputes the whole correlation. This cache stores what the
+    correlation produced instead: the positions scoring at least a floor, with
+    their scores, per (frame key, template, match method). Any query with a
+    threshold at or above the floor is answered from it.
+    
+    Frame keys start with the frame source ID and the frame ID, as frame IDs
+    are only unique within their source. Entries of frames more than
+    max_frames behind the newest frame seen from the same source are dropped,
+    and the least recently used entries are evicted beyond max_bytes.
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_frames: int = 4,
+                 peak_floor: float = 0.5, max_peaks: int = 50000):
+        """
+        Initialize the response map cache.
+        
+        Args:
+            max_bytes: Maximum size of all stored peaks in bytes
+            max_frames: Number of most recent frame IDs per source whose entries are kept
+            peak_floor: Lowest score stored for complete correlation maps, so
+                later queries with lower thresholds are served as well
+            max_peaks: Peaks stored per entry before the floor is raised to
+                the requested threshold
+        """
+        self.max_bytes = max_bytes
+        self.max_frames = max_frames
+        self.peak_floor = peak_floor
+        self.max_peaks = max_peaks
+        
+        # key -> (floor, xs, ys, scores, nbytes)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self._newest_frames: Dict[Any, int] = {}  # Frame source ID -> newest frame ID
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+    def get(self, frame_key: Tuple, template_name: str, method: int,
+            threshold: float) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get the positions of a template scoring at least a threshold.
+        
+        Args:
+            frame_key: Frame identity, starting with the frame source ID and frame ID
+            template_name: Template name
+            method: OpenCV match method
+            threshold: Minimum score
+            
+        Returns:
+            Tuple of (xs, ys, scores) in row-major order like np.nonzero, or
+            None if nothing usable is cached
+        """
+        key = (frame_key, template_name, method)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or threshold < entry[0]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            
+        _, xs, ys, scores, _ = entry
+        if threshold > entry[0]:
+            keep = scores >= threshold
+            return xs[keep], ys[keep], scores[keep]
+        return xs, ys, scores
+        
+    def put(self, frame_key: Tuple, template_name: str, method: int, response: np.ndarray,
+            threshold: float, complete: bool = True) -> None:
+        """
+        Store the peaks of a correlation map.
+        
+        Args:
+            frame_key: Frame identity, starting with the frame source ID and frame ID
+            template_name: Template name
+            method: OpenCV match method (higher scores must be better)
+            response: Correlation map
+            threshold: Threshold of the query that computed the map
+            complete: Whether every position of the map holds its true score;
+                partial maps (e.g. from the prefilter) are only valid at or
+                above the threshold they were computed for
+        """
+        floor = min(threshold, self.peak_floor) if complete else threshold
+        ys, xs = np.nonzero(response >= floor)
+        if len(xs) > self.max_peaks and floor < threshold:
+            floor = threshold
+            ys, xs = np.nonzero(response >= floor)
+        xs = xs.astype(np.int32)
+        ys = ys.astype(np.int32)
+        scores = response[ys, xs].astype(np.float32)
+        for array in (xs, ys, scores):
+            array.flags.writeable = False
+        nbytes = xs.nbytes + ys.nbytes + scores.nbytes + 64
+        
+        key = (frame_key, template_name, method)
+        with self._lock:
+            source, frame_id = frame_key[:2]
+            newest = self._newest_frames.get(source)
+            if newest is None or frame_id > newest:
+                self._newest_frames[source] = frame_id
+                self._evict_old_frames(source)
+            elif frame_id <= newest - self.max_frames:
+                return
+                
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[4]
+            self._entries[key] = (floor, xs, ys, scores, nbytes)
+            self._bytes += nbytes
+            self._evict_to(self.max_bytes)
+            
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._newest_frames.clear()
+            
+    def remove_templates(self, prefix: str) -> int:
+        """
+        Remove the entries of templates whose names start with a prefix.
+        
+        Args:
+            prefix: Template name prefix, e.g. a strategy's template directory
+            
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[1].startswith(prefix)]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[4]
+            return len(keys)
+            
+    def get_footprint(self) -> int:
+        """
+        Get the size of all stored peaks.
+        
+        Returns:
+            Size in bytes
+        """
+        return self._bytes
+        
+    def trim(self, target_bytes: int) -> int:
+        """
+        Evict least recently used entries until the cache fits a size.
+        
+        Args:
+            target_bytes: Maximum number of bytes to keep
+            
+        Returns:
+            Number of evicted entries
+        """
+        with self._lock:
+            return self._evict_to(target_bytes)
+            
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, size, hits, misses and evictions
+        """
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+        
+    def _evict_old_frames(self, source: Any) -> None:
+        """Drop entries of a source's frames too far behind its newest one (lock held)."""
+        oldest = self._newest_frames[source] - self.max_frames
+        for key in [key for key in self._entries if key[0][0] == source and key[0][1] <= oldest]:
+            self._bytes -= self._entries.pop(key)[4]
+            self.evictions += 1
+            
+    def _evict_to(self, target_bytes: int) -> int:
+        """Evict least recently used entries down to a size (lock held)."""
+        evicted = 0
+        while self._entries and self._bytes > target_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry[4]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
 
 
 def cached(cache_instance, key_func=None, expiration=None):
@@ -550,21 +914,61 @@ class CacheManager:
         
         self.result_cache = LRUCache(200)  # General-purpose cache
         
+        # Correlation peaks per frame, shared by all thresholds and result limits
+        self.response_cache = ResponseMapCache()
+        
+        # Let the memory policy trim in-memory caches under pressure;
+        # detection results are the most expensive to recompute
+        memory_policy.register(
+            'result_cache',
+            footprint=self.result_cache.get_footprint,
+            trim=self.result_cache.trim,
+            priority=20,
+            evictions=lambda: self.result_cache.evictions
+        )
+        memory_policy.register(
+            'detection_cache',
+            footprint=self.detection_cache.get_footprint,
+            trim=self.detection_cache.trim,
+            priority=30,
+            evictions=lambda: self.detection_cache.evictions
+        )
+        memory_policy.register(
+            'response_cache',
+            footprint=self.response_cache.get_footprint,
+            trim=self.response_cache.trim,
+            priority=25,
+            evictions=lambda: self.response_cache.evictions
+        )
+        
     def clear_all_caches(self) -> None:
         """Clear all caches."""
         self.detection_cache.clear()
         self.result_cache.clear()
+        self.response_cache.clear()
         logger.info("Cleared all caches")
         
     def get_cache_size(self) -> Dict[str, int]:
         """
         Get the current size of all caches.
         
+        Besides the entry count of the result cache, this reports the in-memory
+        footprint ('<name>_bytes') and eviction count ('<name>_evictions') of every
+        cache registered with the memory pressure policy.
+        
         Returns:
             Dictionary with cache sizes
         """
         result = {'result_cache': len(self.result_cache)}
         
+        # Per-cache footprint and evictions
+        total_bytes = 0
+        for name, stats in memory_policy.get_stats().items():
+            result[f'{name}_bytes'] = stats['bytes']
+            result[f'{name}_evictions'] = stats['evictions']
+            total_bytes += stats['bytes']
+        result['memory_size_bytes'] = total_bytes
+        
         # Calculate size of persistent cache if available
         if self.cache_dir and os.path.exists(self.cache_dir):
             total_size = 0
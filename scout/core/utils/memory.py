@@ -14,12 +14,194 @@ import logging
 import threading
 import weakref
 from typing import Dict, List, Any, Optional, Callable, Set, Tuple, Type
-import psutil
+# Try to import real psutil, fall back to our stub implementation
+try:
+    import psutil
+except ImportError:
+    import scout.core.utils.psutil_stub as psutil
 import numpy as np
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+class MemoryPressurePolicy:
+    """
+    Coordinates cache eviction across the application under memory pressure.
+    
+    Caches register a callable reporting their byte footprint, a callable that
+    trims them down to a target size, and a priority. When memory usage crosses
+    the soft or hard watermark (or the registered caches together exceed the
+    configured budget), caches are trimmed starting with the lowest priority.
+    
+    Trimming behaviour per level:
+    - 'soft': each cache is halved, in priority order, until enough bytes are freed
+    - 'hard': each cache is emptied, in priority order, until enough bytes are freed
+    """
+    
+    def __init__(self, budget_mb: Optional[float] = None):
+        """
+        Initialize the memory pressure policy.
+        
+        Args:
+            budget_mb: Maximum combined footprint of all registered caches in MB
+                       (None for no fixed budget)
+        """
+        self.budget_mb = budget_mb
+        self.caches: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()
+        
+    def register(self, name: str, footprint: Callable[[], int],
+                trim: Callable[[int], int], priority: int = 0,
+                evictions: Optional[Callable[[], int]] = None) -> None:
+        """
+        Register a cache with the policy.
+        
+        Registering a name that already exists replaces the previous entry.
+        
+        Args:
+            name: Unique cache name
+            footprint: Callable returning the current size of the cache in bytes
+            trim: Callable that shrinks the cache to at most the given number of
+                  bytes and returns the number of evicted entries
+            priority: Eviction priority (lower values are trimmed first)
+            evictions: Callable returning the cache's own eviction count
+                       (None to report only evictions made by this policy)
+        """
+        with self.lock:
+            self.caches[name] = {
+                'footprint': footprint,
+                'trim': trim,
+                'priority': priority,
+                'evictions': evictions,
+                'pressure_evictions': 0
+            }
+        logger.debug(f"Registered cache '{name}' with memory policy (priority {priority})")
+        
+    def unregister(self, name: str) -> bool:
+        """
+        Remove a cache from the policy.
+        
+        Args:
+            name: Cache name
+            
+        Returns:
+            True if the cache was registered, False otherwise
+        """
+        with self.lock:
+            return self.caches.pop(name, None) is not None
+            
+    def _get_footprint(self, name: str, entry: Dict[str, Any]) -> int:
+        """Get the footprint of a registered cache, treating errors as empty."""
+        try:
+            return int(entry['footprint']())
+        except Exception as e:
+            logger.error(f"Error getting footprint of cache '{name}': {e}")
+            return 0
+            
+    def get_total_footprint(self) -> int:
+        """
+        Get the combined footprint of all registered caches.
+        
+        Returns:
+            Total size in bytes
+        """
+        with self.lock:
+            return sum(self._get_footprint(name, entry) for name, entry in self.caches.items())
+            
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get footprint and eviction statistics for every registered cache.
+        
+        Returns:
+            Dictionary mapping cache names to dictionaries with 'bytes',
+            'priority', 'evictions' and 'pressure_evictions'
+        """
+        with self.lock:
+            stats = {}
+            for name, entry in self.caches.items():
+                evictions = entry['pressure_evictions']
+                if entry['evictions'] is not None:
+                    try:
+                        evictions = int(entry['evictions']())
+                    except Exception as e:
+                        logger.error(f"Error getting eviction count of cache '{name}': {e}")
+                        
+                stats[name] = {
+                    'bytes': self._get_footprint(name, entry),
+                    'priority': entry['priority'],
+                    'evictions': evictions,
+                    'pressure_evictions': entry['pressure_evictions']
+                }
+            return stats
+            
+    def relieve(self, level: str, bytes_to_free: Optional[int] = None) -> int:
+        """
+        Trim registered caches in priority order.
+        
+        Args:
+            level: Pressure level ('soft' halves caches, 'hard' empties them)
+            bytes_to_free: Stop once at least this many bytes have been released
+                           (None to trim every registered cache)
+            
+        Returns:
+            Number of bytes released according to the cache footprints
+        """
+        if level not in ('soft', 'hard'):
+            logger.warning(f"Unknown memory pressure level: {level}")
+            return 0
+            
+        with self.lock:
+            ordered = sorted(self.caches.items(), key=lambda item: item[1]['priority'])
+            freed = 0
+            
+            for name, entry in ordered:
+                if bytes_to_free is not None and freed >= bytes_to_free:
+                    break
+                    
+                before = self._get_footprint(name, entry)
+                if before <= 0:
+                    continue
+                    
+                target = before // 2 if level == 'soft' else 0
+                
+                # Never trim further than needed to reach the requested amount
+                if bytes_to_free is not None:
+                    target = max(target, before - (bytes_to_free - freed))
+                    
+                try:
+                    evicted = entry['trim'](target)
+                except Exception as e:
+                    logger.error(f"Error trimming cache '{name}': {e}")
+                    continue
+                    
+                after = self._get_footprint(name, entry)
+                entry['pressure_evictions'] += evicted or 0
+                freed += max(0, before - after)
+                
+                logger.debug(f"Trimmed cache '{name}' from {before} to {after} bytes "
+                            f"({evicted} entries evicted, {level} pressure)")
+                            
+        if freed:
+            logger.info(f"Released {freed / (1024 * 1024):.2f}MB of cached data ({level} memory pressure)")
+        return freed
+        
+    def enforce_budget(self) -> int:
+        """
+        Trim caches until their combined footprint fits within the budget.
+        
+        Returns:
+            Number of bytes released
+        """
+        if self.budget_mb is None:
+            return 0
+            
+        excess = self.get_total_footprint() - int(self.budget_mb * 1024 * 1024)
+        if excess <= 0:
+            return 0
+            
+        return self.relieve('hard', excess)
+
+
 class MemoryMonitor:
     """
     Utility for monitoring memory usage of the application.
@@ -29,17 +211,26 @@ class MemoryMonitor:
     - Identifying memory leaks
     - Taking memory snapshots for comparison
     - Triggering garbage collection when memory usage exceeds thresholds
+    - Asking a MemoryPressurePolicy to trim caches at soft and hard watermarks
     """
     
-    def __init__(self, threshold_mb: float = 500, poll_interval: float = 10):
+    def __init__(self, threshold_mb: float = 500, poll_interval: float = 10,
+                soft_threshold_mb: Optional[float] = None,
+                policy: Optional[MemoryPressurePolicy] = None):
         """
         Initialize the memory monitor.
         
         Args:
-            threshold_mb: Memory threshold in MB to trigger cleanup
+            threshold_mb: Memory threshold in MB to trigger cleanup (hard watermark)
             poll_interval: Time between memory checks in seconds
+            soft_threshold_mb: Memory threshold in MB at which caches start being
+                               trimmed (default: 80% of threshold_mb)
+            policy: Cache eviction policy to apply under memory pressure
         """
         self.threshold_mb = threshold_mb
+        self.soft_threshold_mb = (soft_threshold_mb if soft_threshold_mb is not None
+                                  else threshold_mb * 0.8)
+        self.policy = policy
         self.poll_interval = poll_interval
         self.process = psutil.Process(os.getpid())
         self.snapshots = []
@@ -92,6 +283,9 @@ class MemoryMonitor:
                     if len(self.memory_data) > 1000:
                         self.memory_data = self.memory_data[-1000:]
                 
+                # Trim caches if memory is under pressure
+                self.apply_pressure_policy(memory_mb)
+                
                 # Check if cleanup is needed
                 if memory_mb > self.threshold_mb:
                     logger.warning(f"Memory usage ({memory_mb:.2f}MB) exceeds threshold ({self.threshold_mb}MB)")
@@ -104,6 +298,53 @@ class MemoryMonitor:
                 logger.error(f"Error in memory monitoring: {e}")
                 time.sleep(self.poll_interval)
                 
+    def get_pressure_level(self, memory_mb: float) -> str:
+        """
+        Classify a memory reading against the watermarks.
+        
+        Args:
+            memory_mb: Resident memory in MB
+            
+        Returns:
+            'normal', 'soft' or 'hard'
+        """
+        if memory_mb > self.threshold_mb:
+            return 'hard'
+        if memory_mb > self.soft_threshold_mb:
+            return 'soft'
+        return 'normal'
+        
+    def apply_pressure_policy(self, memory_mb: float) -> int:
+        """
+        Trim caches through the policy according to the current memory usage.
+        
+        Under soft pressure caches are trimmed until usage would fall back to the
+        soft watermark; under hard pressure until it would fall below the hard one.
+        The policy's fixed cache budget is enforced on every call.
+        
+        Args:
+            memory_mb: Resident memory in MB
+            
+        Returns:
+            Number of bytes released
+        """
+        if self.policy is None:
+            return 0
+            
+        freed = self.policy.enforce_budget()
+        level = self.get_pressure_level(memory_mb)
+        
+        if level != 'normal':
+            watermark_mb = self.threshold_mb if level == 'hard' else self.soft_threshold_mb
+            excess_bytes = int((memory_mb - watermark_mb) * 1024 * 1024)
+            logger.debug(f"Memory pressure '{level}': {memory_mb:.2f}MB, "
+                        f"trimming caches by {excess_bytes / (1024 * 1024):.2f}MB")
+            remaining = excess_bytes - freed
+            if remaining > 0:
+                freed += self.policy.relieve(level, remaining)
+            
+        return freed
+        
     def force_cleanup(self) -> float:
         """
         Force garbage collection and memory cleanup.
@@ -382,6 +623,7 @@ class ImageBuffer:
         """
         self.max_size = max_size
         self.buffer = {}  # Maps (height, width, channels) to list of images
+        self.evictions = 0
         self.lock = threading.RLock()
         
     def get(self, height: int, width: int, channels: int = 3) -> np.ndarray:
@@ -436,6 +678,43 @@ class ImageBuffer:
             if len(self.buffer[key]) < self.max_size:
                 self.buffer[key].append(image)
                 
+    def get_footprint(self) -> int:
+        """
+        Get the memory held by buffered images.
+        
+        Returns:
+            Size in bytes
+        """
+        with self.lock:
+            return sum(image.nbytes for images in self.buffer.values() for image in images)
+            
+    def trim(self, target_bytes: int) -> int:
+        """
+        Drop buffered images, largest sizes first, until the buffer fits the target.
+        
+        Args:
+            target_bytes: Maximum number of bytes to keep
+            
+        Returns:
+            Number of images dropped
+        """
+        with self.lock:
+            footprint = self.get_footprint()
+            dropped = 0
+            
+            for key in sorted(self.buffer, key=lambda k: k[0] * k[1] * k[2], reverse=True):
+                images = self.buffer[key]
+                while images and footprint > target_bytes:
+                    footprint -= images.pop().nbytes
+                    dropped += 1
+                if not images:
+                    del self.buffer[key]
+                if footprint <= target_bytes:
+                    break
+                    
+            self.evictions += dropped
+            return dropped
+            
     def clear(self) -> None:
         """Clear all images from the buffer."""
         with self.lock:
@@ -452,6 +731,7 @@ class ImageBuffer:
             stats = {
                 'total_images': sum(len(images) for images in self.buffer.values()),
                 'unique_sizes': len(self.buffer),
+                'evictions': self.evictions,
                 'memory_mb': 0
             }
             
@@ -476,9 +756,18 @@ class MemoryOptimizer:
     
     def __init__(self):
         """Initialize the memory optimizer."""
-        self.monitor = MemoryMonitor()
+        self.monitor = MemoryMonitor(policy=memory_policy)
         self.resource_tracker = ResourceTracker()
         self.image_buffer = ImageBuffer()
+        
+        # Recycled images are the cheapest memory to give back
+        memory_policy.register(
+            'image_buffer',
+            footprint=self.image_buffer.get_footprint,
+            trim=self.image_buffer.trim,
+            priority=0,
+            evictions=lambda: self.image_buffer.evictions
+        )
         self.cleanup_scheduled = False
         self.cleanup_thread = None
         self.lock = threading.RLock()
@@ -498,7 +787,30 @@ class MemoryOptimizer:
                 self.cleanup_thread.start()
                 
             logger.info("Started memory optimization services")
-            
+
+    def configure(self, budget_mb: Optional[float] = None,
+                 soft_threshold_mb: Optional[float] = None,
+                 threshold_mb: Optional[float] = None) -> None:
+        """
+        Set the cache budget and the memory watermarks.
+
+        Args:
+            budget_mb: Maximum combined footprint of the registered caches in MB
+                       (None or 0 for no fixed budget)
+            soft_threshold_mb: Memory usage in MB at which caches start being
+                               trimmed (None to keep the current watermark)
+            threshold_mb: Memory usage in MB at which caches are emptied
+                          (None to keep the current watermark)
+        """
+        memory_policy.budget_mb = budget_mb or None
+        with self.monitor.lock:
+            if threshold_mb is not None:
+                self.monitor.threshold_mb = threshold_mb
+            if soft_threshold_mb is not None:
+                self.monitor.soft_threshold_mb = min(soft_threshold_mb, self.monitor.threshold_mb)
+        logger.info(f"Memory budget: {memory_policy.budget_mb}MB for caches, "
+                   f"watermarks {self.monitor.soft_threshold_mb}MB/{self.monitor.threshold_mb}MB")
+
     def stop(self) -> None:
         """Stop memory optimization services."""
         with self.lock:
@@ -597,6 +909,7 @@ class MemoryOptimizer:
         stats = {
             'resources': self.resource_tracker.get_stats(),
             'image_buffer': self.image_buffer.get_stats(),
+            'caches': memory_policy.get_stats(),
             'memory': {}
         }
         
@@ -613,5 +926,8 @@ class MemoryOptimizer:
         return stats
 
 
+# Create global memory pressure policy shared by all caches
+memory_policy = MemoryPressurePolicy()
+
 # Create global optimizer instance
 memory_optimizer = MemoryOptimizer() 
\ No newline at end of file
@@ -13,11 +13,13 @@ import logging
 import threading
 import queue
 import concurrent.futures
-from typing import Any, Dict, List, Tuple, Callable, TypeVar, Generic, Optional, Iterator
+from typing import Any, Dict, List, Tuple, Callable, TypeVar, Generic, Optional, Iterator, Union
 import multiprocessing
 import numpy as np
 import cv2
 
+from scout.core.detection.detection_batch import DetectionBatch
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -206,7 +208,7 @@ class ImageProcessor:
         self.executor = executor or ParallelExecutor()
         
     def _split_image_into_tiles(self, image: np.ndarray, tile_size: int, 
-                               overlap: int = 0) -> List[Tuple[np.ndarray, Tuple[int, int, int, int]]]:
+                               overlap: int = 0, copy: bool = True) -> List[Tuple[np.ndarray, Tuple[int, int, int, int]]]:
         """
         Split an image into overlapping tiles.
         
@@ -214,6 +216,8 @@ class ImageProcessor:
             image: Input image
             tile_size: Size of tiles (height=width)
             overlap: Overlap between adjacent tiles
+            copy: Whether to copy tiles (False returns views into the image,
+                  which is enough for read-only consumers such as detection)
             
         Returns:
             List of (tile_image, (x, y, width, height)) tuples
@@ -239,7 +243,9 @@ class ImageProcessor:
                     y1 = max(0, y2 - tile_size)
                     
                 # Extract tile
-                tile = image[y1:y2, x1:x2].copy()
+                tile = image[y1:y2, x1:x2]
+                if copy:
+                    tile = tile.copy()
                 tile_info = (x1, y1, x2 - x1, y2 - y1)
                 tiles.append((tile, tile_info))
                 
@@ -305,30 +311,38 @@ class ImageProcessor:
                                detect_func: Callable[[np.ndarray], List[Dict]],
                                tile_size: int = 400,
                                overlap: int = 50,
-                               min_distance: int = 20) -> List[Dict]:
+                               min_distance: int = 20) -> Union[List[Dict], DetectionBatch]:
         """
         Apply detection in parallel by dividing image into tiles.
         
+        When the detection function returns DetectionBatch objects, tile offsets
+        are applied as views and the merged result is a single DetectionBatch.
+        
         Args:
             image: Input image
             detect_func: Detection function that returns list of detections
+                         or a DetectionBatch
             tile_size: Size of tiles
             overlap: Overlap between adjacent tiles
             min_distance: Minimum distance for duplicate removal
             
         Returns:
-            Combined list of detections with duplicates removed
+            Combined detections with duplicates removed
         """
-        # Split image into tiles
-        tiles = self._split_image_into_tiles(image, tile_size, overlap)
+        # Split image into tiles (detection only reads them, so views suffice)
+        tiles = self._split_image_into_tiles(image, tile_size, overlap, copy=False)
         
         # Define function to process a tile
-        def process_tile(item: Tuple[np.ndarray, Tuple[int, int, int, int]]) -> List[Dict]:
+        def process_tile(item: Tuple[np.ndarray, Tuple[int, int, int, int]]) -> Union[List[Dict], DetectionBatch]:
             tile, (x, y, w, h) = item
             
             # Run detection on tile
             detections = detect_func(tile)
             
+            # Shift batches to global image space without copying
+            if isinstance(detections, DetectionBatch):
+                return detections.with_offset(x, y)
+            
             # Adjust coordinates to global image space
             for detection in detections:
                 if 'x' in detection and 'y' in detection:
@@ -341,8 +355,14 @@ class ImageProcessor:
                     
             return detections
             
-        # Process tiles in parallel
-        tile_results = self.executor.map(process_tile, tiles)
+        # Process tiles in parallel (failed tiles come back as None)
+        tile_results = [r for r in self.executor.map(process_tile, tiles) if r is not None]
+        
+        # Merge batches and remove duplicates with vectorized suppression
+        if tile_results and all(isinstance(r, DetectionBatch) for r in tile_results):
+            return self._remove_duplicate_detections(
+                DetectionBatch.concatenate(tile_results), min_distance
+            )
         
         # Flatten results
         all_detections = []
@@ -352,18 +372,21 @@ class ImageProcessor:
         # Remove duplicates
         return self._remove_duplicate_detections(all_detections, min_distance)
         
-    def _remove_duplicate_detections(self, detections: List[Dict], 
-                                   min_distance: int) -> List[Dict]:
+    def _remove_duplicate_detections(self, detections: Union[List[Dict], DetectionBatch], 
+                                   min_distance: int) -> Union[List[Dict], DetectionBatch]:
         """
         Remove duplicate detections based on distance.
         
         Args:
-            detections: List of detection results
+            detections: List of detection results or a DetectionBatch
             min_distance: Minimum distance to consider detections as duplicates
             
         Returns:
-            List of detections with duplicates removed
+            Detections with duplicates removed
         """
+        if isinstance(detections, DetectionBatch):
+            return detections.suppress_duplicates(min_distance)
+            
         if not detections:
             return []
             
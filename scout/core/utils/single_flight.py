@@ -0,0 +1,141 @@
+"""
+Single-Flight Request Coalescing
+
+This module provides the SingleFlight class, which lets concurrent callers
+asking for the same computation share one execution. The first caller for a
+key runs the computation; callers arriving while it is in flight wait for it
+and receive the same result (or exception) instead of running their own.
+
+A caller can also attach to an in-flight computation that is not identical
+but subsumes its request, such as the same detection with a lower confidence
+threshold. It then receives the broader result together with the parameters
+it was computed with, and narrows it itself.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-flight computation."""
+
+    __slots__ = ('spec', 'done', 'result', 'error', 'waiters')
+
+    def __init__(self, spec: Any) -> None:
+        self.spec = spec
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls of the same computation.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no computations in flight."""
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, List[_Flight]] = {}
+
+        # Statistics
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.subsumed = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any], spec: Any = None,
+           covers: Optional[Callable[[Any, Any], bool]] = None) -> Tuple[Any, Any]:
+        """
+        Run a computation, or wait for an equivalent one already running.
+
+        Args:
+            key: Identity of the computation's inputs apart from spec
+            func: Computation to run if nothing suitable is in flight
+            spec: Parameters of this request that another request may subsume
+            covers: Function (in-flight spec, requested spec) -> bool telling
+                whether an in-flight computation's result can answer this
+                request (None to only share identical specs)
+
+        Returns:
+            Tuple of (result, spec the result was computed with)
+
+        Raises:
+            Exception: Whatever the computation raised, also in waiting callers
+        """
+        with self._lock:
+            self.requests += 1
+            flight = None
+            for candidate in self._flights.get(key, ()):
+                if candidate.spec == spec:
+                    self.coalesced += 1
+                    flight = candidate
+                    break
+                if covers is not None and covers(candidate.spec, spec):
+                    self.subsumed += 1
+                    flight = candidate
+                    break
+
+            leader = flight is None
+            if leader:
+                flight = _Flight(spec)
+                self._flights.setdefault(key, []).append(flight)
+                self.executions += 1
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, flight.spec
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                flights = self._flights.get(key, [])
+                if flight in flights:
+                    flights.remove(flight)
+                if not flights:
+                    self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result, flight.spec
+
+    def in_flight(self) -> int:
+        """
+        Get the number of computations currently running.
+
+        Returns:
+            Number of in-flight computations
+        """
+        with self._lock:
+            return sum(len(flights) for flights in self._flights.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with request, execution and coalescing counts, and the
+            coalescing ratio (share of requests answered by another request's
+            computation)
+        """
+        with self._lock:
+            requests, executions = self.requests, self.executions
+            coalesced, subsumed = self.coalesced, self.subsumed
+        return {
+            'requests': requests,
+            'executions': executions,
+            'coalesced': coalesced,
+            'subsumed': subsumed,
+            'coalescing_ratio': (coalesced + subsumed) / requests if requests else 0.0
+        }
@@ -0,0 +1,337 @@
+"""
+Capture Planner
+
+This module provides the CapturePlanner class, which captures only the parts of
+the window that consumers actually need. Consumers register the regions they
+read every tick (HUD coordinates, resource bar, minimap, ...); each tick the
+planner merges them into a minimal set of rectangles, grabs only those and
+hands every consumer a view into the grabbed pixels.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .frame_source import Frame
+from .screen_grabber import screen_grabber
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (left, top, right, bottom)
+Rect = Tuple[int, int, int, int]
+
+
+def _to_rect(region: Dict[str, int]) -> Rect:
+    """Convert a {left, top, width, height} region to a rectangle."""
+    left = region['left']
+    top = region['top']
+    return (left, top, left + region['width'], top + region['height'])
+
+
+def _area(rect: Rect) -> int:
+    """Area of a rectangle."""
+    return max(rect[2] - rect[0], 0) * max(rect[3] - rect[1], 0)
+
+
+def merge_rectangles(regions: Iterable[Dict[str, int]], merge_overhead: int = 4096) -> List[Dict[str, int]]:
+    """
+    Merge regions into a minimal set of rectangles to capture.
+
+    Two rectangles are replaced by their bounding box when capturing the box
+    costs no more than capturing both separately, counting merge_overhead
+    pixels for the fixed cost of an extra grab. Contained regions are
+    therefore always merged.
+
+    Args:
+        regions: Regions {left, top, width, height}
+        merge_overhead: Per-grab cost expressed in pixels
+
+    Returns:
+        Rectangles to capture as regions
+    """
+    rects = [_to_rect(region) for region in regions if region['width'] > 0 and region['height'] > 0]
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                a, b = rects[i], rects[j]
+                union = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                if _area(union) <= _area(a) + _area(b) + merge_overhead:
+                    rects[i] = union
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return [
+        {'left': r[0], 'top': r[1], 'width': r[2] - r[0], 'height': r[3] - r[1]}
+        for r in rects
+    ]
+
+
+@dataclass(frozen=True)
+class PlannedCapture:
+    """The rectangles captured in one planner tick."""
+    frame_id: int
+    timestamp: float  # time.monotonic() at capture
+    frames: List[Frame] = field(default_factory=list)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the tick was captured."""
+        return time.monotonic() - self.timestamp
+
+    @property
+    def pixel_count(self) -> int:
+        """Number of pixels captured in this tick."""
+        return sum(frame.width * frame.height for frame in self.frames)
+
+    def crop(self, region: Dict[str, int]) -> Optional[np.ndarray]:
+        """
+        Get a view of a region from the captured rectangles.
+
+        Args:
+            region: Region {left, top, width, height}
+
+        Returns:
+            View into a captured rectangle, or None if none contains the region
+        """
+        for frame in self.frames:
+            view = frame.crop(region)
+            if view is not None:
+                return view
+        return None
+
+
+class CapturePlanner:
+    """
+    Captures the union of the regions requested by registered consumers.
+
+    Regions are relative to the capture area returned by window_func (e.g. the
+    game window) and clipped to it; without window_func they are screen
+    coordinates.
+    """
+
+    def __init__(self, grab_func: Optional[Callable[[Dict[str, int]], np.ndarray]] = None,
+                 window_func: Optional[Callable[[], Optional[Tuple[int, int, int, int]]]] = None,
+                 tick_interval: float = 1 / 30, merge_overhead: int = 4096):
+        """
+        Initialize the capture planner.
+
+        Args:
+            grab_func: Function grabbing a screen region as BGR (default: shared ScreenGrabber)
+            window_func: Function returning the capture area (left, top, width, height) on screen
+            tick_interval: Minimum time between captures in seconds
+            merge_overhead: Per-grab cost in pixels used when merging rectangles
+        """
+        self._grab_func = grab_func or screen_grabber.grab
+        self._window_func = window_func
+        self.tick_interval = tick_interval
+        self.merge_overhead = merge_overhead
+
+        self._consumers: Dict[str, Dict[str, int]] = {}
+        self._latest: Optional[PlannedCapture] = None
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+        # Statistics
+        self.ticks = 0
+        self.rectangles_captured = 0
+        self.pixels_captured = 0
+        self.window_pixels = 0  # Pixels a full-window capture would have taken
+
+    def register(self, name: str, region: Dict[str, int]) -> None:
+        """
+        Register a region a consumer needs every tick.
+
+        Args:
+            name: Consumer name
+            region: Region {left, top, width, height}
+        """
+        with self._lock:
+            self._consumers[name] = dict(region)
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove a consumer's region.
+
+        Args:
+            name: Consumer name
+        """
+        with self._lock:
+            self._consumers.pop(name, None)
+
+    def get_regions(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the registered regions.
+
+        Returns:
+            Dictionary of consumer name to region
+        """
+        with self._lock:
+            return {name: dict(region) for name, region in self._consumers.items()}
+
+    def plan(self, extra_regions: Iterable[Dict[str, int]] = ()) -> List[Dict[str, int]]:
+        """
+        Compute the rectangles to capture for the next tick.
+
+        Args:
+            extra_regions: One-off regions to include besides the registered ones
+
+        Returns:
+            Rectangles to capture, clipped to the capture area
+        """
+        return self._plan(extra_regions, self._get_window())
+
+    def capture(self, extra_regions: Iterable[Dict[str, int]] = ()) -> Optional[PlannedCapture]:
+        """
+        Capture the planned rectangles for a new tick.
+
+        Args:
+            extra_regions: One-off regions to include besides the registered ones
+
+        Returns:
+            Captured tick, or None if the capture area is unavailable
+        """
+        window = self._get_window()
+        if self._window_func is not None and window is None:
+            return None
+        origin_x, origin_y = (window[0], window[1]) if window is not None else (0, 0)
+
+        with self._lock:
+            rectangles = self._plan(extra_regions, window)
+            timestamp = time.monotonic()
+            frame_id = self._next_id
+            self._next_id += 1
+
+            frames = []
+            for rect in rectangles:
+                screen_region = dict(rect, left=rect['left'] + origin_x, top=rect['top'] + origin_y)
+                try:
+                    image = self._grab_func(screen_region)
+                except Exception as e:
+                    logger.error(f"Error capturing region {screen_region}: {e}")
+                    continue
+                image.flags.writeable = False
+                frames.append(Frame(frame_id, timestamp, image, origin=(rect['left'], rect['top'])))
+
+            captured = PlannedCapture(frame_id, timestamp, frames)
+            self._latest = captured
+
+            self.ticks += 1
+            self.rectangles_captured += len(frames)
+            self.pixels_captured += captured.pixel_count
+            if window is not None:
+                self.window_pixels += window[2] * window[3]
+
+        logger.debug(f"Captured {len(frames)} rectangles ({captured.pixel_count} pixels) for tick {frame_id}")
+        return captured
+
+    def capture_region(self, region: Dict[str, int], max_age: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Get a view of a region, capturing a new tick if needed.
+
+        The latest tick is reused when it is fresh enough and contains the
+        region; otherwise a tick covering the registered regions and this one
+        is captured.
+
+        Args:
+            region: Region {left, top, width, height}
+            max_age: Maximum acceptable age in seconds (None for one tick)
+
+        Returns:
+            Read-only view of the region, or None if capture failed
+        """
+        max_age = self.tick_interval if max_age is None else max(max_age, self.tick_interval)
+
+        window = self._get_window()
+        if window is not None:
+            region = self._clip(region, window[2], window[3])
+
+        with self._lock:
+            latest = self._latest
+            if latest is not None and latest.age <= max_age:
+                view = latest.crop(region)
+                if view is not None:
+                    return view
+
+            captured = self.capture([region])
+
+        return captured.crop(region) if captured is not None else None
+
+    def get_view(self, name: str, max_age: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Get a view of a registered consumer's region.
+
+        Args:
+            name: Consumer name
+            max_age: Maximum acceptable age in seconds (None for one tick)
+
+        Returns:
+            Read-only view of the region, or None if unknown or capture failed
+        """
+        with self._lock:
+            region = self._consumers.get(name)
+        if region is None:
+            return None
+        return self.capture_region(region, max_age)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get planner statistics.
+
+        Returns:
+            Dictionary with tick, rectangle and pixel counts and the bandwidth
+            saving compared to full-window captures
+        """
+        with self._lock:
+            return {
+                'consumers': len(self._consumers),
+                'ticks': self.ticks,
+                'rectangles_captured': self.rectangles_captured,
+                'pixels_captured': self.pixels_captured,
+                'bandwidth_reduction': (self.window_pixels / self.pixels_captured
+                                        if self.pixels_captured else 0.0)
+            }
+
+    def _plan(self, extra_regions: Iterable[Dict[str, int]],
+              window: Optional[Tuple[int, int, int, int]]) -> List[Dict[str, int]]:
+        """Merge registered and extra regions, clipped to the capture area."""
+        with self._lock:
+            regions = list(self._consumers.values()) + list(extra_regions)
+
+        if window is not None:
+            regions = [self._clip(region, window[2], window[3]) for region in regions]
+
+        return merge_rectangles(regions, self.merge_overhead)
+
+    def _get_window(self) -> Optional[Tuple[int, int, int, int]]:
+        """Get the capture area, or None if unavailable or not configured."""
+        if self._window_func is None:
+            return None
+        try:
+            window = self._window_func()
+        except Exception as e:
+            logger.error(f"Error getting capture area: {e}")
+            return None
+        return tuple(window) if window else None
+
+    @staticmethod
+    def _clip(region: Dict[str, int], width: int, height: int) -> Dict[str, int]:
+        """Clip a region to a capture area of the given size."""
+        left = max(0, min(region['left'], width - 1))
+        top = max(0, min(region['top'], height - 1))
+        return {
+            'left': left,
+            'top': top,
+            'width': max(1, min(region['width'], width - left)),
+            'height': max(1, min(region['height'], height - top))
+        }
@@ -0,0 +1,28 @@
+"""
+Capture Strategy
+
+This module defines the CaptureStrategy base class shared by all window capture
+backends. It has no platform dependencies so that backends which do not need a
+live Win32 window (e.g. replaying a recording) can be used on any host.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class CaptureStrategy:
+    """Base class for different window capture strategies."""
+    
+    def capture(self, hwnd: int, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """
+        Capture a screenshot using this strategy.
+        
+        Args:
+            hwnd: Window handle
+            rect: Window rectangle (left, top, width, height)
+            
+        Returns:
+            Screenshot as numpy array in BGR format or None if failed
+        """
+        raise NotImplementedError("Capture strategy must implement capture method")
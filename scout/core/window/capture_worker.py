@@ -0,0 +1,191 @@
+"""
+Capture Worker
+
+This module provides the CaptureWorker class, a background thread that keeps a
+FrameSource supplied with frames at a configured rate. Capture latency is then
+paid on the worker thread instead of inside detection callbacks, and consumers
+always pick up the newest frame while older ones are dropped.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .frame_source import Frame, FrameSource
+from .screen_grabber import screen_grabber
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class CaptureWorker:
+    """
+    Background capture thread with a ring buffer of recent frames.
+
+    The worker attaches itself as producer of a FrameSource while running, so
+    FrameSource.get_latest and get_newer_than wait for its frames instead of
+    capturing on the caller's thread.
+    """
+
+    def __init__(self, frame_source: FrameSource, rate: float = 30.0, buffer_size: int = 4):
+        """
+        Initialize the capture worker.
+
+        Args:
+            frame_source: Frame source to capture into
+            rate: Target capture rate in frames per second
+            buffer_size: Number of recent frames kept in the ring buffer
+        """
+        if rate <= 0:
+            raise ValueError("Capture rate must be positive")
+
+        self.frame_source = frame_source
+        self._rate = rate
+        self._buffer: Deque[Frame] = deque(maxlen=max(1, buffer_size))
+        self._buffer_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Optional FrameRecorder that receives every captured frame
+        self.recorder: Optional[Any] = None
+
+        # Statistics
+        self.frames_captured = 0
+        self.capture_failures = 0
+        self.overruns = 0  # Captures that took longer than one interval
+        self._total_capture_time = 0.0
+        self._started_at: Optional[float] = None
+
+    @property
+    def rate(self) -> float:
+        """Target capture rate in frames per second."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        """Change the target capture rate; takes effect on the next frame."""
+        if rate <= 0:
+            raise ValueError("Capture rate must be positive")
+        self._rate = rate
+
+    @property
+    def interval(self) -> float:
+        """Target time between captures in seconds."""
+        return 1.0 / self._rate
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the capture thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start capturing in the background."""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"CaptureWorker-{self.frame_source.name}",
+            daemon=True
+        )
+        self._thread.start()
+        self.frame_source.set_producer(self)
+        logger.info(f"Capture worker started for {self.frame_source.name} at {self._rate:.1f} fps")
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        Stop the capture thread.
+
+        Args:
+            timeout: Maximum time to wait for the thread in seconds
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        if self.frame_source.producer is self:
+            self.frame_source.set_producer(None)
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info(f"Capture worker stopped for {self.frame_source.name}")
+
+    def get_recent_frames(self) -> List[Frame]:
+        """
+        Get the frames in the ring buffer.
+
+        Returns:
+            Frames from oldest to newest
+        """
+        with self._buffer_lock:
+            return list(self._buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get capture statistics.
+
+        Returns:
+            Dictionary with capture counts, measured rate, dropped frames and buffer fill
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        source_stats = self.frame_source.get_stats()
+        return {
+            'running': self.is_running,
+            'target_rate': self._rate,
+            'actual_rate': self.frames_captured / elapsed if elapsed > 0 else 0.0,
+            'frames_captured': self.frames_captured,
+            'capture_failures': self.capture_failures,
+            'overruns': self.overruns,
+            'avg_capture_time': (self._total_capture_time / self.frames_captured
+                                 if self.frames_captured else 0.0),
+            'dropped_frames': source_stats['dropped'],
+            'consumer_drops': source_stats['consumer_drops'],
+            'buffered_frames': len(self._buffer)
+        }
+
+    def _run(self) -> None:
+        """Thread entry point."""
+        try:
+            self._capture_loop()
+        finally:
+            # The grabber belongs to this thread, so release it here
+            screen_grabber.close_thread()
+
+    def _capture_loop(self) -> None:
+        """Capture frames on a fixed schedule until stopped."""
+        next_capture = time.monotonic()
+
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            frame = self.frame_source.capture_now()
+            capture_time = time.monotonic() - start
+
+            if frame is None:
+                self.capture_failures += 1
+            else:
+                self.frames_captured += 1
+                self._total_capture_time += capture_time
+                with self._buffer_lock:
+                    self._buffer.append(frame)
+                if self.recorder is not None:
+                    self._record(frame)
+
+            # Schedule on a fixed grid, skipping ticks rather than bursting after a slow capture
+            interval = self.interval
+            next_capture += interval
+            now = time.monotonic()
+            if next_capture < now:
+                self.overruns += 1
+                next_capture = now + interval
+
+            self._stop_event.wait(next_capture - now)
+
+    def _record(self, frame: Frame) -> None:
+        """Write a frame to the attached recorder."""
+        try:
+            self.recorder.record_frame(frame)
+        except Exception as e:
+            logger.error(f"Error recording frame {frame.frame_id}: {e}")
@@ -0,0 +1,493 @@
+"""
+Frame Recording
+
+This module records captured frames to disk and replays them as a capture
+strategy, so the detection and automation pipeline can be exercised and
+profiled without a live game window.
+
+A recording is a single memory-mapped ring file:
+
+    [magic + JSON header][index: one record per slot][frame slots]
+
+Every slot holds one frame, either raw or zlib-compressed (lossless). When the
+ring is full the oldest slot is overwritten, so long sessions keep the last
+`capacity` frames. The index stores a sequence number, the capture timestamp
+and the window rectangle of each frame.
+"""
+
+import json
+import time
+import zlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .capture_strategy import CaptureStrategy
+from .frame_source import Frame
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b'SCOUTREC'
+FORMAT_VERSION = 1
+HEADER_SIZE = 4096
+SLOT_ALIGNMENT = 4096
+
+INDEX_DTYPE = np.dtype([
+    ('seq', '<i8'),         # -1 for empty slots
+    ('timestamp', '<f8'),   # time.monotonic() at capture
+    ('left', '<i4'),
+    ('top', '<i4'),
+    ('width', '<i4'),
+    ('height', '<i4'),
+    ('nbytes', '<i4'),      # Bytes used in the slot
+    ('compressed', 'u1')
+])
+
+
+def _layout(width: int, height: int, channels: int, capacity: int) -> Tuple[int, int, int]:
+    """
+    Compute the file layout.
+
+    Returns:
+        Tuple of (slot size, offset of the first slot, total file size)
+    """
+    slot_size = width * height * channels
+    index_end = HEADER_SIZE + capacity * INDEX_DTYPE.itemsize
+    slots_offset = -(-index_end // SLOT_ALIGNMENT) * SLOT_ALIGNMENT
+    return slot_size, slots_offset, slots_offset + capacity * slot_size
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    """A frame read back from a recording."""
+    seq: int
+    timestamp: float
+    image: np.ndarray  # BGR, read-only
+    window_rect: Tuple[int, int, int, int]  # (left, top, width, height)
+
+
+class FrameRecorder:
+    """
+    Writes frames to a memory-mapped ring file.
+
+    Frames may be smaller than the slot dimensions (e.g. after the window
+    shrank) but not larger; larger frames are skipped and counted.
+    """
+
+    def __init__(self, path: str, width: int, height: int, channels: int = 3,
+                 capacity: int = 300, compress: bool = False, compression_level: int = 1,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """
+        Create a recording file.
+
+        Args:
+            path: Path of the recording file (overwritten if it exists)
+            width: Maximum frame width
+            height: Maximum frame height
+            channels: Number of color channels
+            capacity: Number of frames kept in the ring
+            compress: Whether to zlib-compress frames
+            compression_level: zlib compression level (1 fastest, 9 smallest)
+            metadata: Extra session metadata stored in the header (e.g. window title)
+        """
+        if width <= 0 or height <= 0 or channels <= 0 or capacity <= 0:
+            raise ValueError("Recording dimensions and capacity must be positive")
+
+        self.path = path
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.capacity = capacity
+        self.compress = compress
+        self.compression_level = compression_level
+
+        header = {
+            'version': FORMAT_VERSION,
+            'width': width,
+            'height': height,
+            'channels': channels,
+            'capacity': capacity,
+            'compress': compress,
+            'created': time.time(),
+            'metadata': metadata or {}
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        if len(MAGIC) + 4 + len(header_bytes) > HEADER_SIZE:
+            raise ValueError("Recording metadata is too large")
+
+        self._slot_size, slots_offset, file_size = _layout(width, height, channels, capacity)
+        self._data = np.memmap(path, dtype=np.uint8, mode='w+', shape=(file_size,))
+        self._data[:len(MAGIC)] = np.frombuffer(MAGIC, dtype=np.uint8)
+        self._data[len(MAGIC):len(MAGIC) + 4] = np.frombuffer(
+            np.uint32(len(header_bytes)).tobytes(), dtype=np.uint8)
+        self._data[len(MAGIC) + 4:len(MAGIC) + 4 + len(header_bytes)] = np.frombuffer(
+            header_bytes, dtype=np.uint8)
+
+        self._index = self._data[HEADER_SIZE:HEADER_SIZE + capacity * INDEX_DTYPE.itemsize].view(INDEX_DTYPE)
+        self._index['seq'] = -1
+        self._slots = self._data[slots_offset:].reshape(capacity, self._slot_size)
+
+        self._next_seq = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.frames_written = 0
+        self.frames_skipped = 0
+        self.bytes_raw = 0
+        self.bytes_stored = 0
+
+        logger.info(f"Recording frames to {path} ({width}x{height}, {capacity} slots, "
+                    f"compression {'on' if compress else 'off'})")
+
+    def record(self, image: np.ndarray, timestamp: Optional[float] = None,
+               window_rect: Optional[Tuple[int, int, int, int]] = None) -> Optional[int]:
+        """
+        Append a frame to the ring.
+
+        Args:
+            image: Frame in BGR format
+            timestamp: Capture time from time.monotonic() (default: now)
+            window_rect: Window rectangle (left, top, width, height) at capture
+
+        Returns:
+            Sequence number of the frame, or None if it was skipped
+        """
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim == 3 else 1
+        if width > self.width or height > self.height or channels != self.channels or image.dtype != np.uint8:
+            self.frames_skipped += 1
+            logger.warning(f"Skipping frame of shape {image.shape}, recording holds up to "
+                           f"{self.width}x{self.height}x{self.channels}")
+            return None
+
+        raw = np.ascontiguousarray(image).tobytes()
+        payload = raw
+        compressed = False
+        if self.compress:
+            packed = zlib.compress(raw, self.compression_level)
+            if len(packed) < len(raw):
+                payload = packed
+                compressed = True
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if window_rect is None:
+            window_rect = (0, 0, width, height)
+
+        with self._lock:
+            if self._data is None:
+                raise ValueError("Recording is closed")
+
+            seq = self._next_seq
+            self._next_seq += 1
+            slot = seq % self.capacity
+
+            # Invalidate the slot while it is rewritten so readers skip it
+            entry = self._index[slot]
+            entry['seq'] = -1
+            self._slots[slot, :len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+            entry['timestamp'] = timestamp
+            entry['left'], entry['top'] = window_rect[0], window_rect[1]
+            entry['width'], entry['height'] = width, height
+            entry['nbytes'] = len(payload)
+            entry['compressed'] = compressed
+            entry['seq'] = seq
+
+            self.frames_written += 1
+            self.bytes_raw += len(raw)
+            self.bytes_stored += len(payload)
+
+        return seq
+
+    def record_frame(self, frame: Frame) -> Optional[int]:
+        """
+        Append a captured frame, using its origin as the window position.
+
+        Args:
+            frame: Frame from a FrameSource
+
+        Returns:
+            Sequence number of the frame, or None if it was skipped
+        """
+        left, top = frame.origin if frame.origin is not None else (0, 0)
+        return self.record(frame.image, frame.timestamp, (left, top, frame.width, frame.height))
+
+    def flush(self) -> None:
+        """Flush written frames to disk."""
+        with self._lock:
+            if self._data is not None:
+                self._data.flush()
+
+    def close(self) -> None:
+        """Flush and close the recording file."""
+        with self._lock:
+            if self._data is None:
+                return
+            self._data.flush()
+            self._index = None
+            self._slots = None
+            self._data = None
+        logger.info(f"Closed recording {self.path} ({self.frames_written} frames)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get recorder statistics.
+
+        Returns:
+            Dictionary with frame counts and the compression ratio
+        """
+        return {
+            'frames_written': self.frames_written,
+            'frames_skipped': self.frames_skipped,
+            'frames_retained': min(self.frames_written, self.capacity),
+            'bytes_raw': self.bytes_raw,
+            'bytes_stored': self.bytes_stored,
+            'compression_ratio': self.bytes_raw / self.bytes_stored if self.bytes_stored else 0.0
+        }
+
+    def __enter__(self) -> 'FrameRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FrameRecording:
+    """
+    Read access to a recording file, in capture order.
+
+    Uncompressed frames are returned as read-only views into the memory map,
+    so reading them does not copy pixel data.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a recording file.
+
+        Args:
+            path: Path of the recording file
+
+        Raises:
+            ValueError: If the file is not a recording
+        """
+        self.path = path
+        self._data = np.memmap(path, dtype=np.uint8, mode='r')
+
+        if bytes(self._data[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a frame recording: {path}")
+        header_length = int(self._data[len(MAGIC):len(MAGIC) + 4].view('<u4')[0])
+        header = json.loads(bytes(self._data[len(MAGIC) + 4:len(MAGIC) + 4 + header_length]).decode('utf-8'))
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version: {header.get('version')}")
+
+        self.width = header['width']
+        self.height = header['height']
+        self.channels = header['channels']
+        self.capacity = header['capacity']
+        self.created = header['created']
+        self.metadata: Dict[str, Any] = header['metadata']
+
+        self._slot_size, slots_offset, _ = _layout(self.width, self.height, self.channels, self.capacity)
+        self._index = self._data[HEADER_SIZE:HEADER_SIZE + self.capacity * INDEX_DTYPE.itemsize].view(INDEX_DTYPE)
+        self._slots = self._data[slots_offset:].reshape(self.capacity, self._slot_size)
+
+        self._order = np.empty(0, dtype=np.int64)
+        self._timestamps = np.empty(0, dtype=np.float64)
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Re-read the index, e.g. while the recording is still being written.
+
+        Returns:
+            Number of frames available
+        """
+        index = self._index.copy()
+        valid = np.flatnonzero(index['seq'] >= 0)
+        self._order = valid[np.argsort(index['seq'][valid], kind='stable')]
+        self._timestamps = index['timestamp'][self._order]
+        return len(self._order)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Capture timestamps in frame order."""
+        return self._timestamps
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and last frame."""
+        if len(self._timestamps) < 2:
+            return 0.0
+        return float(self._timestamps[-1] - self._timestamps[0])
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, position: int) -> RecordedFrame:
+        """
+        Get a frame by its position in capture order.
+
+        Args:
+            position: Frame position (negative positions count from the end)
+
+        Returns:
+            Recorded frame
+        """
+        slot = int(self._order[position])
+        entry = self._index[slot]
+        width, height = int(entry['width']), int(entry['height'])
+        payload = self._slots[slot, :int(entry['nbytes'])]
+
+        if entry['compressed']:
+            image = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+        else:
+            image = payload
+        shape = (height, width, self.channels) if self.channels > 1 else (height, width)
+        image = image.reshape(shape)
+        image.flags.writeable = False
+
+        return RecordedFrame(
+            seq=int(entry['seq']),
+            timestamp=float(entry['timestamp']),
+            image=image,
+            window_rect=(int(entry['left']), int(entry['top']), width, height)
+        )
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        for position in range(len(self)):
+            yield self[position]
+
+
+class ReplayCaptureStrategy(CaptureStrategy):
+    """
+    Capture strategy that replays a recording instead of grabbing the screen.
+
+    In real-time mode each capture returns the frame that was on screen at
+    the corresponding point of the recorded session (scaled by speed), so a
+    slow consumer skips frames just as it would live. Otherwise every capture
+    returns the next frame, replaying as fast as the consumer can go.
+    """
+
+    def __init__(self, recording: Union[str, FrameRecording], realtime: bool = True,
+                 speed: float = 1.0, loop: bool = False,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the replay strategy.
+
+        Args:
+            recording: Recording or path of a recording file
+            realtime: Whether to follow the recorded timing
+            speed: Playback speed factor in real-time mode
+            loop: Whether to restart at the end of the recording
+            clock: Time source used for real-time playback
+        """
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+
+        self.recording = recording if isinstance(recording, FrameRecording) else FrameRecording(recording)
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+        self._clock = clock
+
+        self._position = 0
+        self._start_time: Optional[float] = None
+        self._last_seq: Optional[int] = None
+        self.window_rect: Optional[Tuple[int, int, int, int]] = None
+        self.finished = False
+
+        # Statistics
+        self.frames_replayed = 0
+        self.frames_skipped = 0
+        self.frames_repeated = 0
+
+    def capture(self, hwnd: int, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """
+        Return the next frame of the recording.
+
+        Args:
+            hwnd: Window handle (not used for replay)
+            rect: Window rectangle (not used; the recorded one is in window_rect)
+
+        Returns:
+            Recorded frame in BGR format, or None once the recording has ended
+        """
+        count = len(self.recording)
+        if count == 0 or self.finished:
+            return None
+
+        position = self._next_realtime_position(count) if self.realtime else self._next_position(count)
+        if position is None:
+            self.finished = True
+            return None
+
+        frame = self.recording[position]
+        if self._last_seq is not None:
+            if frame.seq == self._last_seq:
+                self.frames_repeated += 1
+            elif frame.seq > self._last_seq + 1:
+                self.frames_skipped += frame.seq - self._last_seq - 1
+        self._last_seq = frame.seq
+
+        self.frames_replayed += 1
+        self.window_rect = frame.window_rect
+        return frame.image
+
+    def reset(self) -> None:
+        """Restart playback from the first frame."""
+        self._position = 0
+        self._start_time = None
+        self._last_seq = None
+        self.finished = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get replay statistics.
+
+        Returns:
+            Dictionary with replayed, skipped and repeated frame counts
+        """
+        return {
+            'frames_replayed': self.frames_replayed,
+            'frames_skipped': self.frames_skipped,
+            'frames_repeated': self.frames_repeated,
+            'recording_frames': len(self.recording),
+            'finished': self.finished
+        }
+
+    def _next_position(self, count: int) -> Optional[int]:
+        """Next frame position when replaying as fast as possible."""
+        if self._position >= count:
+            if not self.loop:
+                return None
+            self._position = 0
+            self._last_seq = None
+        position = self._position
+        self._position += 1
+        return position
+
+    def _next_realtime_position(self, count: int) -> Optional[int]:
+        """Frame position matching the elapsed playback time."""
+        now = self._clock()
+        if self._start_time is None:
+            self._start_time = now
+
+        timestamps = self.recording.timestamps
+        duration = self.recording.duration
+        # The last frame stays on screen for one average frame interval
+        frame_interval = duration / (count - 1) if count > 1 else 0.0
+        elapsed = (now - self._start_time) * self.speed
+
+        period = duration + frame_interval
+        if elapsed > period:
+            if not self.loop:
+                return None
+            elapsed = elapsed % period if period > 0 else 0.0
+            self._last_seq = None
+
+        position = int(np.searchsorted(timestamps, timestamps[0] + elapsed, side='right')) - 1
+        return min(max(position, 0), count - 1)
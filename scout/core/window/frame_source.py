@@ -0,0 +1,437 @@
+"""
+Frame Source
+
+This module provides the FrameSource class, a shared capture point that stamps
+every frame with a monotonic ID and timestamp. Services ask either for the
+latest frame or for a frame newer than one they already processed, so a single
+capture per tick is shared by everything that needs the window contents.
+"""
+
+import time
+import uuid
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# A capture function returns an image, optionally with the screen position of its top-left pixel
+CaptureResult = Union[np.ndarray, Tuple[np.ndarray, Optional[Tuple[int, int]]], None]
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    A captured frame.
+
+    The image is read-only because the same frame is handed to every consumer;
+    copy it before drawing on it.
+    """
+    frame_id: int
+    timestamp: float  # time.monotonic() at capture
+    image: np.ndarray  # BGR
+    origin: Optional[Tuple[int, int]] = None  # Screen position of pixel (0, 0)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the frame was captured."""
+        return time.monotonic() - self.timestamp
+
+    @property
+    def width(self) -> int:
+        """Frame width in pixels."""
+        return self.image.shape[1]
+
+    @property
+    def height(self) -> int:
+        """Frame height in pixels."""
+        return self.image.shape[0]
+
+    def crop(self, region: Dict[str, int]) -> Optional[np.ndarray]:
+        """
+        Get a view of a screen region from this frame.
+
+        Args:
+            region: Region in screen coordinates {left, top, width, height}
+
+        Returns:
+            View into the frame image, or None if the frame has no screen
+            origin or does not fully contain the region
+        """
+        if self.origin is None:
+            return None
+
+        x = region['left'] - self.origin[0]
+        y = region['top'] - self.origin[1]
+        w = region['width']
+        h = region['height']
+
+        if x < 0 or y < 0 or w <= 0 or h <= 0 or x + w > self.width or y + h > self.height:
+            return None
+
+        return self.image[y:y+h, x:x+w]
+
+
+class FrameSource:
+    """
+    Shared, versioned source of captured frames.
+
+    Captures go through a single lock so concurrent requests for the same tick
+    share one capture. Frame IDs increase monotonically, which lets consumers
+    tell whether they have already processed a frame.
+
+    When a background producer (see CaptureWorker) is attached, requests wait
+    for its next frame instead of capturing on the caller's thread. Consumers
+    always get the newest frame; frames nobody asked for are counted as dropped.
+    """
+
+    def __init__(self, capture_func: Callable[[], CaptureResult],
+                 min_interval: float = 1 / 30, name: str = 'frames'):
+        """
+        Initialize the frame source.
+
+        Args:
+            capture_func: Function capturing an image, or an (image, origin) tuple;
+                          returns None on failure
+            min_interval: Minimum time between captures in seconds (one tick)
+            name: Name used in log messages
+        """
+        self._capture_func = capture_func
+        self.min_interval = min_interval
+        self.name = name
+        self.source_id = uuid.uuid4().hex  # Tells frame IDs of different sources apart in shared caches
+
+        self._latest: Optional[Frame] = None
+        self._next_id = 1
+        self._lock = threading.Lock()  # Guards frame state and statistics
+        self._capture_lock = threading.Lock()  # Serializes captures
+        self._frame_published = threading.Condition(self._lock)
+        self._producer = None  # Background producer feeding this source
+        self._delivered_id = 0  # Highest frame ID handed to a consumer
+
+        # Statistics
+        self.captures = 0
+        self.shared = 0
+        self.failures = 0
+        self.dropped = 0
+        self._consumer_drops: Dict[str, int] = {}
+
+    @property
+    def latest_frame(self) -> Optional[Frame]:
+        """The most recent frame, without capturing."""
+        return self._latest
+
+    @property
+    def latest_id(self) -> int:
+        """ID of the most recent frame (0 if none was captured yet)."""
+        frame = self._latest
+        return frame.frame_id if frame is not None else 0
+
+    @property
+    def producer(self) -> Optional[Any]:
+        """The attached background producer, if any."""
+        return self._producer
+
+    def set_producer(self, producer: Optional[Any]) -> None:
+        """
+        Attach or detach a background producer.
+
+        The producer must expose is_running and interval and publish frames
+        through capture_now.
+
+        Args:
+            producer: Producer to attach, or None to capture on demand again
+        """
+        with self._lock:
+            self._producer = producer
+            self._frame_published.notify_all()
+
+    def get_latest(self, max_age: Optional[float] = None) -> Optional[Frame]:
+        """
+        Get the latest frame, capturing a new one if it is too old.
+
+        Ages below one tick are raised to the tick length, so a frame is never
+        captured more than once per tick.
+
+        Args:
+            max_age: Maximum acceptable frame age in seconds (None for one tick)
+
+        Returns:
+            Frame or None if capture failed
+        """
+        producer = self._producer
+        if max_age is None and producer is not None and producer.is_running:
+            # Any frame from the producer's current interval is the latest one
+            max_age = producer.interval + self.min_interval
+        max_age = self.min_interval if max_age is None else max(max_age, self.min_interval)
+
+        frame = self._latest
+        if frame is not None and frame.age <= max_age:
+            return self._deliver(frame, shared=True)
+
+        # Let a running producer deliver the frame instead of capturing here
+        frame = self._wait_for_producer(
+            lambda latest: latest is not None and latest.age <= max_age
+        )
+        if frame is not None:
+            return self._deliver(frame, shared=True)
+
+        with self._capture_lock:
+            # Another caller may have captured while we were waiting
+            frame = self._latest
+            if frame is not None and frame.age <= max_age:
+                return self._deliver(frame, shared=True)
+
+            return self._deliver(self._capture())
+
+    def get_newer_than(self, frame_id: int, timeout: Optional[float] = None,
+                       consumer: Optional[str] = None,
+                       cancel_event: Optional[threading.Event] = None) -> Optional[Frame]:
+        """
+        Get a frame newer than the given frame ID.
+
+        If the latest frame is not newer, a new frame is captured as soon as
+        the current tick has elapsed. Frames between frame_id and the returned
+        one are skipped (latest wins) and counted as dropped for the consumer.
+
+        Args:
+            frame_id: ID of the last frame the caller has seen
+            timeout: Maximum time to wait in seconds (None to wait for the tick)
+            consumer: Name used for per-consumer dropped-frame counters
+            cancel_event: Event ending the wait early when set; call
+                wake_waiters after setting it to interrupt a wait for the producer
+
+        Returns:
+            Frame or None if capture failed, the timeout would be exceeded or
+            the wait was cancelled
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        frame = self._latest
+        if frame is not None and frame.frame_id > frame_id:
+            return self._deliver(frame, frame_id, consumer, shared=True)
+
+        frame = self._wait_for_producer(
+            lambda latest: latest is not None and latest.frame_id > frame_id, deadline, cancel_event
+        )
+        if frame is not None:
+            return self._deliver(frame, frame_id, consumer, shared=True)
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+
+        with self._capture_lock:
+            frame = self._latest
+            if frame is not None and frame.frame_id > frame_id:
+                return self._deliver(frame, frame_id, consumer, shared=True)
+
+            # Respect the tick before capturing again
+            if frame is not None:
+                wait = frame.timestamp + self.min_interval - time.monotonic()
+                if wait > 0:
+                    if deadline is not None and time.monotonic() + wait > deadline:
+                        return None
+                    if cancel_event is not None:
+                        if cancel_event.wait(wait):
+                            return None
+                    else:
+                        time.sleep(wait)
+
+            return self._deliver(self._capture(), frame_id, consumer)
+
+    def wake_waiters(self) -> None:
+        """Wake threads waiting for the producer so they re-check their cancel events."""
+        with self._frame_published:
+            self._frame_published.notify_all()
+
+    def capture_now(self) -> Optional[Frame]:
+        """
+        Capture and publish a new frame regardless of the tick.
+
+        Used by background producers; consumers should use get_latest or
+        get_newer_than.
+
+        Returns:
+            New frame or None if capture failed
+        """
+        with self._capture_lock:
+            return self._capture()
+
+    def publish(self, image: np.ndarray, origin: Optional[Tuple[int, int]] = None,
+                timestamp: Optional[float] = None) -> Frame:
+        """
+        Publish an externally captured image as the latest frame.
+
+        Args:
+            image: Captured image (BGR)
+            origin: Screen position of the image's top-left pixel
+            timestamp: Capture time from time.monotonic() (None for now)
+
+        Returns:
+            The new frame
+        """
+        image.flags.writeable = False
+
+        with self._lock:
+            frame = Frame(
+                frame_id=self._next_id,
+                timestamp=time.monotonic() if timestamp is None else timestamp,
+                image=image,
+                origin=origin
+            )
+            self._next_id += 1
+            self._latest = frame
+            self._frame_published.notify_all()
+
+        return frame
+
+    def invalidate(self) -> None:
+        """Drop the latest frame so the next request captures a new one."""
+        with self._lock:
+            self._latest = None
+
+    def get_footprint(self) -> int:
+        """
+        Get the memory held by the latest frame.
+
+        Returns:
+            Size in bytes
+        """
+        frame = self._latest
+        return frame.image.nbytes if frame is not None else 0
+
+    def trim(self, target_bytes: int) -> int:
+        """
+        Drop the latest frame if it exceeds the target size.
+
+        Args:
+            target_bytes: Size to trim down to
+
+        Returns:
+            Number of frames dropped
+        """
+        if self._latest is None or self.get_footprint() <= target_bytes:
+            return 0
+
+        self.invalidate()
+        return 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get frame source statistics.
+
+        Returns:
+            Dictionary with capture counts, shared requests and latest frame info
+        """
+        with self._lock:
+            frame = self._latest
+            requests = self.captures + self.shared
+            return {
+                'captures': self.captures,
+                'shared': self.shared,
+                'failures': self.failures,
+                'dropped': self.dropped,
+                'consumer_drops': dict(self._consumer_drops),
+                'share_ratio': self.shared / requests if requests else 0.0,
+                'latest_id': frame.frame_id if frame is not None else 0,
+                'latest_age': frame.age if frame is not None else None
+            }
+
+    def _deliver(self, frame: Optional[Frame], seen_id: Optional[int] = None,
+                 consumer: Optional[str] = None, shared: bool = False) -> Optional[Frame]:
+        """
+        Record that a frame is handed to a consumer.
+
+        Args:
+            frame: Frame being delivered (None is passed through)
+            seen_id: Last frame ID the consumer had seen, if known
+            consumer: Consumer name for per-consumer drop counters
+            shared: Whether the frame was served without capturing
+
+        Returns:
+            The frame
+        """
+        if frame is None:
+            return None
+
+        with self._lock:
+            if shared:
+                self.shared += 1
+
+            # Frames newer than the last delivered one that nobody received
+            if frame.frame_id > self._delivered_id:
+                if self._delivered_id:
+                    self.dropped += frame.frame_id - self._delivered_id - 1
+                self._delivered_id = frame.frame_id
+
+            if consumer is not None and seen_id:
+                skipped = max(frame.frame_id - seen_id - 1, 0)
+                self._consumer_drops[consumer] = self._consumer_drops.get(consumer, 0) + skipped
+
+        return frame
+
+    def _wait_for_producer(self, accept: Callable[[Optional[Frame]], bool],
+                           deadline: Optional[float] = None,
+                           cancel_event: Optional[threading.Event] = None) -> Optional[Frame]:
+        """
+        Wait for a running producer to publish an acceptable frame.
+
+        Args:
+            accept: Predicate applied to the latest frame
+            deadline: time.monotonic() value to give up at (None for two producer intervals)
+            cancel_event: Event ending the wait early when set
+
+        Returns:
+            Accepted frame, or None if no producer is running, it did not
+            deliver in time or the wait was cancelled
+        """
+        producer = self._producer
+        if producer is None or not producer.is_running:
+            return None
+
+        if deadline is None:
+            deadline = time.monotonic() + 2 * producer.interval + self.min_interval
+
+        with self._frame_published:
+            while not accept(self._latest):
+                remaining = deadline - time.monotonic()
+                producer = self._producer
+                if remaining <= 0 or producer is None or not producer.is_running:
+                    return None
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                self._frame_published.wait(remaining)
+            return self._latest
+
+    def _capture(self) -> Optional[Frame]:
+        """
+        Capture a new frame. Must be called with the capture lock held.
+
+        Returns:
+            New frame or None if capture failed
+        """
+        timestamp = time.monotonic()
+        try:
+            result = self._capture_func()
+        except Exception as e:
+            logger.error(f"Error capturing frame for {self.name}: {e}")
+            result = None
+
+        origin = None
+        if isinstance(result, tuple):
+            result, origin = result
+
+        if result is None:
+            with self._lock:
+                self.failures += 1
+            return None
+
+        with self._lock:
+            self.captures += 1
+
+        return self.publish(result, origin, timestamp)
@@ -6,48 +6,126 @@ window capture implementation, especially for converting between QImage and nump
 """
 
 import logging
+import cv2
 import numpy as np
 from typing import Optional
 
 from PyQt6.QtGui import QImage
 from PyQt6.QtCore import Qt, QSize
+from PyQt6 import sip
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
-def qimage_to_numpy(image: QImage) -> Optional[np.ndarray]:
+# 32-bit formats whose bytes are B, G, R, A in memory (on little-endian hosts)
+_BGRA_FORMATS = (
+    QImage.Format.Format_RGB32,
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied
+)
+
+# 32-bit formats whose bytes are R, G, B, A in memory
+_RGBA_FORMATS = (
+    QImage.Format.Format_RGBX8888,
+    QImage.Format.Format_RGBA8888,
+    QImage.Format.Format_RGBA8888_Premultiplied
+)
+
+
+class _QImageBuffer:
     """
-    Convert a QImage to a numpy array in BGR format (for OpenCV compatibility).
+    Exposes a QImage's pixels to NumPy while holding a reference to it.
+    
+    Arrays created from this object keep it as their base, so the QImage
+    stays alive as long as any view of its pixels does.
+    """
+    
+    def __init__(self, image: QImage, channels: int):
+        """
+        Initialize the buffer.
+        
+        Args:
+            image: Image whose pixels are exposed (read-only)
+            channels: Bytes per pixel
+        """
+        self.qimage = image
+        height, width = image.height(), image.width()
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        strides = (image.bytesPerLine(), channels, 1) if channels > 1 else (image.bytesPerLine(), 1)
+        self.__array_interface__ = {
+            'version': 3,
+            'shape': shape,
+            'typestr': '|u1',
+            'strides': strides,
+            'data': (int(image.constBits()), True)
+        }
+
+
+def _view_qimage(image: QImage, channels: int) -> np.ndarray:
+    """Create a read-only view of a QImage's pixel rows, honoring row padding."""
+    return np.asarray(_QImageBuffer(image, channels))
+
+
+def qimage_to_bgra(image: QImage) -> Optional[np.ndarray]:
+    """
+    Get a QImage's pixels as a BGRA array, without copying when possible.
+    
+    32-bit formats stored as B, G, R, A (RGB32, ARGB32) are returned as a
+    read-only view that keeps the QImage alive; OpenCV consumes it directly,
+    e.g. cv2.cvtColor(view, cv2.COLOR_BGRA2GRAY). Other formats are converted
+    once.
     
     Args:
         image: QImage to convert
         
     Returns:
-        np.ndarray: Numpy array in BGR format, or None if conversion failed
+        np.ndarray: BGRA array (read-only), or None if conversion failed
     """
     if image is None or image.isNull():
         logger.error("Cannot convert null QImage to numpy array")
         return None
         
     try:
-        # Convert to RGB32 format first for consistent handling
-        if image.format() != QImage.Format.Format_RGB32:
-            image = image.convertToFormat(QImage.Format.Format_RGB32)
-            
-        # Get image dimensions
-        width = image.width()
-        height = image.height()
+        if image.format() in _BGRA_FORMATS:
+            return _view_qimage(image, 4)
+        if image.format() in _RGBA_FORMATS:
+            return cv2.cvtColor(_view_qimage(image, 4), cv2.COLOR_RGBA2BGRA)
+        return _view_qimage(image.convertToFormat(QImage.Format.Format_ARGB32), 4)
         
-        # Create numpy array from image data
-        ptr = image.bits()
-        ptr.setsize(height * width * 4)  # 4 bytes per pixel (RGBA)
-        arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
+    except Exception as e:
+        logger.error(f"Error converting QImage to numpy array: {e}")
+        return None
+
+
+def qimage_to_numpy(image: QImage) -> Optional[np.ndarray]:
+    """
+    Convert a QImage to a numpy array in BGR format (for OpenCV compatibility).
+    
+    The alpha channel is dropped in a single pass over the shared pixel
+    buffer; use qimage_to_bgra to avoid the copy altogether.
+    
+    Args:
+        image: QImage to convert
         
-        # Convert from RGBA to BGR (OpenCV format)
-        bgr_array = arr[:, :, 2::-1].copy()  # Copy to ensure memory continuity
+    Returns:
+        np.ndarray: Contiguous numpy array in BGR format, or None if conversion failed
+    """
+    if image is None or image.isNull():
+        logger.error("Cannot convert null QImage to numpy array")
+        return None
         
-        logger.debug(f"Converted QImage {width}x{height} to numpy array")
+    try:
+        if image.format() in _RGBA_FORMATS:
+            bgr_array = cv2.cvtColor(_view_qimage(image, 4), cv2.COLOR_RGBA2BGR)
+        elif image.format() == QImage.Format.Format_BGR888:
+            bgr_array = np.ascontiguousarray(_view_qimage(image, 3))
+        elif image.format() == QImage.Format.Format_RGB888:
+            bgr_array = cv2.cvtColor(_view_qimage(image, 3), cv2.COLOR_RGB2BGR)
+        else:
+            bgr_array = cv2.cvtColor(qimage_to_bgra(image), cv2.COLOR_BGRA2BGR)
+            
+        logger.debug(f"Converted QImage {image.width()}x{image.height()} to numpy array")
         return bgr_array
         
     except Exception as e:
@@ -57,48 +135,115 @@ def qimage_to_numpy(image: QImage) -> Optional[np.ndarray]:
 
 def numpy_to_qimage(array: np.ndarray) -> Optional[QImage]:
     """
-    Convert a numpy array to a QImage.
+    Wrap a numpy array in a QImage without copying pixel data.
+    
+    BGR arrays map to Format_BGR888, BGRA arrays to Format_ARGB32 (the same
+    byte order) and grayscale arrays to Format_Grayscale8. The QImage shares
+    the array's memory and keeps a reference to it; call .copy() on the
+    QImage if it must outlive the Python wrapper (QPixmap.fromImage already
+    copies).
     
     Args:
-        array: Numpy array (BGR format expected for best results)
+        array: Numpy array (BGR, BGRA or grayscale, uint8)
         
     Returns:
-        QImage: Converted image, or None if conversion failed
+        QImage: Image sharing the array's memory, or None if conversion failed
     """
     if array is None or not isinstance(array, np.ndarray):
         logger.error("Invalid numpy array for conversion to QImage")
         return None
         
     try:
+        if array.dtype != np.uint8:
+            logger.error(f"Unsupported array dtype for QImage: {array.dtype}")
+            return None
+            
+        if array.ndim == 2:  # Grayscale
+            image_format = QImage.Format.Format_Grayscale8
+        elif array.ndim == 3 and array.shape[2] == 3:  # BGR
+            image_format = QImage.Format.Format_BGR888
+        elif array.ndim == 3 and array.shape[2] == 4:  # BGRA
+            image_format = QImage.Format.Format_ARGB32
+        else:
+            logger.error(f"Unsupported array shape for QImage: {array.shape}")
+            return None
+            
+        # Rows may be padded (e.g. crops), but pixels within a row must be packed
+        pixel_strides = (array.itemsize,) if array.ndim == 2 else (array.shape[2], 1)
+        if array.strides[1:] != pixel_strides or array.strides[0] < 0:
+            array = np.ascontiguousarray(array)
+            
         height, width = array.shape[:2]
+        image = QImage(sip.voidptr(array.ctypes.data), width, height, array.strides[0], image_format)
+        # Keep the buffer alive as long as the QImage wrapper
+        image._numpy_buffer = array
         
-        # Handle different array formats
-        if len(array.shape) == 2:  # Grayscale
-            # Create a grayscale QImage
-            bytes_per_line = width
-            return QImage(array.data, width, height, bytes_per_line, QImage.Format.Format_Grayscale8)
-            
-        elif len(array.shape) == 3:
-            if array.shape[2] == 3:  # BGR
-                # Convert BGR to RGB
-                rgb = array[:, :, ::-1].copy()  # Copy to ensure memory continuity
-                bytes_per_line = width * 3
-                return QImage(rgb.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                
-            elif array.shape[2] == 4:  # BGRA
-                # Convert BGRA to RGBA
-                rgba = array[:, :, [2, 1, 0, 3]].copy()  # Copy to ensure memory continuity
-                bytes_per_line = width * 4
-                return QImage(rgba.data, width, height, bytes_per_line, QImage.Format.Format_RGBA8888)
-                
         logger.debug(f"Converted numpy array {width}x{height} to QImage")
-        return None  # Unsupported format
+        return image
         
     except Exception as e:
         logger.error(f"Error converting numpy array to QImage: {e}")
         return None
 
 
+class QImageFrame:
+    """
+    A captured QImage with NumPy conversions computed lazily.
+    
+    Conversions are done on first access and cached, so a frame that is only
+    displayed never gets converted, and several consumers of the same frame
+    share one conversion. The arrays are read-only; copy them before drawing.
+    """
+    
+    def __init__(self, image: QImage):
+        """
+        Initialize the frame.
+        
+        Args:
+            image: Captured image
+        """
+        self.image = image
+        self._bgra: Optional[np.ndarray] = None
+        self._bgr: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        
+    @property
+    def width(self) -> int:
+        """Frame width in pixels."""
+        return self.image.width()
+        
+    @property
+    def height(self) -> int:
+        """Frame height in pixels."""
+        return self.image.height()
+        
+    @property
+    def bgra(self) -> Optional[np.ndarray]:
+        """BGRA pixels, a zero-copy view for 32-bit frames."""
+        if self._bgra is None:
+            self._bgra = qimage_to_bgra(self.image)
+        return self._bgra
+        
+    @property
+    def bgr(self) -> Optional[np.ndarray]:
+        """Contiguous BGR pixels."""
+        if self._bgr is None:
+            self._bgr = qimage_to_numpy(self.image)
+            if self._bgr is not None:
+                self._bgr.flags.writeable = False
+        return self._bgr
+        
+    @property
+    def gray(self) -> Optional[np.ndarray]:
+        """Grayscale pixels, converted straight from BGRA."""
+        if self._gray is None:
+            bgra = self.bgra
+            if bgra is not None:
+                self._gray = cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY)
+                self._gray.flags.writeable = False
+        return self._gray
+
+
 def resize_image(image: QImage, max_width: int = 1920, max_height: int = 1080) -> QImage:
     """
     Resize an image if it exceeds the specified dimensions, preserving aspect ratio.
@@ -0,0 +1,138 @@
+"""
+Screen Grabber
+
+This module provides the ScreenGrabber class, which keeps one long-lived mss
+instance per thread instead of opening a new one (and a new display
+connection) for every capture. It also converts mss's BGRA buffers to
+contiguous BGR arrays in a single step.
+"""
+
+import logging
+import threading
+from typing import Any, Dict
+
+import cv2
+import mss
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ScreenGrabber:
+    """
+    Pool of thread-local mss grabbers.
+
+    mss instances hold platform handles that must not be shared between
+    threads, so each thread gets its own, created on first use and kept until
+    close_thread or close_all is called.
+    """
+
+    def __init__(self):
+        """Initialize the grabber pool."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances: Dict[int, Any] = {}  # id(instance) -> mss instance
+
+        # Statistics
+        self.grabs = 0
+        self.instances_created = 0
+
+    def get_grabber(self) -> Any:
+        """
+        Get the calling thread's mss instance, creating it if needed.
+
+        Returns:
+            mss instance owned by the calling thread
+        """
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._instances[id(sct)] = sct
+                self.instances_created += 1
+            logger.debug(f"Created screen grabber for thread {threading.current_thread().name}")
+        return sct
+
+    def grab_bgra(self, region: Dict[str, int]) -> np.ndarray:
+        """
+        Grab a screen region without color conversion.
+
+        The array is a zero-copy view of the grab buffer.
+
+        Args:
+            region: Region in screen coordinates {left, top, width, height}
+
+        Returns:
+            Image in BGRA format
+        """
+        shot = self.get_grabber().grab(region)
+        self.grabs += 1
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def grab(self, region: Dict[str, int]) -> np.ndarray:
+        """
+        Grab a screen region as a contiguous BGR image.
+
+        Dropping the alpha channel with cvtColor writes a new contiguous
+        array, unlike the [:, :, :3] slice whose strided view makes every
+        later OpenCV call copy it again.
+
+        Args:
+            region: Region in screen coordinates {left, top, width, height}
+
+        Returns:
+            Image in BGR format
+        """
+        return cv2.cvtColor(self.grab_bgra(region), cv2.COLOR_BGRA2BGR)
+
+    def close_thread(self) -> None:
+        """Close the calling thread's mss instance."""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            return
+
+        self._local.sct = None
+        with self._lock:
+            self._instances.pop(id(sct), None)
+        self._close(sct)
+
+    def close_all(self) -> None:
+        """
+        Close every mss instance, e.g. at shutdown.
+
+        Threads that grab again afterwards get a new instance.
+        """
+        with self._lock:
+            instances = list(self._instances.values())
+            self._instances.clear()
+        self._local = threading.local()
+
+        for sct in instances:
+            self._close(sct)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get grabber statistics.
+
+        Returns:
+            Dictionary with grab count and open/created instance counts
+        """
+        with self._lock:
+            return {
+                'grabs': self.grabs,
+                'open_instances': len(self._instances),
+                'instances_created': self.instances_created
+            }
+
+    def _close(self, sct: Any) -> None:
+        """Close an mss instance, ignoring errors from dead handles."""
+        try:
+            sct.close()
+        except Exception as e:
+            logger.debug(f"Error closing screen grabber: {e}")
+
+
+# Create a global screen grabber pool
+screen_grabber = ScreenGrabber()
@@ -6,30 +6,21 @@ It abstracts the details of capturing screenshots from windows.
 """
 
 from typing import Optional, Dict, Any, Tuple
-import win32gui
-import win32con
-import win32ui
+try:
+    import win32gui
+    import win32con
+    import win32ui
+except ImportError:
+    # Not on Windows: only the portable strategies can capture
+    win32gui = win32con = win32ui = None
 import numpy as np
-import mss
 import logging
 
-logger = logging.getLogger(__name__)
+from .capture_strategy import CaptureStrategy
+from .screen_grabber import screen_grabber
+from .x11_capture import X11CaptureStrategy
 
-class CaptureStrategy:
-    """Base class for different window capture strategies."""
-    
-    def capture(self, hwnd: int, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
-        """
-        Capture a screenshot using this strategy.
-        
-        Args:
-            hwnd: Window handle
-            rect: Window rectangle (left, top, width, height)
-            
-        Returns:
-            Screenshot as numpy array in BGR format or None if failed
-        """
-        raise NotImplementedError("Capture strategy must implement capture method")
+logger = logging.getLogger(__name__)
 
 class MSSCaptureStrategy(CaptureStrategy):
     """
@@ -37,6 +28,7 @@ class MSSCaptureStrategy(CaptureStrategy):
     
     This strategy uses the MSS library to capture screenshots, which is generally
     faster than other methods but captures the entire region including window decorations.
+    Grabbers are long-lived and thread-local (see ScreenGrabber).
     """
     
     def capture(self, hwnd: int, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
@@ -53,21 +45,15 @@ class MSSCaptureStrategy(CaptureStrategy):
         try:
             x, y, width, height = rect
             
-            with mss.mss() as sct:
-                monitor = {
-                    'left': x,
-                    'top': y,
-                    'width': width,
-                    'height': height
-                }
-                
-                # Grab screenshot
-                screenshot = np.array(sct.grab(monitor))
-                
-                # Convert from BGRA to BGR
-                screenshot = screenshot[:, :, :3]
-                
-                return screenshot
+            monitor = {
+                'left': x,
+                'top': y,
+                'width': width,
+                'height': height
+            }
+            
+            # Grab screenshot as contiguous BGR
+            return screen_grabber.grab(monitor)
                 
         except Exception as e:
             logger.error(f"MSS capture error: {e}")
@@ -142,9 +128,27 @@ class WindowCapture:
             'win32': Win32CaptureStrategy()
         }
         
+        # MIT-SHM capture on X11 hosts (e.g. browser instances under Xvfb)
+        if X11CaptureStrategy.is_available():
+            self.strategies['x11'] = X11CaptureStrategy()
+        
         # Set default strategy
         self.default_strategy = 'mss'
         
+    def register_strategy(self, name: str, strategy: CaptureStrategy, make_default: bool = False) -> None:
+        """
+        Register an additional capture strategy.
+        
+        Args:
+            name: Name used to select the strategy
+            strategy: Capture strategy instance
+            make_default: Whether to use the strategy when none is specified
+        """
+        self.strategies[name] = strategy
+        if make_default:
+            self.default_strategy = name
+        logger.info(f"Registered capture strategy '{name}'")
+        
     def capture(self, hwnd: int, rect: Tuple[int, int, int, int], 
                strategy_name: Optional[str] = None) -> Optional[np.ndarray]:
         """
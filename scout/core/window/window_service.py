@@ -24,6 +24,8 @@ from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QFontMetrics
 from ..interfaces.service_interfaces import WindowServiceInterface
 from ..services.event_bus import EventBus
 from .window_capture import WindowCapture
+from .frame_source import FrameSource
+from .capture_worker import CaptureWorker
 from ..events.event_types import EventType
 
 # Windows API structures for window operations
@@ -122,6 +124,10 @@ class WindowService(QObject, WindowServiceMixin):
         self._window_state = "unknown"
         self._window_capture = WindowCapture()
         
+        # Frames are shared by every consumer that asks within the same tick
+        self._frame_source = FrameSource(self._grab_screenshot, name='window_service')
+        self._capture_worker: Optional[CaptureWorker] = None
+        
         # Try to find the window
         self.find_window()
         
@@ -278,15 +284,74 @@ class WindowService(QObject, WindowServiceMixin):
             logger.error(f"Error getting window position: {e}")
             return None
     
+    @property
+    def frame_source(self) -> FrameSource:
+        """Shared source of versioned window frames."""
+        return self._frame_source
+    
+    @property
+    def capture_worker(self) -> Optional[CaptureWorker]:
+        """Background capture worker, if started."""
+        return self._capture_worker
+    
+    def start_capture_worker(self, rate: float = 30.0, buffer_size: int = 4) -> CaptureWorker:
+        """
+        Start capturing the window continuously in the background.
+        
+        While the worker runs, capture_screenshot returns its latest frame
+        instead of capturing on the caller's thread.
+        
+        Args:
+            rate: Capture rate in frames per second
+            buffer_size: Number of recent frames kept
+            
+        Returns:
+            The running capture worker
+        """
+        if self._capture_worker is None:
+            self._capture_worker = CaptureWorker(self._frame_source, rate, buffer_size)
+        else:
+            self._capture_worker.rate = rate
+        self._capture_worker.start()
+        return self._capture_worker
+    
+    def stop_capture_worker(self) -> None:
+        """Stop background capture and capture on demand again."""
+        if self._capture_worker is not None:
+            self._capture_worker.stop()
+            self._capture_worker = None
+    
     def capture_screenshot(self, use_strategy: Optional[str] = None) -> Optional[np.ndarray]:
         """
         Capture a screenshot of the game window.
         
+        With the default strategy the latest frame of the shared frame source
+        is returned, so callers within the same tick share one capture. When
+        the capture worker runs, the frame comes from its ring buffer.
+        
         Args:
             use_strategy: Capture strategy to use ('mss' or 'win32', None for default)
             
         Returns:
-            Optional[np.ndarray]: Screenshot as numpy array in BGR format, or None if failed
+            Optional[np.ndarray]: Screenshot as numpy array in BGR format (read-only
+            when shared), or None if failed
+        """
+        if use_strategy is not None:
+            captured = self._grab_screenshot(use_strategy)
+            return captured[0] if captured is not None else None
+            
+        frame = self._frame_source.get_latest()
+        return frame.image if frame is not None else None
+    
+    def _grab_screenshot(self, use_strategy: Optional[str] = None) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+        """
+        Capture a new screenshot of the game window.
+        
+        Args:
+            use_strategy: Capture strategy to use ('mss' or 'win32', None for default)
+            
+        Returns:
+            Tuple of (screenshot, window origin on screen), or None if failed
         """
         if not self.find_window():
             return None
@@ -320,7 +385,7 @@ class WindowService(QObject, WindowServiceMixin):
                     {'image': screenshot, 'window_position': position}
                 )
             
-            return screenshot
+            return screenshot, (x, y)
             
         except Exception as e:
             logger.error(f"Error capturing screenshot: {e}")
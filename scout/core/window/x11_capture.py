@@ -0,0 +1,574 @@
+"""
+X11 Capture
+
+This module provides the X11CaptureStrategy class, which captures windows on
+Linux X servers (including Xvfb) through the MIT-SHM extension. The server
+copies the window's drawable straight into a shared memory segment that is
+created once and reused for every frame of the same size, so a grab costs no
+socket transfer and no allocation.
+
+Xlib is accessed through ctypes, so no extra Python package is required.
+Windows are found by title through the _NET_CLIENT_LIST / _NET_WM_NAME
+properties set by window managers, falling back to walking the window tree
+and WM_NAME on bare X servers such as Xvfb.
+"""
+
+import os
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .capture_strategy import CaptureStrategy
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Xlib constants
+Z_PIXMAP = 2
+ALL_PLANES = 0xFFFFFFFFFFFFFFFF
+XA_WINDOW = 33
+ANY_PROPERTY_TYPE = 0
+SUCCESS = 0
+IS_VIEWABLE = 2
+
+# System V IPC constants
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+
+class XImage(ctypes.Structure):
+    """Leading fields of Xlib's XImage (only ever used through a pointer)."""
+    _fields_ = [
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('xoffset', ctypes.c_int),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p),
+        ('byte_order', ctypes.c_int),
+        ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int),
+        ('bitmap_pad', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int),
+        ('bits_per_pixel', ctypes.c_int)
+    ]
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    """MIT-SHM segment descriptor."""
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong),
+        ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p),
+        ('readOnly', ctypes.c_int)
+    ]
+
+
+class XWindowAttributes(ctypes.Structure):
+    """Xlib window attributes."""
+    _fields_ = [
+        ('x', ctypes.c_int),
+        ('y', ctypes.c_int),
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('border_width', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('visual', ctypes.c_void_p),
+        ('root', ctypes.c_ulong),
+        ('class_', ctypes.c_int),
+        ('bit_gravity', ctypes.c_int),
+        ('win_gravity', ctypes.c_int),
+        ('backing_store', ctypes.c_int),
+        ('backing_planes', ctypes.c_ulong),
+        ('backing_pixel', ctypes.c_ulong),
+        ('save_under', ctypes.c_int),
+        ('colormap', ctypes.c_ulong),
+        ('map_installed', ctypes.c_int),
+        ('map_state', ctypes.c_int),
+        ('all_event_masks', ctypes.c_long),
+        ('your_event_mask', ctypes.c_long),
+        ('do_not_propagate_mask', ctypes.c_long),
+        ('override_redirect', ctypes.c_int),
+        ('screen', ctypes.c_void_p)
+    ]
+
+
+class XErrorEvent(ctypes.Structure):
+    """Xlib error event."""
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('display', ctypes.c_void_p),
+        ('resourceid', ctypes.c_ulong),
+        ('serial', ctypes.c_ulong),
+        ('error_code', ctypes.c_ubyte),
+        ('request_code', ctypes.c_ubyte),
+        ('minor_code', ctypes.c_ubyte)
+    ]
+
+
+_ERROR_HANDLER_TYPE = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(XErrorEvent))
+
+
+class _XLib:
+    """ctypes bindings for the Xlib, XShm and libc functions used here."""
+
+    def __init__(self):
+        """
+        Load the libraries and declare function signatures.
+
+        Raises:
+            OSError: If libX11, libXext or libc cannot be loaded
+        """
+        x11_name = ctypes.util.find_library('X11')
+        xext_name = ctypes.util.find_library('Xext')
+        if not x11_name or not xext_name:
+            raise OSError("libX11/libXext not found")
+
+        self.x11 = ctypes.CDLL(x11_name)
+        self.xext = ctypes.CDLL(xext_name)
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+        # Last error reported by the X server, per display pointer
+        self.errors: Dict[int, int] = {}
+
+        def declare(lib, name, restype, *argtypes):
+            func = getattr(lib, name)
+            func.restype = restype
+            func.argtypes = list(argtypes)
+            setattr(self, name, func)
+
+        p, ul, i = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int
+        declare(self.x11, 'XOpenDisplay', p, ctypes.c_char_p)
+        declare(self.x11, 'XCloseDisplay', i, p)
+        declare(self.x11, 'XDefaultRootWindow', ul, p)
+        declare(self.x11, 'XSync', i, p, i)
+        declare(self.x11, 'XFree', i, p)
+        declare(self.x11, 'XInternAtom', ul, p, ctypes.c_char_p, i)
+        declare(self.x11, 'XGetWindowProperty', i, p, ul, ul, ctypes.c_long, ctypes.c_long, i, ul,
+                ctypes.POINTER(ul), ctypes.POINTER(i), ctypes.POINTER(ul), ctypes.POINTER(ul),
+                ctypes.POINTER(p))
+        declare(self.x11, 'XFetchName', i, p, ul, ctypes.POINTER(ctypes.c_char_p))
+        declare(self.x11, 'XQueryTree', i, p, ul, ctypes.POINTER(ul), ctypes.POINTER(ul),
+                ctypes.POINTER(ctypes.POINTER(ul)), ctypes.POINTER(ctypes.c_uint))
+        declare(self.x11, 'XGetWindowAttributes', i, p, ul, ctypes.POINTER(XWindowAttributes))
+        declare(self.x11, 'XTranslateCoordinates', i, p, ul, ul, i, i,
+                ctypes.POINTER(i), ctypes.POINTER(i), ctypes.POINTER(ul))
+        declare(self.x11, 'XDestroyImage', i, ctypes.POINTER(XImage))
+        declare(self.x11, 'XSetErrorHandler', p, _ERROR_HANDLER_TYPE)
+
+        declare(self.xext, 'XShmQueryExtension', i, p)
+        declare(self.xext, 'XShmCreateImage', ctypes.POINTER(XImage), p, p, ctypes.c_uint, i, p,
+                ctypes.POINTER(XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint)
+        declare(self.xext, 'XShmAttach', i, p, ctypes.POINTER(XShmSegmentInfo))
+        declare(self.xext, 'XShmDetach', i, p, ctypes.POINTER(XShmSegmentInfo))
+        declare(self.xext, 'XShmGetImage', i, p, ul, ctypes.POINTER(XImage), i, i, ul)
+
+        declare(self.libc, 'shmget', i, i, ctypes.c_size_t, i)
+        declare(self.libc, 'shmat', p, i, p, i)
+        declare(self.libc, 'shmdt', i, p)
+        declare(self.libc, 'shmctl', i, i, i, p)
+
+        # The default Xlib error handler exits the process; record errors instead.
+        # The callback must stay referenced for as long as Xlib may call it.
+        self._error_handler = _ERROR_HANDLER_TYPE(self._on_error)
+        self.XSetErrorHandler(self._error_handler)
+
+    def _on_error(self, display: int, event: Any) -> int:
+        """Record an X error for the display it occurred on."""
+        self.errors[display] = event.contents.error_code
+        return 0
+
+
+_xlib: Optional[_XLib] = None
+_xlib_lock = threading.Lock()
+
+
+def _get_xlib() -> Optional[_XLib]:
+    """Load the Xlib bindings once, or return None if unavailable."""
+    global _xlib
+    with _xlib_lock:
+        if _xlib is None:
+            try:
+                _xlib = _XLib()
+            except (OSError, AttributeError) as e:
+                logger.debug(f"X11 capture unavailable: {e}")
+                return None
+        return _xlib
+
+
+class _ShmSegment:
+    """A shared memory XImage reused across grabs of the same size."""
+
+    def __init__(self, xlib: _XLib, display: int, visual: int, depth: int, width: int, height: int):
+        """
+        Create and attach the segment.
+
+        Raises:
+            OSError: If the segment cannot be created or attached
+        """
+        self.xlib = xlib
+        self.display = display
+        self.key = (visual, depth, width, height)
+        self.info = XShmSegmentInfo()
+        self.image = xlib.XShmCreateImage(display, visual, depth, Z_PIXMAP, None,
+                                          ctypes.byref(self.info), width, height)
+        if not self.image:
+            raise OSError("XShmCreateImage failed")
+
+        image = self.image.contents
+        size = image.bytes_per_line * image.height
+        self.info.shmid = xlib.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            xlib.XDestroyImage(self.image)
+            raise OSError(ctypes.get_errno(), "shmget failed")
+
+        address = xlib.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            xlib.shmctl(self.info.shmid, IPC_RMID, None)
+            xlib.XDestroyImage(self.image)
+            raise OSError(ctypes.get_errno(), "shmat failed")
+
+        self.info.shmaddr = address
+        self.info.readOnly = 0
+        image.data = address
+
+        xlib.errors.pop(display, None)
+        xlib.XShmAttach(display, ctypes.byref(self.info))
+        xlib.XSync(display, 0)
+        # Mark for removal now; the kernel frees it once both sides detach
+        xlib.shmctl(self.info.shmid, IPC_RMID, None)
+        if xlib.errors.pop(display, None) is not None:
+            self._release(attached=False)
+            raise OSError("XShmAttach failed")
+
+        buffer = (ctypes.c_ubyte * size).from_address(address)
+        pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(height, image.bytes_per_line)
+        self.bits_per_pixel = image.bits_per_pixel
+        self.pixels = pixels[:, :width * (image.bits_per_pixel // 8)]
+
+    def release(self) -> None:
+        """Detach and free the segment."""
+        self._release(attached=True)
+
+    def _release(self, attached: bool) -> None:
+        if attached:
+            self.xlib.XShmDetach(self.display, ctypes.byref(self.info))
+            self.xlib.XSync(self.display, 0)
+        # XShm images only free their struct, never the shared data
+        self.xlib.XDestroyImage(self.image)
+        self.xlib.shmdt(self.info.shmaddr)
+        self.pixels = None
+
+
+class X11CaptureStrategy(CaptureStrategy):
+    """
+    Capture strategy using X11 MIT-SHM.
+
+    With a window ID as hwnd the window's own drawable is grabbed, which works
+    for windows that are viewable; without compositing, parts covered by other
+    windows are undefined, as with any X11 window grab. With hwnd 0 the rect
+    is grabbed from the root window.
+
+    The strategy owns one display connection and one shared segment; calls
+    are serialized with a lock.
+    """
+
+    def __init__(self, display_name: Optional[str] = None):
+        """
+        Initialize the strategy. The display is opened on first use.
+
+        Args:
+            display_name: X display to connect to (default: $DISPLAY)
+        """
+        self.display_name = display_name
+        self._display: Optional[int] = None
+        self._root = 0
+        self._segment: Optional[_ShmSegment] = None
+        self._lock = threading.RLock()
+
+        # Statistics
+        self.grabs = 0
+        self.segments_created = 0
+
+    @staticmethod
+    def is_available(display_name: Optional[str] = None) -> bool:
+        """
+        Check whether X11 capture can be used.
+
+        Args:
+            display_name: X display to check (default: $DISPLAY)
+
+        Returns:
+            True if Xlib loads and a display is configured
+        """
+        return bool(display_name or os.environ.get('DISPLAY')) and _get_xlib() is not None
+
+    def capture(self, hwnd: int, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """
+        Capture a screenshot using MIT-SHM.
+
+        Args:
+            hwnd: X window ID, or 0 to grab rect from the root window
+            rect: Window rectangle (left, top, width, height); for window
+                grabs only width and height are used
+
+        Returns:
+            Screenshot as numpy array in BGR format or None if failed
+        """
+        pixels = self.capture_bgra(hwnd, rect)
+        if pixels is None:
+            return None
+        # The shared segment is overwritten by the next grab, so copy out
+        return cv2.cvtColor(pixels, cv2.COLOR_BGRA2BGR)
+
+    def capture_bgra(self, hwnd: int, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """
+        Grab into the shared segment and return a view of it.
+
+        The view is only valid until the next grab.
+
+        Args:
+            hwnd: X window ID, or 0 to grab rect from the root window
+            rect: Window rectangle (left, top, width, height)
+
+        Returns:
+            BGRA view of the shared segment, or None if failed
+        """
+        with self._lock:
+            xlib = _get_xlib()
+            if xlib is None or not self._open():
+                return None
+
+            try:
+                if hwnd:
+                    attributes = self._get_attributes(hwnd)
+                    if attributes is None or attributes.map_state != IS_VIEWABLE:
+                        logger.warning(f"X11 window {hwnd:#x} is not viewable")
+                        return None
+                    drawable, x, y = hwnd, 0, 0
+                    width = min(rect[2], attributes.width) if rect else attributes.width
+                    height = min(rect[3], attributes.height) if rect else attributes.height
+                    visual, depth = attributes.visual, attributes.depth
+                else:
+                    attributes = self._get_attributes(self._root)
+                    drawable = self._root
+                    x, y, width, height = rect
+                    visual, depth = attributes.visual, attributes.depth
+
+                segment = self._get_segment(visual, depth, width, height)
+                if segment.bits_per_pixel != 32:
+                    logger.error(f"Unsupported X11 pixel format: {segment.bits_per_pixel} bits per pixel")
+                    return None
+
+                xlib.errors.pop(self._display, None)
+                ok = xlib.XShmGetImage(self._display, drawable, segment.image, x, y, ALL_PLANES)
+                error = xlib.errors.pop(self._display, None)
+                if not ok or error is not None:
+                    logger.error(f"XShmGetImage failed (error code {error})")
+                    return None
+
+                self.grabs += 1
+                return segment.pixels.reshape(height, width, 4)
+
+            except Exception as e:
+                logger.error(f"X11 capture error: {e}")
+                return None
+
+    def find_window(self, title: str, exact: bool = False) -> Optional[int]:
+        """
+        Find a window by title.
+
+        Args:
+            title: Window title, or part of it unless exact is set
+            exact: Whether the title must match exactly
+
+        Returns:
+            X window ID, or None if no window matches
+        """
+        for window, window_title in self.list_windows():
+            if window_title == title or (not exact and title in window_title):
+                return window
+        return None
+
+    def list_windows(self) -> List[Tuple[int, str]]:
+        """
+        List titled top-level windows.
+
+        Returns:
+            List of (window ID, title)
+        """
+        with self._lock:
+            if not self._open():
+                return []
+            windows = self._get_client_list() or self._walk_tree(self._root)
+            result = []
+            for window in windows:
+                title = self._get_title(window)
+                if title:
+                    result.append((window, title))
+            return result
+
+    def get_window_rect(self, window: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get a window's position on screen and size.
+
+        Args:
+            window: X window ID
+
+        Returns:
+            Tuple of (left, top, width, height), or None if the window is gone
+        """
+        with self._lock:
+            if not self._open():
+                return None
+            attributes = self._get_attributes(window)
+            if attributes is None:
+                return None
+
+            xlib = _get_xlib()
+            x, y, child = ctypes.c_int(), ctypes.c_int(), ctypes.c_ulong()
+            xlib.XTranslateCoordinates(self._display, window, self._root, 0, 0,
+                                       ctypes.byref(x), ctypes.byref(y), ctypes.byref(child))
+            return (x.value, y.value, attributes.width, attributes.height)
+
+    def close(self) -> None:
+        """Release the shared segment and close the display connection."""
+        with self._lock:
+            if self._segment is not None:
+                self._segment.release()
+                self._segment = None
+            if self._display:
+                _get_xlib().XCloseDisplay(self._display)
+                self._display = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get capture statistics.
+
+        Returns:
+            Dictionary with grab and segment counts
+        """
+        return {
+            'grabs': self.grabs,
+            'segments_created': self.segments_created,
+            'segment_size': self._segment.key[2:] if self._segment is not None else None
+        }
+
+    def _open(self) -> bool:
+        """Open the display connection if needed."""
+        if self._display:
+            return True
+
+        xlib = _get_xlib()
+        if xlib is None:
+            return False
+
+        name = self.display_name.encode() if self.display_name else None
+        display = xlib.XOpenDisplay(name)
+        if not display:
+            logger.error(f"Cannot open X display {self.display_name or os.environ.get('DISPLAY')}")
+            return False
+        if not xlib.XShmQueryExtension(display):
+            logger.error("X server does not support the MIT-SHM extension")
+            xlib.XCloseDisplay(display)
+            return False
+
+        self._display = display
+        self._root = xlib.XDefaultRootWindow(display)
+        return True
+
+    def _get_segment(self, visual: int, depth: int, width: int, height: int) -> _ShmSegment:
+        """Get a shared segment for the size, replacing the current one if it differs."""
+        key = (visual, depth, width, height)
+        if self._segment is None or self._segment.key != key:
+            if self._segment is not None:
+                self._segment.release()
+                self._segment = None
+            self._segment = _ShmSegment(_get_xlib(), self._display, visual, depth, width, height)
+            self.segments_created += 1
+            logger.debug(f"Created X11 shared segment {width}x{height} (depth {depth})")
+        return self._segment
+
+    def _get_attributes(self, window: int) -> Optional[XWindowAttributes]:
+        """Get window attributes, or None if the window does not exist."""
+        xlib = _get_xlib()
+        attributes = XWindowAttributes()
+        xlib.errors.pop(self._display, None)
+        status = xlib.XGetWindowAttributes(self._display, window, ctypes.byref(attributes))
+        if not status or xlib.errors.pop(self._display, None) is not None:
+            return None
+        return attributes
+
+    def _get_property(self, window: int, name: bytes, property_type: int) -> Optional[Tuple[int, bytes]]:
+        """
+        Read a window property.
+
+        Returns:
+            Tuple of (format in bits, raw bytes), or None if not set
+        """
+        xlib = _get_xlib()
+        atom = xlib.XInternAtom(self._display, name, 1)
+        if not atom:
+            return None
+
+        actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+        count, remaining, data = ctypes.c_ulong(), ctypes.c_ulong(), ctypes.c_void_p()
+        status = xlib.XGetWindowProperty(self._display, window, atom, 0, 1 << 16, 0, property_type,
+                                         ctypes.byref(actual_type), ctypes.byref(actual_format),
+                                         ctypes.byref(count), ctypes.byref(remaining), ctypes.byref(data))
+        if status != SUCCESS or not data.value:
+            return None
+        try:
+            # Xlib returns 32-bit items as C longs
+            item_size = {8: 1, 16: 2, 32: ctypes.sizeof(ctypes.c_long)}.get(actual_format.value, 1)
+            return actual_format.value, ctypes.string_at(data.value, count.value * item_size)
+        finally:
+            xlib.XFree(data)
+
+    def _get_client_list(self) -> List[int]:
+        """Top-level windows listed by the window manager."""
+        prop = self._get_property(self._root, b'_NET_CLIENT_LIST', XA_WINDOW)
+        if prop is None:
+            return []
+        return np.frombuffer(prop[1], dtype=np.uint64 if ctypes.sizeof(ctypes.c_long) == 8 else np.uint32).tolist()
+
+    def _walk_tree(self, window: int, depth: int = 0) -> List[int]:
+        """All descendants of a window, for servers without a window manager."""
+        xlib = _get_xlib()
+        root, parent = ctypes.c_ulong(), ctypes.c_ulong()
+        children, count = ctypes.POINTER(ctypes.c_ulong)(), ctypes.c_uint()
+        if not xlib.XQueryTree(self._display, window, ctypes.byref(root), ctypes.byref(parent),
+                               ctypes.byref(children), ctypes.byref(count)):
+            return []
+
+        windows = [children[i] for i in range(count.value)]
+        if children:
+            xlib.XFree(children)
+
+        result = list(windows)
+        if depth < 3:
+            for child in windows:
+                result.extend(self._walk_tree(child, depth + 1))
+        return result
+
+    def _get_title(self, window: int) -> str:
+        """Window title from _NET_WM_NAME, falling back to WM_NAME."""
+        xlib = _get_xlib()
+        utf8 = xlib.XInternAtom(self._display, b'UTF8_STRING', 1)
+        if utf8:
+            prop = self._get_property(window, b'_NET_WM_NAME', utf8)
+            if prop is not None:
+                return prop[1].decode('utf-8', errors='replace')
+
+        name = ctypes.c_char_p()
+        if xlib.XFetchName(self._display, window, ctypes.byref(name)) and name.value is not None:
+            title = name.value.decode('latin-1')
+            xlib.XFree(ctypes.cast(name, ctypes.c_void_p))
+            return title
+        return ''
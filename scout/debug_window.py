@@ -1,13 +1,14 @@
 from typing import Optional, Dict, Any, List, Tuple
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTabWidget, QScrollArea
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtGui import QPixmap
 import numpy as np
 import cv2
 from pathlib import Path
 import logging
 from datetime import datetime
 from scout.config_manager import ConfigManager
+from scout.core.window.image_utils import numpy_to_qimage
 
 logger = logging.getLogger(__name__)
 
@@ -63,16 +64,11 @@ class ImageTab(QWidget):
             metadata: Optional metadata to display
         """
         try:
-            # Convert image for display
-            if len(image.shape) == 2:  # Grayscale
-                h, w = image.shape
-                bytes_per_line = w
-                q_img = QImage(image.data, w, h, bytes_per_line, QImage.Format.Format_Grayscale8)
-            else:  # Color (assume BGR)
-                h, w, c = image.shape
-                bytes_per_line = 3 * w
-                rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                q_img = QImage(rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+            # Wrap the array for display (BGR and grayscale are shared, not converted)
+            h, w = image.shape[:2]
+            q_img = numpy_to_qimage(image)
+            if q_img is None:
+                raise ValueError(f"Unsupported image format {image.shape} {image.dtype}")
             
             # Scale image while preserving aspect ratio
             pixmap = QPixmap.fromImage(q_img)
@@ -29,6 +29,7 @@ import mss
 from pathlib import Path
 from scout.text_ocr import TextOCR
 from scout.window_manager import WindowManager
+from scout.core.window.screen_grabber import screen_grabber
 from scout.automation.gui.automation_tab import AutomationTab
 from scout.actions import GameActions
 
@@ -1308,6 +1309,11 @@ class OverlayController(QMainWindow):
             # Save all settings
             self.save_settings()
             
+            # Stop background capture and release screen grabbers
+            if hasattr(self, 'window_manager'):
+                self.window_manager.stop_capture_worker()
+            screen_grabber.close_all()
+            
             logger.info("Cleanup completed")
             
         except Exception as e:
@@ -16,7 +16,13 @@ import win32con
 import win32api
 from scout.window_manager import WindowManager
 from scout.template_matcher import TemplateMatch, GroupedMatch, TemplateMatcher
+from scout.overlay_renderer import OverlayRenderer
+from scout.core.detection.detection_worker import DetectionResult, DetectionWorker
+from scout.core.detection.rate_controller import DetectionRateController
+from scout.core.detection.tracker import IoUTracker, TrackedObject
+from scout.core.detection.motion import MotionCompensator
 import logging
+import threading
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import QTimer
 import time
@@ -67,20 +73,36 @@ class Overlay(QWidget):
         self.window_hwnd = None  # Store window handle
         self.window_created = False  # Flag to track if window has been created
         
-        # Separate timers for template matching and drawing
-        self.template_matching_timer = QTimer()
-        self.template_matching_timer.timeout.connect(self._update_template_matching)
+        # Template matching runs on a worker thread and publishes immutable
+        # snapshots; the draw timer on the Qt thread only reads the latest one
+        self.detection_worker = DetectionWorker(self._update_template_matching, name="OverlayDetection")
+        
+        # Adapts the detection interval to measured cost, CPU headroom and idleness;
+        # target_frequency is the upper bound
+        latency_budget = template_settings.get("latency_budget", 0.0)
+        self.rate_controller = DetectionRateController(
+            max_frequency=min(template_settings["target_frequency"], 60.0),
+            cpu_budget=template_settings.get("cpu_budget", 0.25) or None,
+            latency_budget=latency_budget if latency_budget and latency_budget > 0 else None
+        )
         
         self.draw_timer = QTimer()
         self.draw_timer.timeout.connect(self._draw_overlay)
         self.draw_timer.setInterval(33)  # ~30 FPS for drawing
         
-        # Add match caching with group persistence
-        self.cached_matches: List[Tuple[str, int, int, int, int, float]] = []  # Current cached matches
-        self.match_counters: Dict[str, int] = {}  # Cache counters for groups
-        # Load persistence and distance settings from config
+        # Match persistence: the tracker links matches across frames and keeps a
+        # missed match at its predicted position for match_persistence - 1 frames.
+        # The detection thread updates it; other threads reset it through reset_tracking.
         self.match_persistence = template_settings.get("match_persistence", 3)  # Default to 3 frames if not in config
-        self.distance_threshold = template_settings.get("distance_threshold", 100)  # Default to 100 pixels if not in config
+        self.tracker = IoUTracker(
+            iou_threshold=template_settings.get("track_iou_threshold", 0.3),
+            min_hits=template_settings.get("track_min_hits", 1),
+            max_misses=max(self.match_persistence - 1, 0)
+        )
+        self._tracker_lock = threading.Lock()
+        
+        # While the map is dragged, shift previous matches and only search the newly exposed strips
+        self.motion_compensator = MotionCompensator()
         
         # Convert QColor to BGR format for OpenCV
         rect_color = overlay_settings["rect_color"]
@@ -99,6 +121,22 @@ class Overlay(QWidget):
         self.cross_thickness = overlay_settings["cross_thickness"]
         self.cross_scale = overlay_settings.get("cross_scale", 1.0)  # Default to 1.0 if not set
         
+        # Retained-mode renderer: redraws only what changed between draw ticks
+        self.renderer = OverlayRenderer(
+            rect_color=self.rect_color,
+            rect_thickness=self.rect_thickness,
+            rect_scale=self.rect_scale,
+            font_color=self.font_color,
+            font_size=self.font_size,
+            text_thickness=self.text_thickness,
+            cross_color=self.cross_color,
+            cross_size=self.cross_size,
+            cross_thickness=self.cross_thickness,
+            cross_scale=self.cross_scale
+        )
+        self._window_rect: Optional[Tuple[int, int, int, int]] = None  # Last rect the overlay was moved to
+        self._drawn_sequence = 0  # Sequence of the detection snapshot on screen
+        
         # Create template matcher and make it accessible
         self.template_matcher = TemplateMatcher(
             window_manager=self.window_manager,
@@ -126,6 +164,44 @@ class Overlay(QWidget):
         if not self.active:
             self._hide_window()
 
+    @property
+    def cached_matches(self) -> List[Tuple[str, int, int, int, int, float]]:
+        """Matches of the latest detection snapshot."""
+        snapshot = self.detection_worker.latest
+        return list(snapshot.matches) if snapshot is not None else []
+        
+    @cached_matches.setter
+    def cached_matches(self, matches: List[Tuple[str, int, int, int, int, float]]) -> None:
+        """Replace the current matches by publishing them as a new snapshot."""
+        self.detection_worker.publish(matches)
+        
+    @property
+    def tracked_objects(self) -> Tuple[TrackedObject, ...]:
+        """Objects with stable track IDs from the latest detection cycle."""
+        return self.tracker.objects
+        
+    def reset_tracking(self) -> None:
+        """Drop all tracks. Safe to call from any thread while detection runs."""
+        with self._tracker_lock:
+            self.tracker.reset()
+        
+    def get_detection_stats(self) -> Dict[str, Any]:
+        """
+        Get detection worker statistics.
+        
+        Returns:
+            Dictionary with detection cycle counts and times, the
+            capture-to-draw staleness of drawn snapshots, and the states of
+            the rate controller ('rate'), tracker ('tracker') and motion
+            compensation ('motion')
+        """
+        stats = self.detection_worker.get_stats()
+        stats['rate'] = self.rate_controller.get_stats()
+        with self._tracker_lock:
+            stats['tracker'] = self.tracker.get_stats()
+        stats['motion'] = self.motion_compensator.get_stats()
+        return stats
+
     def create_overlay_window(self) -> None:
         """Create the overlay window with transparency."""
         # Check if we already have a valid window
@@ -247,6 +323,9 @@ class Overlay(QWidget):
             cv2.imshow(self.window_name, overlay)
             cv2.waitKey(1)
             
+            # The window no longer shows the renderer's canvas
+            self.renderer.invalidate()
+            
             # Refresh transparency settings
             win32gui.SetLayeredWindowAttributes(
                 self.window_hwnd,
@@ -277,6 +356,7 @@ class Overlay(QWidget):
                 x, y, width, height,
                 win32con.SWP_SHOWWINDOW | win32con.SWP_NOACTIVATE
             )
+            self._window_rect = pos
             logger.debug(f"Updated window position to ({x}, {y}) with size {width}x{height}")
         except Exception as e:
             logger.error(f"Error updating window position: {e}")
@@ -294,6 +374,7 @@ class Overlay(QWidget):
             
         try:
             win32gui.ShowWindow(self.window_hwnd, win32con.SW_HIDE)
+            self._window_rect = None
             logger.debug("Window hidden")
         except Exception as e:
             logger.error(f"Error hiding window: {e}")
@@ -364,25 +445,30 @@ class Overlay(QWidget):
         else:
             logger.debug(f"Not showing overlay window - active: {self.active}")
         
-        # Clear match cache before starting new matching session
-        self.cached_matches = []
-        self.match_counters.clear()
-        
-        # Start both timers if not already running
-        logger.debug(f"Starting timers - draw timer active: {self.draw_timer.isActive()}, template timer active: {self.template_matching_timer.isActive()}")
+        # Start detection and drawing if not already running
+        logger.debug(f"Starting detection - draw timer active: {self.draw_timer.isActive()}, detection worker running: {self.detection_worker.is_running}")
         
-        # Always stop timers first to ensure a clean restart
-        if self.template_matching_timer.isActive():
-            self.template_matching_timer.stop()
-            logger.debug("Stopped template matching timer before restart")
+        # Always stop first to ensure a clean restart; stop() waits for the
+        # running cycle, so it cannot feed the old session into the reset tracker
+        if self.detection_worker.is_running:
+            self.detection_worker.stop()
+            logger.debug("Stopped detection worker before restart")
             
+        # Clear match cache before starting new matching session
+        self.detection_worker.clear()
+        self.reset_tracking()
+        self.motion_compensator.reset()
+        
         if self.draw_timer.isActive():
             self.draw_timer.stop()
             logger.debug("Stopped draw timer before restart")
         
-        # Start template matching timer with updated interval
-        self.update_timer_interval()  # This will start the template matching timer
-        logger.debug(f"Template matching timer started with interval: {self.template_matching_timer.interval()} ms")
+        # Capture in the background so the timer callback only picks up frames
+        self.window_manager.start_capture_worker(rate=self._get_capture_rate())
+        
+        # Start the detection worker with updated interval
+        self.update_timer_interval()  # This will start the detection worker
+        logger.debug(f"Detection worker started with interval: {self.detection_worker.interval * 1000:.0f} ms")
             
         # Start draw timer with fixed interval
         self.draw_timer.setInterval(33)  # ~30 FPS
@@ -395,27 +481,60 @@ class Overlay(QWidget):
         logger.debug("Template matching started successfully")
 
     def update_timer_interval(self) -> None:
-        """Update the template matching timer interval based on target frequency."""
+        """
+        Apply the target frequency as the rate controller's upper bound.
+        
+        The controller restarts from the target rate and adapts the detection
+        interval from there on every cycle.
+        """
         if not hasattr(self.template_matcher, 'target_frequency'):
             logger.warning("Template matcher has no target_frequency attribute")
             return
             
-        interval = max(int(1000 / self.template_matcher.target_frequency), 16)  # Minimum 16ms (60 FPS max)
+        self.rate_controller.set_target(min(self.template_matcher.target_frequency, 60.0))  # 60 FPS max
+        interval = int(self.rate_controller.interval * 1000)
         logger.debug(
-            f"Updating template matching timer interval: "
+            f"Updating detection interval: "
             f"target_frequency={self.template_matcher.target_frequency:.2f} updates/sec -> "
             f"interval={interval}ms"
         )
         
+        # A running worker picks up the new interval from its next cycle
+        self.detection_worker.interval = self.rate_controller.interval
+        
         if self.template_matching_active:
-            # Stop the timer if it's running
-            if self.template_matching_timer.isActive():
-                self.template_matching_timer.stop()
-            
-            # Set new interval and start timer
-            self.template_matching_timer.setInterval(interval)
-            self.template_matching_timer.start()
-            logger.info(f"Template matching timer restarted with new interval: {interval}ms")
+            self.detection_worker.start()
+            logger.info(f"Detection worker running with interval: {interval}ms")
+            
+            # Keep the capture rate in step with the matching rate
+            if self.window_manager.capture_worker is not None:
+                self.window_manager.capture_worker.rate = self._get_capture_rate()
+                
+    def _get_capture_rate(self) -> float:
+        """
+        Get the background capture rate for the current matching frequency.
+        
+        Frames are captured at twice the matching rate (capped at 30 fps) so a
+        matching cycle never works on a frame older than half its period.
+        
+        Returns:
+            Capture rate in frames per second
+        """
+        return min(max(2.0 * self.rate_controller.frequency, 1.0), 30.0)
+        
+    def _apply_detection_interval(self, interval: float) -> None:
+        """
+        Apply an interval chosen by the rate controller.
+        
+        Args:
+            interval: Seconds until the next detection cycle
+        """
+        self.detection_worker.interval = interval
+        capture_worker = self.window_manager.capture_worker
+        if capture_worker is not None:
+            rate = self._get_capture_rate()
+            if abs(capture_worker.rate - rate) > 0.1:
+                capture_worker.rate = rate
 
     def _destroy_window_safely(self) -> None:
         """Safely destroy the overlay window if it exists."""
@@ -443,156 +562,116 @@ class Overlay(QWidget):
         except Exception as e:
             logger.debug(f"Window hide skipped: {e}")
 
-    def _get_group_key(self, match: Tuple[str, int, int, int, int, float]) -> str:
-        """Get the cache key for a match based on approximate position only (not template name)."""
-        _, x, y, _, _, _ = match
-        # Use grid-based position to allow for small movements
-        grid_size = self.distance_threshold
-        grid_x = x // grid_size
-        grid_y = y // grid_size
-        # No longer include template name in key since we want to group across templates
-        return f"pos_{grid_x}_{grid_y}"
-
-    def _is_same_group(self, match1: Tuple[str, int, int, int, int, float],
-                      match2: Tuple[str, int, int, int, int, float]) -> bool:
+    def _find_match_tuples(self, image: np.ndarray) -> List[Tuple[str, int, int, int, int, float]]:
         """
-        Check if two matches belong to the same group based on position.
-        Matches from different templates can be grouped if they are close enough.
+        Find template matches in an image as match tuples.
         
         Args:
-            match1: First match tuple (name, x, y, w, h, conf)
-            match2: Second match tuple (name, x, y, w, h, conf)
+            image: Image to search (a full frame or a strip of one)
             
         Returns:
-            bool: True if matches are in the same group
+            List of (name, x, y, width, height, confidence) in image coordinates
         """
-        # Extract positions and dimensions
-        name1, x1, y1, w1, h1, _ = match1
-        name2, x2, y2, w2, h2, _ = match2
-        
-        # Calculate centers
-        center1_x = x1 + w1 // 2
-        center1_y = y1 + h1 // 2
-        center2_x = x2 + w2 // 2
-        center2_y = y2 + h2 // 2
-        
-        # Check if centers are within threshold
-        return (abs(center1_x - center2_x) <= self.distance_threshold and
-                abs(center1_y - center2_y) <= self.distance_threshold)
+        matches = self.template_matcher.find_matches(image)
+        logger.debug(f"Found {len(matches)} match groups")
+        
+        # Convert grouped matches to tuple format with averaged positions
+        current_matches = []
+        
+        for group in matches:
+            # Calculate average position for the group
+            avg_x = sum(m.bounds[0] for m in group.matches) // len(group.matches)
+            avg_y = sum(m.bounds[1] for m in group.matches) // len(group.matches)
+            # Use width and height from first match since they should be the same
+            width = group.matches[0].bounds[2]
+            height = group.matches[0].bounds[3]
+            # Use highest confidence from the group
+            confidence = max(m.confidence for m in group.matches)
+            
+            match_tuple = (
+                group.template_name,
+                avg_x,
+                avg_y,
+                width,
+                height,
+                confidence
+            )
+            current_matches.append(match_tuple)
+            
+            logger.debug(
+                f"Group for {group.template_name}: {len(group.matches)} matches, "
+                f"average position: ({avg_x}, {avg_y}), confidence: {confidence:.2f}"
+            )
+        
+        return current_matches
 
-    def _update_template_matching(self) -> None:
-        """Run template matching update cycle."""
+    def _update_template_matching(self) -> DetectionResult:
+        """
+        Run one template matching cycle (on the detection worker thread).
+        
+        Returns:
+            Tuple of (matches, capture timestamp, frame ID) to publish, or
+            None if the cycle failed
+        """
         try:
             logger.debug("Running template matching update")
             
+            # Nothing to detect while the game window is minimized
+            hwnd = self.window_manager.hwnd
+            if hwnd and win32gui.IsIconic(hwnd):
+                logger.debug("Game window minimized, backing off detection")
+                self._apply_detection_interval(self.rate_controller.update_idle())
+                return [], time.monotonic(), None
+            
             # Capture window image
-            image = self.template_matcher.capture_window()
-            if image is None:
+            frame = self.template_matcher.capture_frame()
+            if frame is None:
                 logger.warning("Failed to capture window for template matching")
-                return
+                return None
+            image = frame.image
                 
             logger.debug(f"Captured image with shape: {image.shape}")
             
-            # First get all matches in GroupedMatch format
-            matches = self.template_matcher.find_matches(image)
-            logger.debug(f"Found {len(matches)} match groups")
-            
-            # Convert grouped matches to tuple format with averaged positions
-            current_matches = []
-            
-            for group in matches:
-                # Calculate average position for the group
-                avg_x = sum(m.bounds[0] for m in group.matches) // len(group.matches)
-                avg_y = sum(m.bounds[1] for m in group.matches) // len(group.matches)
-                # Use width and height from first match since they should be the same
-                width = group.matches[0].bounds[2]
-                height = group.matches[0].bounds[3]
-                # Use highest confidence from the group
-                confidence = max(m.confidence for m in group.matches)
-                
-                match_tuple = (
-                    group.template_name,
-                    avg_x,
-                    avg_y,
-                    width,
-                    height,
-                    confidence
-                )
-                current_matches.append(match_tuple)
-                
-                logger.debug(
-                    f"Group for {group.template_name}: {len(group.matches)} matches, "
-                    f"average position: ({avg_x}, {avg_y}), confidence: {confidence:.2f}"
-                )
-            
-            # Handle match persistence based on groups
-            all_matches = []
-            new_counters = {}
-            
-            # First, add all current matches
-            for current_match in current_matches:
-                group_key = self._get_group_key(current_match)
-                # Check if we already have a match in this group
-                existing_match = None
-                for match in all_matches:
-                    if self._is_same_group(current_match, match):
-                        existing_match = match
-                        break
-                
-                if existing_match:
-                    # If existing match has lower confidence, replace it
-                    if current_match[5] > existing_match[5]:
-                        all_matches.remove(existing_match)
-                        all_matches.append(current_match)
-                        new_counters[group_key] = 0
-                else:
-                    # No existing match in this group, add new match
-                    all_matches.append(current_match)
-                    new_counters[group_key] = 0
-                
-                logger.debug(f"Added current match for group {group_key}")
-            
-            # Then check cached matches
-            for cached_match in self.cached_matches:
-                group_key = self._get_group_key(cached_match)
-                
-                # Skip if this group already has a match
-                if group_key in new_counters:
-                    continue
-                
-                # Check if this cached match is close to any current match
-                # Skip if it's too close to avoid duplicates
-                if any(self._is_same_group(cached_match, current) for current in current_matches):
-                    continue
-                
-                # Increment counter for this group
-                counter = self.match_counters.get(group_key, 0) + 1
-                
-                if counter < self.match_persistence:
-                    # Keep the match if within persistence window
-                    all_matches.append(cached_match)
-                    new_counters[group_key] = counter
-                    logger.debug(f"Using cached match for group {group_key} (frame {counter}/{self.match_persistence})")
-                else:
-                    logger.debug(f"Cache cleared for group {group_key}")
-            
-            # Update cache and counters
-            self.cached_matches = all_matches
-            self.match_counters = new_counters
+            # Unchanged contents give the same matches; republish them for this frame
+            if self.rate_controller.is_unchanged(image):
+                logger.debug("Window contents unchanged, backing off detection")
+                self._apply_detection_interval(self.rate_controller.update_idle())
+                return self.cached_matches, frame.timestamp, frame.frame_id
+            
+            # Find matches; if the view was only panned, just in the newly exposed strips
+            start_time = time.monotonic()
+            start_cpu = time.thread_time()
+            margin = max((max(t.shape[:2]) for t in self.template_matcher.templates.values()), default=0)
+            current_matches, shift = self.motion_compensator.detect(image, self._find_match_tuples, margin)
+            if shift is not None:
+                logger.debug(f"View shifted by ({shift.dx}, {shift.dy}), reused previous matches")
+            
+            # Link matches to tracks; missed matches persist at their predicted position
+            with self._tracker_lock:
+                tracked = self.tracker.update(current_matches)
+            all_matches = [obj.as_match() for obj in tracked]
+            logger.debug(f"Tracking {len(tracked)} objects")
+            
+            self._apply_detection_interval(self.rate_controller.update(
+                time.monotonic() - start_time, time.thread_time() - start_cpu
+            ))
+            return all_matches, frame.timestamp, frame.frame_id
             
         except Exception as e:
             logger.error(f"Error in template matching update: {e}", exc_info=True)
+            return None
 
     def _draw_overlay(self) -> None:
-        """Draw the overlay with current matches."""
+        """
+        Draw the overlay with current matches.
+        
+        Runs every draw tick but only does work when something changed: the
+        renderer repaints the dirty rectangles of added or removed matches,
+        the canvas is presented only if it changed, and the window is only
+        repositioned when the game window moved or resized.
+        """
         try:
-            # First log whether conditions for drawing are met
-            if not self.active:
-                logger.debug("Not drawing overlay - overlay is not active")
-                return
-                
-            if not self.template_matching_active:
-                logger.debug("Not drawing overlay - template matching is not active")
+            if not self.active or not self.template_matching_active:
                 return
             
             # Make sure we have a valid window to draw on
@@ -606,182 +685,61 @@ class Overlay(QWidget):
                     return
             
             # Make sure window is shown
-            self._show_window()
+            if not win32gui.IsWindowVisible(self.window_hwnd):
+                self._show_window()
             
-            # Update window position to track game window
+            # Track the game window, moving the overlay only when it moved
             pos = self.window_manager.get_window_position()
             if not pos:
                 logger.warning("Target window not found during draw")
                 return
             
+            if pos != self._window_rect:
+                x, y, width, height = pos
+                try:
+                    win32gui.SetWindowPos(
+                        self.window_hwnd, win32con.HWND_TOPMOST,
+                        x, y, width, height,
+                        win32con.SWP_SHOWWINDOW | win32con.SWP_NOACTIVATE
+                    )
+                    self._window_rect = pos
+                except Exception as e:
+                    logger.error(f"Error updating window position: {e}")
+                    # Try to recreate window if this fails
+                    self.window_hwnd = None
+                    self.window_created = False
+                    self.create_overlay_window()
+                    return
+            
             x, y, width, height = pos
             
-            # Ensure position is updated
-            try:
-                win32gui.SetWindowPos(
-                    self.window_hwnd, win32con.HWND_TOPMOST,
-                    x, y, width, height,
-                    win32con.SWP_SHOWWINDOW | win32con.SWP_NOACTIVATE
-                )
-            except Exception as e:
-                logger.error(f"Error updating window position: {e}")
-                # Try to recreate window if this fails
-                self.window_hwnd = None
-                self.window_created = False
-                self.create_overlay_window()
-                return
-                
             # Ensure positive coordinates for drawing
             if x < 0:
                 width += x
-                x = 0
             if y < 0:
                 height += y
-                y = 0
-            
-            # Always log overlay state for diagnosis
-            logger.debug(f"Drawing overlay: active={self.active}, template_matching_active={self.template_matching_active}, cached_matches={len(self.cached_matches)}")
-            
-            # Create magenta background (will be transparent)
-            overlay = np.zeros((height, width, 3), dtype=np.uint8)
-            overlay[:] = (255, 0, 255)  # Set background to magenta
+            if width <= 0 or height <= 0:
+                return
             
-            # Force draw a simple indicator in the top-left corner to verify drawing is working
-            cv2.circle(overlay, (50, 50), 20, (0, 255, 0), -1)  # Green circle
-            cv2.putText(overlay, "Drawing Active", (80, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            # Read the latest published snapshot; it is never modified afterwards
+            snapshot = self.detection_worker.latest
+            matches = snapshot.matches if snapshot is not None else ()
             
-            # Only draw matches if we have any
-            if self.cached_matches:
-                match_count = len(self.cached_matches)
-                logger.debug(f"Drawing {match_count} matches on overlay")
-                
-                # Log match data for diagnosis
-                for i, match_data in enumerate(self.cached_matches[:3]):  # Log first 3 matches
-                    logger.debug(f"Match {i+1} data: {match_data}")
+            self.renderer.resize(width, height)
+            status_text = f"No matches in cache (detection running: {self.detection_worker.is_running})"
+            dirty = self.renderer.render(matches, status_text)
+            if dirty:
+                logger.debug(f"Redrew {len(dirty)} overlay regions for {len(matches)} matches")
                 
-                # Draw matches
-                for i, match_data in enumerate(self.cached_matches):
-                    # Make sure match data has the right format
-                    if not isinstance(match_data, tuple) or len(match_data) != 6:
-                        logger.warning(f"Invalid match data format for match {i}: {match_data}")
-                        continue
-                        
-                    name, match_x, match_y, match_width, match_height, confidence = match_data
-                    
-                    # Verify coordinates are valid integers
-                    try:
-                        match_x = int(match_x)
-                        match_y = int(match_y)
-                        match_width = int(match_width)
-                        match_height = int(match_height)
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Invalid coordinates for match {i}: {e}")
-                        continue
-                        
-                    # Ensure coordinates are within the overlay
-                    if match_x < 0 or match_y < 0 or match_x >= width or match_y >= height:
-                        logger.warning(f"Match {i} coordinates outside overlay: ({match_x}, {match_y})")
-                        continue
-                    
-                    # Calculate center point
-                    center_x = match_x + match_width // 2
-                    center_y = match_y + match_height // 2
-                    
-                    # Calculate scaled dimensions
-                    scaled_width = int(match_width * self.rect_scale)
-                    scaled_height = int(match_height * self.rect_scale)
-                    
-                    # Calculate new bounds ensuring they're integers
-                    new_x1 = max(0, min(int(center_x - scaled_width // 2), width - 1))
-                    new_y1 = max(0, min(int(center_y - scaled_height // 2), height - 1))
-                    new_x2 = max(0, min(int(new_x1 + scaled_width), width - 1))
-                    new_y2 = max(0, min(int(new_y1 + scaled_height), height - 1))
-                    
-                    # Skip if the rectangle is too small
-                    if new_x2 - new_x1 < 10 or new_y2 - new_y1 < 10:
-                        logger.warning(f"Match {i} rectangle too small: ({new_x1}, {new_y1}) -> ({new_x2}, {new_y2})")
-                        continue
-                    
-                    logger.debug(f"Drawing match {i}: {name} at ({new_x1}, {new_y1}) -> ({new_x2}, {new_y2})")
-                    
-                    # Ensure color values are tuples of integers
-                    rect_color = tuple(map(int, self.rect_color))
-                    font_color = tuple(map(int, self.font_color))
-                    cross_color = tuple(map(int, self.cross_color))
-                    
-                    # Draw rectangle
-                    cv2.rectangle(
-                        overlay,
-                        (new_x1, new_y1),
-                        (new_x2, new_y2),
-                        rect_color,
-                        self.rect_thickness
-                    )
-                    
-                    # Draw text above the rectangle
-                    text = f"{name} ({confidence:.2f})"
-                    cv2.putText(
-                        overlay,
-                        text,
-                        (new_x1, max(5, new_y1 - 5)),  # Ensure text is not cut off
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        self.font_size / 30,
-                        font_color,
-                        self.text_thickness
-                    )
-                    
-                    # Draw cross at center
-                    # Scale the cross size based on cross_scale setting
-                    scaled_cross_size = int(self.cross_size * self.cross_scale)
-                    half_size = scaled_cross_size // 2
-                    
-                    # Draw cross with scaled size
-                    cv2.line(
-                        overlay,
-                        (center_x - half_size, center_y),
-                        (center_x + half_size, center_y),
-                        cross_color,
-                        self.cross_thickness
-                    )
-                    cv2.line(
-                        overlay,
-                        (center_x, center_y - half_size),
-                        (center_x, center_y + half_size),
-                        cross_color,
-                        self.cross_thickness
-                    )
-            else:
-                # No matches to draw - still show diagnostic text
-                cv2.putText(
-                    overlay,
-                    f"No matches in cache (timer active: {self.template_matching_timer.isActive()})",
-                    (80, 80),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 255, 255),  # Yellow text
-                    1
-                )
-                logger.debug("No matches to draw on overlay")
-            
-            # Show overlay
-            cv2.imshow(self.window_name, overlay)
-            cv2.waitKey(1)
-            
-            # Make sure window is still topmost
-            win32gui.SetWindowPos(
-                self.window_hwnd,
-                win32con.HWND_TOPMOST,
-                0, 0, 0, 0,  # Ignore position/size - already set above
-                win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
-            )
-            
-            # Refresh transparency settings
-            win32gui.SetLayeredWindowAttributes(
-                self.window_hwnd,
-                win32api.RGB(255, 0, 255),  # Magenta color key
-                0,  # Alpha (0 = fully transparent for non-magenta pixels)
-                win32con.LWA_COLORKEY
-            )
+                # Present the updated canvas
+                cv2.imshow(self.window_name, self.renderer.canvas)
+                cv2.waitKey(1)
+            
+            # Record capture-to-draw staleness once per snapshot shown
+            if snapshot is not None and snapshot.sequence != self._drawn_sequence:
+                self._drawn_sequence = snapshot.sequence
+                staleness = self.detection_worker.record_draw(snapshot)
+                logger.debug(f"Drew detection snapshot {snapshot.sequence} {staleness * 1000:.0f} ms after capture")
         except Exception as e:
             logger.error(f"Error updating overlay: {str(e)}", exc_info=True)
 
@@ -790,20 +748,23 @@ class Overlay(QWidget):
         logger.info("Stopping template matching")
         self.template_matching_active = False
         
-        # Stop timers
-        if self.template_matching_timer.isActive():
-            self.template_matching_timer.stop()
+        # Stop detection and drawing
+        self.detection_worker.stop()
         
         if self.draw_timer.isActive():
             self.draw_timer.stop()
+            
+        # Stop background capture
+        self.window_manager.stop_capture_worker()
         
         # Reset template matcher frequency
         self.template_matcher.update_frequency = 0.0
         self.template_matcher.last_update_time = 0.0
         
         # Clear match cache
-        self.cached_matches = []
-        self.match_counters.clear()
+        self.detection_worker.clear()
+        self.reset_tracking()
+        self.motion_compensator.reset()
         
         # Hide window but never destroy it
         if self.window_hwnd and win32gui.IsWindow(self.window_hwnd):
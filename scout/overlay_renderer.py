@@ -0,0 +1,301 @@
+"""
+Overlay Renderer
+
+This module provides a retained-mode renderer for the overlay window. It keeps
+a persistent canvas and the set of elements currently drawn on it; when the
+matches change, only the rectangles covered by added or removed elements are
+cleared and redrawn. Rendering an unchanged scene costs nothing, so the
+overlay can poll at 30 FPS while staying idle between detections.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import logging
+
+import cv2
+import numpy as np
+
+from scout.core.window.capture_planner import merge_rectangles
+
+logger = logging.getLogger(__name__)
+
+# Magenta is the overlay window's transparency color key
+BACKGROUND_COLOR = (255, 0, 255)
+
+# (x1, y1, x2, y2), exclusive end
+Box = Tuple[int, int, int, int]
+Match = Tuple[str, int, int, int, int, float]
+
+
+class OverlayRenderer:
+    """
+    Draws template matches onto a persistent transparent canvas.
+
+    Scene elements are identified by hashable keys (the match tuples plus a
+    status indicator), each with the bounding box it paints. A render call
+    diffs the new scene against the drawn one, merges the boxes of changed
+    elements into dirty rectangles, and repaints each dirty rectangle from
+    scratch: background first, then every element intersecting it, clipped
+    to the rectangle. The canvas therefore always equals a full redraw.
+    """
+
+    def __init__(self, rect_color: Tuple[int, int, int], rect_thickness: int, rect_scale: float,
+                 font_color: Tuple[int, int, int], font_size: float, text_thickness: int,
+                 cross_color: Tuple[int, int, int], cross_size: int, cross_thickness: int,
+                 cross_scale: float = 1.0) -> None:
+        """
+        Initialize the renderer.
+
+        Args:
+            rect_color: Rectangle color (BGR)
+            rect_thickness: Rectangle line thickness
+            rect_scale: Scale applied to match rectangles around their center
+            font_color: Label color (BGR)
+            font_size: Label font size (divided by 30 for OpenCV's scale)
+            text_thickness: Label line thickness
+            cross_color: Center cross color (BGR)
+            cross_size: Center cross size in pixels
+            cross_thickness: Center cross line thickness
+            cross_scale: Scale applied to the cross size
+        """
+        self.rect_color = tuple(map(int, rect_color))
+        self.rect_thickness = rect_thickness
+        self.rect_scale = rect_scale
+        self.font_color = tuple(map(int, font_color))
+        self.font_size = font_size
+        self.text_thickness = text_thickness
+        self.cross_color = tuple(map(int, cross_color))
+        self.cross_size = cross_size
+        self.cross_thickness = cross_thickness
+        self.cross_scale = cross_scale
+
+        self.canvas: Optional[np.ndarray] = None
+        self._drawn: Dict[Hashable, Tuple[Box, Dict[str, Any]]] = {}
+        self._full_redraw = True
+
+        # Statistics
+        self.renders = 0
+        self.idle_renders = 0
+        self.pixels_redrawn = 0
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Canvas size as (width, height)."""
+        if self.canvas is None:
+            return (0, 0)
+        return (self.canvas.shape[1], self.canvas.shape[0])
+
+    def resize(self, width: int, height: int) -> bool:
+        """
+        Match the canvas to the window size.
+
+        Args:
+            width: Window width
+            height: Window height
+
+        Returns:
+            True if the canvas was reallocated (everything will be redrawn)
+        """
+        if self.size == (width, height):
+            return False
+        self.canvas = np.empty((height, width, 3), dtype=np.uint8)
+        self.invalidate()
+        return True
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next render, e.g. after the window was cleared."""
+        self._full_redraw = True
+
+    def render(self, matches: Sequence[Match], status_text: Optional[str] = None) -> List[Box]:
+        """
+        Bring the canvas up to date with the given matches.
+
+        Args:
+            matches: Matches as (name, x, y, width, height, confidence) in window coordinates
+            status_text: Diagnostic line shown while there are no matches
+
+        Returns:
+            Dirty rectangles (x1, y1, x2, y2) that were repainted; empty if
+            the canvas did not change
+        """
+        if self.canvas is None:
+            return []
+
+        self.renders += 1
+        scene = self._build_scene(matches, status_text)
+
+        width, height = self.size
+        if self._full_redraw:
+            dirty = [(0, 0, width, height)]
+        else:
+            changed = [box for key, (box, _) in self._drawn.items() if key not in scene]
+            changed.extend(box for key, (box, _) in scene.items() if key not in self._drawn)
+            dirty = self._merge(changed, width, height)
+
+        if not dirty:
+            self.idle_renders += 1
+            return []
+
+        for x1, y1, x2, y2 in dirty:
+            view = self.canvas[y1:y2, x1:x2]
+            view[:] = BACKGROUND_COLOR
+            for box, element in scene.values():
+                if box[0] < x2 and box[2] > x1 and box[1] < y2 and box[3] > y1:
+                    self._draw_element(view, element, -x1, -y1)
+            self.pixels_redrawn += (x2 - x1) * (y2 - y1)
+
+        self._drawn = scene
+        self._full_redraw = False
+        return dirty
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get renderer statistics.
+
+        Returns:
+            Dictionary with render counts and redrawn pixels
+        """
+        return {
+            'renders': self.renders,
+            'idle_renders': self.idle_renders,
+            'pixels_redrawn': self.pixels_redrawn,
+            'elements': len(self._drawn)
+        }
+
+    def _build_scene(self, matches: Sequence[Match],
+                     status_text: Optional[str]) -> Dict[Hashable, Tuple[Box, Dict[str, Any]]]:
+        """Compute the elements to draw and their bounding boxes."""
+        scene: Dict[Hashable, Tuple[Box, Dict[str, Any]]] = {}
+
+        # Indicator in the top-left corner to verify drawing is working
+        indicator = {'kind': 'indicator'}
+        scene[('indicator',)] = (self._text_box("Drawing Active", (80, 50), 0.5, 1, (30, 30, 70, 70)), indicator)
+
+        if not matches and status_text:
+            status = {'kind': 'status', 'text': status_text}
+            scene[('status', status_text)] = (self._text_box(status_text, (80, 80), 0.5, 1), status)
+
+        for i, match in enumerate(matches):
+            element = self._match_geometry(i, match)
+            if element is not None:
+                scene[('match', tuple(match))] = (element.pop('box'), element)
+
+        return scene
+
+    def _match_geometry(self, index: int, match: Match) -> Optional[Dict[str, Any]]:
+        """Compute the drawing geometry of a match, or None if it cannot be drawn."""
+        if not isinstance(match, tuple) or len(match) != 6:
+            logger.warning(f"Invalid match data format for match {index}: {match}")
+            return None
+
+        name, match_x, match_y, match_width, match_height, confidence = match
+        try:
+            match_x, match_y = int(match_x), int(match_y)
+            match_width, match_height = int(match_width), int(match_height)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Invalid coordinates for match {index}: {e}")
+            return None
+
+        width, height = self.size
+        if match_x < 0 or match_y < 0 or match_x >= width or match_y >= height:
+            logger.debug(f"Match {index} coordinates outside overlay: ({match_x}, {match_y})")
+            return None
+
+        # Scale the rectangle around the match center
+        center_x = match_x + match_width // 2
+        center_y = match_y + match_height // 2
+        scaled_width = int(match_width * self.rect_scale)
+        scaled_height = int(match_height * self.rect_scale)
+
+        x1 = max(0, min(int(center_x - scaled_width // 2), width - 1))
+        y1 = max(0, min(int(center_y - scaled_height // 2), height - 1))
+        x2 = max(0, min(int(x1 + scaled_width), width - 1))
+        y2 = max(0, min(int(y1 + scaled_height), height - 1))
+
+        if x2 - x1 < 10 or y2 - y1 < 10:
+            logger.debug(f"Match {index} rectangle too small: ({x1}, {y1}) -> ({x2}, {y2})")
+            return None
+
+        text = f"{name} ({confidence:.2f})"
+        text_origin = (x1, max(5, y1 - 5))
+        half_cross = int(self.cross_size * self.cross_scale) // 2
+
+        pad = max(self.rect_thickness, self.cross_thickness) + 1
+        box = self._union(
+            (x1 - pad, y1 - pad, x2 + pad + 1, y2 + pad + 1),
+            (center_x - half_cross - pad, center_y - half_cross - pad,
+             center_x + half_cross + pad + 1, center_y + half_cross + pad + 1),
+            self._text_box(text, text_origin, self.font_size / 30, self.text_thickness)
+        )
+
+        return {
+            'kind': 'match',
+            'box': box,
+            'rect': (x1, y1, x2, y2),
+            'text': text,
+            'text_origin': text_origin,
+            'center': (center_x, center_y),
+            'half_cross': half_cross
+        }
+
+    def _draw_element(self, canvas: np.ndarray, element: Dict[str, Any], dx: int, dy: int) -> None:
+        """Draw an element onto a canvas view whose origin is offset by (-dx, -dy)."""
+        kind = element['kind']
+
+        if kind == 'indicator':
+            cv2.circle(canvas, (50 + dx, 50 + dy), 20, (0, 255, 0), -1)  # Green circle
+            cv2.putText(canvas, "Drawing Active", (80 + dx, 50 + dy),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+
+        elif kind == 'status':
+            cv2.putText(canvas, element['text'], (80 + dx, 80 + dy),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)  # Yellow text
+
+        elif kind == 'match':
+            x1, y1, x2, y2 = element['rect']
+            cv2.rectangle(canvas, (x1 + dx, y1 + dy), (x2 + dx, y2 + dy),
+                          self.rect_color, self.rect_thickness)
+
+            text_x, text_y = element['text_origin']
+            cv2.putText(canvas, element['text'], (text_x + dx, text_y + dy),
+                        cv2.FONT_HERSHEY_SIMPLEX, self.font_size / 30,
+                        self.font_color, self.text_thickness)
+
+            center_x, center_y = element['center']
+            half_size = element['half_cross']
+            cv2.line(canvas, (center_x - half_size + dx, center_y + dy),
+                     (center_x + half_size + dx, center_y + dy),
+                     self.cross_color, self.cross_thickness)
+            cv2.line(canvas, (center_x + dx, center_y - half_size + dy),
+                     (center_x + dx, center_y + half_size + dy),
+                     self.cross_color, self.cross_thickness)
+
+    @staticmethod
+    def _text_box(text: str, origin: Tuple[int, int], scale: float, thickness: int,
+                  extra: Optional[Box] = None) -> Box:
+        """Bounding box of a putText call, optionally united with another box."""
+        (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        x, y = origin
+        pad = thickness + 2
+        box = (x - pad, y - text_height - pad, x + text_width + pad, y + baseline + pad)
+        return OverlayRenderer._union(box, extra) if extra else box
+
+    @staticmethod
+    def _union(*boxes: Box) -> Box:
+        """Smallest box containing all boxes."""
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    @staticmethod
+    def _merge(boxes: List[Box], width: int, height: int) -> List[Box]:
+        """Clip boxes to the canvas and merge them into few dirty rectangles."""
+        regions = []
+        for x1, y1, x2, y2 in boxes:
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(width, x2), min(height, y2)
+            if x2 > x1 and y2 > y1:
+                regions.append({'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1})
+
+        return [
+            (r['left'], r['top'], r['left'] + r['width'], r['top'] + r['height'])
+            for r in merge_rectangles(regions, merge_overhead=1024)
+        ]
@@ -14,6 +14,8 @@ from pathlib import Path
 from dataclasses import dataclass
 from scout.window_manager import WindowManager
 from scout.sound_manager import SoundManager
+from scout.core.detection.detection_batch import DetectionBatch
+from scout.core.window.frame_source import Frame
 
 logger = logging.getLogger(__name__)
 
@@ -206,6 +208,49 @@ class TemplateMatcher:
             logger.error(f"Error finding template {template_name}: {e}")
             return []
             
+    def find_match_batch(self, image: np.ndarray, template_names: Optional[List[str]] = None,
+                         distance_threshold: int = 10) -> DetectionBatch:
+        """
+        Find template matches in an image as a single DetectionBatch.
+        
+        Matches of the same template within distance_threshold pixels are
+        grouped like in _group_matches, keeping the most confident one, but
+        without building a match object per hit.
+        
+        Args:
+            image: Image to search in (BGR format)
+            template_names: List of template names to search for (None for all)
+            distance_threshold: Maximum pixel distance between matches to group
+            
+        Returns:
+            DetectionBatch of grouped matches, highest confidence first
+        """
+        try:
+            # Use all templates if none specified
+            if template_names is None:
+                template_names = list(self.templates.keys())
+                
+            batches = []
+            for name in template_names:
+                if name not in self.templates:
+                    logger.warning(f"Template not found: {name}")
+                    continue
+                    
+                template = self.templates[name]
+                result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+                ys, xs = np.nonzero(result >= self.confidence)
+                batches.append(DetectionBatch.from_match_locations(
+                    name, xs, ys, template.shape[1], template.shape[0], result[ys, xs]
+                ))
+                
+            return DetectionBatch.concatenate(batches).suppress_duplicates(
+                distance_threshold, metric='chebyshev', per_label=True
+            )
+            
+        except Exception as e:
+            logger.error(f"Error finding matches: {e}")
+            return DetectionBatch.empty()
+            
     def _group_matches(self, matches: List[TemplateMatch],
                       distance_threshold: int = 10) -> List[GroupedMatch]:
         """
@@ -280,6 +325,15 @@ class TemplateMatcher:
         """
         return self.window_manager.capture_screenshot()
         
+    def capture_frame(self) -> Optional[Frame]:
+        """
+        Capture the game window as a frame with its ID and capture timestamp.
+        
+        Returns:
+            Latest frame of the window manager's frame source, or None if failed
+        """
+        return self.window_manager.frame_source.get_latest()
+        
     def find_all_templates(self, image: np.ndarray) -> List[Tuple[str, int, int, int, int, float]]:
         """
         Find all templates in an image.
@@ -290,13 +344,8 @@ class TemplateMatcher:
         Returns:
             List of tuples (template_name, x, y, w, h, confidence)
         """
-        matches = self.find_matches(image)
-        
         # Convert to legacy format
-        return [
-            (match.template_name, *match.bounds, match.confidence)
-            for match in matches
-        ]
+        return self.find_match_batch(image).to_tuples()
         
     def start_template_matching(self) -> None:
         """Start continuous template matching."""
@@ -0,0 +1,120 @@
+"""
+Tests for the DetectionBatch result container.
+"""
+
+import pickle
+import unittest
+import numpy as np
+
+from scout.core.detection.detection_batch import DetectionBatch, offset_results
+from scout.core.utils.caching import estimate_size
+from scout.core.utils.parallel import ImageProcessor, ParallelExecutor
+
+
+def make_batch():
+    """Create a small batch with two labels."""
+    return DetectionBatch.from_dicts([
+        {'template_name': 'a', 'x': 10, 'y': 20, 'width': 5, 'height': 6, 'confidence': 0.9},
+        {'template_name': 'b', 'x': 12, 'y': 21, 'width': 7, 'height': 8, 'confidence': 0.95},
+        {'template_name': 'a', 'x': 100, 'y': 200, 'width': 5, 'height': 6, 'confidence': 0.8},
+    ])
+
+
+class TestDetectionBatch(unittest.TestCase):
+    """Test construction, views and vectorized operations."""
+
+    def test_dict_view_matches_input(self):
+        """Test that the lazy dictionary view reproduces the results."""
+        batch = make_batch()
+
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch[1]['template_name'], 'b')
+        self.assertEqual(batch[1]['x'], 12)
+        self.assertAlmostEqual(batch[1]['confidence'], 0.95, places=5)
+        self.assertEqual([r['template_name'] for r in batch], ['a', 'b', 'a'])
+
+    def test_arrays_are_read_only(self):
+        """Test that the batch cannot be mutated through its arrays."""
+        batch = make_batch()
+
+        with self.assertRaises(ValueError):
+            batch.x[0] = 0
+        with self.assertRaises(ValueError):
+            batch.confidence[0] = 0.0
+
+    def test_with_offset_does_not_touch_original(self):
+        """Test that offsets are applied as views and accumulate."""
+        batch = make_batch()
+        shifted = batch.with_offset(5, 7).with_offset(1, 1)
+
+        self.assertEqual(shifted.offset, (6, 8))
+        self.assertEqual(shifted[0]['x'], 16)
+        self.assertEqual(shifted[0]['y'], 28)
+        self.assertEqual(batch[0]['x'], 10)
+        self.assertIs(batch.with_offset(0, 0), batch)
+
+    def test_top_k_orders_by_confidence(self):
+        """Test that top_k keeps the most confident detections."""
+        top = make_batch().top_k(2)
+
+        self.assertEqual([r['template_name'] for r in top], ['b', 'a'])
+        self.assertEqual(top[1]['x'], 10)
+
+    def test_suppress_duplicates(self):
+        """Test greedy suppression with and without label separation."""
+        batch = make_batch()
+
+        merged = batch.suppress_duplicates(10)
+        self.assertEqual([r['template_name'] for r in merged], ['b', 'a'])
+        self.assertEqual(merged[1]['x'], 100)
+
+        per_label = batch.suppress_duplicates(10, per_label=True)
+        self.assertEqual(len(per_label), 3)
+
+    def test_concatenate_merges_labels_and_offsets(self):
+        """Test that concatenation remaps labels and bakes in offsets."""
+        first = DetectionBatch.from_match_locations('a', [0], [0], 4, 4, [0.9])
+        second = DetectionBatch.from_match_locations('b', [1, 2], [1, 2], 4, 4, [0.8, 0.7])
+
+        combined = DetectionBatch.concatenate([first, second.with_offset(10, 0)])
+
+        self.assertEqual(combined.labels, ('a', 'b'))
+        self.assertEqual(combined.to_tuples()[1][:5], ('b', 11, 1, 4, 4))
+
+    def test_pickle_and_size(self):
+        """Test that batches survive pickling and report their size to caches."""
+        batch = make_batch().with_offset(3, 4)
+
+        restored = pickle.loads(pickle.dumps(batch))
+
+        self.assertEqual(restored, batch)
+        self.assertEqual(estimate_size(batch), batch.nbytes)
+
+    def test_tiled_detection_merges_batches(self):
+        """Test that tile results are shifted and deduplicated as one batch."""
+        processor = ImageProcessor(ParallelExecutor(max_workers=2))
+        image = np.zeros((100, 100), dtype=np.uint8)
+
+        def detect(tile):
+            return DetectionBatch.from_match_locations('dot', [5], [5], 2, 2, [0.9])
+
+        results = processor.apply_detection_in_tiles(
+            image, detect, tile_size=60, overlap=10, min_distance=20
+        )
+
+        self.assertIsInstance(results, DetectionBatch)
+        self.assertEqual(sorted((r['x'], r['y']) for r in results),
+                         [(5, 5), (5, 45), (45, 5), (45, 45)])
+
+    def test_offset_results_copies(self):
+        """Test that shifting results leaves the originals untouched."""
+        original = [{'x': 1, 'y': 2, 'bbox': [1, 2, 3, 4]}]
+        offset_results(original, 10, 20)
+        self.assertEqual(original, [{'x': 1, 'y': 2, 'bbox': [1, 2, 3, 4]}])
+
+        batch = DetectionBatch.from_match_locations('a', [1], [2], 5, 5, [0.9])
+        self.assertEqual(offset_results(batch, 10, 20)[0]['x'], 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
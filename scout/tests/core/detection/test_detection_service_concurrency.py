@@ -0,0 +1,151 @@
+"""
+Stress tests for concurrent use of the detection service.
+"""
+
+import random
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from scout.core.detection.detection_service import DetectionService
+from scout.core.utils.caching import cache_manager
+from scout.core.window.frame_source import FrameSource
+
+
+def run_threads(count, target):
+    """Run a function in several threads at once and wait for them."""
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+
+class TestConcurrentDetection(unittest.TestCase):
+    """Test that concurrent requesters get correct, private results."""
+
+    def setUp(self):
+        """Create a service with strategies returning results in region space."""
+        cache_manager.detection_cache.clear()
+        self.delay = 0.002
+
+        def detect_template(image, template_names, **params):
+            time.sleep(self.delay)
+            return [{'template_name': template_names[0], 'x': 5, 'y': 7,
+                     'width': 10, 'height': 10, 'confidence': 0.9}]
+
+        def detect_text(image, **params):
+            time.sleep(self.delay)
+            return [{'text': '42', 'x': 3, 'y': 4, 'width': 5, 'height': 5, 'confidence': 0.9}]
+
+        def detect_objects(image, **params):
+            time.sleep(self.delay)
+            return [{'class_name': 'unit', 'x': 1, 'y': 2, 'width': 10, 'height': 10,
+                     'bbox': [1, 2, 10, 10], 'confidence': 0.9}]
+
+        self.strategies = {}
+        window_service = MagicMock()
+        window_service.frame_source = FrameSource(lambda: None, min_interval=10.0)
+        window_service.frame_source.publish(np.random.RandomState(0).randint(0, 256, (480, 640, 3)).astype(np.uint8))
+        self.service = DetectionService(MagicMock(), window_service)
+        for name, func in (('template', detect_template), ('ocr', detect_text), ('yolo', detect_objects)):
+            strategy = MagicMock()
+            strategy.detect.side_effect = func
+            self.strategies[name] = strategy
+            self.service.register_strategy(name, strategy)
+
+    def tearDown(self):
+        """Drop cached results of the mock strategies."""
+        cache_manager.detection_cache.clear()
+
+    def test_results_are_never_shifted_twice(self):
+        """Test region offsets with many requesters hitting the cache and shared detections."""
+        errors = []
+        regions = [{'left': 10 * i, 'top': 20 * i, 'width': 100, 'height': 80} for i in range(4)]
+
+        def request(index):
+            rng = random.Random(index)
+            for _ in range(60):
+                region = rng.choice(regions)
+                use_cache = rng.random() < 0.7
+                kind = rng.choice(('template', 'ocr', 'yolo'))
+                if kind == 'template':
+                    results = self.service.detect_template('button', region=region, use_cache=use_cache)
+                    expected = (5, 7)
+                elif kind == 'ocr':
+                    results = self.service.detect_text(region=region, use_cache=use_cache)
+                    expected = (3, 4)
+                else:
+                    results = self.service.detect_objects(region=region, use_cache=use_cache)
+                    expected = (1, 2)
+                    if results and results[0]['bbox'][:2] != [region['left'] + 1, region['top'] + 2]:
+                        errors.append((kind, region, results))
+
+                position = (results[0]['x'], results[0]['y']) if results else None
+                if position != (region['left'] + expected[0], region['top'] + expected[1]):
+                    errors.append((kind, region, results))
+
+                # Callers own their results; changing them must not affect anyone else
+                results[0]['x'] = -1000
+                if 'bbox' in results[0]:
+                    results[0]['bbox'][0] = -1000
+
+        run_threads(16, request)
+
+        self.assertEqual(errors, [])
+
+    def test_region_requests_are_coalesced(self):
+        """Test that concurrent identical region OCR requests share one detection."""
+        self.delay = 0.1
+        region = {'left': 30, 'top': 40, 'width': 100, 'height': 50}
+        results = [None] * 4
+
+        def request(index):
+            results[index] = self.service.detect_text(region=region, use_cache=False)
+
+        run_threads(4, request)
+
+        self.assertEqual(self.strategies['ocr'].detect.call_count, 1)
+        self.assertEqual([(r[0]['x'], r[0]['y']) for r in results], [(33, 44)] * 4)
+        self.assertEqual(len({id(r[0]) for r in results}), 4)
+
+    def test_independent_requests_overlap(self):
+        """Test that independent requests from several threads run detections concurrently."""
+        self.delay = 0.02
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        detect = self.strategies['template'].detect.side_effect
+
+        def counting_detect(image, **params):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            try:
+                return detect(image, **params)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        self.strategies['template'].detect.side_effect = counting_detect
+
+        def request(index):
+            for i in range(5):
+                self.service.detect_template(f'template_{index}_{i}', use_cache=False)
+
+        run_threads(8, request)
+
+        self.assertEqual(self.strategies['template'].detect.call_count, 40)
+        self.assertGreater(peak[0], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for streaming detection results per frame.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from scout.core.detection.detection_service import DetectionService
+from scout.core.detection.detection_stream import DetectionStream
+from scout.core.window.frame_source import FrameSource
+
+
+class TestDetectionStream(unittest.TestCase):
+    """Test the blocking and asynchronous stream interfaces."""
+
+    def setUp(self):
+        """Create a frame source capturing a new frame every 10 ms."""
+        self.frame_source = FrameSource(lambda: np.zeros((10, 10, 3), dtype=np.uint8), min_interval=0.01)
+        self.counter = itertools.count()
+
+    def test_one_update_per_new_frame(self):
+        """Test that updates come from increasing frames and skip to the latest."""
+        def slow_detect():
+            # Meanwhile a producer publishes several frames
+            for _ in range(3):
+                self.frame_source.publish(np.zeros((10, 10, 3), dtype=np.uint8))
+            return next(self.counter)
+
+        stream = DetectionStream(self.frame_source, slow_detect, consumer='test')
+        updates = list(itertools.islice(stream, 3))
+
+        self.assertEqual([u.results for u in updates], [0, 1, 2])
+        frame_ids = [u.frame_id for u in updates]
+        self.assertEqual(frame_ids, sorted(set(frame_ids)))
+        self.assertEqual([u.dropped for u in updates[1:]], [2, 2])
+        self.assertEqual(stream.dropped, 4)
+
+    def test_timeout_and_cancel(self):
+        """Test that the stream ends on timeout and on cancellation."""
+        stream = DetectionStream(self.frame_source, lambda: None, timeout=0.1, min_interval=0.03)
+        start = time.monotonic()
+        updates = list(stream)
+        self.assertTrue(stream.timed_out)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(2 <= len(updates) <= 5)
+
+        cancel = threading.Event()
+        stream = DetectionStream(self.frame_source, lambda: None, min_interval=10, cancel_event=cancel)
+        self.assertIsNotNone(stream.next_update())
+        threading.Timer(0.05, cancel.set).start()
+        self.assertIsNone(stream.next_update())
+        self.assertFalse(stream.timed_out)
+
+    def test_cancel_wakes_wait_for_producer(self):
+        """Test that cancelling interrupts a wait for a slow background producer."""
+        self.frame_source.get_latest()
+        self.frame_source.set_producer(MagicMock(is_running=True, interval=10.0))
+        stream = DetectionStream(self.frame_source, lambda: None)
+        stream._frame_id = self.frame_source.latest_id
+
+        threading.Timer(0.05, stream.cancel).start()
+        start = time.monotonic()
+        self.assertIsNone(stream.next_update())
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_service_detects_on_awaited_frame(self):
+        """Test that uncached detections in a service stream use the awaited frame."""
+        captured = []
+
+        def capture():
+            captured.append(np.zeros((10, 10, 3), dtype=np.uint8))
+            return captured[-1]
+
+        window_service = MagicMock()
+        window_service.frame_source = FrameSource(capture, min_interval=0.01)
+        service = DetectionService(MagicMock(), window_service)
+        seen = []
+        strategy = MagicMock()
+        strategy.detect.side_effect = lambda image, **params: seen.append(image) or []
+        service.register_strategy('template', strategy)
+
+        # The awaited frame is a tick old by the time the detection asks for one
+        stream = service.stream(lambda: time.sleep(0.02) or service.detect_template('button', use_cache=False))
+        updates = list(itertools.islice(stream, 3))
+
+        self.assertEqual(len(captured), 3)
+        self.assertEqual([id(image) for image in seen], [id(captured[u.frame_id - 1]) for u in updates])
+
+    def test_first_update_skips_stale_frame(self):
+        """Test that a service stream does not start on a frame older than the cache timeout."""
+        window_service = MagicMock()
+        window_service.frame_source = self.frame_source
+        service = DetectionService(MagicMock(), window_service)
+        stale = self.frame_source.publish(np.zeros((10, 10, 3), dtype=np.uint8),
+                                          timestamp=time.monotonic() - 1.0)
+
+        update = service.stream(lambda: None, timeout=1.0).next_update()
+
+        self.assertIsNotNone(update)
+        self.assertGreater(update.frame_id, stale.frame_id)
+        self.assertEqual(update.dropped, 0)
+
+        # A fresh frame is still used as is
+        fresh = self.frame_source.publish(np.zeros((10, 10, 3), dtype=np.uint8))
+        self.assertEqual(service.stream(lambda: None).next_update().frame_id, fresh.frame_id)
+
+    def test_async_iteration(self):
+        """Test async iteration and that task cancellation ends the stream."""
+        stream = DetectionStream(self.frame_source, lambda: next(self.counter), min_interval=10)
+
+        async def consume():
+            results = []
+            async for update in stream:
+                results.append(update.results)
+            return results
+
+        async def main():
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.assertTrue(stream.cancelled)
+        self.assertEqual(stream.updates, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
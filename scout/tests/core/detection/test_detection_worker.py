@@ -0,0 +1,106 @@
+"""
+Tests for the background detection worker.
+"""
+
+import time
+import threading
+import unittest
+import dataclasses
+
+from scout.core.detection.detection_worker import DetectionWorker
+
+
+class TestDetectionWorker(unittest.TestCase):
+    """Test snapshot publishing and the worker thread."""
+
+    def setUp(self):
+        """Create a worker with a counting detection function."""
+        self.calls = 0
+        self.fail = False
+
+        def detect():
+            self.calls += 1
+            if self.fail:
+                return None
+            return [('city', self.calls, 0, 10, 10, 0.9)], time.monotonic() - 0.05, self.calls
+
+        self.worker = DetectionWorker(detect, interval=0.01)
+        self.addCleanup(self.worker.stop)
+
+    def test_snapshots_are_immutable(self):
+        """Test that published snapshots cannot be modified."""
+        matches = [('city', 1, 2, 3, 4, 0.9)]
+        snapshot = self.worker.publish(matches)
+        matches.append(('mine', 0, 0, 1, 1, 0.8))
+
+        self.assertIs(self.worker.latest, snapshot)
+        self.assertEqual(len(snapshot.matches), 1)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.matches = ()
+
+    def test_run_once_publishes_frame_metadata(self):
+        """Test that a cycle publishes matches with the frame's capture time."""
+        snapshot = self.worker.run_once()
+
+        self.assertEqual(snapshot.frame_id, 1)
+        self.assertGreaterEqual(snapshot.age, 0.05)
+        self.assertEqual(self.worker.latest.sequence, snapshot.sequence)
+
+    def test_failed_cycle_keeps_previous_snapshot(self):
+        """Test that a failed cycle leaves the latest snapshot in place."""
+        first = self.worker.run_once()
+        self.fail = True
+
+        self.assertIsNone(self.worker.run_once())
+        self.assertIs(self.worker.latest, first)
+        self.assertEqual(self.worker.get_stats()['failures'], 1)
+
+    def test_worker_thread_publishes_while_reader_polls(self):
+        """Test that a reader sees monotonically newer snapshots without locking."""
+        seen = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                snapshot = self.worker.latest
+                if snapshot is not None:
+                    seen.append(snapshot.sequence)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        self.worker.start()
+        time.sleep(0.2)
+        self.worker.stop()
+        stop.set()
+        thread.join()
+
+        self.assertGreater(self.worker.get_stats()['cycles'], 3)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_interval_change_applies_while_running(self):
+        """Test that shortening the interval takes effect without a restart."""
+        self.worker.interval = 10.0
+        self.worker.start()
+        time.sleep(0.05)
+        cycles = self.worker.cycles
+
+        self.worker.interval = 0.01
+        time.sleep(0.2)
+
+        self.assertGreater(self.worker.cycles, cycles + 3)
+
+    def test_staleness_metric(self):
+        """Test that drawn snapshots report capture-to-draw staleness."""
+        snapshot = self.worker.run_once()
+
+        staleness = self.worker.record_draw(snapshot)
+        stats = self.worker.get_stats()
+
+        self.assertGreaterEqual(staleness, 0.05)
+        self.assertEqual(stats['draws_recorded'], 1)
+        self.assertEqual(stats['last_drawn_sequence'], snapshot.sequence)
+        self.assertAlmostEqual(stats['staleness_last'], staleness)
+
+
+if __name__ == '__main__':
+    unittest.main()
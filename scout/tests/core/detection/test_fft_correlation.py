@@ -0,0 +1,102 @@
+"""
+Tests for the FFT correlation engine.
+"""
+
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from scout.core.detection.fft_correlation import FFTCorrelationEngine
+from scout.core.detection.strategies.template_strategy import TemplateMatchingStrategy
+
+
+def make_frame(shape=(120, 160, 3)):
+    """Create a smooth random test frame."""
+    rng = np.random.RandomState(0)
+    return cv2.GaussianBlur(rng.randint(0, 256, shape).astype(np.uint8), (3, 3), 0)
+
+
+class TestFFTCorrelationEngine(unittest.TestCase):
+    """Test FFT correlation against cv2.matchTemplate."""
+
+    def setUp(self):
+        """Create an engine and a frame."""
+        self.engine = FFTCorrelationEngine()
+        self.frame = make_frame()
+
+    def test_matches_opencv_color_and_gray(self):
+        """Test that FFT maps equal TM_CCOEFF_NORMED maps."""
+        gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+        for image in (self.frame, gray):
+            template = np.ascontiguousarray(image[30:55, 40:80])
+            expected = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+
+            result = self.engine.match_fft(self.engine.prepare(image), template)
+
+            self.assertEqual(result.shape, expected.shape)
+            np.testing.assert_allclose(result, expected, atol=1e-4)
+
+    def test_flat_windows_do_not_divide_by_zero(self):
+        """Test that constant image areas give zero correlation."""
+        image = self.frame.copy()
+        image[:, :80] = 128
+        template = np.ascontiguousarray(self.frame[10:30, 100:130])
+
+        result = self.engine.match_fft(self.engine.prepare(image), template)
+
+        self.assertTrue(np.isfinite(result).all())
+        self.assertEqual(float(np.abs(result[:, :40]).max()), 0.0)
+
+    def test_spectra_are_shared(self):
+        """Test that frame and template spectra are computed once."""
+        frame = self.engine.prepare(self.frame)
+        template = np.ascontiguousarray(self.frame[0:20, 0:20])
+
+        self.engine.match_fft(frame, template, key='a')
+        spectra = frame.spectra
+        self.engine.match_fft(frame, template, key='a')
+
+        self.assertIs(frame.spectra, spectra)
+        stats = self.engine.get_stats()
+        self.assertEqual((stats['spectrum_misses'], stats['spectrum_hits']), (1, 1))
+
+    def test_crossover_selects_backend(self):
+        """Test that small templates use direct matching."""
+        self.engine.crossover_area = 400
+        frame = self.engine.prepare(self.frame)
+
+        self.engine.match(frame, np.ascontiguousarray(self.frame[:10, :10]))
+        self.engine.match(frame, np.ascontiguousarray(self.frame[:30, :30]))
+
+        stats = self.engine.get_stats()
+        self.assertEqual((stats['direct_matches'], stats['fft_matches']), (1, 1))
+        self.assertGreater(self.engine.calibrate((90, 120, 3), sizes=(8, 16), repeats=1), 0)
+
+
+class TestTemplateStrategyFFT(unittest.TestCase):
+    """Test that the strategy finds the same matches with and without FFT."""
+
+    def test_same_results(self):
+        """Test FFT and direct backends agree."""
+        frame = make_frame((200, 300, 3))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cv2.imwrite(os.path.join(temp_dir, 'icon.png'), frame[50:90, 120:170])
+            cv2.imwrite(os.path.join(temp_dir, 'dot.png'), frame[150:158, 20:28])
+            strategy = TemplateMatchingStrategy(templates_dir=temp_dir)
+
+        fft_results = strategy.detect(frame, confidence_threshold=0.9).to_tuples()
+        strategy.use_fft = False
+        direct_results = strategy.detect(frame, confidence_threshold=0.9).to_tuples()
+
+        self.assertEqual(len(fft_results), len(direct_results))
+        for a, b in zip(sorted(fft_results), sorted(direct_results)):
+            self.assertEqual(a[:5], b[:5])
+            self.assertAlmostEqual(a[5], b[5], places=3)
+        self.assertEqual(strategy.fft_engine.get_stats()['fft_matches'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for global motion compensation.
+"""
+
+import unittest
+import numpy as np
+import cv2
+
+from scout.core.detection.motion import MotionCompensator, exposed_regions
+
+
+def make_world():
+    """Create a textured map larger than the view."""
+    rng = np.random.RandomState(0)
+    world = rng.randint(0, 255, (600, 800, 3)).astype(np.uint8)
+    return cv2.GaussianBlur(world, (5, 5), 0)
+
+
+def view(world, x, y, width=480, height=320):
+    """Get the part of the map visible with the view's top-left at (x, y)."""
+    return np.ascontiguousarray(world[y:y + height, x:x + width])
+
+
+class TestExposedRegions(unittest.TestCase):
+    """Test strip computation for shifts."""
+
+    def test_strips_cover_new_content_without_overlap(self):
+        """Test horizontal, vertical and diagonal shifts."""
+        self.assertEqual(exposed_regions(100, 80, 10, 0), [(0, 0, 10, 80)])
+        self.assertEqual(exposed_regions(100, 80, 0, -5, margin=3), [(0, 72, 100, 8)])
+        self.assertEqual(exposed_regions(100, 80, -10, 5), [(0, 0, 100, 5), (90, 5, 10, 75)])
+
+
+class TestMotionCompensator(unittest.TestCase):
+    """Test shift estimation and detection reuse."""
+
+    def setUp(self):
+        """Create a map with two landmarks and a detector that finds them."""
+        self.world = make_world()
+        self.objects = {'city': (300, 200), 'mine': (150, 420)}  # Map coordinates
+        self.view_origin = (0, 0)
+        self.searched = []
+
+        def detect(image):
+            # Find landmarks by locating their map patch in the image
+            self.searched.append(image.shape[:2])
+            found = []
+            for name, (mx, my) in self.objects.items():
+                patch = self.world[my:my + 30, mx:mx + 30]
+                if image.shape[0] < 30 or image.shape[1] < 30:
+                    continue
+                result = cv2.matchTemplate(image, patch, cv2.TM_SQDIFF_NORMED)
+                min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+                if min_val < 0.01:
+                    found.append((name, min_loc[0], min_loc[1], 30, 30, 0.95))
+            return found
+
+        self.detect = detect
+        self.compensator = MotionCompensator()
+
+    def test_estimate_shift(self):
+        """Test that a pan is recovered exactly in pixels."""
+        previous = cv2.cvtColor(view(self.world, 100, 100), cv2.COLOR_BGR2GRAY)
+        current = cv2.cvtColor(view(self.world, 113, 93), cv2.COLOR_BGR2GRAY)
+
+        shift = self.compensator.estimate_shift(previous, current)
+
+        self.assertEqual((shift.dx, shift.dy), (-13, 7))
+
+    def test_unrelated_frames_are_rejected(self):
+        """Test that a non-translational change is not compensated."""
+        previous = cv2.cvtColor(view(self.world, 100, 100), cv2.COLOR_BGR2GRAY)
+        current = cv2.rotate(previous, cv2.ROTATE_180)
+
+        self.assertIsNone(self.compensator.estimate_shift(previous, current))
+
+    def test_pan_reuses_detections(self):
+        """Test that panning shifts old matches and searches only the new strip."""
+        first, shift = self.compensator.detect(view(self.world, 100, 100), self.detect, margin=30)
+        self.assertIsNone(shift)
+        self.assertEqual(sorted(m[0] for m in first), ['city'])
+
+        # Pan down-left: the view moves, the content moves up and right
+        self.searched.clear()
+        matches, shift = self.compensator.detect(view(self.world, 80, 140), self.detect, margin=30)
+
+        self.assertEqual((shift.dx, shift.dy), (20, -40))
+        self.assertEqual(sorted(matches), [('city', 220, 60, 30, 30, 0.95), ('mine', 70, 280, 30, 30, 0.95)])
+        searched = sum(h * w for h, w in self.searched)
+        self.assertLess(searched, 480 * 320 // 2)
+        self.assertLess(self.compensator.get_stats()['searched_ratio'], 0.8)
+
+    def test_full_sweep_interval(self):
+        """Test that a full detection is forced periodically."""
+        self.compensator.full_sweep_interval = 1
+        self.compensator.detect(view(self.world, 100, 100), self.detect)
+        self.compensator.detect(view(self.world, 105, 100), self.detect)
+        _, shift = self.compensator.detect(view(self.world, 110, 100), self.detect)
+
+        self.assertIsNone(shift)
+        self.assertEqual(self.compensator.get_stats()['full_detections'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
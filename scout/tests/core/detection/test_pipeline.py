@@ -0,0 +1,147 @@
+"""
+Tests for the declarative detection pipeline.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from scout.core.detection.pipeline import DetectionPipeline, PipelineRegion, PipelineSpec, PipelineStep
+from scout.core.detection.detection_service import DetectionService
+from scout.core.window.frame_source import FrameSource
+
+
+SPEC = {
+    'regions': {
+        'map': {'left': 100, 'top': 50, 'width': 200, 'height': 150},
+        'coords': {'left': 20, 'top': 100, 'width': 60, 'height': 20, 'parent': 'map'}
+    },
+    'steps': {
+        'coords': {'strategy': 'ocr', 'region': 'coords', 'params': {'pattern': r'\d+'}},
+        'resources': {'strategy': 'template', 'every_seconds': 5.0},
+        'icons': {'strategy': 'template', 'region': 'map', 'plane': 'gray', 'every_frames': 2},
+        'units': {'strategy': 'yolo', 'region': 'map', 'plane': 'gray', 'every_frames': 2}
+    }
+}
+
+
+class TestPipelineSpec(unittest.TestCase):
+    """Test building and validating pipeline specs."""
+
+    def test_from_dict(self):
+        """Test that a dictionary spec yields regions and steps."""
+        spec = PipelineSpec.from_dict(SPEC)
+
+        self.assertEqual([r.name for r in spec.region_chain('coords')], ['map', 'coords'])
+        self.assertEqual(spec.steps['coords'].params, {'pattern': r'\d+'})
+        self.assertEqual(spec.steps['icons'].every_frames, 2)
+
+    def test_invalid_specs(self):
+        """Test that unknown references and region cycles are rejected."""
+        with self.assertRaises(ValueError):
+            PipelineSpec([], [PipelineStep('a', 'ocr', region='missing')])
+        with self.assertRaises(ValueError):
+            PipelineSpec([], [PipelineStep('a', 'ocr', plane='missing')])
+        with self.assertRaises(ValueError):
+            PipelineSpec([PipelineRegion('a', 0, 0, 1, 1, parent='b'), PipelineRegion('b', 0, 0, 1, 1, parent='a')])
+
+
+class TestDetectionPipeline(unittest.TestCase):
+    """Test executing a pipeline on frames."""
+
+    def setUp(self):
+        """Create a pipeline recording the images its steps receive."""
+        self.calls = []
+
+        def run_step(step, image):
+            self.calls.append((step.name, image))
+            return [{'x': 1, 'y': 2, 'bbox': [1, 2, 3, 4]}]
+
+        self.pipeline = DetectionPipeline(PipelineSpec.from_dict(SPEC), run_step)
+        self.image = np.zeros((400, 600, 3), dtype=np.uint8)
+
+    def test_rates(self):
+        """Test that steps run at their frame and time rates."""
+        ran = [self.pipeline.run(self.image, frame_id, timestamp).ran
+               for frame_id, timestamp in enumerate([0.0, 1.0, 2.0, 6.0])]
+
+        self.assertEqual(ran[0], ('coords', 'resources', 'icons', 'units'))
+        self.assertEqual(ran[1], ('coords',))
+        self.assertEqual(ran[2], ('coords', 'icons', 'units'))
+        self.assertEqual(ran[3], ('coords', 'resources'))
+
+    def test_shared_crops_and_frame_coordinates(self):
+        """Test that steps share crops and planes and results are in frame coordinates."""
+        result = self.pipeline.run(self.image, 7, 0.0)
+
+        images = dict(self.calls)
+        self.assertEqual(images['coords'].shape, (20, 60, 3))
+        self.assertEqual(images['icons'].shape, (150, 200))
+        self.assertIs(images['icons'], images['units'])
+        self.assertEqual(self.pipeline.get_stats()['planes'], 3)
+
+        self.assertEqual(result['coords'], [{'x': 121, 'y': 152, 'bbox': [121, 152, 3, 4]}])
+        self.assertEqual(result['resources'], [{'x': 1, 'y': 2, 'bbox': [1, 2, 3, 4]}])
+
+        # Results of steps that did not run are carried over with their frame
+        result = self.pipeline.run(self.image, 8, 1.0)
+        self.assertIn('icons', result)
+        self.assertEqual(result.age('icons'), 1)
+        self.assertEqual(result.age('coords'), 0)
+
+    def test_motion_compensated_step(self):
+        """Test that a panned view only searches the exposed strip and shifts previous results."""
+        world = np.random.RandomState(1).randint(0, 256, (300, 500, 3)).astype(np.uint8)
+        searched = []
+
+        def run_step(step, image):
+            searched.append(image.shape[:2])
+            if image.shape[1] < 400:
+                return []
+            return [{'template_name': 'icon', 'x': 100, 'y': 50, 'width': 10, 'height': 10, 'confidence': 0.9}]
+
+        spec = PipelineSpec([], [PipelineStep('icons', 'template', motion_margin=10)])
+        pipeline = DetectionPipeline(spec, run_step)
+        pipeline.run(world[:, :400], 1, 1.0)
+        result = pipeline.run(world[:, 20:420], 2, 2.0)
+
+        self.assertEqual([(r['template_name'], r['x'], r['y']) for r in result['icons']], [('icon', 80, 50)])
+        self.assertEqual(searched[0], (300, 400))
+        self.assertTrue(all(width < 400 for _, width in searched[1:]))
+        self.assertEqual(pipeline.get_stats()['steps']['icons']['motion']['compensated_detections'], 1)
+
+
+class TestServicePipeline(unittest.TestCase):
+    """Test running the pipeline through the detection service."""
+
+    def test_once_per_frame(self):
+        """Test that each frame is processed once and published as one event."""
+        strategy = MagicMock()
+        strategy.detect.return_value = [{'x': 0, 'y': 0, 'text': '42'}]
+        window_service = MagicMock()
+        window_service.frame_source = FrameSource(lambda: None, min_interval=1.0)
+        event_bus = MagicMock()
+        service = DetectionService(event_bus, window_service)
+        service.register_strategy('ocr', strategy)
+        service.set_pipeline({
+            'regions': {'coords': {'left': 10, 'top': 20, 'width': 30, 'height': 10}},
+            'steps': {'coords': {'strategy': 'ocr', 'region': 'coords', 'params': {'pattern': r'\d+'}}}
+        })
+
+        window_service.frame_source.publish(np.zeros((100, 100, 3), dtype=np.uint8))
+        first = service.run_pipeline()
+        self.assertIs(service.run_pipeline(), first)
+        window_service.frame_source.publish(np.zeros((100, 100, 3), dtype=np.uint8))
+        second = service.run_pipeline()
+
+        self.assertEqual(strategy.detect.call_count, 2)
+        strategy.detect.assert_called_with(strategy.detect.call_args[0][0], pattern=r'\d+')
+        self.assertEqual(second['coords'][0]['x'], 10)
+        self.assertIs(service.pipeline_result, second)
+        event_bus.publish.assert_called_with('detection_pipeline_completed', second)
+        self.assertEqual(event_bus.publish.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for the template prefilter cascade.
+"""
+
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from scout.core.detection.prefilter import PrefilterCascade
+from scout.core.detection.strategies.template_strategy import TemplateMatchingStrategy
+
+
+def make_scene():
+    """Create a mostly flat frame with a few textured, colored objects."""
+    rng = np.random.RandomState(1)
+    frame = np.full((240, 320, 3), (60, 40, 30), dtype=np.uint8)
+    icon = cv2.GaussianBlur(rng.randint(0, 256, (40, 48, 3)).astype(np.uint8), (3, 3), 0)
+    icon[:, :, 2] = np.maximum(icon[:, :, 2], 180)  # Reddish
+    other = cv2.GaussianBlur(rng.randint(0, 256, (40, 48, 3)).astype(np.uint8), (3, 3), 0)
+    other[:, :, 0] = np.maximum(other[:, :, 0], 180)  # Bluish
+    frame[100:140, 200:248] = icon
+    frame[20:60, 20:68] = other
+    return frame, icon
+
+
+class TestPrefilterCascade(unittest.TestCase):
+    """Test stage rejection and candidate correlation."""
+
+    def setUp(self):
+        """Create a scene and a cascade."""
+        self.frame, self.icon = make_scene()
+        self.cascade = PrefilterCascade()
+
+    def test_match_equals_full_correlation_at_candidates(self):
+        """Test that the true match survives and scores like the full correlation."""
+        frame = self.cascade.prepare(self.frame)
+        result = self.cascade.match(frame, self.icon, 'icon', 0.8)
+        expected = cv2.matchTemplate(self.frame, self.icon, cv2.TM_CCOEFF_NORMED)
+
+        self.assertIsNotNone(result)
+        self.assertEqual(np.unravel_index(np.argmax(result), result.shape), (100, 200))
+        self.assertAlmostEqual(float(result[100, 200]), float(expected[100, 200]), places=4)
+        self.assertEqual(len(np.nonzero(result >= 0.8)[0]), len(np.nonzero(expected >= 0.8)[0]))
+
+    def test_rejection_ratios_per_stage(self):
+        """Test that statistics report which stage rejected positions."""
+        frame = self.cascade.prepare(self.frame)
+        mask = self.cascade.candidates(frame, self.icon, 'icon', 0.8)
+
+        stats = self.cascade.get_stats()['icon']
+        ratios = stats['rejection_ratios']
+        self.assertEqual(set(ratios), {'statistics', 'color', 'coarse'})
+        # The flat background is rejected by the first stage, the blue object by color
+        self.assertGreater(ratios['statistics'], 0.5)
+        self.assertGreater(ratios['color'], 0.0)
+        self.assertAlmostEqual(stats['candidate_ratio'], mask.mean())
+        self.assertTrue(mask[100, 200])
+
+    def test_per_template_options(self):
+        """Test that stages can be disabled per template."""
+        self.cascade.configure_template('icon', stages=('statistics',))
+        frame = self.cascade.prepare(self.frame)
+        self.cascade.candidates(frame, self.icon, 'icon', 0.8)
+
+        self.assertEqual(list(self.cascade.get_stats()['icon']['rejection_ratios']), ['statistics'])
+        with self.assertRaises(ValueError):
+            self.cascade.configure_template('icon', unknown=1)
+
+    def test_falls_back_when_nothing_is_rejected(self):
+        """Test that no partial map is returned when candidates cover the frame."""
+        self.cascade.configure_template('icon', stages=())
+        result = self.cascade.match(self.cascade.prepare(self.frame), self.icon, 'icon', 0.8)
+
+        self.assertIsNone(result)
+        self.assertEqual(self.cascade.get_stats()['icon']['full_fallbacks'], 1)
+
+    def test_strategy_uses_prefilter(self):
+        """Test that the strategy finds the same match with the cascade enabled."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cv2.imwrite(os.path.join(temp_dir, 'icon.png'), self.icon)
+            strategy = TemplateMatchingStrategy(templates_dir=temp_dir)
+
+        expected = strategy.detect(self.frame, confidence_threshold=0.8).to_tuples()
+        strategy.prefilter = self.cascade
+        results = strategy.detect(self.frame, confidence_threshold=0.8).to_tuples()
+
+        self.assertEqual([r[:5] for r in results], [r[:5] for r in expected])
+        self.assertEqual(self.cascade.get_stats()['icon']['evaluations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for out-of-process detection workers.
+"""
+
+import os
+import signal
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+from scout.core.detection.process_worker import DetectionProcessPool, SharedFrameRing
+from scout.core.detection.detection_service import DetectionService
+from scout.core.window.frame_source import FrameSource
+
+
+def make_frame():
+    """Create a frame containing a distinctive 24x24 button at (60, 30)."""
+    rng = np.random.RandomState(3)
+    button = rng.randint(0, 256, (24, 24, 3)).astype(np.uint8)
+    frame = np.full((120, 200, 3), 80, dtype=np.uint8)
+    frame[30:54, 60:84] = button
+    return frame, button
+
+
+class TestSharedFrameRing(unittest.TestCase):
+    """Test frame handoff through shared memory."""
+
+    def test_write_and_read(self):
+        """Test that a reader attached by name sees written frames and detects overwrites."""
+        ring = SharedFrameRing(slots=2, slot_bytes=100 * 100 * 3)
+        reader = SharedFrameRing(slots=2, slot_bytes=100 * 100 * 3, name=ring.name)
+        try:
+            frame, _ = make_frame()
+            frame = frame[:50, :60]
+            sequence = ring.write(1, frame)
+            view = reader.read(1, sequence)
+            np.testing.assert_array_equal(view, frame)
+            self.assertFalse(view.flags.writeable)
+
+            ring.write(1, frame)
+            with self.assertRaises(ValueError):
+                reader.read(1, sequence)
+            with self.assertRaises(ValueError):
+                ring.write(0, np.zeros((200, 200, 3), dtype=np.uint8))
+            del view
+        finally:
+            reader.close()
+            ring.close()
+
+
+class TestDetectionProcessPool(unittest.TestCase):
+    """Test detection in worker processes."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one worker with a template directory holding the button."""
+        cls.frame, button = make_frame()
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cv2.imwrite(os.path.join(cls.temp_dir.name, 'button.png'), button)
+        cls.pool = DetectionProcessPool(factory_args=(cls.temp_dir.name,), slots=4,
+                                        slot_bytes=cls.frame.nbytes, max_restarts=2)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the worker."""
+        cls.pool.stop()
+        cls.temp_dir.cleanup()
+
+    def test_service_uses_remote_strategy(self):
+        """Test that a detection service delegates template matching to the worker."""
+        window_service = MagicMock()
+        window_service.frame_source = FrameSource(lambda: None, min_interval=1.0)
+        window_service.frame_source.publish(self.frame)
+        service = DetectionService(MagicMock(), window_service)
+        service.use_process_pool(self.pool, ['template'])
+
+        results = service.detect_template('button', confidence_threshold=0.9, use_cache=False)
+
+        self.assertEqual([(r['x'], r['y']) for r in results], [(60, 30)])
+        self.assertEqual(self.pool.get_stats()['free_slots'], 4)
+
+        # Template names, sizes and priors are known without asking the worker
+        proxy = service.strategies['template']
+        self.assertEqual(proxy.get_template_names(), ['button'])
+        self.assertEqual(proxy.template_sizes, {'button': (24, 24)})
+        self.assertIsNotNone(proxy.spatial_priors)
+        results = service.detect_all_templates(confidence_threshold=0.9, use_cache=False)
+        self.assertEqual([(r['template_name'], r['x'], r['y']) for r in results], [('button', 60, 30)])
+
+    def test_slot_wait_times_out(self):
+        """Test that a request gives up when no frame slot becomes free in time."""
+        for _ in range(4):
+            self.pool._free_slots.acquire()
+        try:
+            with self.assertRaises(TimeoutError):
+                self.pool.detect('template', self.frame, timeout=0.1, template_names=['button'])
+        finally:
+            for _ in range(4):
+                self.pool._free_slots.release()
+
+    def test_shared_frame_and_errors(self):
+        """Test that concurrent requests on one read-only frame share a slot, and worker errors surface."""
+        frame = self.frame.copy()
+        frame.flags.writeable = False
+        futures = [self.pool.submit('template', frame, template_names=['button'], confidence_threshold=0.9)
+                   for _ in range(3)]
+        for future in futures:
+            self.assertEqual(len(future.result(30)), 1)
+        self.assertGreaterEqual(self.pool.get_stats()['shared_frames'], 1)
+
+        with self.assertRaises(RuntimeError):
+            self.pool.detect('missing', self.frame, timeout=30)
+
+    def test_restart_after_crash(self):
+        """Test that a killed worker is restarted and serves requests again."""
+        pid = self.pool.get_stats()['workers'][0]['pid']
+        os.kill(pid, signal.SIGKILL)
+
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            worker = self.pool.get_stats()['workers'][0]
+            if worker['ready'] and worker['pid'] != pid:
+                break
+            time.sleep(0.05)
+
+        results = self.pool.detect('template', self.frame, timeout=30, template_names=['button'],
+                                   confidence_threshold=0.9)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(self.pool.get_stats()['crashes'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the adaptive detection rate controller.
+"""
+
+import unittest
+import numpy as np
+
+from scout.core.detection.rate_controller import DetectionRateController
+
+
+class TestDetectionRateController(unittest.TestCase):
+    """Test rate adaptation to cost, headroom and idleness."""
+
+    def setUp(self):
+        """Create a controller with a controllable system CPU reading."""
+        self.system_cpu = 10.0
+        self.controller = DetectionRateController(
+            max_frequency=10.0, min_frequency=0.5, cpu_budget=0.25,
+            cpu_percent_func=lambda: self.system_cpu
+        )
+
+    def test_cheap_detection_runs_at_target(self):
+        """Test that cheap ticks keep the target frequency."""
+        interval = self.controller.update(0.005)
+
+        self.assertAlmostEqual(interval, 0.1)
+        self.assertEqual(self.controller.get_stats()['limited_by'], 'target')
+
+    def test_cpu_budget_caps_rate(self):
+        """Test that expensive ticks are slowed to the CPU share."""
+        for _ in range(5):
+            self.controller.update(0.1, cpu_time=0.1)
+
+        self.assertAlmostEqual(self.controller.frequency, 2.5)
+        self.assertAlmostEqual(self.controller.get_stats()['cpu_share'], 0.25)
+
+    def test_recovery_is_gradual(self):
+        """Test that the rate ramps back up instead of jumping."""
+        self.controller.update(0.5)
+        slow = self.controller.frequency
+
+        self.controller.smoothing = 1.0
+        self.controller.update(0.001)
+
+        self.assertAlmostEqual(self.controller.frequency, slow * self.controller.ramp)
+
+    def test_busy_system_reduces_rate(self):
+        """Test that low system headroom scales the rate down."""
+        self.system_cpu = 90.0
+        self.controller.update(0.001)
+
+        self.assertAlmostEqual(self.controller.frequency, 5.0)
+        self.assertEqual(self.controller.get_stats()['limited_by'], 'headroom')
+
+    def test_latency_budget_lowers_rate_to_what_is_needed(self):
+        """Test that a latency budget only asks for the rate it needs."""
+        self.controller.latency_budget = 0.6
+        self.controller.update(0.1, cpu_time=0.01)
+
+        self.assertAlmostEqual(self.controller.interval, 0.5)
+        self.assertEqual(self.controller.get_stats()['limited_by'], 'latency')
+
+    def test_idle_backs_off_to_minimum(self):
+        """Test that idle ticks halve the rate down to the minimum."""
+        for _ in range(10):
+            self.controller.update_idle()
+
+        self.assertAlmostEqual(self.controller.frequency, 0.5)
+        self.controller.set_target(4.0)
+        self.assertAlmostEqual(self.controller.frequency, 4.0)
+
+    def test_unchanged_frames(self):
+        """Test change detection against the last changed frame."""
+        image = np.random.RandomState(0).randint(0, 255, (180, 320, 3)).astype(np.uint8)
+
+        self.assertFalse(self.controller.is_unchanged(image))
+        self.assertTrue(self.controller.is_unchanged(image.copy()))
+        self.assertFalse(self.controller.is_unchanged(255 - image))
+        self.assertEqual(self.controller.get_stats()['unchanged_frames'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
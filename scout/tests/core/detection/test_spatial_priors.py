@@ -0,0 +1,100 @@
+"""
+Tests for learned per-template search regions.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from scout.core.detection.spatial_priors import SpatialPriors
+from scout.core.detection.detection_service import DetectionService
+from scout.core.detection.strategies.template_strategy import TemplateMatchingStrategy
+
+
+class TestSpatialPriors(unittest.TestCase):
+    """Test learning, region computation and persistence."""
+
+    def setUp(self):
+        """Create in-memory priors."""
+        self.priors = SpatialPriors(cell_size=32, margin=32, min_observations=3, sweep_interval=4)
+        self.size = (640, 480)
+
+    def test_unlearned_templates_search_everywhere(self):
+        """Test that templates without enough observations have no regions."""
+        self.assertIsNone(self.priors.regions('button', self.size))
+
+        self.priors.observe('button', [(100, 100, 40, 20)] * 2, self.size)
+        self.assertIsNone(self.priors.regions('button', self.size))
+
+    def test_regions_cover_observations_with_margin(self):
+        """Test that learned regions contain every match plus the margin."""
+        self.priors.observe('button', [(100, 100, 40, 20)] * 2 + [(500, 400, 40, 20)], self.size)
+
+        regions = sorted(self.priors.regions('button', self.size))
+
+        self.assertEqual(regions, [(64, 64, 128, 96), (448, 352, 128, 128)])
+        self.assertEqual(self.priors.regions('button', (800, 600)), None)
+
+    def test_large_coverage_falls_back_to_full_frame(self):
+        """Test that restricting is skipped when regions would cover most of the frame."""
+        boxes = [(x, y, 40, 40) for x in range(0, 640, 96) for y in range(0, 480, 96)]
+        self.priors.observe('icon', boxes, self.size)
+
+        self.assertIsNone(self.priors.regions('icon', self.size))
+
+    def test_periodic_sweep(self):
+        """Test that every sweep_interval-th request is a sweep."""
+        sweeps = [self.priors.next_is_sweep() for _ in range(8)]
+
+        self.assertEqual(sweeps, [False, False, False, True] * 2)
+
+    def test_persistence(self):
+        """Test that priors survive a save/load round trip."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, SpatialPriors.FILENAME)
+            priors = SpatialPriors(path, min_observations=1)
+            priors.observe('button', [(100, 100, 40, 20)], self.size)
+            self.assertTrue(priors.save())
+
+            loaded = SpatialPriors(path, min_observations=1)
+            self.assertEqual(loaded.regions('button', self.size), priors.regions('button', self.size))
+
+
+class TestDetectionServicePriors(unittest.TestCase):
+    """Test that detect_all_templates restricts learned templates."""
+
+    def setUp(self):
+        """Create a service with a real template strategy and a synthetic frame."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        rng = np.random.RandomState(1)
+        self.frame = rng.randint(0, 255, (300, 400, 3)).astype(np.uint8)
+        cv2.imwrite(os.path.join(self.temp_dir.name, 'button.png'), self.frame[200:230, 300:340])
+
+        self.strategy = TemplateMatchingStrategy(templates_dir=self.temp_dir.name)
+        self.strategy.spatial_priors.min_observations = 2
+        self.service = DetectionService(MagicMock(), MagicMock())
+        self.service.register_strategy('template', self.strategy)
+
+    def test_learned_template_is_searched_in_region(self):
+        """Test that after learning only the learned region is searched."""
+        with patch.object(self.service, '_get_detection_image', return_value=(self.frame, 0, 0)):
+            for _ in range(2):
+                self.service.detect_all_templates(confidence_threshold=0.95, use_cache=False)
+
+            with patch.object(self.strategy, 'detect', wraps=self.strategy.detect) as detect:
+                results = self.service.detect_all_templates(confidence_threshold=0.95, use_cache=False)
+
+        searched = detect.call_args.kwargs['image']
+        self.assertLess(searched.size, self.frame.size // 4)
+        self.assertEqual([(r['template_name'], r['x'], r['y']) for r in results], [('button', 300, 200)])
+        self.assertEqual(self.strategy.spatial_priors.get_stats()['restricted_searches'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for near-duplicate template clustering.
+"""
+
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from scout.core.detection.template_clusters import TemplateClusterIndex, representative_threshold
+from scout.core.detection.strategies.template_strategy import TemplateMatchingStrategy
+
+
+def make_templates():
+    """Create three variants of one icon and an unrelated template of the same size."""
+    rng = np.random.RandomState(2)
+    base = rng.randint(0, 256, (32, 32, 3)).astype(np.uint8)
+    templates = {}
+    for level in range(1, 4):
+        # Level badge in the corner
+        variant = base.copy()
+        cv2.putText(variant, str(level), (22, 30), cv2.FONT_HERSHEY_PLAIN, 0.7, (255, 255, 255), 1)
+        templates[f'gold_{level}'] = variant
+    templates['other'] = rng.randint(0, 256, (32, 32, 3)).astype(np.uint8)
+    return templates
+
+
+class TestTemplateClusterIndex(unittest.TestCase):
+    """Test clustering, the score bound and persistence."""
+
+    def setUp(self):
+        """Create templates and a temporary cluster file."""
+        self.templates = make_templates()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, TemplateClusterIndex.FILENAME)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_variants_share_a_cluster(self):
+        """Test that only the near-identical variants are clustered."""
+        index = TemplateClusterIndex(self.path)
+        clusters = index.cluster(self.templates, similarity=0.8)
+
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(set(clusters[0].members), {'gold_1', 'gold_2', 'gold_3'})
+        self.assertIsNone(index.cluster_of('other'))
+
+        searches, independent = index.plan(['gold_1', 'gold_3', 'other'])
+        self.assertEqual([members for _, members in searches], [['gold_1', 'gold_3']])
+        self.assertEqual(independent, ['other'])
+
+    def test_stale_clusters_are_dropped(self):
+        """Test that clusters are reloaded only for unchanged templates."""
+        TemplateClusterIndex(self.path).cluster(self.templates, similarity=0.8)
+
+        index = TemplateClusterIndex(self.path)
+        self.assertTrue(index.load(self.templates))
+        self.assertEqual(index.get_stats()['clustered_templates'], 3)
+
+        self.templates['gold_2'] = 255 - self.templates['gold_2']
+        self.assertFalse(index.load(self.templates))
+        self.assertEqual(index.clusters, [])
+
+    def test_representative_threshold(self):
+        """Test the angle bound on representative scores."""
+        self.assertAlmostEqual(representative_threshold(1.0, 0.8), 0.8 - 1e-3)
+        self.assertLess(representative_threshold(0.9, 0.8), 0.8)
+        self.assertEqual(representative_threshold(-1.0, 0.5), -1.0)
+
+
+class TestClusteredDetection(unittest.TestCase):
+    """Test that clustered search finds the same matches as searching every template."""
+
+    def test_same_results(self):
+        """Test detection with and without clusters."""
+        templates = make_templates()
+        frame = np.full((200, 300, 3), 90, dtype=np.uint8)
+        frame[40:72, 50:82] = templates['gold_2']
+        frame[120:152, 200:232] = templates['gold_3']
+        frame[10:42, 240:272] = templates['other']
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, template in templates.items():
+                cv2.imwrite(os.path.join(temp_dir, f'{name}.png'), template)
+            strategy = TemplateMatchingStrategy(templates_dir=temp_dir)
+            strategy.cluster_templates(similarity=0.8)
+
+            # A fresh strategy picks up the saved clusters
+            strategy = TemplateMatchingStrategy(templates_dir=temp_dir)
+
+        clustered = strategy.detect(frame, confidence_threshold=0.9).to_tuples()
+        strategy.use_clusters = False
+        expected = strategy.detect(frame, confidence_threshold=0.9).to_tuples()
+
+        self.assertEqual(sorted(r[:5] for r in clustered), sorted(r[:5] for r in expected))
+        self.assertEqual(strategy.template_clusters.get_stats()['member_searches'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests for the IoU object tracker.
+"""
+
+import unittest
+import numpy as np
+
+from scout.core.detection.tracker import IoUTracker, iou_matrix
+
+
+class TestIoUMatrix(unittest.TestCase):
+    """Test the vectorized IoU computation."""
+
+    def test_pairwise_values(self):
+        """Test identical, half-overlapping and disjoint boxes."""
+        a = np.array([[0, 0, 10, 10]])
+        b = np.array([[0, 0, 10, 10], [5, 0, 10, 10], [20, 20, 5, 5]])
+
+        np.testing.assert_allclose(iou_matrix(a, b), [[1.0, 50 / 150, 0.0]])
+        self.assertEqual(iou_matrix(a, np.empty((0, 4))).shape, (1, 0))
+
+
+class TestIoUTracker(unittest.TestCase):
+    """Test association, persistence and motion prediction."""
+
+    def setUp(self):
+        """Create a tracker that keeps missed tracks for two updates."""
+        self.tracker = IoUTracker(iou_threshold=0.3, min_hits=1, max_misses=2)
+
+    def test_ids_are_stable_across_frames(self):
+        """Test that slightly moving objects keep their track IDs."""
+        first = self.tracker.update([('city', 100, 100, 40, 40, 0.9), ('mine', 300, 100, 40, 40, 0.8)])
+        second = self.tracker.update([('mine', 304, 102, 40, 40, 0.85), ('city', 103, 101, 40, 40, 0.9)])
+
+        self.assertEqual([obj.track_id for obj in first], [1, 2])
+        ids = {obj.label: obj.track_id for obj in second}
+        self.assertEqual(ids, {'city': 1, 'mine': 2})
+        self.assertEqual(self.tracker.get(2).x, 304)
+
+    def test_missed_tracks_persist_then_drop(self):
+        """Test that a missed object is kept for max_misses updates."""
+        self.tracker.update([('city', 100, 100, 40, 40, 0.9)])
+
+        for _ in range(2):
+            objects = self.tracker.update([])
+            self.assertEqual(len(objects), 1)
+            self.assertTrue(objects[0].is_predicted)
+
+        self.assertEqual(self.tracker.update([]), ())
+        self.assertEqual(self.tracker.get_stats()['tracks_dropped'], 1)
+
+    def test_motion_prediction_bridges_gaps(self):
+        """Test that a fast object is re-associated at its predicted position."""
+        tracker = IoUTracker(iou_threshold=0.3, max_misses=2, velocity_smoothing=1.0)
+        for x in (0, 8, 16):
+            tracker.update([('ship', x, 0, 20, 20, 0.9)])
+
+        coasting = tracker.update([])[0]
+        self.assertEqual(coasting.x, 24)
+
+        # Without prediction the box at 32 would not overlap the last seen one at 16 enough
+        objects = tracker.update([('ship', 32, 0, 20, 20, 0.9)])
+        self.assertEqual([obj.track_id for obj in objects], [1])
+        self.assertEqual(objects[0].velocity, (8.0, 0.0))
+
+    def test_min_hits_delays_reporting(self):
+        """Test that new tracks are reported after enough hits."""
+        tracker = IoUTracker(min_hits=2)
+
+        self.assertEqual(tracker.update([('city', 0, 0, 40, 40, 0.9)]), ())
+        self.assertEqual(len(tracker.update([('city', 1, 0, 40, 40, 0.9)])), 1)
+
+    def test_overlapping_detections_are_merged(self):
+        """Test that the most confident of overlapping detections wins."""
+        objects = self.tracker.update([('city', 0, 0, 40, 40, 0.7), ('castle', 2, 2, 40, 40, 0.9)])
+
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(objects[0].as_match(), ('castle', 2, 2, 40, 40, 0.9))
+
+    def test_match_labels(self):
+        """Test that label matching keeps different labels on separate tracks."""
+        tracker = IoUTracker(match_labels=True, duplicate_iou=None)
+        tracker.update([('city', 0, 0, 40, 40, 0.9)])
+        objects = tracker.update([('mine', 0, 0, 40, 40, 0.9)])
+
+        self.assertEqual([(obj.track_id, obj.label, obj.misses) for obj in objects],
+                         [(1, 'city', 1), (2, 'mine', 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Tests for the asyncio service adapters and the Qt bridge.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from scout.core.automation.task import TaskStatus
+from scout.core.services.async_services import (
+    AsyncAutomationService, AsyncDetectionService, AsyncWindowService, ServiceExecutors
+)
+from scout.core.window.frame_source import FrameSource
+
+
+class TestAsyncDetectionService(unittest.TestCase):
+    """Test awaiting frames and detections."""
+
+    def setUp(self):
+        """Create a detection service whose frames are captured every 20 ms."""
+        self.captures = 0
+
+        def capture():
+            self.captures += 1
+            return np.zeros((10, 10, 3), dtype=np.uint8)
+
+        self.service = MagicMock()
+        self.service.frame_source = FrameSource(capture, min_interval=0.02)
+        self.service.cache_timeout = 0.5
+        self.executors = ServiceExecutors()
+        self.async_service = AsyncDetectionService(self.service, self.executors)
+
+    def tearDown(self):
+        """Stop the executor threads."""
+        self.executors.shutdown()
+
+    def test_waiters_share_captures(self):
+        """Test that many concurrent frame waits cost one capture."""
+        async def main():
+            frames = await asyncio.gather(*(self.async_service.next_frame() for _ in range(1000)))
+            return frames, threading.active_count()
+
+        frames, threads = asyncio.run(main())
+
+        self.assertEqual(self.captures, 1)
+        self.assertEqual(len({frame.frame_id for frame in frames}), 1)
+        self.assertLess(threads, 50)
+
+    def test_wait_for(self):
+        """Test waiting for a detection to return results, and timing out."""
+        results = iter([[], [], [{'x': 1}]])
+        self.service.detect_template.side_effect = lambda name: next(results)
+
+        async def main():
+            found = await self.async_service.wait_for(lambda: self.service.detect_template('ok'), timeout=2)
+            missing = await self.async_service.wait_for(lambda: [], timeout=0.1)
+            return found, missing
+
+        start = time.monotonic()
+        found, missing = asyncio.run(main())
+
+        self.assertEqual(found, [{'x': 1}])
+        self.assertIsNone(missing)
+        self.assertEqual(self.service.detect_template.call_count, 3)
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_wait_for_detects_on_fresh_awaited_frame(self):
+        """Test that wait_for skips a stale frame and detects on the frame it awaited."""
+        stale = self.service.frame_source.publish(np.zeros((10, 10, 3), dtype=np.uint8),
+                                                  timestamp=time.monotonic() - 1.0)
+        pinned = []
+
+        @contextmanager
+        def use_frame(frame):
+            pinned.append(frame)
+            yield frame
+
+        self.service.use_frame.side_effect = use_frame
+
+        results = asyncio.run(self.async_service.wait_for(lambda: [pinned[-1].frame_id], timeout=2))
+
+        self.assertEqual(self.captures, 1)
+        self.assertGreater(results[0], stale.frame_id)
+        self.assertEqual(results, [self.service.frame_source.latest_id])
+
+    def test_next_frame_timeout_frees_capture_thread(self):
+        """Test that a timed out frame wait does not hold the capture thread."""
+        frame_source = self.service.frame_source
+        frame_source.get_latest()
+        frame_source.set_producer(MagicMock(is_running=True, interval=10.0))
+
+        async def main():
+            frame = await self.async_service.next_frame(frame_source.latest_id, timeout=0.05)
+            start = time.monotonic()
+            await self.executors.run('capture', lambda: None)
+            return frame, time.monotonic() - start
+
+        frame, blocked = asyncio.run(main())
+
+        self.assertIsNone(frame)
+        self.assertLess(blocked, 1.0)
+
+    def test_detection_runs_in_executor(self):
+        """Test that detections run on the detection executor threads."""
+        self.service.detect_text.side_effect = lambda **params: threading.current_thread().name
+
+        thread_name = asyncio.run(self.async_service.detect_text(pattern='x'))
+
+        self.assertTrue(thread_name.startswith('async-detection'))
+        self.service.detect_text.assert_called_once_with(pattern='x')
+
+
+class TestAsyncWindowAndAutomation(unittest.TestCase):
+    """Test waiting for the window and for tasks."""
+
+    def test_wait_for_window(self):
+        """Test that the window search is repeated until it succeeds."""
+        window_service = MagicMock()
+        window_service.find_window.side_effect = [False, False, True]
+        service = AsyncWindowService(window_service)
+
+        self.assertTrue(asyncio.run(service.wait_for_window(timeout=2, interval=0.01)))
+        self.assertEqual(window_service.find_window.call_count, 3)
+        service.executors.shutdown()
+
+    def test_wait_for_task(self):
+        """Test waiting for a task's status to become final."""
+        task = MagicMock(status=TaskStatus.RUNNING)
+        automation_service = MagicMock()
+        automation_service.get_task.return_value = task
+        service = AsyncAutomationService(automation_service, poll_interval=0.01)
+        threading.Timer(0.05, lambda: setattr(task, 'status', TaskStatus.COMPLETED)).start()
+
+        self.assertTrue(asyncio.run(service.wait_for_task('collect', timeout=2)))
+        task.status = TaskStatus.RUNNING
+        self.assertFalse(asyncio.run(service.wait_for_task('collect', timeout=0.05)))
+
+
+    def test_wait_for_task_wakes_on_callback(self):
+        """Test that a task's completion callback ends the wait without polling."""
+        task = MagicMock(status=TaskStatus.RUNNING)
+        callbacks = []
+        automation_service = MagicMock()
+        automation_service.get_task.return_value = task
+        automation_service.register_task_completion_callback.side_effect = lambda name, callback: callbacks.append(callback)
+        service = AsyncAutomationService(automation_service, poll_interval=10)
+
+        def complete():
+            task.status = TaskStatus.COMPLETED
+            for callback in callbacks:
+                callback(task)
+
+        threading.Timer(0.05, complete).start()
+        start = time.monotonic()
+        self.assertTrue(asyncio.run(service.wait_for_task('collect', timeout=5)))
+        self.assertLess(time.monotonic() - start, 1.0)
+        automation_service.register_task_failure_callback.assert_called_once()
+
+class TestQtAsyncBridge(unittest.TestCase):
+    """Test running coroutines for Qt code."""
+
+    def test_callback_on_qt_thread(self):
+        """Test that completion callbacks run on the Qt thread."""
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt6.QtCore import QCoreApplication
+        from scout.core.services.qt_async import QtAsyncBridge
+
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        bridge = QtAsyncBridge()
+        outcomes = []
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return threading.current_thread().name
+
+        future = bridge.submit(work(), lambda done: outcomes.append((done.result(), threading.current_thread())))
+        deadline = time.monotonic() + 5
+        while not outcomes and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        bridge.stop()
+
+        self.assertEqual(future.result(), 'QtAsyncBridge')
+        self.assertEqual(outcomes, [('QtAsyncBridge', threading.main_thread())])
+
+
+if __name__ == '__main__':
+    unittest.main()
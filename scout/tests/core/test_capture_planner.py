@@ -0,0 +1,139 @@
+"""
+Tests for region-only capture planning.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+
+from scout.core.window.capture_planner import CapturePlanner, merge_rectangles
+from scout.core.detection.detection_service import DetectionService
+
+
+class RecordingGrab:
+    """Grab function returning a gradient image and recording requested regions."""
+
+    def __init__(self):
+        self.regions = []
+        # Screen pixel (x, y) has value (x + y) % 256 in every channel
+        ys, xs = np.mgrid[0:1200, 0:2000]
+        self.screen = np.repeat(((xs + ys) % 256).astype(np.uint8)[..., None], 3, axis=2)
+
+    def __call__(self, region):
+        self.regions.append(dict(region))
+        top, left = region['top'], region['left']
+        return self.screen[top:top + region['height'], left:left + region['width']].copy()
+
+
+def region(left, top, width, height):
+    """Build a region dictionary."""
+    return {'left': left, 'top': top, 'width': width, 'height': height}
+
+
+class TestMergeRectangles(unittest.TestCase):
+    """Test the rectangle merging heuristic."""
+
+    def test_overlapping_and_contained_regions_merge(self):
+        """Test that overlapping regions become their bounding box."""
+        merged = merge_rectangles([region(0, 0, 10, 10), region(5, 5, 10, 10), region(6, 6, 2, 2)])
+
+        self.assertEqual(merged, [region(0, 0, 15, 15)])
+        self.assertEqual(merge_rectangles([region(0, 0, 10, 10), region(2, 2, 4, 4)], merge_overhead=0),
+                         [region(0, 0, 10, 10)])
+
+    def test_distant_regions_stay_separate(self):
+        """Test that far apart regions are captured separately."""
+        merged = merge_rectangles([region(0, 0, 20, 20), region(500, 500, 20, 20)])
+
+        self.assertEqual(len(merged), 2)
+
+    def test_nearby_regions_merge_within_overhead(self):
+        """Test that a small gap is bridged when cheaper than an extra grab."""
+        regions = [region(0, 0, 50, 20), region(52, 0, 50, 20)]
+
+        self.assertEqual(merge_rectangles(regions, merge_overhead=100), [region(0, 0, 102, 20)])
+        self.assertEqual(len(merge_rectangles(regions, merge_overhead=0)), 2)
+
+
+class TestCapturePlanner(unittest.TestCase):
+    """Test planned captures and consumer views."""
+
+    def setUp(self):
+        """Set up a planner for a 1000x800 window at (100, 50)."""
+        self.grab = RecordingGrab()
+        self.planner = CapturePlanner(
+            grab_func=self.grab,
+            window_func=lambda: (100, 50, 1000, 800),
+            tick_interval=10.0
+        )
+        self.planner.register('hud', region(10, 10, 120, 20))
+        self.planner.register('minimap', region(850, 600, 140, 140))
+
+    def test_only_registered_regions_are_captured(self):
+        """Test that a tick grabs the registered rectangles in screen space."""
+        captured = self.planner.capture()
+
+        self.assertEqual(sorted(r['left'] for r in self.grab.regions), [110, 950])
+        self.assertEqual(captured.pixel_count, 120 * 20 + 140 * 140)
+        self.assertGreater(self.planner.get_stats()['bandwidth_reduction'], 10)
+
+    def test_views_share_one_tick(self):
+        """Test that consumers get read-only views from the same tick."""
+        hud = self.planner.get_view('hud')
+        minimap = self.planner.get_view('minimap')
+
+        self.assertEqual(len(self.grab.regions), 2)
+        self.assertEqual(hud.shape, (20, 120, 3))
+        self.assertEqual(minimap.shape, (140, 140, 3))
+        self.assertFalse(hud.flags.writeable)
+        # Window pixel (10, 10) is screen pixel (110, 60)
+        self.assertEqual(hud[0, 0, 0], (110 + 60) % 256)
+
+    def test_one_off_region_joins_tick(self):
+        """Test that an unregistered region triggers a tick including it."""
+        view = self.planner.capture_region(region(400, 300, 50, 40))
+
+        self.assertEqual(view.shape, (40, 50, 3))
+        self.assertEqual(len(self.grab.regions), 3)
+
+        # A region inside an already captured rectangle is served without grabbing
+        self.planner.capture_region(region(20, 12, 30, 10))
+        self.assertEqual(len(self.grab.regions), 3)
+
+    def test_regions_are_clipped_to_window(self):
+        """Test that regions beyond the window edge are clipped."""
+        view = self.planner.capture_region(region(980, 790, 100, 100))
+
+        self.assertEqual(view.shape, (10, 20, 3))
+
+    def test_missing_window(self):
+        """Test that nothing is captured without a window."""
+        planner = CapturePlanner(grab_func=self.grab, window_func=lambda: None)
+
+        self.assertIsNone(planner.capture_region(region(0, 0, 10, 10)))
+        self.assertEqual(self.grab.regions, [])
+
+
+class TestDetectionServiceRegionCapture(unittest.TestCase):
+    """Test that region detections capture only their region."""
+
+    def test_region_detection_uses_planner(self):
+        """Test that a region detection does not capture the full window."""
+        window_service = MagicMock()
+        window_service.get_window_position.return_value = (100, 50, 1000, 800)
+        grab = RecordingGrab()
+
+        service = DetectionService(event_bus=None, window_service=window_service)
+        service.set_capture_planner(CapturePlanner(grab_func=grab,
+                                                   window_func=window_service.get_window_position))
+
+        image, x, y = service._get_detection_image(region(10, 10, 120, 20), use_cache=False)
+
+        self.assertEqual(image.shape, (20, 120, 3))
+        self.assertEqual((x, y), (10, 10))
+        self.assertEqual(grab.regions, [region(110, 60, 120, 20)])
+        window_service.capture_screenshot.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
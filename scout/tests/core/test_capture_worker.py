@@ -0,0 +1,103 @@
+"""
+Tests for the background capture worker.
+"""
+
+import threading
+import time
+import unittest
+import numpy as np
+
+from scout.core.window.frame_source import FrameSource
+from scout.core.window.capture_worker import CaptureWorker
+
+
+class ThreadRecordingCapture:
+    """Capture function that records which threads called it."""
+
+    def __init__(self):
+        self.threads = set()
+
+    def __call__(self):
+        self.threads.add(threading.current_thread().name)
+        return np.zeros((10, 10, 3), dtype=np.uint8)
+
+
+class TestCaptureWorker(unittest.TestCase):
+    """Test background capture, ring buffer and dropped-frame accounting."""
+
+    def setUp(self):
+        """Set up a frame source fed by a fast worker."""
+        self.capture = ThreadRecordingCapture()
+        self.source = FrameSource(self.capture, min_interval=0.001, name='test')
+        self.worker = CaptureWorker(self.source, rate=200.0, buffer_size=3)
+
+    def tearDown(self):
+        """Stop the worker."""
+        self.worker.stop()
+
+    def wait_for_frames(self, count):
+        """Wait until the worker captured at least count frames."""
+        deadline = time.monotonic() + 2.0
+        while self.worker.frames_captured < count and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def test_consumers_do_not_capture(self):
+        """Test that consumers are served from the worker's frames."""
+        self.worker.start()
+        self.wait_for_frames(1)
+
+        frame = self.source.get_latest()
+
+        self.assertIsNotNone(frame)
+        self.assertEqual(self.capture.threads, {'CaptureWorker-test'})
+        self.assertIs(self.source.producer, self.worker)
+
+    def test_ring_buffer_is_bounded(self):
+        """Test that the ring buffer keeps only the newest frames."""
+        self.worker.start()
+        self.wait_for_frames(6)
+
+        frames = self.worker.get_recent_frames()
+
+        self.assertEqual(len(frames), 3)
+        ids = [frame.frame_id for frame in frames]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_slow_consumer_skips_to_latest(self):
+        """Test that slow consumers get the newest frame and count drops."""
+        self.worker.start()
+        first = self.source.get_newer_than(0, consumer='slow')
+        self.wait_for_frames(first.frame_id + 5)
+
+        latest = self.source.get_newer_than(first.frame_id, consumer='slow')
+
+        skipped = latest.frame_id - first.frame_id - 1
+        self.assertGreaterEqual(skipped, 4)
+        stats = self.worker.get_stats()
+        self.assertEqual(stats['consumer_drops']['slow'], skipped)
+        self.assertGreaterEqual(stats['dropped_frames'], skipped)
+
+    def test_stop_detaches_producer(self):
+        """Test that stopping returns the source to on-demand capture."""
+        self.worker.start()
+        self.wait_for_frames(1)
+        self.worker.stop()
+        captured = self.worker.frames_captured
+
+        self.source.get_newer_than(self.source.latest_id)
+
+        self.assertIsNone(self.source.producer)
+        self.assertFalse(self.worker.is_running)
+        self.assertEqual(self.worker.frames_captured, captured)
+        self.assertIn(threading.current_thread().name, self.capture.threads)
+
+    def test_invalid_rate(self):
+        """Test that non-positive rates are rejected."""
+        with self.assertRaises(ValueError):
+            CaptureWorker(self.source, rate=0)
+        with self.assertRaises(ValueError):
+            self.worker.rate = -1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for frame recording and replay.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from scout.core.window.frame_source import Frame
+from scout.core.window.frame_recording import FrameRecorder, FrameRecording, ReplayCaptureStrategy
+
+
+def make_image(value, width=32, height=24):
+    """Create a frame image with a recognizable pattern."""
+    image = np.full((height, width, 3), value, dtype=np.uint8)
+    image[0, :, 1] = np.arange(width, dtype=np.uint8)
+    return image
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameRecording(unittest.TestCase):
+    """Test recording frames and reading them back."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'session.rec')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def _record(self, count, capacity=10, compress=False):
+        """Record count frames 0.1s apart."""
+        with FrameRecorder(self.path, 32, 24, capacity=capacity, compress=compress,
+                           metadata={'window_title': 'Total Battle'}) as recorder:
+            for i in range(count):
+                recorder.record(make_image(i), timestamp=10.0 + i * 0.1, window_rect=(5, 7, 32, 24))
+            return recorder.get_stats()
+
+    def test_roundtrip_raw(self):
+        """Test that raw frames read back identically with metadata."""
+        self._record(3)
+
+        recording = FrameRecording(self.path)
+
+        self.assertEqual(len(recording), 3)
+        self.assertEqual(recording.metadata, {'window_title': 'Total Battle'})
+        for i, frame in enumerate(recording):
+            np.testing.assert_array_equal(frame.image, make_image(i))
+            self.assertEqual(frame.window_rect, (5, 7, 32, 24))
+            self.assertAlmostEqual(frame.timestamp, 10.0 + i * 0.1)
+            self.assertFalse(frame.image.flags.writeable)
+
+    def test_roundtrip_compressed(self):
+        """Test that compression is lossless and saves space."""
+        stats = self._record(3, compress=True)
+
+        recording = FrameRecording(self.path)
+
+        self.assertGreater(stats['compression_ratio'], 1.0)
+        np.testing.assert_array_equal(recording[2].image, make_image(2))
+
+    def test_ring_keeps_latest_frames(self):
+        """Test that the oldest frames are overwritten when the ring is full."""
+        self._record(7, capacity=4)
+
+        recording = FrameRecording(self.path)
+
+        self.assertEqual([frame.seq for frame in recording], [3, 4, 5, 6])
+        np.testing.assert_array_equal(recording[0].image, make_image(3))
+
+    def test_smaller_and_oversized_frames(self):
+        """Test that smaller frames fit and larger frames are skipped."""
+        with FrameRecorder(self.path, 32, 24) as recorder:
+            recorder.record_frame(Frame(1, 1.0, make_image(1, width=16, height=8), origin=(3, 4)))
+            self.assertIsNone(recorder.record(make_image(2, width=64)))
+            self.assertEqual(recorder.get_stats()['frames_skipped'], 1)
+
+        frame = FrameRecording(self.path)[0]
+
+        self.assertEqual(frame.image.shape, (8, 16, 3))
+        self.assertEqual(frame.window_rect, (3, 4, 16, 8))
+
+    def test_replay_as_fast_as_possible(self):
+        """Test that fast replay returns every frame in order, then stops."""
+        self._record(3)
+        strategy = ReplayCaptureStrategy(self.path, realtime=False)
+
+        values = [strategy.capture(0, (0, 0, 32, 24))[1, 0, 0] for _ in range(3)]
+
+        self.assertEqual(values, [0, 1, 2])
+        self.assertEqual(strategy.window_rect, (5, 7, 32, 24))
+        self.assertIsNone(strategy.capture(0, (0, 0, 32, 24)))
+        self.assertTrue(strategy.finished)
+
+    def test_replay_loop(self):
+        """Test that looping restarts from the first frame."""
+        self._record(2)
+        strategy = ReplayCaptureStrategy(self.path, realtime=False, loop=True)
+
+        values = [strategy.capture(0, (0, 0, 32, 24))[1, 0, 0] for _ in range(5)]
+
+        self.assertEqual(values, [0, 1, 0, 1, 0])
+
+    def test_replay_realtime_follows_clock(self):
+        """Test that real-time replay picks the frame on screen at that moment."""
+        self._record(5)
+        clock = FakeClock()
+        strategy = ReplayCaptureStrategy(self.path, realtime=True, clock=clock)
+
+        self.assertEqual(strategy.capture(0, None)[1, 0, 0], 0)
+        clock.now += 0.05
+        self.assertEqual(strategy.capture(0, None)[1, 0, 0], 0)
+        clock.now += 0.2
+        self.assertEqual(strategy.capture(0, None)[1, 0, 0], 2)
+
+        stats = strategy.get_stats()
+        self.assertEqual(stats['frames_repeated'], 1)
+        self.assertEqual(stats['frames_skipped'], 1)
+
+        clock.now += 1.0
+        self.assertIsNone(strategy.capture(0, None))
+
+    def test_invalid_file(self):
+        """Test that non-recordings are rejected."""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a recording' * 10)
+
+        with self.assertRaises(ValueError):
+            FrameRecording(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
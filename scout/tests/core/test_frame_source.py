@@ -0,0 +1,116 @@
+"""
+Tests for the shared, versioned frame source.
+"""
+
+import threading
+import time
+import unittest
+import numpy as np
+
+from scout.core.window.frame_source import Frame, FrameSource
+
+
+class CountingCapture:
+    """Capture function that counts its calls."""
+
+    def __init__(self, delay: float = 0.0, origin=None):
+        self.calls = 0
+        self.delay = delay
+        self.origin = origin
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        image = np.zeros((40, 60, 3), dtype=np.uint8)
+        return (image, self.origin) if self.origin is not None else image
+
+
+class TestFrameSource(unittest.TestCase):
+    """Test frame sharing, versioning and freshness."""
+
+    def test_latest_is_shared_within_tick(self):
+        """Test that requests within one tick share a single capture."""
+        capture = CountingCapture()
+        source = FrameSource(capture, min_interval=10.0)
+
+        first = source.get_latest()
+        second = source.get_latest(max_age=0)
+
+        self.assertIs(first, second)
+        self.assertEqual(capture.calls, 1)
+        self.assertEqual(first.frame_id, 1)
+        self.assertFalse(first.image.flags.writeable)
+        self.assertEqual(source.get_stats()['shared'], 1)
+
+    def test_newer_than_waits_for_next_tick(self):
+        """Test that asking for a newer frame captures after the tick."""
+        capture = CountingCapture()
+        source = FrameSource(capture, min_interval=0.02)
+
+        first = source.get_latest()
+        second = source.get_newer_than(first.frame_id)
+
+        self.assertEqual(second.frame_id, first.frame_id + 1)
+        self.assertGreaterEqual(second.timestamp - first.timestamp, 0.02)
+        self.assertEqual(capture.calls, 2)
+
+    def test_newer_than_respects_timeout(self):
+        """Test that a timeout shorter than the tick returns None."""
+        source = FrameSource(CountingCapture(), min_interval=10.0)
+
+        frame = source.get_latest()
+
+        self.assertIsNone(source.get_newer_than(frame.frame_id, timeout=0.01))
+        self.assertIs(source.get_newer_than(0), frame)
+
+    def test_concurrent_requests_capture_once(self):
+        """Test that concurrent callers wait for and share one capture."""
+        capture = CountingCapture(delay=0.05)
+        source = FrameSource(capture, min_interval=1.0)
+        frames = []
+
+        threads = [threading.Thread(target=lambda: frames.append(source.get_latest()))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(capture.calls, 1)
+        self.assertEqual({frame.frame_id for frame in frames}, {1})
+
+    def test_failed_capture(self):
+        """Test that failed captures return None and are counted."""
+        source = FrameSource(lambda: None)
+
+        self.assertIsNone(source.get_latest())
+        self.assertEqual(source.latest_id, 0)
+        self.assertEqual(source.get_stats()['failures'], 1)
+
+    def test_crop_uses_screen_origin(self):
+        """Test that crops are views in screen coordinates."""
+        source = FrameSource(CountingCapture(origin=(100, 200)))
+        frame = source.get_latest()
+
+        crop = frame.crop({'left': 110, 'top': 205, 'width': 20, 'height': 10})
+
+        self.assertEqual(crop.shape, (10, 20, 3))
+        self.assertIs(crop.base, frame.image)
+        self.assertIsNone(frame.crop({'left': 150, 'top': 205, 'width': 20, 'height': 10}))
+        self.assertIsNone(Frame(1, 0.0, frame.image).crop({'left': 0, 'top': 0, 'width': 1, 'height': 1}))
+
+    def test_trim_drops_frame(self):
+        """Test that trimming under memory pressure drops the frame."""
+        source = FrameSource(CountingCapture())
+        source.get_latest()
+
+        self.assertEqual(source.get_footprint(), 40 * 60 * 3)
+        self.assertEqual(source.trim(0), 1)
+        self.assertIsNone(source.latest_frame)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for QImage/NumPy bridging.
+"""
+
+import gc
+import unittest
+import numpy as np
+
+from PyQt6.QtGui import QImage
+
+from scout.core.window.image_utils import (
+    QImageFrame, numpy_to_qimage, qimage_to_bgra, qimage_to_numpy
+)
+
+
+def make_qimage(width=6, height=4, argb=0xFF112233):
+    """Create a filled RGB32 QImage."""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(argb)
+    return image
+
+
+class TestImageUtils(unittest.TestCase):
+    """Test zero-copy conversions in both directions."""
+
+    def test_bgra_view_shares_memory_and_keeps_image_alive(self):
+        """Test that the BGRA view reads the QImage buffer after the image is dropped."""
+        image = make_qimage()
+        view = qimage_to_bgra(image)
+        address = int(image.constBits())
+
+        self.assertEqual(view.__array_interface__['data'][0], address)
+        self.assertFalse(view.flags.writeable)
+
+        del image
+        gc.collect()
+        self.assertEqual(tuple(view[3, 5]), (0x33, 0x22, 0x11, 0xFF))
+
+    def test_qimage_to_numpy_returns_bgr(self):
+        """Test that the BGR conversion keeps the channel order."""
+        array = qimage_to_numpy(make_qimage())
+
+        self.assertEqual(array.shape, (4, 6, 3))
+        self.assertTrue(array.flags['C_CONTIGUOUS'])
+        self.assertEqual(tuple(array[0, 0]), (0x33, 0x22, 0x11))
+
+    def test_numpy_to_qimage_wraps_bgr_without_copy(self):
+        """Test that BGR arrays are shared with the QImage."""
+        array = np.zeros((4, 6, 3), dtype=np.uint8)
+        array[..., 2] = 200  # Red
+        image = numpy_to_qimage(array)
+
+        self.assertEqual(image.pixel(0, 0), 0xFFC80000)
+        array[0, 0] = (1, 2, 3)
+        self.assertEqual(image.pixel(0, 0), 0xFF030201)
+
+    def test_numpy_to_qimage_handles_crops_and_gray(self):
+        """Test padded rows and grayscale arrays."""
+        array = np.zeros((10, 10, 3), dtype=np.uint8)
+        array[2:, 3:, 0] = 255  # Blue
+        crop = numpy_to_qimage(array[2:6, 3:8])
+        gray = numpy_to_qimage(np.full((3, 5), 7, dtype=np.uint8))
+
+        self.assertEqual((crop.width(), crop.height()), (5, 4))
+        self.assertEqual(crop.pixel(0, 0), 0xFF0000FF)
+        self.assertEqual(gray.pixel(4, 2), 0xFF070707)
+        self.assertIsNone(numpy_to_qimage(np.zeros((2, 2), dtype=np.float32)))
+
+    def test_roundtrip(self):
+        """Test that BGR survives numpy -> QImage -> numpy."""
+        array = np.random.RandomState(0).randint(0, 255, (5, 7, 3)).astype(np.uint8)
+
+        np.testing.assert_array_equal(qimage_to_numpy(numpy_to_qimage(array)), array)
+
+    def test_frame_converts_lazily_once(self):
+        """Test that QImageFrame caches conversions."""
+        frame = QImageFrame(make_qimage())
+
+        self.assertIsNone(frame._bgr)
+        bgr = frame.bgr
+        self.assertIs(frame.bgr, bgr)
+        self.assertFalse(bgr.flags.writeable)
+        self.assertEqual(frame.gray.shape, (4, 6))
+        self.assertEqual((frame.width, frame.height), (6, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
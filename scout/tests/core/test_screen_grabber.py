@@ -0,0 +1,94 @@
+"""
+Tests for the thread-local screen grabber pool.
+"""
+
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+
+from scout.core.window.screen_grabber import ScreenGrabber
+
+
+class FakeShot:
+    """Minimal stand-in for an mss ScreenShot."""
+
+    def __init__(self, region):
+        self.width = region['width']
+        self.height = region['height']
+        pixels = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        pixels[..., 0] = 10  # Blue
+        pixels[..., 2] = 30  # Red
+        pixels[..., 3] = 255  # Alpha
+        self.raw = bytearray(pixels.tobytes())
+
+
+def make_fake_mss():
+    """Create a fake mss instance."""
+    sct = MagicMock()
+    sct.grab.side_effect = FakeShot
+    return sct
+
+
+class TestScreenGrabber(unittest.TestCase):
+    """Test grabber reuse, thread isolation and conversion."""
+
+    def setUp(self):
+        """Patch mss with fakes."""
+        patcher = patch('scout.core.window.screen_grabber.mss.mss', side_effect=make_fake_mss)
+        self.mss_factory = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.grabber = ScreenGrabber()
+        self.region = {'left': 0, 'top': 0, 'width': 8, 'height': 4}
+
+    def test_grabber_is_reused_per_thread(self):
+        """Test that one thread reuses its instance across grabs."""
+        for _ in range(5):
+            self.grabber.grab(self.region)
+
+        self.assertEqual(self.mss_factory.call_count, 1)
+        self.assertEqual(self.grabber.get_stats()['grabs'], 5)
+
+    def test_threads_get_own_grabbers(self):
+        """Test that every thread gets a separate instance."""
+        seen = []
+
+        def worker():
+            seen.append(self.grabber.get_grabber())
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(sct) for sct in seen}), 3)
+        self.assertEqual(self.grabber.get_stats()['open_instances'], 3)
+
+        self.grabber.close_all()
+        for sct in seen:
+            sct.close.assert_called_once()
+        self.assertEqual(self.grabber.get_stats()['open_instances'], 0)
+
+    def test_grab_returns_contiguous_bgr(self):
+        """Test that the alpha channel is dropped into a contiguous array."""
+        image = self.grabber.grab(self.region)
+
+        self.assertEqual(image.shape, (4, 8, 3))
+        self.assertTrue(image.flags['C_CONTIGUOUS'])
+        self.assertEqual(tuple(image[0, 0]), (10, 0, 30))
+
+    def test_close_thread_recreates_on_next_grab(self):
+        """Test that a closed thread grabber is replaced on demand."""
+        first = self.grabber.get_grabber()
+        self.grabber.close_thread()
+
+        second = self.grabber.get_grabber()
+
+        first.close.assert_called_once()
+        self.assertIsNot(first, second)
+        self.assertEqual(self.grabber.get_stats()['instances_created'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the X11 MIT-SHM capture strategy.
+
+Capture itself needs an X server; those tests only run when DISPLAY is set
+(e.g. under Xvfb).
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from scout.core.window.x11_capture import X11CaptureStrategy
+
+
+class TestX11CaptureWithoutDisplay(unittest.TestCase):
+    """Test that the strategy degrades gracefully without an X server."""
+
+    def test_unavailable_without_display(self):
+        """Test that availability requires a configured display."""
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertFalse(X11CaptureStrategy.is_available())
+
+    def test_unreachable_display(self):
+        """Test that an unreachable display yields no frames or windows."""
+        strategy = X11CaptureStrategy(':1999')
+
+        self.assertIsNone(strategy.capture(0, (0, 0, 16, 16)))
+        self.assertEqual(strategy.list_windows(), [])
+        self.assertIsNone(strategy.find_window('Total Battle'))
+        self.assertIsNone(strategy.get_window_rect(1))
+
+
+@unittest.skipUnless(X11CaptureStrategy.is_available(), "No X display available")
+class TestX11Capture(unittest.TestCase):
+    """Test capturing from a live X display."""
+
+    def setUp(self):
+        """Create the strategy."""
+        self.strategy = X11CaptureStrategy()
+        self.addCleanup(self.strategy.close)
+
+    def test_root_capture_reuses_segment(self):
+        """Test that repeated grabs of one size share a segment."""
+        for _ in range(3):
+            image = self.strategy.capture(0, (0, 0, 64, 48))
+            self.assertEqual(image.shape, (48, 64, 3))
+
+        stats = self.strategy.get_stats()
+        self.assertEqual(stats['grabs'], 3)
+        self.assertEqual(stats['segments_created'], 1)
+
+    def test_resize_replaces_segment(self):
+        """Test that a new size creates a new segment."""
+        self.strategy.capture(0, (0, 0, 64, 48))
+        image = self.strategy.capture(0, (0, 0, 32, 16))
+
+        self.assertEqual(image.shape, (16, 32, 3))
+        self.assertEqual(self.strategy.get_stats()['segments_created'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Tests for memory-pressure-aware cache eviction.
+"""
+
+import gc
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from scout.core.detection.detection_service import DetectionService
+from scout.core.utils.caching import LRUCache
+from scout.core.utils.memory import MemoryPressurePolicy, MemoryMonitor, ImageBuffer, memory_policy
+
+
+class TestLRUCacheFootprint(unittest.TestCase):
+    """Test byte accounting and trimming of the LRU cache."""
+    
+    def test_footprint_tracks_arrays(self):
+        """Test that the footprint follows puts, replacements and removals."""
+        cache = LRUCache(capacity=10)
+        cache.put('a', np.zeros(1000, dtype=np.uint8))
+        cache.put('b', np.zeros(2000, dtype=np.uint8))
+        self.assertEqual(cache.get_footprint(), 3000)
+        
+        cache.put('a', np.zeros(500, dtype=np.uint8))
+        self.assertEqual(cache.get_footprint(), 2500)
+        
+        cache.remove('b')
+        self.assertEqual(cache.get_footprint(), 500)
+        
+        cache.clear()
+        self.assertEqual(cache.get_footprint(), 0)
+    
+    def test_trim_evicts_least_recently_used(self):
+        """Test that trimming evicts the oldest entries first."""
+        cache = LRUCache(capacity=10)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, np.zeros(1000, dtype=np.uint8))
+        cache.get('a')  # Mark 'a' as recently used
+        
+        evicted = cache.trim(2000)
+        
+        self.assertEqual(evicted, 1)
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.evictions, 1)
+    
+    def test_max_bytes(self):
+        """Test that the byte budget is enforced on put."""
+        cache = LRUCache(capacity=10, max_bytes=2500)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, np.zeros(1000, dtype=np.uint8))
+        
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_footprint(), 2000)
+
+
+class TestMemoryPressurePolicy(unittest.TestCase):
+    """Test trimming of registered caches in priority order."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.policy = MemoryPressurePolicy()
+        self.low = LRUCache(capacity=10)
+        self.high = LRUCache(capacity=10)
+        for i in range(4):
+            self.low.put(f'low{i}', np.zeros(1000, dtype=np.uint8))
+            self.high.put(f'high{i}', np.zeros(1000, dtype=np.uint8))
+        
+        self.policy.register('high', self.high.get_footprint, self.high.trim, priority=10,
+                             evictions=lambda: self.high.evictions)
+        self.policy.register('low', self.low.get_footprint, self.low.trim, priority=0)
+    
+    def test_soft_pressure_trims_lowest_priority_first(self):
+        """Test that soft pressure halves caches starting with the lowest priority."""
+        freed = self.policy.relieve('soft', 2000)
+        
+        self.assertEqual(freed, 2000)
+        self.assertEqual(self.low.get_footprint(), 2000)
+        self.assertEqual(self.high.get_footprint(), 4000)
+    
+    def test_hard_pressure_empties_caches(self):
+        """Test that hard pressure without a target empties every cache."""
+        freed = self.policy.relieve('hard')
+        
+        self.assertEqual(freed, 8000)
+        self.assertEqual(self.policy.get_total_footprint(), 0)
+    
+    def test_budget(self):
+        """Test that the fixed budget is enforced."""
+        self.policy.budget_mb = 5000 / (1024 * 1024)
+        
+        self.policy.enforce_budget()
+        
+        self.assertLessEqual(self.policy.get_total_footprint(), 5000)
+        self.assertEqual(self.high.get_footprint(), 4000)
+    
+    def test_stats(self):
+        """Test that stats report footprints and eviction counts."""
+        self.policy.relieve('hard')
+        stats = self.policy.get_stats()
+        
+        self.assertEqual(stats['low']['bytes'], 0)
+        self.assertEqual(stats['low']['evictions'], 4)
+        self.assertEqual(stats['high']['evictions'], 4)
+        self.assertEqual(stats['high']['pressure_evictions'], 4)
+    
+    def test_monitor_watermarks(self):
+        """Test that the monitor classifies readings and applies the policy."""
+        monitor = MemoryMonitor(threshold_mb=100, soft_threshold_mb=80, policy=self.policy)
+        
+        self.assertEqual(monitor.get_pressure_level(50), 'normal')
+        self.assertEqual(monitor.get_pressure_level(90), 'soft')
+        self.assertEqual(monitor.get_pressure_level(110), 'hard')
+        
+        self.assertEqual(monitor.apply_pressure_policy(50), 0)
+        self.assertGreater(monitor.apply_pressure_policy(80.001), 0)
+    
+    def test_image_buffer_trim(self):
+        """Test that the image buffer can be trimmed by the policy."""
+        buffer = ImageBuffer()
+        buffer.put(np.zeros((10, 10, 3), dtype=np.uint8))
+        buffer.put(np.zeros((20, 20, 3), dtype=np.uint8))
+        self.policy.register('image_buffer', buffer.get_footprint, buffer.trim)
+        
+        buffer.trim(300)
+        
+        self.assertEqual(buffer.get_footprint(), 300)
+        self.assertEqual(buffer.evictions, 1)
+
+
+class TestDetectionServiceRegistration(unittest.TestCase):
+    """Test how detection services report their screenshots to the global policy."""
+    
+    def test_services_register_separately_and_are_released(self):
+        """Test that each service has its own entry, dropped on shutdown or collection."""
+        first = DetectionService(MagicMock(), MagicMock())
+        second = DetectionService(MagicMock(), MagicMock())
+        names = (first._memory_name, second._memory_name)
+        
+        self.assertNotEqual(names[0], names[1])
+        self.assertTrue(all(name in memory_policy.get_stats() for name in names))
+        
+        first.shutdown()
+        del second
+        gc.collect()
+        
+        self.assertFalse(any(name in memory_policy.get_stats() for name in names))
+
+
+if __name__ == '__main__':
+    unittest.main()
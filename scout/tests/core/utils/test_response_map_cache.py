@@ -0,0 +1,153 @@
+"""
+Tests for the per-frame correlation peak cache.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from scout.core.utils.caching import ResponseMapCache
+from scout.core.window.frame_source import FrameSource
+from scout.core.detection.detection_service import DetectionService
+from scout.core.detection.strategies.template_strategy import TemplateMatchingStrategy
+
+
+def make_response():
+    """Create a 20x30 response map with scores from 0 to 1."""
+    return np.linspace(0.0, 1.0, 600, dtype=np.float32).reshape(20, 30)
+
+
+class TestResponseMapCache(unittest.TestCase):
+    """Test threshold reuse and eviction."""
+
+    def setUp(self):
+        """Create a cache."""
+        self.cache = ResponseMapCache(peak_floor=0.5, max_frames=2)
+
+    def test_queries_at_or_above_floor_are_served(self):
+        """Test that any threshold above the stored floor is answered from the cache."""
+        response = make_response()
+        self.cache.put(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, response, threshold=0.8)
+
+        for threshold in (0.5, 0.9):
+            xs, ys, scores = self.cache.get(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, threshold)
+            expected_ys, expected_xs = np.nonzero(response >= threshold)
+            np.testing.assert_array_equal(xs, expected_xs)
+            np.testing.assert_array_equal(ys, expected_ys)
+            np.testing.assert_array_equal(scores, response[expected_ys, expected_xs])
+
+        self.assertIsNone(self.cache.get(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, 0.4))
+        self.assertIsNone(self.cache.get(('a', 1), 'icon', cv2.TM_CCORR_NORMED, 0.9))
+
+    def test_partial_maps_keep_their_threshold(self):
+        """Test that partial maps are not used for lower thresholds."""
+        self.cache.put(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, make_response(), threshold=0.8, complete=False)
+
+        self.assertIsNone(self.cache.get(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, 0.7))
+        self.assertIsNotNone(self.cache.get(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, 0.8))
+
+    def test_eviction_by_frame_age_and_bytes(self):
+        """Test that old frames and least recently used entries are dropped."""
+        for frame_id in (1, 2, 3):
+            self.cache.put(('a', frame_id), 'icon', cv2.TM_CCOEFF_NORMED, make_response(), threshold=0.9)
+
+        self.assertIsNone(self.cache.get(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+        self.assertIsNotNone(self.cache.get(('a', 2), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+        self.assertEqual(self.cache.get_stats()['entries'], 2)
+
+        self.cache.trim(self.cache.get_footprint() - 1)
+        self.assertIsNone(self.cache.get(('a', 3), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+        self.assertIsNotNone(self.cache.get(('a', 2), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+
+    def test_sources_are_kept_apart(self):
+        """Test that equal frame IDs of different sources neither collide nor evict each other."""
+        self.cache.put(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, make_response(), threshold=0.9)
+        for frame_id in (5, 6, 7):
+            self.cache.put(('b', frame_id), 'icon', cv2.TM_CCOEFF_NORMED, make_response(), threshold=0.9)
+
+        self.assertIsNotNone(self.cache.get(('a', 1), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+        self.assertIsNone(self.cache.get(('b', 1), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+        self.assertIsNone(self.cache.get(('b', 5), 'icon', cv2.TM_CCOEFF_NORMED, 0.9))
+
+    def test_reloading_templates_keeps_other_directories(self):
+        """Test that a strategy reloading its templates only drops its own peaks."""
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            first = TemplateMatchingStrategy(templates_dir=first_dir)
+            second = TemplateMatchingStrategy(templates_dir=second_dir)
+            first.response_cache = second.response_cache = self.cache
+            for strategy in (first, second):
+                self.cache.put(('a', 1), strategy._cache_name('icon'), cv2.TM_CCOEFF_NORMED,
+                               make_response(), threshold=0.9)
+
+            first.reload_templates()
+
+            self.assertIsNone(self.cache.get(('a', 1), first._cache_name('icon'), cv2.TM_CCOEFF_NORMED, 0.9))
+            self.assertIsNotNone(self.cache.get(('a', 1), second._cache_name('icon'), cv2.TM_CCOEFF_NORMED, 0.9))
+
+
+class TestServiceReuse(unittest.TestCase):
+    """Test that the detection service reuses correlation peaks within a frame."""
+
+    def test_thresholds_share_one_correlation(self):
+        """Test that different thresholds and regions of one frame correlate once."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        rng = np.random.RandomState(3)
+        image = rng.randint(0, 255, (300, 400, 3)).astype(np.uint8)
+        cv2.imwrite(os.path.join(temp_dir.name, 'button.png'), image[200:230, 300:340])
+
+        strategy = TemplateMatchingStrategy(templates_dir=temp_dir.name)
+        strategy.response_cache = ResponseMapCache()
+        window_service = MagicMock()
+        window_service.frame_source = FrameSource(lambda: None)
+        window_service.frame_source.publish(image)
+        service = DetectionService(MagicMock(), window_service)
+        service.register_strategy('template', strategy)
+
+        with patch.object(strategy, '_match_map', wraps=strategy._match_map) as match_map:
+            first = service.detect_template('button', confidence_threshold=0.9, use_cache=False)
+            second = service.detect_template('button', confidence_threshold=0.6, max_results=1, use_cache=False)
+
+        self.assertEqual(match_map.call_count, 1)
+        self.assertEqual([(r['x'], r['y']) for r in first], [(300, 200)])
+        self.assertEqual([(r['x'], r['y']) for r in second], [(300, 200)])
+        self.assertEqual(strategy.response_cache.get_stats()['hits'], 1)
+
+        # A new frame is correlated again
+        window_service.frame_source.publish(image.copy())
+        with patch.object(strategy, '_match_map', wraps=strategy._match_map) as match_map:
+            service.detect_template('button', confidence_threshold=0.9, use_cache=False)
+        self.assertEqual(match_map.call_count, 1)
+
+    def test_services_with_separate_sources(self):
+        """Test that services sharing the cache do not read each other's peaks."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        rng = np.random.RandomState(5)
+        button = rng.randint(0, 255, (30, 40, 3)).astype(np.uint8)
+        cv2.imwrite(os.path.join(temp_dir.name, 'button.png'), button)
+        response_cache = ResponseMapCache()
+
+        positions = []
+        for x, y in ((10, 20), (300, 200)):
+            image = np.full((300, 400, 3), 90, dtype=np.uint8)
+            image[y:y + 30, x:x + 40] = button
+            strategy = TemplateMatchingStrategy(templates_dir=temp_dir.name)
+            strategy.response_cache = response_cache
+            window_service = MagicMock()
+            window_service.frame_source = FrameSource(lambda: None)
+            window_service.frame_source.publish(image)
+            service = DetectionService(MagicMock(), window_service)
+            service.register_strategy('template', strategy)
+            results = service.detect_template('button', confidence_threshold=0.9, use_cache=False)
+            positions.append([(r['x'], r['y']) for r in results])
+
+        self.assertEqual(positions, [[(10, 20)], [(300, 200)]])
+
+
+if __name__ == '__main__':
+    unittest.main()
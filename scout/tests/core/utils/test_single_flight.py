@@ -0,0 +1,130 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from scout.core.utils.single_flight import SingleFlight
+from scout.core.window.frame_source import FrameSource
+from scout.core.detection.detection_batch import DetectionBatch
+from scout.core.detection.detection_service import DetectionService
+
+
+def run_concurrently(*funcs):
+    """Start functions in threads, the first one slightly earlier, and collect their results."""
+    results = [None] * len(funcs)
+
+    def run(index, func):
+        results[index] = func()
+
+    threads = [threading.Thread(target=run, args=(i, func)) for i, func in enumerate(funcs)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test deduplication of concurrent calls."""
+
+    def setUp(self):
+        """Create a single-flight group and a slow computation."""
+        self.flights = SingleFlight()
+        self.calls = 0
+
+    def slow(self, value):
+        """Return a value after a delay, counting executions."""
+        self.calls += 1
+        time.sleep(0.1)
+        return value
+
+    def test_identical_calls_share_one_run(self):
+        """Test that concurrent identical calls execute once."""
+        results = run_concurrently(
+            lambda: self.flights.do('key', lambda: self.slow('a')),
+            lambda: self.flights.do('key', lambda: self.slow('b')),
+            lambda: self.flights.do('other', lambda: self.slow('c'))
+        )
+
+        self.assertEqual(results, [('a', None), ('a', None), ('c', None)])
+        self.assertEqual(self.calls, 2)
+        stats = self.flights.get_stats()
+        self.assertEqual((stats['requests'], stats['executions'], stats['coalesced']), (3, 2, 1))
+        self.assertAlmostEqual(stats['coalescing_ratio'], 1 / 3)
+        self.assertEqual(self.flights.in_flight(), 0)
+
+    def test_subsumed_calls_get_the_broader_spec(self):
+        """Test that a covering in-flight call answers a narrower request."""
+        covers = lambda running, wanted: running <= wanted
+        results = run_concurrently(
+            lambda: self.flights.do('key', lambda: self.slow('low'), spec=0.5, covers=covers),
+            lambda: self.flights.do('key', lambda: self.slow('high'), spec=0.8, covers=covers),
+            lambda: self.flights.do('key', lambda: self.slow('lower'), spec=0.3, covers=covers)
+        )
+
+        self.assertEqual(results, [('low', 0.5), ('low', 0.5), ('lower', 0.3)])
+        self.assertEqual(self.flights.get_stats()['subsumed'], 1)
+
+    def test_errors_reach_every_waiter(self):
+        """Test that waiting callers see the computation's exception."""
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError("capture failed")
+
+        errors = []
+
+        def call():
+            try:
+                self.flights.do('key', fail)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        run_concurrently(call, call)
+        self.assertEqual(errors, ["capture failed", "capture failed"])
+
+
+class TestServiceCoalescing(unittest.TestCase):
+    """Test that concurrent detection requests on one frame share a detection."""
+
+    def test_concurrent_template_requests(self):
+        """Test identical and stricter requests attaching to a running detection."""
+        batch = DetectionBatch.from_match_locations('button', [10, 50, 90], [5, 5, 5], 20, 20, [0.95, 0.8, 0.7])
+
+        def detect(**kwargs):
+            time.sleep(0.1)
+            return batch.filter_confidence(kwargs['confidence_threshold']).top_k(kwargs['max_results'])
+
+        strategy = MagicMock()
+        strategy.detect.side_effect = detect
+        window_service = MagicMock()
+        # One frame per second, so every request sees the published frame
+        window_service.frame_source = FrameSource(lambda: None, min_interval=1.0)
+        window_service.frame_source.publish(np.zeros((200, 300, 3), dtype=np.uint8))
+        service = DetectionService(MagicMock(), window_service)
+        service.register_strategy('template', strategy)
+
+        results = run_concurrently(
+            lambda: service.detect_template('button', confidence_threshold=0.7, max_results=5, use_cache=False),
+            lambda: service.detect_template('button', confidence_threshold=0.7, max_results=5, use_cache=False),
+            lambda: service.detect_template('button', confidence_threshold=0.75, max_results=1, use_cache=False),
+            lambda: service.detect_template('button', confidence_threshold=0.6, max_results=5, use_cache=False)
+        )
+
+        self.assertEqual(strategy.detect.call_count, 2)
+        self.assertEqual(len(results[0]), 3)
+        self.assertIs(results[1], results[0])
+        self.assertEqual([r['x'] for r in results[2]], [10])
+        stats = service.get_coalescing_stats()
+        self.assertEqual((stats['coalesced'], stats['subsumed']), (1, 1))
+        self.assertAlmostEqual(stats['coalescing_ratio'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests for the retained-mode overlay renderer.
+"""
+
+import unittest
+import numpy as np
+
+from scout.overlay_renderer import OverlayRenderer, BACKGROUND_COLOR
+
+
+def make_renderer():
+    """Create a renderer with typical overlay settings."""
+    return OverlayRenderer(
+        rect_color=(0, 255, 0), rect_thickness=2, rect_scale=1.0,
+        font_color=(255, 255, 255), font_size=12, text_thickness=1,
+        cross_color=(0, 0, 255), cross_size=10, cross_thickness=1
+    )
+
+
+def full_redraw(matches, status_text=None, size=(400, 300)):
+    """Render a scene from scratch for comparison."""
+    renderer = make_renderer()
+    renderer.resize(*size)
+    renderer.render(matches, status_text)
+    return renderer.canvas.copy()
+
+
+class TestOverlayRenderer(unittest.TestCase):
+    """Test dirty-rectangle rendering."""
+
+    def setUp(self):
+        """Create a renderer with a 400x300 canvas."""
+        self.renderer = make_renderer()
+        self.renderer.resize(400, 300)
+        self.first = ('city', 100, 120, 40, 30, 0.91)
+        self.second = ('mine', 300, 200, 50, 40, 0.85)
+
+    def test_first_render_redraws_everything(self):
+        """Test that a fresh canvas is repainted completely."""
+        dirty = self.renderer.render([self.first])
+
+        self.assertEqual(dirty, [(0, 0, 400, 300)])
+        self.assertEqual(tuple(self.renderer.canvas[299, 0]), BACKGROUND_COLOR)
+
+    def test_unchanged_scene_is_idle(self):
+        """Test that rendering the same matches does nothing."""
+        self.renderer.render([self.first])
+
+        self.assertEqual(self.renderer.render([self.first]), [])
+        self.assertEqual(self.renderer.get_stats()['idle_renders'], 1)
+
+    def test_only_changed_region_is_redrawn(self):
+        """Test that adding a match repaints only around it."""
+        self.renderer.render([self.first])
+        dirty = self.renderer.render([self.first, self.second])
+
+        self.assertEqual(len(dirty), 1)
+        x1, y1, x2, y2 = dirty[0]
+        self.assertTrue(x1 > 200 and y1 > 150)
+        self.assertLess((x2 - x1) * (y2 - y1), 400 * 300 // 4)
+
+    def test_incremental_matches_full_redraw(self):
+        """Test that incremental updates produce the same canvas as a full redraw."""
+        moved = ('city', 110, 125, 40, 30, 0.93)
+        sequence = [[self.first], [self.first, self.second], [moved, self.second], [moved], []]
+
+        for matches in sequence:
+            self.renderer.render(matches, "No matches")
+            np.testing.assert_array_equal(self.renderer.canvas, full_redraw(matches, "No matches"))
+
+    def test_resize_and_invalidate_force_full_redraw(self):
+        """Test that resizing or invalidating repaints the whole canvas."""
+        self.renderer.render([self.first])
+
+        self.renderer.invalidate()
+        self.assertEqual(self.renderer.render([self.first]), [(0, 0, 400, 300)])
+
+        self.assertTrue(self.renderer.resize(500, 300))
+        self.assertFalse(self.renderer.resize(500, 300))
+        self.assertEqual(self.renderer.render([self.first]), [(0, 0, 500, 300)])
+
+    def test_invalid_matches_are_skipped(self):
+        """Test that malformed or out-of-bounds matches are not drawn."""
+        self.renderer.render([])
+        dirty = self.renderer.render([('bad', 'x', 0, 10, 10, 0.9), ('far', 1000, 1000, 20, 20, 0.9)])
+
+        self.assertEqual(dirty, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ import re
 from dataclasses import dataclass
 from scout.debug_window import DebugWindow
 from scout.window_manager import WindowManager
-import mss
+from scout.core.window.screen_grabber import screen_grabber
 
 logger = logging.getLogger(__name__)
 
@@ -233,9 +233,13 @@ class TextOCR(QObject):
             
             logger.debug(f"Capturing region at: {capture_region}")
             
-            # Capture region using mss
-            with mss.mss() as sct:
-                screenshot = np.array(sct.grab(capture_region))
+            # Reuse the shared window frame when it covers the region
+            frame = self.window_manager.frame_source.get_latest()
+            screenshot = frame.crop(capture_region) if frame is not None else None
+            
+            # Otherwise capture the region directly
+            if screenshot is None:
+                screenshot = screen_grabber.grab(capture_region)
             
             if screenshot is None:
                 logger.warning("Failed to capture OCR region")
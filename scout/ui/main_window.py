@@ -41,7 +41,10 @@ from scout.core.automation.automation_service import AutomationService
 from scout.core.game.game_service import GameService
 from scout.core.game.game_state_service_interface import GameStateServiceInterface
 from scout.core.window.window_service import WindowService
+from scout.core.window.screen_grabber import screen_grabber
+from scout.core.window.capture_planner import CapturePlanner
 from scout.core.events.event_bus import EventBus
+from scout.core.utils.memory import memory_optimizer
 
 # Import the ServiceLocator from the UI module
 from scout.ui.service_locator_ui import ServiceLocator
@@ -51,6 +54,7 @@ from scout.ui.views.detection_tab import DetectionTab
 from scout.ui.views.automation_tab import AutomationTab
 from scout.ui.views.game_tab import GameTab
 from scout.ui.views.settings_tab import SettingsTab
+from scout.ui.models.settings_model import SettingsModel
 from scout.ui.widgets.detection_result_widget import DetectionResultWidget
 from scout.ui.widgets.control_panel_widget import ControlPanelWidget
 
@@ -366,6 +370,9 @@ class MainWindow(QMainWindow):
         # Create service instances
         window_service = WindowService(window_title="Total Battle", event_bus=event_bus)
         detection_service = DetectionService(event_bus=event_bus, window_service=window_service)
+        detection_service.set_capture_planner(
+            CapturePlanner(window_func=window_service.get_window_position)
+        )
         automation_service = AutomationService(event_bus=event_bus)
         game_state_service = GameService(window_service=window_service, detection_service=detection_service, event_bus=event_bus)
         
@@ -437,6 +444,22 @@ class MainWindow(QMainWindow):
         self.game_state_service = game_state_service
         
         logger.info("Services initialized and registered")
+        
+        # Hold the session's caches to the configured memory budget
+        self._start_memory_monitoring()
+    
+    def _start_memory_monitoring(self):
+        """Start the memory monitor with the budget and watermarks from the settings."""
+        try:
+            settings = SettingsModel()
+            memory_optimizer.configure(
+                budget_mb=float(settings.get('cache_memory_budget')),
+                soft_threshold_mb=float(settings.get('memory_soft_limit')),
+                threshold_mb=float(settings.get('memory_hard_limit'))
+            )
+            memory_optimizer.start()
+        except Exception as e:
+            logger.error(f"Error starting memory monitoring: {e}")
     
     def _init_ui(self):
         """Initialize the user interface."""
@@ -988,6 +1011,12 @@ class MainWindow(QMainWindow):
             ServiceLocator.shutdown()
             logger.info("Services shut down during application close")
             
+            # Release screen grabbers held by capture threads
+            screen_grabber.close_all()
+            
+            # Stop the memory monitor
+            memory_optimizer.stop()
+            
         except Exception as e:
             logger.error(f"Error during application close: {e}")
             
@@ -130,6 +130,9 @@ class SettingsModel:
         'thread_count': 4,
         'process_priority': 'normal',
         'image_cache_size': 100,  # MB
+        'cache_memory_budget': 256,  # MB for all caches together (0 for no budget)
+        'memory_soft_limit': 800,  # MB of process memory before caches are trimmed
+        'memory_hard_limit': 1000,  # MB of process memory before caches are emptied
         'parallel_processing': True,
         'log_level': 'INFO',
         'log_to_file': True,
@@ -18,7 +18,7 @@ from PyQt6.QtMultimediaWidgets import QVideoWidget
 
 from scout.ui.utils.language_manager import tr
 from scout.core.window.capture_session import CaptureSession
-from scout.core.window.image_utils import qimage_to_numpy, resize_image
+from scout.core.window.image_utils import QImageFrame, resize_image
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -50,6 +50,7 @@ class CapturePreviewWidget(QWidget):
         self._capture_session = None
         self._is_auto_screenshot = False
         self._current_frame = None
+        self._current_frame_data: Optional[QImageFrame] = None  # Lazy NumPy views of the frame
         self._frame_count = 0
         self._fps = 0
         self._last_fps_update = time.time()
@@ -199,6 +200,7 @@ class CapturePreviewWidget(QWidget):
         # When disabled, clear the current frame to stop sending
         if not enabled:
             self._current_frame = None
+            self._current_frame_data = None
     
     def _on_frame_ready(self, frame: QImage):
         """
@@ -210,18 +212,16 @@ class CapturePreviewWidget(QWidget):
         if frame.isNull():
             return
             
-        # Store the current frame
+        # Store the current frame; it is only converted to NumPy on request
         self._current_frame = frame
+        self._current_frame_data = QImageFrame(frame)
         
         # Increment frame counter for FPS calculation
         self._frame_count += 1
         
-        # Resize image if it's large
-        resized_frame = resize_image(frame, 1280, 720)
-        
-        # If auto screenshot is enabled, emit the frame for detection
+        # If auto screenshot is enabled, emit the frame (resized if large) for detection
         if self._is_auto_screenshot:
-            self.frame_captured.emit(resized_frame)
+            self.frame_captured.emit(resize_image(frame, 1280, 720))
     
     def _update_fps(self):
         """Update FPS counter."""
@@ -297,10 +297,13 @@ class CapturePreviewWidget(QWidget):
         """
         Get the current frame as a numpy array.
         
+        The conversion is done once per frame and shared between callers, so
+        the array is read-only.
+        
         Returns:
-            Optional[np.ndarray]: Current frame as a numpy array, or None if no frame
+            Optional[np.ndarray]: Current frame as a BGR numpy array, or None if no frame
         """
-        if self._current_frame is None:
+        if self._current_frame_data is None:
             return None
             
-        return qimage_to_numpy(self._current_frame) 
\ No newline at end of file
+        return self._current_frame_data.bgr 
\ No newline at end of file
@@ -17,12 +17,13 @@ from PyQt6.QtWidgets import (
     QHeaderView, QComboBox, QMessageBox
 )
 from PyQt6.QtGui import (
-    QImage, QPixmap, QPainter, QPen, QColor, QBrush, QFont,
+    QPixmap, QPainter, QPen, QColor, QBrush, QFont,
     QMouseEvent, QResizeEvent, QPaintEvent
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QRect, QSize, QPoint
 
 from scout.core.window.window_service_interface import WindowServiceInterface
+from scout.core.window.image_utils import numpy_to_qimage
 from scout.ui.utils.language_manager import tr
 
 # Set up logging
@@ -103,13 +104,9 @@ class ResultImageView(QWidget):
         if self._image is None:
             return
         
-        # Make a copy of the original image for drawing
+        # Make a copy of the original image for drawing (kept BGR; Qt reads it as BGR888)
         display = self._image.copy()
         
-        # Convert from BGR to RGB for Qt
-        if display.shape[2] == 3:
-            display = cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
-        
         # Calculate result rectangles at original scale
         self._result_rects = []
         
@@ -174,17 +171,8 @@ class ResultImageView(QWidget):
                     1
                 )
         
-        # Convert to QImage
-        height, width, channels = display.shape
-        bytes_per_line = channels * width
-        
-        self._display_image = QImage(
-            display.data,
-            width,
-            height,
-            bytes_per_line,
-            QImage.Format.Format_RGB888
-        )
+        # Wrap as QImage without converting; the QImage keeps the array alive
+        self._display_image = numpy_to_qimage(display)
     
     def paintEvent(self, event: QPaintEvent) -> None:
         """
@@ -4,10 +4,11 @@ import logging
 import ctypes
 from ctypes.wintypes import RECT, POINT
 import numpy as np
-import cv2
-import mss
 import time
 import pywintypes
+from scout.core.window.frame_source import FrameSource
+from scout.core.window.capture_worker import CaptureWorker
+from scout.core.window.screen_grabber import screen_grabber
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,10 @@ class WindowManager:
         """
         self.window_title = window_title
         self.hwnd = None  # Windows handle to the game window
+        
+        # Screenshots are shared by all consumers that ask within the same tick
+        self.frame_source = FrameSource(self._grab_window, name='window_manager')
+        self.capture_worker: Optional[CaptureWorker] = None
         logger.debug(f"WindowManager initialized to track window: {window_title}")
     
     def find_window(self) -> bool:
@@ -253,13 +258,55 @@ class WindowManager:
             logger.error(f"Error converting coordinates: {e}")
             return screen_x, screen_y
 
+    def start_capture_worker(self, rate: float = 30.0, buffer_size: int = 4) -> CaptureWorker:
+        """
+        Start capturing the window continuously in the background.
+        
+        Keeps capture latency off the caller's thread (e.g. the overlay's
+        template matching timer); slow consumers skip to the newest frame.
+        
+        Args:
+            rate: Capture rate in frames per second
+            buffer_size: Number of recent frames kept
+            
+        Returns:
+            The running capture worker
+        """
+        if self.capture_worker is None:
+            self.capture_worker = CaptureWorker(self.frame_source, rate, buffer_size)
+        else:
+            self.capture_worker.rate = rate
+        self.capture_worker.start()
+        return self.capture_worker
+        
+    def stop_capture_worker(self) -> None:
+        """Stop background capture and capture on demand again."""
+        if self.capture_worker is not None:
+            self.capture_worker.stop()
+            self.capture_worker = None
+    
     def capture_screenshot(self) -> Optional[np.ndarray]:
         """
         Capture a screenshot of the game window.
         
+        Returns the latest frame of the shared frame source, so template
+        matching, OCR and scanning share one capture per tick. While the
+        capture worker runs, the frame comes from its ring buffer. The image
+        is read-only; copy it before drawing on it.
+        
         Returns:
             Screenshot as numpy array in BGR format (OpenCV), or None if failed
         """
+        frame = self.frame_source.get_latest()
+        return frame.image if frame is not None else None
+        
+    def _grab_window(self) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+        """
+        Capture a new screenshot of the game window.
+        
+        Returns:
+            Tuple of (screenshot in BGR format, window origin on screen), or None if failed
+        """
         try:
             if not self.find_window():
                 return None
@@ -272,27 +319,21 @@ class WindowManager:
             x, y, width, height = window_pos
             logger.debug(f"Window found at ({x}, {y}) with size {width}x{height}")
             
-            # Capture the screen
-            with mss.mss() as sct:
-                # Define capture region
-                monitor = {
-                    'left': x,
-                    'top': y,
-                    'width': width,
-                    'height': height
-                }
-                
-                logger.debug(f"Attempting to capture with monitor settings: {monitor}")
-                
-                # Grab screenshot using MSS
-                screenshot = np.array(sct.grab(monitor))
-                
-                # Convert from BGRA to BGR (drop alpha channel)
-                logger.debug(f"Captured image shape before conversion: {screenshot.shape}")
-                screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGRA2BGR)
-                logger.debug(f"Converted image shape: {screenshot.shape}")
-                
-                return screenshot
+            # Define capture region
+            monitor = {
+                'left': x,
+                'top': y,
+                'width': width,
+                'height': height
+            }
+            
+            logger.debug(f"Attempting to capture with monitor settings: {monitor}")
+            
+            # Grab screenshot with this thread's long-lived MSS instance, as contiguous BGR
+            screenshot = screen_grabber.grab(monitor)
+            logger.debug(f"Captured image shape: {screenshot.shape}")
+            
+            return screenshot, (x, y)
                 
         except pywintypes.error as e:
             # Special handling for common Windows API errors
@@ -7,13 +7,13 @@ import logging
 from time import sleep
 from pathlib import Path
 import pytesseract
-from mss import mss
 import time
 from PyQt6.QtCore import QObject, pyqtSignal
 from scout.template_matcher import TemplateMatcher
 from scout.config_manager import ConfigManager
 from scout.debug_window import DebugWindow
 from scout.window_manager import WindowManager
+from scout.core.window.screen_grabber import screen_grabber
 
 # Set Tesseract executable path
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'  # Adjust path if needed
@@ -83,6 +83,22 @@ class WorldScanner:
         
         logger.debug("WorldScanner initialized")
         
+    def _capture_region(self, region: Dict[str, int]) -> np.ndarray:
+        """
+        Capture a screen region, reusing the shared window frame when it covers it.
+        
+        Args:
+            region: Region in screen coordinates {left, top, width, height}
+            
+        Returns:
+            Captured image in BGR format (read-only when taken from the shared frame)
+        """
+        frame = self.window_manager.frame_source.get_latest()
+        image = frame.crop(region) if frame is not None else None
+        if image is None:
+            image = screen_grabber.grab(region)
+        return image
+        
     def get_current_position(self) -> Optional[WorldPosition]:
         """
         Get the current position from the minimap coordinates.
@@ -118,95 +134,95 @@ class WorldScanner:
             }
             
             # Add visual debug for coordinate regions
-            with mss() as sct:
-                # Take screenshot of entire minimap area plus coordinates
-                context_region = {
-                    'left': self.minimap_left,
-                    'top': self.minimap_top,
-                    'width': self.minimap_width,
-                    'height': self.minimap_height + int(30 * self.dpi_scale)  # Add scaled space for coordinates below
-                }
-                context_shot = np.array(sct.grab(context_region))
+            # Take screenshot of entire minimap area plus coordinates
+            context_region = {
+                'left': self.minimap_left,
+                'top': self.minimap_top,
+                'width': self.minimap_width,
+                'height': self.minimap_height + int(30 * self.dpi_scale)  # Add scaled space for coordinates below
+            }
+            # Copy since the debug overlay is drawn onto it
+            context_shot = self._capture_region(context_region).copy()
+            
+            # Draw rectangles around coordinate regions
+            for coord_type, region in coordinate_regions.items():
+                # Calculate relative positions to context region
+                x1 = region['left'] - context_region['left']
+                y1 = region['top'] - context_region['top']
+                x2 = x1 + region['width']
+                y2 = y1 + region['height']
                 
-                # Draw rectangles around coordinate regions
-                for coord_type, region in coordinate_regions.items():
-                    # Calculate relative positions to context region
-                    x1 = region['left'] - context_region['left']
-                    y1 = region['top'] - context_region['top']
-                    x2 = x1 + region['width']
-                    y2 = y1 + region['height']
-                    
-                    # Only draw if within bounds
-                    if (0 <= x1 < context_shot.shape[1] and 
-                        0 <= y1 < context_shot.shape[0] and 
-                        0 <= x2 < context_shot.shape[1] and 
-                        0 <= y2 < context_shot.shape[0]):
-                        cv2.rectangle(context_shot, (x1, y1), (x2, y2), (0, 255, 0), 1)
-                        cv2.putText(context_shot, coord_type, (x1, y1-5), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5 * self.dpi_scale, (0, 255, 0), 1)
+                # Only draw if within bounds
+                if (0 <= x1 < context_shot.shape[1] and 
+                    0 <= y1 < context_shot.shape[0] and 
+                    0 <= x2 < context_shot.shape[1] and 
+                    0 <= y2 < context_shot.shape[0]):
+                    cv2.rectangle(context_shot, (x1, y1), (x2, y2), (0, 255, 0), 1)
+                    cv2.putText(context_shot, coord_type, (x1, y1-5), 
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5 * self.dpi_scale, (0, 255, 0), 1)
+            
+            # Update debug window with context image
+            self.debug_window.update_image(
+                "Coordinate Regions",
+                context_shot,
+                metadata={
+                    "dpi_scale": self.dpi_scale,
+                    "minimap_size": f"{self.minimap_width}x{self.minimap_height}"
+                },
+                save=True
+            )
+            
+            # Process each coordinate region
+            coordinates = {}
+            for coord_type, region in coordinate_regions.items():
+                # Capture and process image
+                screenshot = self._capture_region(region)
+                gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
+                gray = cv2.convertScaleAbs(gray, alpha=2.0, beta=0)
+                blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+                thresh = cv2.adaptiveThreshold(
+                    blurred, 255,
+                    cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                    cv2.THRESH_BINARY,
+                    11, 2
+                )
+                
+                # Try OCR
+                text = pytesseract.image_to_string(
+                    thresh,
+                    config='--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789'
+                )
+                
+                # Clean text and get value
+                try:
+                    value = int(''.join(filter(str.isdigit, text.strip())))
+                    coordinates[coord_type] = value
+                except ValueError:
+                    coordinates[coord_type] = 0
+                    logger.warning(f"Failed to parse {coord_type} coordinate")
                 
-                # Update debug window with context image
+                # Update debug window with processed image
                 self.debug_window.update_image(
-                    "Coordinate Regions",
-                    context_shot,
+                    f"Coordinate {coord_type}",
+                    thresh,
                     metadata={
-                        "dpi_scale": self.dpi_scale,
-                        "minimap_size": f"{self.minimap_width}x{self.minimap_height}"
+                        "raw_text": text.strip(),
+                        "value": coordinates[coord_type]
                     },
                     save=True
                 )
-                
-                # Process each coordinate region
-                coordinates = {}
-                for coord_type, region in coordinate_regions.items():
-                    # Capture and process image
-                    screenshot = np.array(sct.grab(region))
-                    gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-                    gray = cv2.convertScaleAbs(gray, alpha=2.0, beta=0)
-                    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-                    thresh = cv2.adaptiveThreshold(
-                        blurred, 255,
-                        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                        cv2.THRESH_BINARY,
-                        11, 2
-                    )
-                    
-                    # Try OCR
-                    text = pytesseract.image_to_string(
-                        thresh,
-                        config='--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789'
-                    )
-                    
-                    # Clean text and get value
-                    try:
-                        value = int(''.join(filter(str.isdigit, text.strip())))
-                        coordinates[coord_type] = value
-                    except ValueError:
-                        coordinates[coord_type] = 0
-                        logger.warning(f"Failed to parse {coord_type} coordinate")
-                    
-                    # Update debug window with processed image
-                    self.debug_window.update_image(
-                        f"Coordinate {coord_type}",
-                        thresh,
-                        metadata={
-                            "raw_text": text.strip(),
-                            "value": coordinates[coord_type]
-                        },
-                        save=True
-                    )
-                
-                if all(coord in coordinates for coord in ['x', 'y', 'k']):
-                    position = WorldPosition(
-                        x=coordinates['x'],
-                        y=coordinates['y'],
-                        k=coordinates['k']
-                    )
-                    logger.info(f"Successfully detected position: X={position.x}, Y={position.y}, K={position.k}")
-                    return position
-                
-                return None
-                
+            
+            if all(coord in coordinates for coord in ['x', 'y', 'k']):
+                position = WorldPosition(
+                    x=coordinates['x'],
+                    y=coordinates['y'],
+                    k=coordinates['k']
+                )
+                logger.info(f"Successfully detected position: X={position.x}, Y={position.y}, K={position.k}")
+                return position
+            
+            return None
+            
         except Exception as e:
             logger.error(f"Error getting current position: {e}", exc_info=True)
             return None
@@ -507,35 +523,34 @@ class ScanWorker(QObject):
                 }
             }
             
-            with mss() as sct:
-                for coord_type, region in coordinate_regions.items():
-                    # Capture and process image
-                    screenshot = np.array(sct.grab(region))
-                    gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-                    gray = cv2.convertScaleAbs(gray, alpha=2.0, beta=0)
-                    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-                    thresh = cv2.adaptiveThreshold(
-                        blurred, 255,
-                        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                        cv2.THRESH_BINARY,
-                        11, 2
-                    )
-                    
-                    # Try OCR
-                    text = pytesseract.image_to_string(
-                        thresh,
-                        config='--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789'
-                    )
-                    
-                    # Clean text and get value
-                    try:
-                        value = int(''.join(filter(str.isdigit, text.strip())))
-                    except ValueError:
-                        value = 0
-                    
-                    # Emit image and value
-                    self.debug_image.emit(thresh, coord_type, value)
-                    
+            for coord_type, region in coordinate_regions.items():
+                # Capture and process image
+                screenshot = self.scanner._capture_region(region)
+                gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
+                gray = cv2.convertScaleAbs(gray, alpha=2.0, beta=0)
+                blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+                thresh = cv2.adaptiveThreshold(
+                    blurred, 255,
+                    cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                    cv2.THRESH_BINARY,
+                    11, 2
+                )
+                
+                # Try OCR
+                text = pytesseract.image_to_string(
+                    thresh,
+                    config='--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789'
+                )
+                
+                # Clean text and get value
+                try:
+                    value = int(''.join(filter(str.isdigit, text.strip())))
+                except ValueError:
+                    value = 0
+                
+                # Emit image and value
+                self.debug_image.emit(thresh, coord_type, value)
+                
         except Exception as e:
             logger.error(f"Error updating debug images: {e}")
     